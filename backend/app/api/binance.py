@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException
-import aiohttp
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+from app.core.http_client import http_client
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -15,32 +16,53 @@ class BinanceClient:
         """Отримати ціну з Binance"""
         try:
             url = f"{self.base_url}/ticker/price?symbol={symbol}"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=10) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return {
-                            'price': float(data['price']),
-                            'exchange': 'Binance',
-                            'symbol': symbol,
-                            'timestamp': data.get('time', '')
-                        }
-                    else:
-                        logger.error(f"Binance API error: {response.status}")
-                        return None
+            async with http_client.get(url, rate_limit='binance', weight=2) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return {
+                        'price': float(data['price']),
+                        'exchange': 'Binance',
+                        'symbol': symbol,
+                        'timestamp': data.get('time', '')
+                    }
+                else:
+                    logger.error(f"Binance API error: {response.status}")
+                    return None
         except Exception as e:
             logger.error(f"Error fetching price from Binance: {e}")
             return None
 
+    async def get_prices_bulk(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Ціни кількох символів одним запитом (/ticker/price без symbol)"""
+        try:
+            # Усі пари і фільтр: параметр symbols дає 400 на весь запит, якщо хоч одна пара недоступна
+            wanted = set(symbols)
+            async with http_client.get(f"{self.base_url}/ticker/price", rate_limit='binance', weight=4) as response:
+                if response.status != 200:
+                    logger.error(f"Binance API error: {response.status}")
+                    return {}
+                data = await response.json()
+            return {
+                item['symbol']: {
+                    'price': float(item['price']),
+                    'exchange': 'Binance',
+                    'symbol': item['symbol'],
+                    'timestamp': ''
+                }
+                for item in data if item['symbol'] in wanted
+            }
+        except Exception as e:
+            logger.error(f"Error fetching bulk prices from Binance: {e}")
+            return {}
+
     async def get_ticker(self, symbol: str) -> Optional[Dict]:
         """Отримати детальну інформацію про тикер"""
         try:
             url = f"{self.base_url}/ticker/24hr?symbol={symbol}"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=10) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    return None
+            async with http_client.get(url, rate_limit='binance', weight=2) as response:
+                if response.status == 200:
+                    return await response.json()
+                return None
         except Exception as e:
             logger.error(f"Error fetching ticker from Binance: {e}")
             return None
@@ -97,21 +119,20 @@ async def get_top_symbols(limit: int = 20):
     """Отримати список популярних символів"""
     try:
         url = f"{client.base_url}/ticker/24hr"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=10) as response:
-                if response.status == 200:
-                    tickers = await response.json()
-                    # Сортуємо за обсягом торгів
-                    sorted_tickers = sorted(
-                        tickers,
-                        key=lambda x: float(x.get('quoteVolume', 0)),
-                        reverse=True
-                    )[:limit]
-                    return {
-                        "success": True,
-                        "data": sorted_tickers,
-                        "count": len(sorted_tickers)
-                    }
-                return {"success": False, "error": "Failed to fetch symbols"}
+        async with http_client.get(url, rate_limit='binance', weight=80) as response:
+            if response.status == 200:
+                tickers = await response.json()
+                # Сортуємо за обсягом торгів
+                sorted_tickers = sorted(
+                    tickers,
+                    key=lambda x: float(x.get('quoteVolume', 0)),
+                    reverse=True
+                )[:limit]
+                return {
+                    "success": True,
+                    "data": sorted_tickers,
+                    "count": len(sorted_tickers)
+                }
+            return {"success": False, "error": "Failed to fetch symbols"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
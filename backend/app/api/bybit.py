@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException
-import aiohttp
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+from app.core.http_client import http_client
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -15,31 +16,55 @@ class BybitClient:
         """Отримати ціну з Bybit"""
         try:
             url = f"{self.base_url}/tickers?category=spot&symbol={symbol}"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=10) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        result = data.get('result', {})
-                        list_data = result.get('list', [])
-                        
-                        if not list_data:
-                            return None
-                        
-                        ticker = list_data[0]
-                        return {
-                            'price': float(ticker.get('lastPrice', 0)),
-                            'exchange': 'Bybit',
-                            'symbol': symbol,
-                            'bid': float(ticker.get('bid1Price', 0)),
-                            'ask': float(ticker.get('ask1Price', 0)),
-                            'volume': float(ticker.get('volume24h', 0)),
-                            'timestamp': ticker.get('time', '')
-                        }
-                    return None
+            async with http_client.get(url, rate_limit='bybit') as response:
+                if response.status == 200:
+                    data = await response.json()
+                    result = data.get('result', {})
+                    list_data = result.get('list', [])
+                    
+                    if not list_data:
+                        return None
+                    
+                    ticker = list_data[0]
+                    return {
+                        'price': float(ticker.get('lastPrice', 0)),
+                        'exchange': 'Bybit',
+                        'symbol': symbol,
+                        'bid': float(ticker.get('bid1Price', 0)),
+                        'ask': float(ticker.get('ask1Price', 0)),
+                        'volume': float(ticker.get('volume24h', 0)),
+                        'timestamp': ticker.get('time', '')
+                    }
+                return None
         except Exception as e:
             logger.error(f"Error fetching price from Bybit: {e}")
             return None
 
+    async def get_prices_bulk(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Ціни кількох символів одним запитом (усі спот-тікери)"""
+        try:
+            wanted = set(symbols)
+            async with http_client.get(f"{self.base_url}/tickers?category=spot", rate_limit='bybit') as response:
+                if response.status != 200:
+                    logger.error(f"Bybit API error: {response.status}")
+                    return {}
+                data = await response.json()
+            return {
+                ticker['symbol']: {
+                    'price': float(ticker.get('lastPrice', 0)),
+                    'exchange': 'Bybit',
+                    'symbol': ticker['symbol'],
+                    'bid': float(ticker.get('bid1Price', 0) or 0),
+                    'ask': float(ticker.get('ask1Price', 0) or 0),
+                    'volume': float(ticker.get('volume24h', 0) or 0),
+                    'timestamp': data.get('time', '')
+                }
+                for ticker in data.get('result', {}).get('list', []) if ticker.get('symbol') in wanted
+            }
+        except Exception as e:
+            logger.error(f"Error fetching bulk prices from Bybit: {e}")
+            return {}
+
 
 client = BybitClient()
 
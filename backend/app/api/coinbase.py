@@ -1,7 +1,9 @@
 from fastapi import APIRouter, HTTPException
-import aiohttp
+import asyncio
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+from app.core.http_client import http_client
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -16,40 +18,44 @@ class CoinbaseClient:
         try:
             url = f"{self.base_url}/products/{symbol}/ticker"
             logger.info(f"Coinbase API call: {url}")
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=10) as response:
-                    logger.info(f"Coinbase response status: {response.status}")
-                    if response.status == 200:
-                        data = await response.json()
-                        logger.info(f"Coinbase data: {data}")
-                        # Перевіряємо, чи є ціна у відповіді
-                        price_str = data.get('price')
-                        if not price_str:
-                            logger.error("Coinbase: No price in response")
-                            return None
-                        try:
-                            price = float(price_str)
-                            return {
-                                'price': price,
-                                'exchange': 'Coinbase',
-                                'symbol': symbol,
-                                'bid': float(data.get('bid', 0)),
-                                'ask': float(data.get('ask', 0)),
-                                'volume': float(data.get('volume', 0)),
-                                'timestamp': data.get('time', '')
-                            }
-                        except ValueError as e:
-                            logger.error(f"Coinbase: Error converting price '{price_str}' to float: {e}")
-                            return None
-                    else:
-                        # Якщо статус не 200, читаємо текст помилки
-                        error_text = await response.text()
-                        logger.error(f"Coinbase API error {response.status}: {error_text}")
+            async with http_client.get(url, rate_limit='coinbase') as response:
+                logger.info(f"Coinbase response status: {response.status}")
+                if response.status == 200:
+                    data = await response.json()
+                    logger.info(f"Coinbase data: {data}")
+                    # Перевіряємо, чи є ціна у відповіді
+                    price_str = data.get('price')
+                    if not price_str:
+                        logger.error("Coinbase: No price in response")
+                        return None
+                    try:
+                        price = float(price_str)
+                        return {
+                            'price': price,
+                            'exchange': 'Coinbase',
+                            'symbol': symbol,
+                            'bid': float(data.get('bid', 0)),
+                            'ask': float(data.get('ask', 0)),
+                            'volume': float(data.get('volume', 0)),
+                            'timestamp': data.get('time', '')
+                        }
+                    except ValueError as e:
+                        logger.error(f"Coinbase: Error converting price '{price_str}' to float: {e}")
                         return None
+                else:
+                    # Якщо статус не 200, читаємо текст помилки
+                    error_text = await response.text()
+                    logger.error(f"Coinbase API error {response.status}: {error_text}")
+                    return None
         except Exception as e:
             logger.error(f"Error fetching price from Coinbase: {e}", exc_info=True)
             return None
 
+    async def get_prices_bulk(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Ціни кількох символів (у Coinbase немає пакетного тікера - паралельні запити)"""
+        prices = await asyncio.gather(*(self.get_price(symbol) for symbol in symbols))
+        return {symbol: price for symbol, price in zip(symbols, prices) if price}
+
 
 client = CoinbaseClient()
 
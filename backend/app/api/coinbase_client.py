@@ -1,23 +1,16 @@
 # app/exchanges/coinbase_client.py
-import aiohttp
 import asyncio
 from typing import Dict, Optional, Any
 from datetime import datetime
 
+from app.core.http_client import http_client
+
 class CoinbaseClient:
     """Клієнт для Coinbase Pro API"""
     
     def __init__(self):
         self.base_url = "https://api.pro.coinbase.com"
-        self.session = None
-        self.timeout = aiohttp.ClientTimeout(total=10)
         
-    async def _get_session(self) -> aiohttp.ClientSession:
-        """Отримати або створити сесію"""
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession(timeout=self.timeout)
-        return self.session
-    
     async def get_price(self, symbol: str) -> Optional[Dict]:
         """
         Отримати поточну ціну з Coinbase Pro
@@ -33,10 +26,9 @@ class CoinbaseClient:
             # BTC-USD -> BTC-USD (залишаємо як є)
             product_id = symbol
             
-            session = await self._get_session()
             url = f"{self.base_url}/products/{product_id}/ticker"
             
-            async with session.get(url) as response:
+            async with http_client.get(url, rate_limit='coinbase') as response:
                 if response.status == 200:
                     data = await response.json()
                     
@@ -67,10 +59,9 @@ class CoinbaseClient:
         """Отримати стакан замовлень"""
         try:
             product_id = symbol
-            session = await self._get_session()
             url = f"{self.base_url}/products/{product_id}/book?level={level}"
             
-            async with session.get(url) as response:
+            async with http_client.get(url, rate_limit='coinbase') as response:
                 if response.status == 200:
                     return await response.json()
         except Exception as e:
@@ -78,11 +69,5 @@ class CoinbaseClient:
         return None
     
     async def close(self):
-        """Закрити сесію"""
-        if self.session and not self.session.closed:
-            await self.session.close()
-    
-    def __del__(self):
-        """Деструктор для закриття сесії"""
-        if self.session and not self.session.closed:
-            asyncio.create_task(self.close())
\ No newline at end of file
+        """Спільна сесія закривається при зупинці застосунку"""
+        pass
\ No newline at end of file
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, HTTPException
-import aiohttp
+import asyncio
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+from app.core.http_client import http_client
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -15,40 +17,65 @@ class KrakenClient:
         """Отримати ціну з Kraken"""
         try:
             url = f"{self.base_url}/Ticker?pair={symbol}"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=10) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get('error'):
-                            logger.error(f"Kraken API error: {data['error']}")
-                            return None
-                        
-                        # Kraken повертає дані з ключем result, де ключ - це символ
-                        result = data.get('result', {})
-                        if not result:
-                            return None
-                        
-                        # Беремо перший символ з результату
-                        first_key = list(result.keys())[0]
-                        ticker_data = result[first_key]
-                        
-                        # Беремо ціну закриття (c[0])
-                        price = float(ticker_data.get('c', [0])[0])
-                        
-                        return {
-                            'price': price,
-                            'exchange': 'Kraken',
-                            'symbol': symbol,
-                            'bid': float(ticker_data.get('b', [0])[0]),
-                            'ask': float(ticker_data.get('a', [0])[0]),
-                            'volume': float(ticker_data.get('v', [0])[0]),
-                            'timestamp': data.get('timestamp', '')
-                        }
-                    return None
+            async with http_client.get(url, rate_limit='kraken') as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if data.get('error'):
+                        logger.error(f"Kraken API error: {data['error']}")
+                        return None
+                    
+                    # Kraken повертає дані з ключем result, де ключ - це символ
+                    result = data.get('result', {})
+                    if not result:
+                        return None
+                    
+                    # Беремо перший символ з результату
+                    first_key = list(result.keys())[0]
+                    ticker_data = result[first_key]
+                    
+                    return self._format_ticker(symbol, ticker_data, data.get('timestamp', ''))
+                return None
         except Exception as e:
             logger.error(f"Error fetching price from Kraken: {e}")
             return None
 
+    async def get_prices_bulk(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Ціни кількох пар одним запитом (Ticker?pair=a,b,c)"""
+        try:
+            url = f"{self.base_url}/Ticker?pair={','.join(symbols)}"
+            async with http_client.get(url, rate_limit='kraken') as response:
+                if response.status != 200:
+                    logger.error(f"Kraken API error: {response.status}")
+                    return {}
+                data = await response.json()
+            if data.get('error'):
+                # Одна невідома пара - помилка на весь запит: по парі окремо
+                logger.warning(f"Kraken bulk error {data['error']}, запит по кожній парі")
+                prices = await asyncio.gather(*(self.get_price(symbol) for symbol in symbols))
+                return {symbol: price for symbol, price in zip(symbols, prices) if price}
+
+            # Ключі результату - канонічні назви пар (як у exchange_symbols)
+            return {
+                key: self._format_ticker(key, ticker_data, data.get('timestamp', ''))
+                for key, ticker_data in data.get('result', {}).items() if key in symbols
+            }
+        except Exception as e:
+            logger.error(f"Error fetching bulk prices from Kraken: {e}")
+            return {}
+
+    @staticmethod
+    def _format_ticker(symbol: str, ticker_data: Dict, timestamp) -> Dict:
+        # Беремо ціну закриття (c[0])
+        return {
+            'price': float(ticker_data.get('c', [0])[0]),
+            'exchange': 'Kraken',
+            'symbol': symbol,
+            'bid': float(ticker_data.get('b', [0])[0]),
+            'ask': float(ticker_data.get('a', [0])[0]),
+            'volume': float(ticker_data.get('v', [0])[0]),
+            'timestamp': timestamp
+        }
+
 
 client = KrakenClient()
 
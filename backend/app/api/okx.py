@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException
-import aiohttp
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+from app.core.http_client import http_client
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -15,33 +16,60 @@ class OKXClient:
         """Отримати ціну з OKX"""
         try:
             url = f"{self.base_url}/market/ticker?instId={symbol}"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=10) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get('code') != '0':
-                            logger.error(f"OKX API error: {data.get('msg')}")
-                            return None
-                        
-                        result = data.get('data', [])
-                        if not result:
-                            return None
-                        
-                        ticker = result[0]
-                        return {
-                            'price': float(ticker.get('last', 0)),
-                            'exchange': 'OKX',
-                            'symbol': symbol,
-                            'bid': float(ticker.get('bidPx', 0)),
-                            'ask': float(ticker.get('askPx', 0)),
-                            'volume': float(ticker.get('vol24h', 0)),
-                            'timestamp': ticker.get('ts', '')
-                        }
-                    return None
+            async with http_client.get(url, rate_limit='okx:market/ticker') as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if data.get('code') != '0':
+                        logger.error(f"OKX API error: {data.get('msg')}")
+                        return None
+                    
+                    result = data.get('data', [])
+                    if not result:
+                        return None
+                    
+                    ticker = result[0]
+                    return {
+                        'price': float(ticker.get('last', 0)),
+                        'exchange': 'OKX',
+                        'symbol': symbol,
+                        'bid': float(ticker.get('bidPx', 0)),
+                        'ask': float(ticker.get('askPx', 0)),
+                        'volume': float(ticker.get('vol24h', 0)),
+                        'timestamp': ticker.get('ts', '')
+                    }
+                return None
         except Exception as e:
             logger.error(f"Error fetching price from OKX: {e}")
             return None
 
+    async def get_prices_bulk(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Ціни кількох символів одним запитом (усі спот-тікери)"""
+        try:
+            wanted = set(symbols)
+            async with http_client.get(f"{self.base_url}/market/tickers?instType=SPOT", rate_limit='okx:market/tickers') as response:
+                if response.status != 200:
+                    logger.error(f"OKX API error: {response.status}")
+                    return {}
+                data = await response.json()
+            if data.get('code') != '0':
+                logger.error(f"OKX API error: {data.get('msg')}")
+                return {}
+            return {
+                ticker['instId']: {
+                    'price': float(ticker.get('last', 0)),
+                    'exchange': 'OKX',
+                    'symbol': ticker['instId'],
+                    'bid': float(ticker.get('bidPx', 0) or 0),
+                    'ask': float(ticker.get('askPx', 0) or 0),
+                    'volume': float(ticker.get('vol24h', 0) or 0),
+                    'timestamp': ticker.get('ts', '')
+                }
+                for ticker in data.get('data', []) if ticker.get('instId') in wanted
+            }
+        except Exception as e:
+            logger.error(f"Error fetching bulk prices from OKX: {e}")
+            return {}
+
 
 client = OKXClient()
 
@@ -0,0 +1,302 @@
+# backend/app/core/candle_store.py
+import logging
+import os
+import re
+import struct
+import threading
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .market_cache import last_closed_candle_ts, timeframe_seconds
+
+try:
+    import fcntl
+except ImportError:  # Windows: лише блокування в межах процесу
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Запит свічок на біржу: (since у мс або None - останні, limit) -> рядки ccxt
+# [[timestamp, open, high, low, close, volume], ...]
+FetchRows = Callable[[Optional[int], int], Sequence[Sequence[float]]]
+
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+MAGIC = b'OHLCVST1'
+HEADER = struct.Struct('<8sqqq')   # magic, timeframe_ms, count, capacity
+HEADER_SIZE = 64
+COUNT_OFFSET = 16
+
+
+class CandleFile:
+    """
+    Файл свічок одного (symbol, timeframe): заголовок 64 байти + колонки
+    timestamp (int64, мс) та open/high/low/close/volume (float64) по capacity
+    значень кожна. Лише закриті свічки, лише дописування в кінець: записані
+    рядки не змінюються, тож view на них лишаються дійсними. Коли місце
+    закінчується, файл перезаписується з подвоєною capacity (атомарний rename).
+    """
+
+    def __init__(self, path: str, timeframe_ms: int, capacity: int = 1024):
+        self.path = path
+        self.timeframe_ms = timeframe_ms
+        if not os.path.exists(path):
+            self._create(path, capacity, 0, {}, timeframe_ms)
+        self._open()
+
+    # ====== ФАЙЛ ======
+
+    @staticmethod
+    def _create(path: str, capacity: int, count: int, columns: Dict[str, np.ndarray], timeframe_ms: int):
+        tmp = f"{path}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, timeframe_ms, count, capacity).ljust(HEADER_SIZE, b'\0'))
+            for name in COLUMNS:
+                block = np.zeros(capacity, dtype=np.int64 if name == 'timestamp' else np.float64)
+                if count:
+                    block[:count] = columns[name][:count]
+                f.write(block.tobytes())
+        os.replace(tmp, path)
+
+    def _open(self):
+        self._map = np.memmap(self.path, dtype=np.uint8, mode='r+')
+        magic, timeframe_ms, _, capacity = HEADER.unpack(bytes(self._map[:HEADER.size]))
+        if magic != MAGIC:
+            raise ValueError(f"Не файл свічок: {self.path}")
+        if timeframe_ms != self.timeframe_ms:
+            raise ValueError(f"Таймфрейм файлу {self.path} не збігається ({timeframe_ms} мс)")
+        self.capacity = capacity
+        self._count = self._map[COUNT_OFFSET:COUNT_OFFSET + 8].view(np.int64)
+        self._columns = {}
+        for i, name in enumerate(COLUMNS):
+            start = HEADER_SIZE + i * capacity * 8
+            self._columns[name] = self._map[start:start + capacity * 8].view(
+                np.int64 if name == 'timestamp' else np.float64)
+        self.inode = os.stat(self.path).st_ino
+
+    def stale(self) -> bool:
+        """Файл замінено іншим процесом (ріст capacity) - потрібен _open()"""
+        try:
+            return os.stat(self.path).st_ino != self.inode
+        except FileNotFoundError:
+            return True
+
+    def reload(self):
+        if not os.path.exists(self.path):
+            self._create(self.path, 1024, 0, {}, self.timeframe_ms)
+        self._open()
+
+    # ====== ДАНІ ======
+
+    @property
+    def count(self) -> int:
+        return int(self._count[0])
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        return int(self._columns['timestamp'][self.count - 1]) if self.count else None
+
+    def columns(self, start: int = 0, stop: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Read-only view колонок [start:stop) без копіювання"""
+        stop = self.count if stop is None else stop
+        views = {}
+        for name, column in self._columns.items():
+            view = column[start:stop].view(np.ndarray)
+            view.flags.writeable = False
+            views[name] = view
+        return views
+
+    def append(self, rows: np.ndarray) -> int:
+        """Дописування рядків (n × 6) з timestamp новішим за останній; повертає кількість доданих"""
+        last = self.last_timestamp
+        if last is not None:
+            rows = rows[rows[:, 0] > last]
+        if len(rows) == 0:
+            return 0
+
+        count = self.count
+        if count + len(rows) > self.capacity:
+            capacity = self.capacity
+            while capacity < count + len(rows):
+                capacity *= 2
+            # старий mmap живе, доки на нього є view у читачів
+            self._create(self.path, capacity, count, self.columns(), self.timeframe_ms)
+            self._open()
+
+        for i, name in enumerate(COLUMNS):
+            values = rows[:, i].astype(np.int64) if name == 'timestamp' else rows[:, i]
+            self._columns[name][count:count + len(rows)] = values
+        self._map.flush()
+        self._count[0] = count + len(rows)  # лічильник - після даних: читачі бачать лише записане
+        return len(rows)
+
+    def reset(self):
+        """Порожній файл на місці старого (видані view старих рядків не змінюються)"""
+        self._create(self.path, self.capacity, 0, {}, self.timeframe_ms)
+        self._open()
+
+
+class CandleStore:
+    """
+    Локальне сховище свічок: по файлу на (symbol, timeframe) у directory.
+    sync() докачує з біржі лише свічки після останньої збереженої (один
+    маленький запит на закриття свічки, між закриттями - лише незакрита
+    свічка запитом limit=1), history()/arrays() повертають історію без
+    копіювання, frame() - останні limit свічок разом з поточною незакритою
+    (як повертає біржа).
+    """
+
+    def __init__(self, directory: str, page_limit: int = 1000, max_gap: int = 5000):
+        self.directory = directory
+        self.page_limit = page_limit  # свічок за один запит докачки
+        self.max_gap = max_gap        # більший розрив - історія починається заново
+        os.makedirs(directory, exist_ok=True)
+        self._files: Dict[Tuple[str, str], CandleFile] = {}
+        self._forming: Dict[Tuple[str, str], Tuple[int, np.ndarray]] = {}
+        self._synced: Dict[Tuple[str, str], Tuple[int, int]] = {}  # (закрита свічка, limit)
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.stats = {'syncs': 0, 'requests': 0, 'appended': 0, 'resets': 0, 'skipped': 0}
+
+    def path(self, symbol: str, timeframe: str) -> str:
+        name = re.sub(r'[^A-Za-z0-9_.-]+', '_', symbol)
+        return os.path.join(self.directory, f"{name}__{timeframe}.ohlcv")
+
+    def _file(self, symbol: str, timeframe: str) -> CandleFile:
+        key = (symbol, timeframe)
+        with self._lock:
+            if key not in self._files:
+                self._files[key] = CandleFile(self.path(symbol, timeframe), timeframe_seconds(timeframe) * 1000)
+                self._locks[key] = threading.Lock()
+            candle_file = self._files[key]
+        if candle_file.stale():
+            candle_file.reload()
+        return candle_file
+
+    # ====== ЧИТАННЯ ======
+
+    def arrays(self, symbol: str, timeframe: str, limit: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Закриті свічки як read-only view колонок (timestamp - int64 мс)"""
+        candle_file = self._file(symbol, timeframe)
+        count = candle_file.count
+        start = 0 if limit is None else max(0, count - limit)
+        return candle_file.columns(start, count)
+
+    def history(self, symbol: str, timeframe: str, limit: Optional[int] = None) -> pd.DataFrame:
+        """DataFrame закритих свічок поверх view файлу (без копії та pd.to_datetime)"""
+        columns = self.arrays(symbol, timeframe, limit)
+        columns['timestamp'] = columns['timestamp'].view('datetime64[ms]')
+        return pd.DataFrame(columns, copy=False)
+
+    def frame(self, symbol: str, timeframe: str, limit: int, fetch: FetchRows,
+              now: Optional[float] = None) -> pd.DataFrame:
+        """Останні limit свічок (з незакритою поточною) після докачки відсутніх"""
+        self.sync(symbol, timeframe, fetch, limit, now)
+        columns = self.arrays(symbol, timeframe, limit)
+        forming = self._forming.get((symbol, timeframe))
+        if forming is not None and forming[0] > (columns['timestamp'][-1] if len(columns['timestamp']) else -1):
+            columns = {name: np.append(values, forming[1][i]) for i, (name, values) in enumerate(columns.items())}
+        columns = {name: values[-limit:] for name, values in columns.items()}
+        columns['timestamp'] = columns['timestamp'].astype(np.int64).view('datetime64[ms]')
+        return pd.DataFrame(columns)
+
+    # ====== ДОКАЧКА ======
+
+    def sync(self, symbol: str, timeframe: str, fetch: FetchRows, limit: int = 500,
+             now: Optional[float] = None) -> int:
+        """
+        Докачка свічок після останньої збереженої (щонайменше limit в історії).
+        У межах однієї свічки закриті не докачуються повторно, оновлюється
+        лише незакрита (запит limit=1). Повертає кількість дописаних закритих.
+        """
+        key = (symbol, timeframe)
+        candle_file = self._file(symbol, timeframe)
+        closed = last_closed_candle_ts(timeframe, now)
+        period = candle_file.timeframe_ms
+
+        with self._locks[key], _FileLock(candle_file.path):
+            if candle_file.stale():
+                candle_file.reload()
+            synced = self._synced.get(key)
+            if synced is not None and synced[0] == closed and synced[1] >= limit:
+                self.stats['skipped'] += 1
+                appended = self._store(key, candle_file, self._request(fetch, None, 1), closed)
+                self.stats['appended'] += appended
+                return appended
+            self.stats['syncs'] += 1
+
+            last = candle_file.last_timestamp
+            missing = max(0, (closed - last) // period) if last is not None else None
+            if missing is None or missing > self.max_gap or candle_file.count + missing < limit:
+                # Порожня/застаріла історія або коротша за limit - свіжий хвіст одним запитом
+                if last is not None:
+                    self.stats['resets'] += 1
+                    candle_file.reset()
+                rows = self._request(fetch, None, limit + 1)
+                appended = self._store(key, candle_file, rows, closed)
+            else:
+                appended, since = 0, last + period
+                while True:
+                    rows = self._request(fetch, since, self.page_limit)
+                    added = self._store(key, candle_file, rows, closed)
+                    appended += added
+                    if not added or len(rows) < self.page_limit or candle_file.last_timestamp >= closed:
+                        break
+                    since = candle_file.last_timestamp + period
+
+            self._synced[key] = (closed, limit)
+            self.stats['appended'] += appended
+            if appended:
+                logger.debug(f"💾 {symbol} {timeframe}: +{appended} свічок у локальному сховищі")
+            return appended
+
+    def _request(self, fetch: FetchRows, since: Optional[int], limit: int) -> np.ndarray:
+        self.stats['requests'] += 1
+        rows = fetch(since, limit)
+        if not rows:
+            return np.empty((0, len(COLUMNS)))
+        return np.array(rows, dtype=float).reshape(len(rows), len(COLUMNS))
+
+    def _store(self, key: Tuple[str, str], candle_file: CandleFile, rows: np.ndarray, closed: int) -> int:
+        """Закриті свічки - у файл, незакрита поточна - у пам'ять"""
+        if len(rows) == 0:
+            return 0
+        rows = rows[np.argsort(rows[:, 0], kind='stable')]
+        done = rows[:, 0] <= closed
+        if not done.all():
+            forming = rows[~done][-1]
+            self._forming[key] = (int(forming[0]), forming)
+        return candle_file.append(rows[done])
+
+
+class _FileLock:
+    """Міжпроцесне блокування файлу на час докачки (fcntl, якщо доступний)"""
+
+    def __init__(self, path: str):
+        self.path = f"{path}.lock"
+        self._fd = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self._fd = open(self.path, 'a')
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            self._fd.close()
+
+
+def create_candle_store() -> Optional[CandleStore]:
+    """Сховище з CANDLE_STORE_DIR; без змінної - вимкнене (None)"""
+    directory = os.getenv('CANDLE_STORE_DIR')
+    if not directory:
+        return None
+    return CandleStore(directory, page_limit=int(os.getenv('CANDLE_STORE_PAGE_LIMIT', 1000)),
+                       max_gap=int(os.getenv('CANDLE_STORE_MAX_GAP', 5000)))
+
+
+# Глобальний екземпляр (None, якщо сховище не налаштоване)
+candle_store = create_candle_store()
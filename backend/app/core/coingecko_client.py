@@ -1,10 +1,10 @@
-import asyncio
 import aiohttp
-import time
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 import logging
 
+from .rate_limiter import rate_limiter, retry_after_seconds
+
 logger = logging.getLogger(__name__)
 
 class CoinGeckoClient:
@@ -12,8 +12,6 @@ class CoinGeckoClient:
         self.base_url = base_url
         self.api_key = api_key
         self.session = None
-        self.rate_limit = 30  # запитів на хвилину
-        self.last_request_time = 0
         
     async def __aenter__(self):
         self.session = aiohttp.ClientSession()
@@ -23,38 +21,33 @@ class CoinGeckoClient:
         if self.session:
             await self.session.close()
     
-    async def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Any]:
-        """Базовий метод для запитів з rate limiting"""
-        # Rate limiting
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        min_interval = 60 / self.rate_limit
-        
-        if time_since_last < min_interval:
-            await asyncio.sleep(min_interval - time_since_last)
-        
+    async def _make_request(self, endpoint: str, params: Optional[Dict] = None,
+                            retries: int = 3) -> Optional[Any]:
+        """Базовий метод для запитів з rate limiting (спільний кошик 'coingecko')"""
         url = f"{self.base_url}/{endpoint}"
         headers = {}
         
         if self.api_key:
             headers["x-cg-demo-api-key"] = self.api_key
         
-        try:
-            async with self.session.get(url, params=params, headers=headers) as response:
-                self.last_request_time = time.time()
-                
-                if response.status == 200:
-                    return await response.json()
-                elif response.status == 429:
-                    logger.warning("Rate limit exceeded, waiting 60 seconds")
-                    await asyncio.sleep(60)
-                    return await self._make_request(endpoint, params)
-                else:
-                    logger.error(f"API error: {response.status}")
-                    return None
-        except Exception as e:
-            logger.error(f"Request failed: {e}")
-            return None
+        for attempt in range(retries + 1):
+            await rate_limiter.acquire('coingecko')
+            try:
+                async with self.session.get(url, params=params, headers=headers) as response:
+                    if response.status == 200:
+                        return await response.json()
+                    elif response.status == 429:
+                        # Пауза з Retry-After для всіх запитів до CoinGecko, далі - повтор
+                        rate_limiter.penalize('coingecko', retry_after_seconds(response.headers))
+                        logger.warning(f"Rate limit exceeded, спроба {attempt + 1}/{retries + 1}")
+                        continue
+                    else:
+                        logger.error(f"API error: {response.status}")
+                        return None
+            except Exception as e:
+                logger.error(f"Request failed: {e}")
+                return None
+        return None
     
     async def get_top_coins(self, limit: int = 100) -> List[Dict]:
         """Отримати топ криптовалют за market cap"""
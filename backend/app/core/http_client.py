@@ -0,0 +1,120 @@
+# backend/app/core/http_client.py
+import asyncio
+import contextlib
+import logging
+import os
+from typing import Any, AsyncIterator, Dict, Optional
+
+import aiohttp
+
+from .rate_limiter import rate_limiter, retry_after_seconds
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClient:
+    """
+    Спільний HTTP-шар для REST-клієнтів бірж: одна aiohttp-сесія на цикл
+    подій з пулом keep-alive з'єднань (окремий ліміт на хост), кешем DNS
+    і таймаутами за замовчуванням. Сесія створюється при першому запиті
+    і закривається при зупинці застосунку (close()) або разом з циклом
+    подій (asyncio.run). get() з rate_limit списує вагу запиту зі спільного
+    rate_limiter.
+    """
+
+    def __init__(self, limit: Optional[int] = None, limit_per_host: Optional[int] = None,
+                 dns_ttl: Optional[int] = None, keepalive: Optional[float] = None,
+                 timeout: Optional[float] = None, connect_timeout: Optional[float] = None):
+        self.limit = limit or int(os.getenv('HTTP_POOL_LIMIT', 100))
+        self.limit_per_host = limit_per_host or int(os.getenv('HTTP_LIMIT_PER_HOST', 20))
+        self.dns_ttl = dns_ttl or int(os.getenv('HTTP_DNS_TTL', 300))
+        self.keepalive = keepalive or float(os.getenv('HTTP_KEEPALIVE', 30))
+        self.timeout = aiohttp.ClientTimeout(
+            total=timeout or float(os.getenv('HTTP_TIMEOUT', 10)),
+            connect=connect_timeout or float(os.getenv('HTTP_CONNECT_TIMEOUT', 5))
+        )
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._guards: Dict[asyncio.AbstractEventLoop, asyncio.Task] = {}
+        self.stats = {'sessions': 0, 'requests': 0, 'errors': 0}
+
+    # ====== СЕСІЯ ======
+
+    def session(self) -> aiohttp.ClientSession:
+        """Сесія поточного циклу подій (викликається лише з async-коду)"""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            # Цикл закрили без скасування задач (не через asyncio.run) - сесію
+            # на ньому вже не закрити, лише забуваємо
+            for stale in [key for key in self._sessions if key.is_closed()]:
+                del self._sessions[stale]
+                self._guards.pop(stale, None)
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_ttl,
+                keepalive_timeout=self.keepalive
+            )
+            session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            self._sessions[loop] = session
+            self._guards[loop] = loop.create_task(self._close_with_loop(session))
+            self.stats['sessions'] += 1
+        return session
+
+    async def _close_with_loop(self, session: aiohttp.ClientSession):
+        """asyncio.run скасовує задачі перед закриттям циклу - сесія закривається на ньому ж"""
+        try:
+            await asyncio.get_running_loop().create_future()
+        finally:
+            if not session.closed:
+                await session.close()
+
+    # ====== ЗАПИТИ ======
+
+    @contextlib.asynccontextmanager
+    async def get(self, url: str, rate_limit: Optional[str] = None, weight: float = 1,
+                  **kwargs) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        GET через спільну сесію. rate_limit - кошик у rate_limiter (біржа або
+        "біржа:ендпоінт"), weight - вага ендпоінту; 429/418 блокують кошик
+        на Retry-After.
+        """
+        if rate_limit is not None:
+            await rate_limiter.acquire(rate_limit, weight)
+        self.stats['requests'] += 1
+        try:
+            async with self.session().get(url, **kwargs) as response:
+                if response.status >= 400:
+                    self.stats['errors'] += 1
+                if rate_limit is not None and response.status in (418, 429):
+                    rate_limiter.penalize(rate_limit, retry_after_seconds(response.headers))
+                yield response
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.stats['errors'] += 1
+            raise
+
+    async def get_json(self, url: str, params: Optional[Dict] = None, rate_limit: Optional[str] = None,
+                       weight: float = 1, **kwargs) -> Optional[Any]:
+        """GET і JSON-відповідь; статус не 200 - None"""
+        async with self.get(url, rate_limit, weight, params=params, **kwargs) as response:
+            if response.status != 200:
+                logger.warning(f"⚠️ HTTP {response.status}: {url}")
+                return None
+            return await response.json()
+
+    # ====== ЗАКРИТТЯ ======
+
+    async def close(self):
+        """Закриття сесії поточного циклу подій (при зупинці FastAPI)"""
+        loop = asyncio.get_running_loop()
+        guard = self._guards.pop(loop, None)
+        if guard is not None:
+            guard.cancel()
+        session = self._sessions.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+            logger.info("🔌 Спільну HTTP-сесію закрито")
+
+
+# Глобальний екземпляр
+http_client = HttpClient()
@@ -0,0 +1,283 @@
+# backend/app/core/market_cache.py
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+TIMEFRAME_UNITS = {'m': 60, 'h': 3600, 'd': 86400, 'w': 604800, 'M': 2592000}
+
+
+def timeframe_seconds(timeframe: str) -> int:
+    """'15m' -> 900, '4h' -> 14400, '1d' -> 86400"""
+    try:
+        return int(timeframe[:-1]) * TIMEFRAME_UNITS[timeframe[-1]]
+    except (KeyError, ValueError, IndexError):
+        raise ValueError(f"Невідомий таймфрейм: {timeframe}")
+
+
+def last_closed_candle_ts(timeframe: str, now: Optional[float] = None) -> int:
+    """Час відкриття (мс) останньої закритої свічки таймфрейму на момент now"""
+    period = timeframe_seconds(timeframe)
+    now = time.time() if now is None else now
+    return (int(now // period) - 1) * period * 1000
+
+
+def frame_fingerprint(df: pd.DataFrame) -> Tuple:
+    """Дешевий відбиток вікна свічок: довжина + остання свічка"""
+    if df is None or len(df) == 0:
+        return (0,)
+    last = df.iloc[-1]
+    stamp = last['timestamp'] if 'timestamp' in df.columns else df.index[-1]
+    return (len(df), str(stamp), float(last['close']), float(last.get('volume', 0.0)))
+
+
+def _read_only(value: Any) -> Any:
+    """Набір індикаторів без спільного змінюваного стану: масиви - read-only view, словники - копії"""
+    if isinstance(value, np.ndarray):
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(value, dict):
+        return {name: _read_only(item) for name, item in value.items()}
+    return value
+
+
+class _LRU:
+    """LRU-словник з обмеженням кількості записів"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: OrderedDict = OrderedDict()
+        self.evictions = 0
+
+    def get(self, key):
+        if key not in self._data:
+            return None
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def put(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class MarketDataCache:
+    """
+    Процесний кеш свічок (OHLCV), порахованих наборів індикаторів та сигналів.
+
+    Свічки кешуються за (symbol, timeframe, остання закрита свічка) і не
+    довше frame_ttl секунд: остання свічка ще формується, тож її ціна
+    застаріває не більше ніж на frame_ttl. Індикатори - за відбитком вікна
+    свічок, тож той самий df рахується один раз (повертаються read-only).
+    Сигнали - до закриття поточної свічки (з урахуванням версії
+    аналізатора). Локально - LRU з лімітом розміру; якщо задано
+    MARKET_CACHE_REDIS_URL, записи також зберігаються в Redis (спільно для
+    кількох процесів, TTL = одна свічка, для свічок - frame_ttl).
+    """
+
+    def __init__(self, max_frames: int = 256, max_bundles: int = 256, max_signals: int = 512,
+                 redis_url: Optional[str] = None, frame_ttl: float = 10.0):
+        self.frame_ttl = frame_ttl  # секунд: вік незакритої свічки в кешованому df
+        self._frames = _LRU(max_frames)
+        self._bundles = _LRU(max_bundles)
+        self._signals = _LRU(max_signals)
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple, threading.Lock] = {}
+        self.stats = {'frame_hits': 0, 'frame_misses': 0, 'bundle_hits': 0, 'bundle_misses': 0,
+                      'signal_hits': 0, 'signal_misses': 0, 'redis_hits': 0}
+
+        self.redis_client = None
+        if redis_url:
+            try:
+                import redis
+                self.redis_client = redis.Redis.from_url(redis_url, socket_connect_timeout=2)
+                self.redis_client.ping()
+                logger.info("✅ Redis підключено для кешу ринкових даних")
+            except Exception as e:
+                logger.warning(f"⚠️ Redis недоступний для кешу: {e}. Використовується лише пам'ять.")
+                self.redis_client = None
+
+    # ===== СВІЧКИ =====
+
+    def get_ohlcv(self, symbol: str, timeframe: str, limit: int,
+                  fetch: Callable[[], pd.DataFrame], now: Optional[float] = None) -> pd.DataFrame:
+        """
+        Свічки з кешу або через fetch(). Запис з більшим limit обслуговує
+        менші запити (повертаються останні limit свічок). Повертається копія.
+        """
+        now = time.time() if now is None else now
+        key = ('ohlcv', symbol, timeframe, last_closed_candle_ts(timeframe, now))
+        fetched = []
+
+        def create():
+            df = fetch()
+            fetched.append(df)
+            # помилки/порожні відповіді не кешуємо
+            return (limit, df, now) if df is not None and len(df) > 0 else None
+
+        entry = self._get_or_create(self._frames, key, 'frame', timeframe, create,
+                                    valid=lambda cached: self._frame_valid(cached, limit, now),
+                                    ttl=self.frame_ttl)
+        if entry is None:
+            return fetched[-1] if fetched else pd.DataFrame()
+        return entry[1].tail(limit).reset_index(drop=True).copy()
+
+    def peek_ohlcv(self, symbol: str, timeframe: str, limit: int,
+                   now: Optional[float] = None) -> Optional[pd.DataFrame]:
+        """Свічки з кешу без запиту на біржу (None - промах); для асинхронних конекторів"""
+        now = time.time() if now is None else now
+        key = ('ohlcv', symbol, timeframe, last_closed_candle_ts(timeframe, now))
+        entry = self._lookup(self._frames, key, 'frame', valid=lambda cached: self._frame_valid(cached, limit, now))
+        return None if entry is None else entry[1].tail(limit).reset_index(drop=True).copy()
+
+    def put_ohlcv(self, symbol: str, timeframe: str, limit: int, df: pd.DataFrame,
+                  now: Optional[float] = None):
+        """Збереження вже завантажених свічок (порожні не кешуються)"""
+        if df is not None and len(df) > 0:
+            now = time.time() if now is None else now
+            key = ('ohlcv', symbol, timeframe, last_closed_candle_ts(timeframe, now))
+            self._store(self._frames, key, (limit, df, now), timeframe, ttl=self.frame_ttl)
+
+    def _frame_valid(self, cached: Tuple, limit: int, now: float) -> bool:
+        """Запис покриває limit і його незакрита свічка не старша за frame_ttl"""
+        return cached[0] >= limit and 0 <= now - cached[2] < self.frame_ttl
+
+    # ===== ІНДИКАТОРИ =====
+
+    def get_indicators(self, namespace: str, symbol: str, timeframe: str, df: pd.DataFrame,
+                       compute: Callable[[], Any]) -> Any:
+        """Набір індикаторів для вікна df; compute() викликається лише при промаху"""
+        key = ('indicators', namespace, symbol, timeframe) + frame_fingerprint(df)
+        return _read_only(self._get_or_create(self._bundles, key, 'bundle', timeframe, compute))
+
+    # ===== СИГНАЛИ =====
+
+    def get_signal(self, symbol: str, timeframe: str, version: str, compute: Callable[[], Any],
+                   now: Optional[float] = None) -> Tuple[Any, bool]:
+        """
+        Результат сигналу в межах поточної свічки: повторні запити до її
+        закриття отримують збережений результат, після закриття запис
+        замінюється новим. compute() -> None (помилка) не кешується.
+        Повертає (результат, взято_з_кешу).
+        """
+        candle = last_closed_candle_ts(timeframe, now)
+        computed = []
+
+        def create():
+            value = compute()
+            computed.append(value)
+            return (candle, value) if value is not None else None
+
+        entry = self._get_or_create(self._signals, ('signal', symbol, timeframe, version), 'signal',
+                                    timeframe, create, valid=lambda cached: cached[0] == candle)
+        if entry is None:
+            return None, False
+        return entry[1], not computed
+
+    # ===== СЛУЖБОВІ =====
+
+    def _get_or_create(self, lru: _LRU, key: Tuple, kind: str, timeframe: str,
+                       create: Callable[[], Any], valid: Callable[[Any], bool] = None,
+                       ttl: Optional[float] = None):
+        """Значення з кешу або create(); паралельні промахи по ключу чекають один розрахунок"""
+        value = self._lookup(lru, key, kind, valid)
+        if value is not None:
+            return value
+
+        with self._lock:
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                value = self._lookup(lru, key, None, valid)
+                if value is None:
+                    value = create()
+                    if value is not None:
+                        self._store(lru, key, value, timeframe, ttl)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return value
+
+    def _lookup(self, lru: _LRU, key: Tuple, kind: Optional[str], valid: Callable[[Any], bool] = None):
+        with self._lock:
+            value = lru.get(key)
+        if value is None and self.redis_client is not None:
+            value = self._redis_get(key)
+            if value is not None:
+                with self._lock:
+                    lru.put(key, value)
+                    self.stats['redis_hits'] += 1
+        if value is not None and valid is not None and not valid(value):
+            value = None
+        if kind is not None:
+            with self._lock:
+                self.stats[f'{kind}_hits' if value is not None else f'{kind}_misses'] += 1
+        return value
+
+    def _store(self, lru: _LRU, key: Tuple, value: Any, timeframe: str, ttl: Optional[float] = None):
+        with self._lock:
+            lru.put(key, value)
+        if self.redis_client is not None:
+            try:
+                expire = timeframe_seconds(timeframe) if ttl is None else max(1, int(ttl))
+                self.redis_client.setex(self._redis_key(key), expire, pickle.dumps(value))
+            except Exception as e:
+                logger.warning(f"⚠️ Не вдалося записати кеш у Redis: {e}")
+
+    def _redis_get(self, key: Tuple):
+        try:
+            raw = self.redis_client.get(self._redis_key(key))
+            return pickle.loads(raw) if raw is not None else None
+        except Exception as e:
+            logger.warning(f"⚠️ Помилка читання кешу з Redis: {e}")
+            return None
+
+    @staticmethod
+    def _redis_key(key: Tuple) -> str:
+        return 'market_cache:' + ':'.join(str(part) for part in key)
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self._bundles.clear()
+            self._signals.clear()
+            self._inflight.clear()
+
+    def get_stats(self) -> Dict:
+        """Лічильники влучань/промахів та розмір кешу"""
+        with self._lock:
+            return {
+                **self.stats,
+                'frames': len(self._frames),
+                'bundles': len(self._bundles),
+                'signals': len(self._signals),
+                'evictions': self._frames.evictions + self._bundles.evictions + self._signals.evictions,
+                'redis': self.redis_client is not None,
+            }
+
+
+# Глобальний екземпляр (спільний для всіх аналізаторів і конекторів процесу)
+market_cache = MarketDataCache(
+    max_frames=int(os.getenv('MARKET_CACHE_MAX_FRAMES', 256)),
+    max_bundles=int(os.getenv('MARKET_CACHE_MAX_BUNDLES', 256)),
+    max_signals=int(os.getenv('MARKET_CACHE_MAX_SIGNALS', 512)),
+    redis_url=os.getenv('MARKET_CACHE_REDIS_URL'),
+    frame_ttl=float(os.getenv('MARKET_CACHE_FRAME_TTL', 10)),
+)
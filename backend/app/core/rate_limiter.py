@@ -0,0 +1,286 @@
+# backend/app/core/rate_limiter.py
+import asyncio
+import email.utils
+import logging
+import os
+import threading
+import time
+from typing import Dict, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Публічні ліміти бірж: ім'я -> (токенів, за секунд). Токен = одиниця ваги запиту.
+# "біржа:ендпоінт" має власний кошик, інакше - кошик біржі.
+DEFAULT_LIMITS: Dict[str, Tuple[float, float]] = {
+    'binance': (6000, 60),          # вага запитів spot REST на IP за хвилину
+    'bybit': (600, 5),              # запитів на IP за 5 секунд
+    'okx:market/ticker': (20, 2),   # OKX рахує ліміт по кожному ендпоінту
+    'okx:market/tickers': (20, 2),
+    'okx': (20, 2),
+    'kraken': (5, 5),               # публічні запити: ~1 на секунду
+    'coinbase': (10, 1),
+    'coingecko': (30, 60),
+}
+
+# Кошик у Redis (атомарно, час - з сервера Redis, спільний для всіх процесів).
+# Повертає очікування в секундах (0 - токени видано). Логіка - як у _take_local.
+# Увага: Redis-гілка не покрита тестами (у тестовому оточенні немає Redis).
+_REDIS_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local weight = tonumber(ARGV[3])
+local block = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts', 'blocked')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+local blocked = tonumber(state[3]) or 0
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if block > 0 then
+    blocked = math.max(blocked, now + block)
+elseif now < blocked then
+    wait = blocked - now
+elseif tokens >= math.min(weight, capacity) then
+    tokens = tokens - weight
+else
+    wait = (math.min(weight, capacity) - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now), 'blocked', tostring(blocked))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate + math.max(0, blocked - now)) + 60)
+return tostring(wait)
+"""
+
+
+def retry_after_seconds(headers: Optional[Mapping], default: float = 60.0) -> float:
+    """Пауза з заголовка Retry-After (секунди або HTTP-дата); без заголовка - default"""
+    value = None
+    if headers:
+        value = next((v for k, v in headers.items() if k.lower() == 'retry-after'), None)
+    if value is None:
+        return default
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+class RateLimiter:
+    """
+    Спільний обмежувач запитів до бірж: token bucket на біржу (або на
+    "біржа:ендпоінт"), запит списує свою вагу. Локально - один стан на процес
+    (asyncio і потоки); якщо задано RATE_LIMIT_REDIS_URL - кошики в Redis,
+    спільні для API та Celery-воркерів. try_acquire() не чекає (для викликів,
+    що можуть відкинути навантаження), acquire()/acquire_sync() - чекають.
+    Відповідь 429/418 блокує кошик на Retry-After (penalize()). Запит,
+    важчий за capacity (ccxt fetch_tickers - 40 проти кошика 20), чекає
+    повного кошика і списує всю вагу в борг: наступні чекають на поповнення.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, float]]] = None,
+                 redis_url: Optional[str] = None, prefix: str = 'ratelimit'):
+        self._limits: Dict[str, Tuple[float, float]] = {}  # ім'я -> (capacity, токенів за секунду)
+        for name, (capacity, period) in (limits if limits is not None else DEFAULT_LIMITS).items():
+            self.configure(name, capacity, period)
+        self.prefix = prefix
+        self._buckets: Dict[str, list] = {}  # ім'я -> [tokens, ts, blocked_until]
+        self._lock = threading.Lock()
+        self.stats = {'granted': 0, 'waits': 0, 'rejected': 0, 'penalties': 0, 'redis_errors': 0}
+
+        self.redis_client = None
+        self._script = None
+        self._redis_url = redis_url
+        self._async_scripts: Dict[asyncio.AbstractEventLoop, object] = {}  # redis.asyncio - на цикл подій
+        if redis_url:
+            try:
+                import redis
+                self.redis_client = redis.Redis.from_url(redis_url, socket_connect_timeout=2)
+                self.redis_client.ping()
+                self._script = self.redis_client.register_script(_REDIS_SCRIPT)
+                logger.info("✅ Redis підключено для обмеження запитів")
+            except Exception as e:
+                logger.warning(f"⚠️ Redis недоступний для лімітів: {e}. Ліміти лише в межах процесу.")
+                self.redis_client = None
+                self._script = None
+
+    # ====== НАЛАШТУВАННЯ ======
+
+    def configure(self, name: str, capacity: float, period: float = 1.0):
+        """capacity токенів за period секунд (capacity - і максимальний сплеск)"""
+        self._limits[name] = (float(capacity), float(capacity) / float(period))
+
+    def limit(self, name: str) -> Optional[Tuple[float, float]]:
+        """(capacity, токенів за секунду) кошика; None - без обмеження"""
+        if name in self._limits:
+            return self._limits[name]
+        return self._limits.get(name.split(':', 1)[0])
+
+    def _bucket_name(self, name: str) -> str:
+        # ендпоінт без власного ліміту ділить кошик біржі
+        return name if name in self._limits else name.split(':', 1)[0]
+
+    # ====== ТОКЕНИ ======
+
+    def _take(self, name: str, weight: float, block: float = 0.0) -> float:
+        """Списання weight токенів; повертає очікування в секундах (0 - видано)"""
+        limit = self.limit(name)
+        if limit is None:
+            return 0.0
+        bucket = self._bucket_name(name)
+
+        if self._script is not None:
+            try:
+                return float(self._script(keys=[f"{self.prefix}:{bucket}"], args=[*limit, weight or 1, block]))
+            except Exception as e:
+                self._redis_failed(bucket, e)
+        return self._take_local(bucket, limit, weight, block)
+
+    async def _take_async(self, name: str, weight: float) -> float:
+        """Як _take, але запит до Redis - через redis.asyncio (не блокує цикл подій)"""
+        limit = self.limit(name)
+        if limit is None:
+            return 0.0
+        bucket = self._bucket_name(name)
+
+        script = self._async_script()
+        if script is not None:
+            try:
+                return float(await script(keys=[f"{self.prefix}:{bucket}"], args=[*limit, weight or 1, 0]))
+            except Exception as e:
+                self._redis_failed(bucket, e)
+        return self._take_local(bucket, limit, weight)
+
+    def _take_local(self, bucket: str, limit: Tuple[float, float], weight: float, block: float = 0.0) -> float:
+        capacity, rate = limit
+        weight = float(weight or 1)
+        # важчий за capacity запит чекає повного кошика, решта ваги - в борг
+        needed = min(weight, capacity)
+        with self._lock:
+            now = time.time()
+            tokens, ts, blocked = self._buckets.get(bucket, (capacity, now, 0.0))
+            tokens = min(capacity, tokens + max(0.0, now - ts) * rate)
+            wait = 0.0
+            if block > 0:
+                blocked = max(blocked, now + block)
+            elif now < blocked:
+                wait = blocked - now
+            elif tokens >= needed:
+                tokens -= weight
+            else:
+                wait = (needed - tokens) / rate
+            self._buckets[bucket] = [tokens, now, blocked]
+            return wait
+
+    def _async_script(self):
+        """Lua-скрипт на клієнті redis.asyncio поточного циклу подій (None - без Redis)"""
+        if self._script is None:
+            return None
+        loop = asyncio.get_running_loop()
+        script = self._async_scripts.get(loop)
+        if script is None:
+            import redis.asyncio as redis_async
+            for stale in [key for key in self._async_scripts if key.is_closed()]:
+                del self._async_scripts[stale]
+            client = redis_async.Redis.from_url(self._redis_url, socket_connect_timeout=2)
+            script = self._async_scripts[loop] = client.register_script(_REDIS_SCRIPT)
+        return script
+
+    def _redis_failed(self, bucket: str, error: Exception):
+        self.stats['redis_errors'] += 1
+        logger.warning(f"⚠️ Redis-ліміт {bucket} недоступний: {error}")
+
+    def try_acquire(self, name: str, weight: float = 1) -> bool:
+        """Токени без очікування; False - ліміт вичерпано (запит краще відкинути)"""
+        if self._take(name, weight) > 0:
+            self.stats['rejected'] += 1
+            return False
+        self.stats['granted'] += 1
+        return True
+
+    async def acquire(self, name: str, weight: float = 1, timeout: Optional[float] = None) -> bool:
+        """Очікування токенів (asyncio); False - не вклалися в timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = await self._take_async(name, weight)
+            if wait <= 0:
+                self.stats['granted'] += 1
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                self.stats['rejected'] += 1
+                return False
+            self.stats['waits'] += 1
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self, name: str, weight: float = 1, timeout: Optional[float] = None) -> bool:
+        """Очікування токенів у синхронному коді (потоки, Celery)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self._take(name, weight)
+            if wait <= 0:
+                self.stats['granted'] += 1
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                self.stats['rejected'] += 1
+                return False
+            self.stats['waits'] += 1
+            time.sleep(wait)
+
+    def penalize(self, name: str, retry_after: float):
+        """Блокування кошика після 429/418 на retry_after секунд"""
+        if self.limit(name) is None or retry_after <= 0:
+            return
+        self.stats['penalties'] += 1
+        logger.warning(f"⏳ {name}: ліміт біржі перевищено, пауза {retry_after:.1f} с")
+        self._take(name, 0, block=retry_after)
+
+    # ====== CCXT ======
+
+    def attach_ccxt(self, exchange, capacity_seconds: float = 1.0) -> str:
+        """
+        Спільний кошик для всіх екземплярів ccxt однієї біржі: замість
+        власного throttle екземпляра - ccxt-вага ендпоінту (cost) з кошика
+        "ccxt:<id>" зі швидкістю 1000 / rateLimit; 429/418 - penalize().
+        """
+        name = f"ccxt:{exchange.id}"
+        if name not in self._limits:
+            rate = 1000.0 / exchange.rateLimit
+            self.configure(name, rate * capacity_seconds, capacity_seconds)
+
+        if asyncio.iscoroutinefunction(type(exchange).throttle):
+            async def throttle(cost=None):
+                await self.acquire(name, cost or 1)
+        else:
+            def throttle(cost=None):
+                self.acquire_sync(name, cost or 1)
+        exchange.throttle = throttle
+
+        handle_errors = exchange.handle_errors
+
+        def handle_errors_with_retry_after(code, reason, url, method, headers, *args, **kwargs):
+            if code in (418, 429):
+                self.penalize(name, retry_after_seconds(headers))
+            return handle_errors(code, reason, url, method, headers, *args, **kwargs)
+        exchange.handle_errors = handle_errors_with_retry_after
+        return name
+
+
+def create_rate_limiter() -> RateLimiter:
+    """Ліміти за замовчуванням + RATE_LIMIT_<ІМ'Я>=токенів/секунд з оточення"""
+    limiter = RateLimiter(redis_url=os.getenv('RATE_LIMIT_REDIS_URL'))
+    for key, value in os.environ.items():
+        if key.startswith('RATE_LIMIT_') and key != 'RATE_LIMIT_REDIS_URL':
+            try:
+                capacity, _, period = value.partition('/')
+                limiter.configure(key[len('RATE_LIMIT_'):].lower(), float(capacity), float(period or 1))
+            except ValueError:
+                logger.warning(f"⚠️ Некоректний ліміт {key}={value}")
+    return limiter
+
+
+# Глобальний екземпляр
+rate_limiter = create_rate_limiter()
@@ -1,7 +1,8 @@
 from fastapi import APIRouter
-import aiohttp
 import logging
 
+from app.core.http_client import http_client
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
@@ -10,14 +11,13 @@ class BinanceClient:
     async def get_price(self, symbol: str):
         try:
             url = f"https://api.binance.com/api/v3/ticker/price?symbol={symbol}"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    data = await response.json()
-                    return {
-                        'price': float(data['price']),
-                        'exchange': 'Binance',
-                        'symbol': symbol
-                    }
+            async with http_client.get(url, rate_limit='binance', weight=2) as response:
+                data = await response.json()
+                return {
+                    'price': float(data['price']),
+                    'exchange': 'Binance',
+                    'symbol': symbol
+                }
         except Exception as e:
             logger.error(f"Binance API error: {e}")
             return None
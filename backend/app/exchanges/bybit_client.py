@@ -1,33 +1,25 @@
 # backend/app/exchanges/bybit_client.py
-import aiohttp
 import asyncio
 from typing import Dict, Optional
 from datetime import datetime
 
+from app.core.http_client import http_client
+
 class BybitClient:
     """Клієнт для Bybit API (спот торгівля)"""
     
     def __init__(self):
         self.base_url = "https://api.bybit.com"
-        self.session = None
-        self.timeout = aiohttp.ClientTimeout(total=10)
         
-    async def _get_session(self):
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession(timeout=self.timeout)
-        return self.session
-    
     async def get_price(self, symbol: str) -> Optional[Dict]:
         """Отримати ціну з Bybit"""
         try:
             # Bybit використовує формат BTCUSDT
-            session = await self._get_session()
-            
             # Для спот-торгівлі
             url = f"{self.base_url}/v5/market/tickers"
             params = {"category": "spot", "symbol": symbol}
             
-            async with session.get(url, params=params) as response:
+            async with http_client.get(url, rate_limit='bybit', params=params) as response:
                 if response.status == 200:
                     data = await response.json()
                     
@@ -49,5 +41,5 @@ class BybitClient:
         return None
     
     async def close(self):
-        if self.session and not self.session.closed:
-            await self.session.close()
\ No newline at end of file
+        """Спільна сесія закривається при зупинці застосунку"""
+        pass
\ No newline at end of file
@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-import aiohttp
 import asyncio
 import logging
 import random
 
+from app.core.http_client import http_client
 from app.database import get_db
 from app.futures.models import VirtualTrade
 
@@ -31,14 +31,13 @@ class BinanceHistoryClient:
                 "limit": limit
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return self._format_klines(data)
-                    else:
-                        logger.warning(f"Binance API error for {symbol}: {response.status}")
-                        return None
+            async with http_client.get(url, rate_limit='binance', weight=2, params=params) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return self._format_klines(data)
+                else:
+                    logger.warning(f"Binance API error for {symbol}: {response.status}")
+                    return None
         except Exception as e:
             logger.error(f"Error fetching history for {symbol}: {e}")
             return None
@@ -12,6 +12,7 @@ from app.futures.services.ai_analyzer import AIAnalyzer
 from app.futures.models.exchange_connector import ExchangeConnector
 from app.futures.services.signal_orchestrator import SignalOrchestrator
 from app.futures.models import VirtualTrade
+from app.core.market_cache import market_cache
 router = APIRouter(tags=["futures"])
 
 # Створюємо екземпляри сервісів
@@ -54,58 +55,73 @@ def generate_signal(
     timeframe: str = "1h",
     db: Session = Depends(get_db)
 ):
-    """Згенерувати реальний AI-сигнал на основі ринкового аналізу"""
-    
-    # Використовуємо оркестратор для повного пайплайну
-    analysis = signal_orchestrator.generate_signal(symbol, timeframe)
-    
-    if "error" in analysis:
-        raise HTTPException(status_code=400, detail=analysis["error"])
-    
-    # Додаємо symbol до analysis для пояснення
-    analysis['symbol'] = symbol
-    analysis['timeframe'] = timeframe
-    
-    # Генеруємо пояснення на основі реального аналізу
-    explanation = explanation_builder.build_explanation(analysis)
+    """
+    Згенерувати реальний AI-сигнал на основі ринкового аналізу.
+    Повторні запити в межах тієї ж свічки повертають збережений сигнал
+    (без перерахунку та нового запису в БД) до закриття свічки.
+    """
+    errors = []
+    
+    def create_signal():
+        # Використовуємо оркестратор для повного пайплайну
+        analysis = signal_orchestrator.generate_signal(symbol, timeframe)
+        
+        if "error" in analysis:
+            errors.append(analysis["error"])
+            return None
+        
+        # Додаємо symbol до analysis для пояснення
+        analysis['symbol'] = symbol
+        analysis['timeframe'] = timeframe
+        
+        # Генеруємо пояснення на основі реального аналізу
+        explanation = explanation_builder.build_explanation(analysis)
+        
+        # Зберігаємо в БД
+        db_signal = Signal(
+            symbol=symbol,
+            direction=analysis["direction"],
+            confidence=analysis["confidence"],
+            reasoning_weights=analysis.get("factors", {}),
+            explanation_text=explanation,
+            entry_price=analysis["entry_price"],
+            take_profit=analysis["take_profit"],
+            stop_loss=analysis["stop_loss"],
+            timeframe=timeframe,
+            is_active=True,
+            source="ai_analyzer_v2"
+        )
+        
+        db.add(db_signal)
+        db.commit()
+        db.refresh(db_signal)
+        
+        return {
+            "status": "success",
+            "signal": {
+                "id": db_signal.id,
+                "symbol": symbol,
+                "direction": analysis["direction"],
+                "confidence": analysis["confidence"],
+                "explanation": explanation,
+                "factors": analysis.get("factors", {}),
+                "entry_price": analysis["entry_price"],
+                "take_profit": analysis["take_profit"],
+                "stop_loss": analysis["stop_loss"],
+                "timeframe": timeframe,
+                "timestamp": datetime.now().isoformat()
+            },
+            "analysis_type": "market_based",
+            "message": "Signal generated based on market analysis"
+        }
     
-    # Зберігаємо в БД
-    db_signal = Signal(
-        symbol=symbol,
-        direction=analysis["direction"],
-        confidence=analysis["confidence"],
-        reasoning_weights=analysis.get("factors", {}),
-        explanation_text=explanation,
-        entry_price=analysis["entry_price"],
-        take_profit=analysis["take_profit"],
-        stop_loss=analysis["stop_loss"],
-        timeframe=timeframe,
-        is_active=True,
-        source="ai_analyzer_v2"
+    response, cached = market_cache.get_signal(
+        symbol, timeframe, signal_orchestrator.analyzer.version, create_signal
     )
+    if response is None:
+        raise HTTPException(status_code=400, detail=errors[-1] if errors else "signal_generation_failed")
     
-    db.add(db_signal)
-    db.commit()
-    db.refresh(db_signal)
-    
-    return {
-        "status": "success",
-        "signal": {
-            "id": db_signal.id,
-            "symbol": symbol,
-            "direction": analysis["direction"],
-            "confidence": analysis["confidence"],
-            "explanation": explanation,
-            "factors": analysis.get("factors", {}),
-            "entry_price": analysis["entry_price"],
-            "take_profit": analysis["take_profit"],
-            "stop_loss": analysis["stop_loss"],
-            "timeframe": timeframe,
-            "timestamp": datetime.now().isoformat()
-        },
-        "analysis_type": "market_based",
-        "message": "Signal generated based on market analysis"
-    }
+    return {**response, "cached": cached}
 
 
 @router.post("/signals/generate-multiple")
@@ -115,7 +131,7 @@ def generate_multiple_signals(
     db: Session = Depends(get_db)
 ):
     """Згенерувати сигнали для кількох пар одночасно"""
-    signals = signal_orchestrator.generate_multiple_signals(symbols)
+    signals = signal_orchestrator.generate_multiple_signals(symbols, timeframe)
     
     saved_signals = []
     for analysis in signals:
@@ -158,6 +174,21 @@ def generate_multiple_signals(
     }
 
 
+@router.get("/signals/screener")
+def screen_universe(timeframe: str = "1h", top_k: Optional[int] = None):
+    """Перший етап відбору: кандидати для повного AI-аналізу з усього ф'ючерсного універсу"""
+    screening = signal_orchestrator.screen_universe(timeframe=timeframe, top_k=top_k)
+    return {**screening, "timestamp": datetime.now().isoformat()}
+
+
+@router.get("/signals/patterns")
+def scan_patterns(timeframe: str = "1h", symbols: Optional[str] = None):
+    """Свічні паттерни TA-Lib (бітові маски hex-рядками на символ і свічку) для списку символів через кому"""
+    symbol_list = [symbol.strip() for symbol in symbols.split(',') if symbol.strip()] if symbols else None
+    scan = signal_orchestrator.scan_patterns(symbol_list, timeframe)
+    return {**scan, "timestamp": datetime.now().isoformat()}
+
+
 @router.get("/signals")
 def get_signals(
     db: Session = Depends(get_db),
@@ -248,6 +279,16 @@ def get_market_data(
         raise HTTPException(status_code=400, detail=f"Failed to fetch market data: {str(e)}")
 
 
+@router.get("/cache/stats")
+def get_cache_stats():
+    """Статистика процесного кешу свічок та індикаторів"""
+    return {
+        "status": "success",
+        "cache": market_cache.get_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
 # ========== ВІРТУАЛЬНІ УГОДИ API (статичні маршрути) ==========
 
 @router.post("/virtual-trades", response_model=dict)
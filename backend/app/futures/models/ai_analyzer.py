@@ -8,15 +8,62 @@ from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+from collections import Counter
+
+from app.core.market_cache import market_cache
+from .compact_bundle import CompactBundle
+from .indicator_engine import CHANNEL_WINDOWS, IndicatorEngineRegistry
+from .indicator_plan import (
+    ema_warmup, natr_from_atr, stoch_fast_k, stochastic_from_fast_k, typical_price, typical_price_node,
+    vwap_from_typical, wilder_warmup, williams_r_from_extrema
+)
+from .lazy_indicators import IndicatorNode, LazyIndicators, anchored_keys, required_window
+from .price_levels import cluster_levels, extract_levels, extract_levels_batch, find_swing_points
+from .resampler import resample_ohlcv, sort_timeframes, timeframe_ms
+from .rolling_extrema import channel_midpoint, rolling_extrema
+from .signal_scoring import CATEGORY_WEIGHTS, _round, score_series, total_confidence
+from .trade_parameters import (
+    direction_codes, entry_prices, position_size, position_size_record, risk_reward,
+    take_profit_stop_loss, valid_signals,
+)
+from .volume_profile import VolumeProfileRegistry
+
 class AIAnalyzer:
-    def __init__(self):
+    def __init__(self, use_streaming: bool = False, streaming_parity: bool = False,
+                 lazy_indicators: bool = True, level_source: str = 'pivots',
+                 compact_indicators: bool = False):
         self.logger = logging.getLogger(__name__)
         self.setup_logging()
         
+        # Граф індикаторів: у сигналі рахуються лише ті, що реально читаються
+        self.indicator_nodes = self._build_indicator_nodes()
+        self.lazy_indicators = lazy_indicators
+        self.last_indicator_usage = None
+        self.indicator_usage_stats = {'signals': 0, 'touched': Counter(), 'computed': Counter()}
+        
+        # Інкрементальні індикатори: стан на кожну пару (symbol, timeframe)
+        self.use_streaming = use_streaming
+        self.indicator_engines = IndicatorEngineRegistry(
+            parity=streaming_parity,
+            reference_fn=lambda history: self.calculate_indicators(history)
+        )
+        
+        # Рівні підтримки/опору: 'pivots' - екстремуми close з кластеризацією,
+        # 'volume_profile' - резидентний індекс профілю об'єму на (symbol, timeframe)
+        self.level_source = level_source
+        self.level_indexes = VolumeProfileRegistry()
+        
+        # Набори індикаторів у кеші: float32/int8 в одному буфері (CompactBundle)
+        self.compact_indicators = compact_indicators
+        
         # Налаштування для професійної торгівлі
         self.MIN_CANDLES = 150  # Мінімум свічок для аналізу
         self.BASE_RISK = 0.02   # Базовий ризик 2% на угоду
         self.MIN_RR = 2.0       # Мінімальне R/R співвідношення
+        self.MIN_CONFIDENCE = 0.5  # Мінімальна впевненість сигналу
+        self.MAX_CONFLICT = 0.4    # Максимальна частка конфліктів індикаторів
+        self.ADX_TREND = 20        # ADX, з якого тренд вважається сильним
+        self.RSI_BANDS = (35, 45, 55, 65)  # Межі зон RSI для оцінки моментуму
         self.MAX_POSITION = 5.0 # Максимальний розмір позиції 5%
         
     def setup_logging(self):
@@ -27,138 +74,201 @@ class AIAnalyzer:
         )
         self.logger = logging.getLogger(__name__)
     
-    def calculate_indicators(self, df: pd.DataFrame, timeframe: str = '1h') -> Dict[str, Any]:
-        """Розрахунок професійних технічних індикаторів"""
-        close = df['close'].values.astype(float)
-        high = df['high'].values.astype(float)
-        low = df['low'].values.astype(float)
-        open_price = df['open'].values.astype(float)
-        volume = df['volume'].values.astype(float)
-        
-        # ====== ТРЕНДОВІ ІНДИКАТОРИ ======
-        ema_8 = talib.EMA(close, timeperiod=8)
-        ema_20 = talib.EMA(close, timeperiod=20)
-        ema_50 = talib.EMA(close, timeperiod=50)
-        ema_100 = talib.EMA(close, timeperiod=100)
-        ema_200 = talib.EMA(close, timeperiod=200)
-        
-        sma_20 = talib.SMA(close, timeperiod=20)
-        sma_50 = talib.SMA(close, timeperiod=50)
-        
-        # ADX для сили тренду
-        adx = talib.ADX(high, low, close, timeperiod=14)
-        plus_di = talib.PLUS_DI(high, low, close, timeperiod=14)
-        minus_di = talib.MINUS_DI(high, low, close, timeperiod=14)
-        
-        # ====== МОМЕНТУМ ======
-        rsi = talib.RSI(close, timeperiod=14)
-        stoch_k, stoch_d = talib.STOCH(high, low, close)
-        stoch_rsi_k, stoch_rsi_d = talib.STOCHRSI(close, timeperiod=14)
-        
-        # MACD
-        macd, macd_signal, macd_hist = talib.MACD(close)
-        
-        # ====== ВОЛАТИЛЬНІСТЬ ======
-        atr = talib.ATR(high, low, close, timeperiod=14)
-        bollinger_upper, bollinger_middle, bollinger_lower = talib.BBANDS(
-            close, timeperiod=20, nbdevup=2, nbdevdn=2
-        )
-        
-        # Додаткова волатильність
-        natr = talib.NATR(high, low, close, timeperiod=14)
-        
-        # ====== ОБСЯГИ ======
-        obv = talib.OBV(close, volume)
-        vwap = self.calculate_vwap(df)
-        volume_sma = pd.Series(volume).rolling(20).mean().values
-        
-        # Об'ємні індикатори
-        mfi = talib.MFI(high, low, close, volume, timeperiod=14)
-        ad = talib.AD(high, low, close, volume)
-        
-        # ====== ОСЦИЛЯТОРИ ======
-        williams_r = talib.WILLR(high, low, close, timeperiod=14)
-        cci = talib.CCI(high, low, close, timeperiod=20)
-        ultosc = talib.ULTOSC(high, low, close)
-        
-        # ====== ІШИМОКУ ======
-        tenkan_sen, kijun_sen, senkou_span_a, senkou_span_b, chikou_span = self.calculate_ichimoku(df)
-        
-        # ====== СВЕЧНІ ПАТТЕРНИ ======
-        doji = talib.CDLDOJI(open_price, high, low, close)
-        hammer = talib.CDLHAMMER(open_price, high, low, close)
-        engulfing = talib.CDLENGULFING(open_price, high, low, close)
-        morning_star = talib.CDLMORNINGSTAR(open_price, high, low, close)
-        evening_star = talib.CDLEVENINGSTAR(open_price, high, low, close)
-        harami = talib.CDLHARAMI(open_price, high, low, close)
-        
-        indicators = {
-            # Трендові
-            'ema_8': ema_8, 'ema_20': ema_20, 'ema_50': ema_50, 
-            'ema_100': ema_100, 'ema_200': ema_200,
-            'sma_20': sma_20, 'sma_50': sma_50,
-            'adx': adx, 'plus_di': plus_di, 'minus_di': minus_di,
-            
-            # Моментум
-            'rsi': rsi, 'stoch_k': stoch_k, 'stoch_d': stoch_d,
-            'stoch_rsi_k': stoch_rsi_k, 'stoch_rsi_d': stoch_rsi_d,
-            'macd': macd, 'macd_signal': macd_signal, 'macd_hist': macd_hist,
-            
-            # Волатильність
-            'atr': atr, 'natr': natr,
-            'bb_upper': bollinger_upper, 'bb_middle': bollinger_middle, 'bb_lower': bollinger_lower,
-            
-            # Обсяги
-            'obv': obv, 'vwap': vwap, 'volume_sma': volume_sma,
-            'mfi': mfi, 'ad': ad,
-            
-            # Осцилятори
-            'williams_r': williams_r, 'cci': cci, 'ultosc': ultosc,
-            
-            # Ішимоку
-            'tenkan_sen': tenkan_sen, 'kijun_sen': kijun_sen,
-            'senkou_span_a': senkou_span_a, 'senkou_span_b': senkou_span_b,
-            'chikou_span': chikou_span,
-            
-            # Свечні паттерни
-            'doji': doji, 'hammer': hammer, 'engulfing': engulfing,
-            'morning_star': morning_star, 'evening_star': evening_star, 'harami': harami,
-            
-            # Базові ціни
-            'close': close, 'high': high, 'low': low, 'open': open_price, 'volume': volume,
+    def calculate_indicators(self, df: pd.DataFrame, timeframe: str = '1h',
+                             symbol: Optional[str] = None, lazy: bool = False) -> Dict[str, Any]:
+        """
+        Розрахунок професійних технічних індикаторів.
+        Якщо увімкнено use_streaming і передано symbol - індикатори оновлюються
+        інкрементально лише для нових свічок (масиви дійсні до наступного виклику).
+        lazy=True повертає LazyIndicators: індикатор рахується при першому зверненні.
+        compact_indicators - набір з symbol кешується як CompactBundle (float32/int8);
+        має пріоритет над lazy: кешований набір рахується один раз на вікно.
+        """
+        if self.use_streaming and symbol:
+            return self.indicator_engines.get(symbol, timeframe).sync(df)
+        
+        if symbol and self.compact_indicators:
+            return market_cache.get_indicators('models_compact', symbol, timeframe, df,
+                                               lambda: CompactBundle(self.build_lazy_indicators(df).materialize()))
+        if lazy:
+            return self.build_lazy_indicators(df)
+        if symbol:
+            return market_cache.get_indicators('models', symbol, timeframe, df,
+                                               lambda: self.build_lazy_indicators(df).materialize())
+        return self.build_lazy_indicators(df).materialize()
+    
+    def build_lazy_indicators(self, df: pd.DataFrame) -> LazyIndicators:
+        """Контейнер індикаторів для вікна df з відкладеним розрахунком"""
+        sources = {
+            'close': df['close'].values.astype(float),
+            'high': df['high'].values.astype(float),
+            'low': df['low'].values.astype(float),
+            'open': df['open'].values.astype(float),
+            'volume': df['volume'].values.astype(float),
+        }
+        return LazyIndicators(self.indicator_nodes, sources, context={'df': df})
+    
+    def _build_indicator_nodes(self) -> List[IndicatorNode]:
+        """
+        Граф індикаторів: вихідні ключі, входи, функція розрахунку та розгін
+        (lookback TA-Lib + збіжність EMA/Wilder-згладжувань, None - кумулятивні)
+        """
+        hlc = ('high', 'low', 'close')
+        ohlc = ('open', 'high', 'low', 'close')
+        
+        def node(outputs, inputs, func, warmup=0):
+            return IndicatorNode((outputs,) if isinstance(outputs, str) else outputs, inputs, func,
+                                 warmup=warmup)
+        
+        def macd_warmup(tolerance):
+            return ema_warmup(26, 33)(tolerance) + ema_warmup(9, deviation=0.01)(tolerance)
+        
+        return [
+            # ====== СПІЛЬНІ ПРОМІЖНІ ВЕЛИЧИНИ ======
+            typical_price_node(),
+            # max high / min low усіх вікон (STOCH, Ішимоку, Williams %R) - один прохід
+            IndicatorNode(('channel_extrema',), ('high', 'low'),
+                          lambda h, l: rolling_extrema(h, l, CHANNEL_WINDOWS), internal=True,
+                          warmup=max(CHANNEL_WINDOWS) - 1),
+            
+            # ====== ТРЕНДОВІ ІНДИКАТОРИ ======
+            node('ema_8', ('close',), lambda c: talib.EMA(c, timeperiod=8), warmup=ema_warmup(8, 7)),
+            node('ema_20', ('close',), lambda c: talib.EMA(c, timeperiod=20), warmup=ema_warmup(20, 19)),
+            node('ema_50', ('close',), lambda c: talib.EMA(c, timeperiod=50), warmup=ema_warmup(50, 49)),
+            node('ema_100', ('close',), lambda c: talib.EMA(c, timeperiod=100), warmup=ema_warmup(100, 99)),
+            node('ema_200', ('close',), lambda c: talib.EMA(c, timeperiod=200), warmup=ema_warmup(200, 199)),
+            node('sma_20', ('close',), lambda c: talib.SMA(c, timeperiod=20), warmup=19),
+            node('sma_50', ('close',), lambda c: talib.SMA(c, timeperiod=50), warmup=49),
+            
+            # ADX для сили тренду
+            node('adx', hlc, lambda h, l, c: talib.ADX(h, l, c, timeperiod=14),
+                 warmup=wilder_warmup(14, 27, stages=2)),
+            node('plus_di', hlc, lambda h, l, c: talib.PLUS_DI(h, l, c, timeperiod=14),
+                 warmup=wilder_warmup(14, 14)),
+            node('minus_di', hlc, lambda h, l, c: talib.MINUS_DI(h, l, c, timeperiod=14),
+                 warmup=wilder_warmup(14, 14)),
+            
+            # ====== МОМЕНТУМ ======
+            node('rsi', ('close',), lambda c: talib.RSI(c, timeperiod=14), warmup=wilder_warmup(14, 14)),
+            node(('stoch_k', 'stoch_d'), ('channel_extrema', 'close'),
+                 lambda e, c: stochastic_from_fast_k(stoch_fast_k(*e[5], c)), warmup=4),
+            # STOCHRSI = STOCHF по вже порахованому RSI (без повторного RSI всередині TA-Lib)
+            node(('stoch_rsi_k', 'stoch_rsi_d'), ('rsi',), lambda r: talib.STOCHF(r, r, r, 5, 3, 0), warmup=6),
+            node(('macd', 'macd_signal', 'macd_hist'), ('close',), lambda c: talib.MACD(c), warmup=macd_warmup),
+            
+            # ====== ВОЛАТИЛЬНІСТЬ ======
+            node('atr', hlc, lambda h, l, c: talib.ATR(h, l, c, timeperiod=14), warmup=wilder_warmup(14, 14)),
+            node('natr', ('atr', 'close'), natr_from_atr),
+            node(('bb_upper', 'bb_middle', 'bb_lower'), ('close',),
+                 lambda c: talib.BBANDS(c, timeperiod=20, nbdevup=2, nbdevdn=2), warmup=19),
+            
+            # ====== ОБСЯГИ ======
+            node('obv', ('close', 'volume'), lambda c, v: talib.OBV(c, v), warmup=None),
+            node('vwap', ('typical_price', 'volume'), vwap_from_typical, warmup=None),
+            node('volume_sma', ('volume',), lambda v: pd.Series(v).rolling(20).mean().values, warmup=19),
+            node('mfi', ('high', 'low', 'close', 'volume'), lambda h, l, c, v: talib.MFI(h, l, c, v, timeperiod=14),
+                 warmup=14),
+            node('ad', ('high', 'low', 'close', 'volume'), lambda h, l, c, v: talib.AD(h, l, c, v), warmup=None),
+            
+            # ====== ОСЦИЛЯТОРИ ======
+            node('williams_r', ('channel_extrema', 'close'), lambda e, c: williams_r_from_extrema(*e[14], c)),
+            node('cci', hlc, lambda h, l, c: talib.CCI(h, l, c, timeperiod=20), warmup=19),
+            node('ultosc', hlc, lambda h, l, c: talib.ULTOSC(h, l, c), warmup=28),
+            
+            # ====== ІШИМОКУ ======
+            node('tenkan_sen', ('channel_extrema',), lambda e: channel_midpoint(e, 9)),
+            node('kijun_sen', ('channel_extrema',), lambda e: channel_midpoint(e, 26)),
+            node('senkou_span_a', ('tenkan_sen', 'kijun_sen'), lambda tenkan, kijun: (tenkan + kijun) / 2),
+            node('senkou_span_b', ('channel_extrema',), lambda e: channel_midpoint(e, 52)),
+            node('chikou_span', ('close',), lambda c: np.roll(c, -26), warmup=None),
+            
+            # ====== СВЕЧНІ ПАТТЕРНИ ======
+            node('doji', ohlc, talib.CDLDOJI, warmup=10),
+            node('hammer', ohlc, talib.CDLHAMMER, warmup=11),
+            node('engulfing', ohlc, talib.CDLENGULFING, warmup=2),
+            node('morning_star', ohlc, talib.CDLMORNINGSTAR, warmup=12),
+            node('evening_star', ohlc, talib.CDLEVENINGSTAR, warmup=12),
+            node('harami', ohlc, talib.CDLHARAMI, warmup=11),
+        ]
+    
+    def required_window(self, tolerance: float = 1e-6, keys: Optional[List[str]] = None) -> int:
+        """
+        Мінімум свічок, за якого останні значення індикаторів (keys - типово всі)
+        не залежать від глибини історії в межах tolerance. EMA200 та ADX
+        збігаються повільно: при малому допуску це більше за MIN_CANDLES.
+        """
+        return required_window(self.indicator_nodes, tolerance, keys)
+    
+    def anchored_indicators(self) -> List[str]:
+        """Кумулятивні індикатори - їх рівень залежить від початку вікна"""
+        return anchored_keys(self.indicator_nodes)
+    
+    def score_series(self, df: pd.DataFrame, indicators: Optional[Any] = None,
+                     weights: Optional[Dict[str, float]] = None) -> Dict[str, np.ndarray]:
+        """
+        Векторна оцінка всієї серії за один виклик: напрямок (1/-1/0),
+        оцінки категорій, впевненість і рівень конфліктів на кожній свічці.
+        На останній свічці збігається з _analyze_* та _calculate_total_confidence.
+        """
+        if indicators is None:
+            indicators = self.build_lazy_indicators(df)
+        return score_series(indicators, weights, self.scoring_thresholds())
+    
+    def scoring_thresholds(self) -> Dict[str, Any]:
+        """Пороги оцінки, спільні для скалярного та векторного шляху"""
+        return {'adx_trend': self.ADX_TREND, 'rsi_bands': tuple(self.RSI_BANDS)}
+    
+    def rescore_confidence(self, series: Dict[str, np.ndarray], weights: Dict[str, float]) -> np.ndarray:
+        """Впевненість з іншими вагами категорій без повторного розрахунку оцінок"""
+        return total_confidence({name: series[f'{name}_score'] for name in CATEGORY_WEIGHTS}, weights)
+    
+    def _record_indicator_usage(self, symbol: str, indicators: Any):
+        """Облік індикаторів, які реально прочитав сигнал"""
+        if not isinstance(indicators, LazyIndicators):
+            return
+        report = indicators.usage_report()
+        self.last_indicator_usage = {'symbol': symbol, **report}
+        self.indicator_usage_stats['signals'] += 1
+        for key in report['touched']:
+            self.indicator_usage_stats['touched'][key] += 1
+        for key in report['computed']:
+            self.indicator_usage_stats['computed'][key] += 1
+    
+    def get_indicator_usage_report(self) -> Dict:
+        """Зведений звіт: скільки разів кожен індикатор читався і рахувався"""
+        all_keys = [key for node in self.indicator_nodes if not node.internal for key in node.outputs]
+        touched = self.indicator_usage_stats['touched']
+        return {
+            'signals': self.indicator_usage_stats['signals'],
+            'touched': dict(touched),
+            'computed': dict(self.indicator_usage_stats['computed']),
+            'never_touched': [key for key in all_keys if key not in touched],
+            'last_signal': self.last_indicator_usage,
         }
-        
-        return indicators
     
     def calculate_vwap(self, df: pd.DataFrame) -> np.ndarray:
         """Розрахунок VWAP"""
-        typical_price = (df['high'] + df['low'] + df['close']) / 3
-        vwap = (typical_price * df['volume']).cumsum() / df['volume'].cumsum()
-        return vwap.values
+        typical = typical_price(df['high'].values, df['low'].values, df['close'].values)
+        return vwap_from_typical(typical, df['volume'].values)
     
     def calculate_ichimoku(self, df: pd.DataFrame) -> Tuple:
         """Розрахунок Ішимоку Кінко Хйо"""
         high = df['high'].values
         low = df['low'].values
         close = df['close'].values
+        extrema = rolling_extrema(high, low, (9, 26, 52))
         
         # Tenkan-sen (Conversion Line)
-        period9_high = pd.Series(high).rolling(window=9).max()
-        period9_low = pd.Series(low).rolling(window=9).min()
-        tenkan_sen = ((period9_high + period9_low) / 2).values
+        tenkan_sen = channel_midpoint(extrema, 9)
         
         # Kijun-sen (Base Line)
-        period26_high = pd.Series(high).rolling(window=26).max()
-        period26_low = pd.Series(low).rolling(window=26).min()
-        kijun_sen = ((period26_high + period26_low) / 2).values
+        kijun_sen = channel_midpoint(extrema, 26)
         
         # Senkou Span A (Leading Span A)
         senkou_span_a = ((tenkan_sen + kijun_sen) / 2)
         
         # Senkou Span B (Leading Span B)
-        period52_high = pd.Series(high).rolling(window=52).max()
-        period52_low = pd.Series(low).rolling(window=52).min()
-        senkou_span_b = ((period52_high + period52_low) / 2).values
+        senkou_span_b = channel_midpoint(extrema, 52)
         
         # Chikou Span (Lagging Span)
         chikou_span = np.roll(close, -26)
@@ -177,12 +287,7 @@ class AIAnalyzer:
             return {}
         
         # Структура максимумів та мінімумів
-        highs, lows = [], []
-        for i in range(10, len(close) - 10):
-            if high[i] == max(high[i-10:i+11]):
-                highs.append((i, high[i]))
-            if low[i] == min(low[i-10:i+11]):
-                lows.append((i, low[i]))
+        highs, lows = find_swing_points(high, low, radius=10)
         
         # Тренд за структурою
         higher_highs = sum(1 for i in range(1, min(5, len(highs))) if highs[i][1] > highs[i-1][1])
@@ -223,43 +328,35 @@ class AIAnalyzer:
         close = df['close'].values
         
         # Знаходимо локальні екстремуми
-        supports, resistances = [], []
-        
-        for i in range(window, len(close) - window):
-            local_min = np.min(close[i-window:i+window+1])
-            local_max = np.max(close[i-window:i+window+1])
-            
-            if close[i] == local_min:
-                supports.append(close[i])
-            if close[i] == local_max:
-                resistances.append(close[i])
-        
-        # Кластеризація
-        def cluster_levels(levels, threshold_percent=0.015):
-            if not levels:
-                return []
-            
-            levels = sorted(levels)
-            clusters = []
-            current_cluster = [levels[0]]
-            
-            for price in levels[1:]:
-                cluster_mean = np.mean(current_cluster)
-                if cluster_mean == 0:
-                    current_cluster.append(price)
-                    continue
-                    
-                if abs(price - cluster_mean) / cluster_mean < threshold_percent:
-                    current_cluster.append(price)
-                else:
-                    clusters.append(np.mean(current_cluster))
-                    current_cluster = [price]
-            
-            if current_cluster:
-                clusters.append(np.mean(current_cluster))
-            
-            return clusters
+        supports, resistances = extract_levels(close, window)
+        return self._build_support_resistance(close, supports, resistances)
+    
+    def support_resistance_for(self, df: pd.DataFrame, symbol: Optional[str] = None,
+                               timeframe: str = '1h') -> Dict:
+        """Рівні з налаштованого джерела (level_source) у форматі calculate_support_resistance"""
+        if self.level_source == 'volume_profile' and symbol:
+            index = self.level_indexes.get(symbol, timeframe).sync(df)
+            return index.support_resistance(float(df['close'].values[-1]))
+        return self.calculate_support_resistance(df)
+    
+    def calculate_support_resistance_batch(self, frames: Dict[str, pd.DataFrame], window: int = 20) -> Dict[str, Dict]:
+        """Рівні підтримки/опору для багатьох символів: екстремуми шукаються одним проходом на матриці"""
+        results = {}
+        
+        # Групуємо символи з однаковою довжиною історії в одну матрицю
+        by_length = {}
+        for symbol, df in frames.items():
+            by_length.setdefault(len(df), []).append(symbol)
         
+        for symbols in by_length.values():
+            closes = np.vstack([frames[symbol]['close'].values.astype(float) for symbol in symbols])
+            for symbol, close, (supports, resistances) in zip(symbols, closes, extract_levels_batch(closes, window)):
+                results[symbol] = self._build_support_resistance(close, supports, resistances)
+        
+        return results
+    
+    def _build_support_resistance(self, close: np.ndarray, supports, resistances) -> Dict:
+        """Кластеризація рівнів і пошук найближчих до поточної ціни"""
         support_clusters = cluster_levels(supports)
         resistance_clusters = cluster_levels(resistances)
         
@@ -350,16 +447,24 @@ class AIAnalyzer:
             }
         }
     
-    def generate_trading_signal(self, symbol: str, df: pd.DataFrame, timeframe: str = '1h') -> Dict:
-        """Генерація професійного торгового сигналу"""
+    def generate_trading_signal(self, symbol: str, df: pd.DataFrame, timeframe: str = '1h',
+                                confirm_timeframes: Optional[List[str]] = None) -> Dict:
+        """
+        Генерація професійного торгового сигналу.
+        confirm_timeframes - старші таймфрейми для підтвердження (агрегуються з df локально)
+        """
+        if confirm_timeframes:
+            return self.generate_multi_timeframe_signal(symbol, df, timeframe, confirm_timeframes)
+        
         self.logger.info(f"Генерую торговий сигнал для {symbol} на {timeframe}")
         
         if len(df) < self.MIN_CANDLES:
             return self._error_response(symbol, f"Недостатньо даних (потрібно мінімум {self.MIN_CANDLES} свічок)")
         
+        indicators = None
         try:
             # Розрахунок індикаторів
-            indicators = self.calculate_indicators(df, timeframe)
+            indicators = self.calculate_indicators(df, timeframe, symbol, lazy=self.lazy_indicators)
             
             # Поточні ціни
             close = indicators['close']
@@ -410,21 +515,22 @@ class AIAnalyzer:
             conflict_score = self._calculate_conflict_score(all_factors)
             
             # Якщо забагато конфліктів - нейтральний
-            if conflict_score > 0.4:
+            if conflict_score > self.MAX_CONFLICT:
                 return self._neutral_signal(
                     symbol, current_price, total_confidence * 0.7, timeframe,
                     reason="Багато конфліктів між індикаторами"
                 )
             
-            # Розрахунок точок входу
+            # Розрахунок точок входу (рівні рахуються один раз на сигнал)
+            support_resistance = self.support_resistance_for(df, symbol, timeframe)
             entry_points = self._calculate_entry_points(
-                direction, current_price, indicators, df
+                direction, current_price, indicators, df, support_resistance
             )
             
             # Розрахунок TP/SL
             tp_sl_points = self._calculate_tp_sl_points(
                 direction, entry_points['optimal_entry'],
-                risk_analysis['atr'], indicators, df
+                risk_analysis['atr'], indicators, df, support_resistance
             )
             
             # Перевірка мінімального R/R
@@ -456,7 +562,6 @@ class AIAnalyzer:
             
             # Додаткові аналізи
             price_action = self.analyze_price_action(df)
-            support_resistance = self.calculate_support_resistance(df)
             market_structure = self.analyze_market_structure(df, indicators)
             
             # Пояснення
@@ -503,6 +608,9 @@ class AIAnalyzer:
         except Exception as e:
             self.logger.error(f"Помилка генерації сигналу для {symbol}: {str(e)}")
             return self._error_response(symbol, f"Помилка аналізу: {str(e)}")
+        
+        finally:
+            self._record_indicator_usage(symbol, indicators)
     
     def _analyze_trend(self, df: pd.DataFrame, indicators: Dict, current_price: float) -> Dict:
         """Детальний аналіз тренду"""
@@ -520,7 +628,7 @@ class AIAnalyzer:
         adx_current = adx[-1] if len(adx) > 0 and not pd.isna(adx[-1]) else 0
         
         # Визначення напрямку
-        if ema_20_current > ema_50_current > ema_200_current and adx_current > 20:
+        if ema_20_current > ema_50_current > ema_200_current and adx_current > self.ADX_TREND:
             direction = 'long'
             # Сила тренду
             if ema_200_current == 0:
@@ -529,7 +637,7 @@ class AIAnalyzer:
                 trend_strength = min(1.0, (ema_20_current - ema_200_current) / ema_200_current * 3)
             score = 0.6 + trend_strength * 0.4
             
-        elif ema_20_current < ema_50_current < ema_200_current and adx_current > 20:
+        elif ema_20_current < ema_50_current < ema_200_current and adx_current > self.ADX_TREND:
             direction = 'short'
             if ema_20_current == 0:
                 trend_strength = 0
@@ -560,9 +668,9 @@ class AIAnalyzer:
         
         return {
             'direction': direction,
-            'score': round(score, 3),
+            'score': round(float(score), 3),
             'factors': {
-                'trend_score': round(score, 3),
+                'trend_score': round(float(score), 3),
                 'ema_alignment': f"{ema_20_current:.2f}/{ema_50_current:.2f}/{ema_200_current:.2f}",
                 'adx_strength': round(adx_current, 1),
             }
@@ -578,26 +686,27 @@ class AIAnalyzer:
         if len(rsi) > 0:
             rsi_current = rsi[-1] if not pd.isna(rsi[-1]) else 50
             factors['rsi_level'] = round(rsi_current, 1)
+            oversold, weak, strong, overbought = self.RSI_BANDS
             
             if direction == 'long':
-                if rsi_current < 35:
+                if rsi_current < oversold:
                     rsi_score = 0.9
-                elif rsi_current < 45:
+                elif rsi_current < weak:
                     rsi_score = 0.8
-                elif rsi_current < 55:
+                elif rsi_current < strong:
                     rsi_score = 0.6
-                elif rsi_current < 65:
+                elif rsi_current < overbought:
                     rsi_score = 0.4
                 else:
                     rsi_score = 0.2
             else:  # short
-                if rsi_current > 65:
+                if rsi_current > overbought:
                     rsi_score = 0.9
-                elif rsi_current > 55:
+                elif rsi_current > strong:
                     rsi_score = 0.8
-                elif rsi_current > 45:
+                elif rsi_current > weak:
                     rsi_score = 0.6
-                elif rsi_current > 35:
+                elif rsi_current > oversold:
                     rsi_score = 0.4
                 else:
                     rsi_score = 0.2
@@ -688,7 +797,7 @@ class AIAnalyzer:
             momentum_score = 0.3
         
         return {
-            'score': round(momentum_score, 3),
+            'score': round(float(momentum_score), 3),
             'factors': factors
         }
     
@@ -911,10 +1020,12 @@ class AIAnalyzer:
         return conflicts / max(total_checks, 1)
     
     def _calculate_entry_points(self, direction: str, current_price: float, 
-                               indicators: Dict, df: pd.DataFrame) -> Dict:
-        """Розрахунок точок входу"""
+                               indicators: Dict, df: pd.DataFrame,
+                               support_resistance: Optional[Dict] = None) -> Dict:
+        """Розрахунок точок входу (support_resistance - вже пораховані рівні)"""
         # Пошук найкращих точок входу на основі підтримки/опору
-        support_resistance = self.calculate_support_resistance(df)
+        if support_resistance is None:
+            support_resistance = self.calculate_support_resistance(df)
         
         if direction == 'long':
             # Для лонга: входимо на підтримці
@@ -980,9 +1091,11 @@ class AIAnalyzer:
         }
     
     def _calculate_tp_sl_points(self, direction: str, entry: float, atr: float, 
-                               indicators: Dict, df: pd.DataFrame) -> Dict:
+                               indicators: Dict, df: pd.DataFrame,
+                               support_resistance: Optional[Dict] = None) -> Dict:
         """Розрахунок Take Profit та Stop Loss з врахуванням структури"""
-        support_resistance = self.calculate_support_resistance(df)
+        if support_resistance is None:
+            support_resistance = self.calculate_support_resistance(df)
         
         if direction == 'long':
             # TP: найближчий опір або ATR-based
@@ -1039,13 +1152,7 @@ class AIAnalyzer:
     def _calculate_total_confidence(self, trend: Dict, momentum: Dict, risk: Dict, 
                                    volume: Dict, structure: Dict) -> float:
         """Розрахунок загальної впевненості"""
-        weights = {
-            'trend': 0.30,
-            'momentum': 0.25,
-            'risk': 0.20,
-            'volume': 0.15,
-            'structure': 0.10,
-        }
+        weights = CATEGORY_WEIGHTS
         
         total = (
             trend['score'] * weights['trend'] +
@@ -1065,7 +1172,7 @@ class AIAnalyzer:
         elif std_score > 0.25:
             total *= 0.9  # Покарання за розбіжності
         
-        return round(min(1.0, max(0.0, total)), 3)
+        return round(float(min(1.0, max(0.0, total))), 3)
     
     def _calculate_risk_reward(self, entry: float, take_profit: float, stop_loss: float) -> float:
         """Розрахунок співвідношення ризик/прибуток"""
@@ -1151,7 +1258,42 @@ class AIAnalyzer:
             'max_position_percent': self.MAX_POSITION,
             'stop_distance_pct': round(stop_distance_pct, 2)
         }
-    
+
+    def trade_parameters_batch(self, directions, prices, atrs, supports, resistances,
+                               volatility, confidence, conflict=None) -> Dict[str, np.ndarray]:
+        """
+        Вхід, TP/SL, R/R і розмір позиції для масиву сигналів одним векторним
+        проходом. Поелементно збігається з _calculate_entry_points,
+        _calculate_tp_sl_points, _calculate_risk_reward і _calculate_position_size;
+        supports/resistances - NaN, якщо рівня немає. 'valid' - маска
+        _validate_signal (confidence і conflict округлюються, як у сигналі).
+        """
+        direction = direction_codes(directions)
+        prices, atrs = np.asarray(prices, dtype=float), np.asarray(atrs, dtype=float)
+        supports, resistances = np.asarray(supports, dtype=float), np.asarray(resistances, dtype=float)
+        confidence = np.asarray(confidence, dtype=float)
+        conflict = np.zeros(len(prices)) if conflict is None else np.asarray(conflict, dtype=float)
+
+        entry = entry_prices(direction, prices, supports, resistances)
+        take_profit, stop_loss = take_profit_stop_loss(direction, entry, atrs, supports, resistances)
+        rr = risk_reward(entry, take_profit, stop_loss)
+        sizes = position_size(entry, stop_loss, np.asarray(volatility, dtype=float), confidence,
+                              self.BASE_RISK, self.MAX_POSITION)
+        valid = valid_signals(_round(confidence, 3), rr, _round(conflict, 2), entry, take_profit, stop_loss,
+                              self.MIN_CONFIDENCE, self.MIN_RR, self.MAX_CONFLICT)
+        return {
+            'entry': entry,
+            'take_profit': take_profit,
+            'stop_loss': stop_loss,
+            'risk_reward': rr,
+            **sizes,
+            'valid': valid,
+        }
+
+    def position_size_record(self, batch: Dict[str, np.ndarray], index: int) -> Dict:
+        """Словник position_size (як _calculate_position_size) для рядка trade_parameters_batch"""
+        return position_size_record(batch, index, self.BASE_RISK, self.MAX_POSITION)
+
     def _determine_signal_strength(self, confidence: float, conflict_score: float) -> str:
         """Визначення сили сигналу"""
         # Корекція за конфлікти
@@ -1264,13 +1406,13 @@ class AIAnalyzer:
     def _validate_signal(self, signal: Dict) -> bool:
         """Фінальна валідація сигналу"""
         # Мінімальні вимоги
-        if signal['confidence'] < 0.5:
+        if signal['confidence'] < self.MIN_CONFIDENCE:
             return False
         
         if signal['risk_reward'] < self.MIN_RR:
             return False
         
-        if signal['conflict_score'] > 0.4:
+        if signal['conflict_score'] > self.MAX_CONFLICT:
             return False
         
         # Перевірка на розумність TP/SL
@@ -1287,6 +1429,60 @@ class AIAnalyzer:
         
         return True
     
+    def generate_multi_timeframe_signal(self, symbol: str, df: pd.DataFrame, timeframe: str,
+                                        confirm_timeframes: List[str],
+                                        frames: Optional[Dict[str, pd.DataFrame]] = None) -> Dict:
+        """
+        Сигнал на базовому таймфреймі + підтвердження старшими.
+        Свічки старших таймфреймів беруться з frames (напр. fetch_ohlcv_multi),
+        а якщо їх немає - агрегуються з df без запитів на біржу.
+        """
+        frames = frames or {}
+        signal = self.generate_trading_signal(symbol, df, timeframe)
+        base_ms = timeframe_ms(timeframe)
+        
+        confirmations = {}
+        for tf in sort_timeframes(confirm_timeframes):
+            if tf == timeframe:
+                continue
+            higher = frames.get(tf)
+            if higher is None:
+                if timeframe_ms(tf) < base_ms or timeframe_ms(tf) % base_ms or 'timestamp' not in df.columns:
+                    confirmations[tf] = {'error': f"Таймфрейм {tf} не можна отримати з {timeframe}"}
+                    continue
+                higher = resample_ohlcv(df, tf)
+                if len(higher) < self.MIN_CANDLES:
+                    # напр. 1d з 1500 годинних свічок - лише 62 доби; потрібні власні свічки
+                    confirmations[tf] = {
+                        'candles': len(higher),
+                        'error': f"Замало свічок {tf} з {timeframe}: {len(higher)} < {self.MIN_CANDLES}, "
+                                 f"передайте frames (fetch_ohlcv_multi)",
+                    }
+                    continue
+            
+            tf_signal = self.generate_trading_signal(symbol, higher, tf)
+            confirmations[tf] = {
+                'direction': tf_signal['direction'],
+                'confidence': tf_signal['confidence'],
+                'signal_strength': tf_signal['signal_strength'],
+                'candles': len(higher),
+            }
+            if 'error' in tf_signal:
+                confirmations[tf]['error'] = tf_signal['error']
+        
+        # Частка старших таймфреймів з напрямком, що збігається з базовим сигналом
+        directional = [c['direction'] for c in confirmations.values() if c.get('direction') in ('long', 'short')]
+        alignment = 0.0
+        if directional and signal['direction'] != 'neutral':
+            alignment = sum(d == signal['direction'] for d in directional) / len(directional)
+        
+        signal['multi_timeframe'] = {
+            'base_timeframe': timeframe,
+            'timeframes': confirmations,
+            'alignment': round(alignment, 2),
+        }
+        return signal
+    
     def _neutral_signal(self, symbol: str, current_price: float, 
                        confidence: float, timeframe: str, reason: str = None) -> Dict:
         """Повернення нейтрального сигналу"""
@@ -14,6 +14,18 @@ warnings.filterwarnings('ignore')
 
 # Імпортуємо оригінальний аналізатор
 from .ai_analyzer import AIAnalyzer
+from .backtest import BacktestEngine
+from .parameter_sweep import ParameterSweep
+
+
+# Фабрики лічильників (lambda в defaultdict не серіалізується pickle)
+def _indicator_counter() -> Dict:
+    return {'wins': 0, 'losses': 0, 'total': 0}
+
+
+def _win_loss_counter() -> Dict:
+    return {'wins': 0, 'losses': 0}
+
 
 class AILearningAnalyzer(AIAnalyzer):
     """
@@ -34,9 +46,9 @@ class AILearningAnalyzer(AIAnalyzer):
         self.knowledge_base = {
             'winning_patterns': [],
             'losing_patterns': [],
-            'indicator_performance': defaultdict(lambda: {'wins': 0, 'losses': 0, 'total': 0}),
-            'market_context_performance': defaultdict(lambda: {'wins': 0, 'losses': 0}),
-            'time_based_performance': defaultdict(lambda: {'wins': 0, 'losses': 0}),
+            'indicator_performance': defaultdict(_indicator_counter),
+            'market_context_performance': defaultdict(_win_loss_counter),
+            'time_based_performance': defaultdict(_win_loss_counter),
             'last_analysis_time': None
         }
         
@@ -653,6 +665,40 @@ class AILearningAnalyzer(AIAnalyzer):
         self.learning_stats['last_optimization'] = datetime.now()
         self.logger.info(f"✅ Ваги оновлено: {self.dynamic_weights}")
     
+    def optimize_parameters(self, frames: Dict[str, pd.DataFrame], space: Dict[str, List],
+                            search: str = 'grid', samples: Optional[int] = None, workers: int = 1,
+                            save_to: Optional[str] = None, seed: Optional[int] = None, **sweep_options) -> Dict:
+        """
+        Перебір ваг категорій і порогів (MIN_RR, RSI_BANDS, ADX_TREND, ...) на історії.
+        Найкращі за out-of-sample ваги записуються в dynamic_weights, пороги та
+        метрики - у базу знань (save_to - файл для збереження).
+        """
+        self.logger.info(f"🔧 Перебір параметрів ({search}) на {len(frames)} символах...")
+        
+        sweep = ParameterSweep(BacktestEngine(self), workers=workers, **sweep_options)
+        result = sweep.run(frames, space, search, samples, seed, base_weights=self.dynamic_weights)
+        best = result['best']
+        if best is None:
+            self.logger.warning("⚠️ Недостатньо історії для перебору параметрів")
+            return result
+        
+        self.dynamic_weights = {name: round(weight, 4) for name, weight in best['config']['weights'].items()}
+        self.knowledge_base['parameter_sweep'] = {
+            'thresholds': best['config']['thresholds'],
+            'in_sample': best['in_sample'],
+            'out_of_sample': best['out_of_sample'],
+            'metric': result['metric'],
+            'configs_evaluated': result['configs'],
+            'timestamp': datetime.now().isoformat(),
+        }
+        self.learning_stats['last_optimization'] = datetime.now()
+        self.logger.info(f"✅ Найкращі ваги: {self.dynamic_weights}, "
+                         f"out-of-sample {result['metric']}: {best['out_of_sample'][result['metric']]}")
+        
+        if save_to:
+            self._save_knowledge_base(save_to)
+        return result
+    
     def _generate_learning_notes(self, result_data: Dict, signal_record: Dict) -> str:
         """
         Генерація нотаток для навчання.
@@ -0,0 +1,189 @@
+# backend/app/futures/models/async_exchange_connector.py
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine, Dict, List, Optional
+
+import ccxt.async_support as ccxt_async
+import pandas as pd
+from dotenv import load_dotenv
+
+from app.core.candle_store import candle_store
+from app.core.market_cache import market_cache
+from app.core.rate_limiter import rate_limiter
+from .exchange_connector import futures_symbol, ohlcv_frame
+
+load_dotenv()
+
+
+def _on_connector_loop(method):
+    """Корутина методу виконується на циклі подій конектора (сесія біржі прив'язана до нього)"""
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        loop = self._ensure_loop()
+        coroutine = method(self, *args, **kwargs)
+        if asyncio.get_running_loop() is loop:
+            return await coroutine
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coroutine, loop))
+    return wrapper
+
+
+class AsyncExchangeConnector:
+    """
+    Асинхронний конектор на ccxt.async_support. Один екземпляр біржі (і його
+    HTTP-сесія) на конектор, одночасних запитів - не більше max_concurrency.
+    Запити виконуються на власному циклі подій у фоновому потоці, тож
+    конектор можна викликати і з async-коду, і з синхронного через run().
+    Свічки - через той самий market_cache (і CandleStore), що й ExchangeConnector,
+    ліміт запитів - спільний з ним кошик rate_limiter.
+    """
+
+    def __init__(self, exchange_id: str = 'binance', max_concurrency: Optional[int] = None):
+        api_key = os.getenv('EXCHANGE_API_KEY')
+        api_secret = os.getenv('EXCHANGE_API_SECRET')
+        if not api_key or not api_secret:
+            raise ValueError("❌ API ключі не знайдено. Перевірте .env файл")
+
+        self.exchange_id = exchange_id
+        self.max_concurrency = max_concurrency or int(os.getenv('EXCHANGE_MAX_CONCURRENCY', 10))
+        self._config = {
+            'apiKey': api_key,
+            'secret': api_secret,
+            'enableRateLimit': True,
+            'options': {
+                'defaultType': 'future',
+                'adjustForTimeDifference': True
+            }
+        }
+        self.candle_store = candle_store
+
+        # Біржа, семафор і цикл подій створюються при першому запиті
+        self.exchange = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        # Потоки для синхронного CandleStore: стільки ж, скільки одночасних запитів
+        # (пул за замовчуванням - лише min(32, CPU + 4) потоків)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.stats = {'requests': 0, 'errors': 0, 'max_in_flight': 0}
+
+    # ====== ЦИКЛ ПОДІЙ ======
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever,
+                                                name=f"{self.exchange_id}-async", daemon=True)
+                self._thread.start()
+                self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                    thread_name_prefix=f"{self.exchange_id}-store")
+            return self._loop
+
+    def run(self, coroutine: Coroutine) -> Any:
+        """Виконання корутини конектора з синхронного коду (блокує до результату)"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._ensure_loop()).result()
+
+    async def _call(self, method: str, *args, **kwargs):
+        """Запит до біржі під семафором (викликається лише на циклі конектора)"""
+        if self.exchange is None:
+            self.exchange = getattr(ccxt_async, self.exchange_id)(self._config)
+            rate_limiter.attach_ccxt(self.exchange)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            self._in_flight += 1
+            self.stats['requests'] += 1
+            self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self._in_flight)
+            try:
+                return await getattr(self.exchange, method)(*args, **kwargs)
+            except Exception:
+                self.stats['errors'] += 1
+                raise
+            finally:
+                self._in_flight -= 1
+
+    # ====== СВІЧКИ ======
+
+    @_on_connector_loop
+    async def fetch_ohlcv(self, symbol: str, timeframe: str = '1h', limit: int = 100,
+                          use_cache: bool = True) -> pd.DataFrame:
+        """Свічки символу (у межах однієї свічки - з процесного кешу)"""
+        symbol = futures_symbol(symbol)
+        if use_cache:
+            cached = market_cache.peek_ohlcv(symbol, timeframe, limit)
+            if cached is not None:
+                return cached
+
+        df = await self._fetch_ohlcv(symbol, timeframe, limit)
+        if use_cache:
+            market_cache.put_ohlcv(symbol, timeframe, limit, df)
+        return df.copy()
+
+    async def _fetch_ohlcv(self, symbol: str, timeframe: str, limit: int) -> pd.DataFrame:
+        try:
+            if self.candle_store is None:
+                return ohlcv_frame(await self._call('fetch_ohlcv', symbol, timeframe, limit=limit))
+
+            # Сховище синхронне: докачка в потоці, запити - назад на цикл конектора
+            loop = asyncio.get_running_loop()
+
+            def fetch_rows(since, count):
+                coroutine = self._call('fetch_ohlcv', symbol, timeframe, since=since, limit=count)
+                return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+            return await loop.run_in_executor(
+                self._executor, lambda: self.candle_store.frame(symbol, timeframe, limit, fetch_rows)
+            )
+        except Exception as e:
+            print(f"❌ Помилка отримання даних {symbol}: {e}")
+            return pd.DataFrame()
+
+    @_on_connector_loop
+    async def fetch_ohlcv_many(self, symbols: List[str], timeframe: str = '1h', limit: int = 100,
+                               use_cache: bool = True) -> Dict[str, pd.DataFrame]:
+        """Свічки кількох символів паралельно (не більше max_concurrency запитів одночасно)"""
+        frames = await asyncio.gather(*(self.fetch_ohlcv(symbol, timeframe, limit, use_cache)
+                                        for symbol in symbols))
+        return dict(zip(symbols, frames))
+
+    # ====== ТІКЕРИ ======
+
+    @_on_connector_loop
+    async def fetch_ticker(self, symbol: str) -> Optional[Dict]:
+        try:
+            return await self._call('fetch_ticker', symbol)
+        except Exception as e:
+            print(f"❌ Помилка ticker {symbol}: {e}")
+            return None
+
+    @_on_connector_loop
+    async def fetch_tickers_many(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Тікери кількох символів паралельно; символи з помилкою пропускаються"""
+        tickers = await asyncio.gather(*(self.fetch_ticker(symbol) for symbol in symbols))
+        return {symbol: ticker for symbol, ticker in zip(symbols, tickers) if ticker}
+
+    # ====== ЗАКРИТТЯ ======
+
+    @_on_connector_loop
+    async def close(self):
+        """Закриття HTTP-сесії біржі"""
+        if self.exchange is not None:
+            await self.exchange.close()
+            self.exchange = None
+
+    def shutdown(self):
+        """Закриття сесії та зупинка циклу подій (синхронно)"""
+        if self._loop is None:
+            return
+        self.run(self.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
+        self._executor.shutdown(wait=False)
+        self._loop = self._thread = self._semaphore = self._executor = None
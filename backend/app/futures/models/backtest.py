@@ -0,0 +1,259 @@
+# backend/app/futures/models/backtest.py
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .ai_analyzer import AIAnalyzer
+from .price_levels import find_pivots
+from .signal_scoring import DIRECTION_NAMES, NEUTRAL
+
+
+class BacktestEngine:
+    """
+    Walk-forward бектест сигналів AIAnalyzer. Індикатори рахуються один раз
+    на всій історії, правила оцінки - векторно на кожній свічці (signal_scoring),
+    точки входу/TP/SL та валідація - векторним trade_parameters_batch, що
+    поелементно збігається з методами живого сигналу. Вихід з угоди - за
+    high/low свічок (SL перевіряється першим, якщо в одній свічці досягнуто
+    обидва рівні).
+
+    lookback - скільки свічок бачить живий сигнал (рівні підтримки/опору
+    шукаються лише в цьому вікні); None - уся історія до поточної свічки.
+    Індикатори беруться з повної історії: EMA/ADX до свічки t збігаються
+    з розрахунком на вікні lookback в межах допуску required_window.
+    """
+
+    SR_WINDOW = 20  # радіус екстремумів, як у calculate_support_resistance
+
+    def __init__(self, analyzer: Optional[AIAnalyzer] = None, lookback: Optional[int] = 500,
+                 entry_window: int = 4, max_hold: int = 48, fee: float = 0.0004,
+                 weights: Optional[Mapping[str, float]] = None):
+        self.analyzer = analyzer or AIAnalyzer()
+        self.lookback = lookback
+        self.entry_window = entry_window  # свічок на виконання лімітного ордера
+        self.max_hold = max_hold          # свічок до примусового закриття
+        self.fee = fee                    # комісія за сторону (частка)
+        self.weights = weights
+
+    # ====== СИГНАЛИ ======
+
+    def score(self, df: pd.DataFrame, indicators: Optional[Any] = None) -> Dict[str, np.ndarray]:
+        """Оцінки категорій, впевненість і конфлікти на кожній свічці"""
+        return self.analyzer.score_series(df, indicators, weights=self.weights)
+
+    def generate_signals(self, df: pd.DataFrame, scores: Optional[Dict[str, np.ndarray]] = None,
+                         levels: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Dict[int, Dict]:
+        """
+        {індекс свічки: сигнал} для свічок, де живий generate_trading_signal
+        повернув би long/short (сигнал формується на закритті свічки).
+        levels - готові nearest_levels(), інакше рівні рахуються для кандидатів.
+        """
+        analyzer = self.analyzer
+        scores = scores if scores is not None else self.score(df)
+        close = df['close'].values.astype(float)
+
+        # Пороги generate_trading_signal/_validate_signal, що не залежать від рівнів
+        bars = np.arange(len(close))
+        candidates = np.flatnonzero(
+            (bars >= analyzer.MIN_CANDLES - 1) & (close > 0) & (scores['direction'] != NEUTRAL) &
+            (scores['confidence'] >= 0.45) & (scores['confidence'] >= analyzer.MIN_CONFIDENCE) &
+            (scores['conflict'] <= analyzer.MAX_CONFLICT)
+        )
+
+        if levels is None:
+            pivots = self._pivots(close)
+            supports, resistances = np.full(len(candidates), np.nan), np.full(len(candidates), np.nan)
+            for i, t in enumerate(candidates):
+                support_resistance = self._support_resistance(close, t, *pivots)
+                supports[i] = support_resistance['nearest_support'] or np.nan
+                resistances[i] = support_resistance['nearest_resistance'] or np.nan
+        else:
+            supports, resistances = levels[0][candidates], levels[1][candidates]
+
+        # Вхід/TP/SL/R/R/розмір і валідація - одним векторним проходом по кандидатах
+        batch = analyzer.trade_parameters_batch(
+            scores['direction'][candidates], close[candidates], scores['atr'][candidates], supports, resistances,
+            scores['volatility'][candidates], scores['confidence'][candidates], scores['conflict'][candidates]
+        )
+
+        signals = {}
+        for i in np.flatnonzero(batch['valid']):
+            t = int(candidates[i])
+            signals[t] = {
+                'bar': t,
+                'direction': DIRECTION_NAMES[scores['direction'][t]],
+                'confidence': round(float(scores['confidence'][t]), 3),
+                'entry_points': {'optimal_entry': float(batch['entry'][i])},
+                'take_profit': float(batch['take_profit'][i]),
+                'stop_loss': float(batch['stop_loss'][i]),
+                'risk_reward': float(batch['risk_reward'][i]),
+                'conflict_score': round(float(scores['conflict'][t]), 2),
+                'position_size': analyzer.position_size_record(batch, i),
+            }
+
+        return signals
+
+    def nearest_levels(self, close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Найближчі підтримка та опір на кожній свічці (NaN - рівня немає).
+        Не залежать від ваг і порогів, тож рахуються один раз на історію.
+        """
+        close = np.asarray(close, dtype=float)
+        supports, resistances = np.full(len(close), np.nan), np.full(len(close), np.nan)
+        pivots = self._pivots(close)
+        for t in range(max(0, self.analyzer.MIN_CANDLES - 1), len(close)):
+            levels = self._support_resistance(close, t, *pivots)
+            supports[t] = levels['nearest_support'] or np.nan
+            resistances[t] = levels['nearest_resistance'] or np.nan
+        return supports, resistances
+
+    def _pivots(self, close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return find_pivots(close, self.SR_WINDOW, 'min'), find_pivots(close, self.SR_WINDOW, 'max')
+
+    def _support_resistance(self, close: np.ndarray, t: int, support_idx: np.ndarray,
+                            resistance_idx: np.ndarray) -> Dict:
+        """
+        Рівні для свічки t без перерахунку екстремумів: екстремум вікна
+        [start, t] - це глобальний екстремум з індексом у [start + r, t - r]
+        """
+        start = 0 if self.lookback is None else max(0, t + 1 - self.lookback)
+        low, high = start + self.SR_WINDOW, t - self.SR_WINDOW
+
+        def levels(indices):
+            return close[indices[np.searchsorted(indices, low):np.searchsorted(indices, high, side='right')]]
+
+        return self.analyzer._build_support_resistance(
+            close[start:t + 1], levels(support_idx), levels(resistance_idx)
+        )
+
+    # ====== СИМУЛЯЦІЯ ======
+
+    def simulate(self, df: pd.DataFrame, signals: Dict[int, Dict]) -> Dict:
+        """
+        Угоди за сигналами: одна позиція одночасно, лімітний вхід, вихід по
+        TP/SL/часу. Сигнали під час відкритої позиції чи ордера пропускаються.
+        """
+        prices = {column: df[column].values.astype(float) for column in ('open', 'high', 'low', 'close')}
+        trades = []
+        unfilled = skipped = 0
+        free_from = 0
+        for t in sorted(signals):
+            if t < free_from:
+                skipped += 1
+                continue
+            trade = self._simulate_trade(signals[t], prices)
+            if trade is None:
+                unfilled += 1
+                free_from = t + self.entry_window  # ордер не виконано - чекаємо його закінчення
+                continue
+            trades.append(trade)
+            free_from = trade['exit_bar']
+        return {'trades': trades, 'unfilled': unfilled, 'skipped': skipped}
+
+    def _simulate_trade(self, signal: Dict, prices: Dict[str, np.ndarray]) -> Optional[Dict]:
+        open_, high, low, close = prices['open'], prices['high'], prices['low'], prices['close']
+        is_long = signal['direction'] == 'long'
+        entry = signal['entry_points']['optimal_entry']
+        take_profit, stop_loss = signal['take_profit'], signal['stop_loss']
+
+        # Вхід: перша свічка після сигналу, що торкнулась лімітної ціни
+        first, last = signal['bar'] + 1, min(signal['bar'] + 1 + self.entry_window, len(close))
+        touched = low[first:last] <= entry if is_long else high[first:last] >= entry
+        if not touched.any():
+            return None
+        fill_bar = first + int(np.argmax(touched))
+        # геп через ліміт - виконання по open
+        fill = min(entry, open_[fill_bar]) if is_long else max(entry, open_[fill_bar])
+
+        # Вихід: перший бар із досягненням SL/TP (SL має пріоритет у тій самій свічці)
+        end = min(fill_bar + self.max_hold, len(close))
+        window_high, window_low = high[fill_bar:end], low[fill_bar:end]
+        sl_hit = window_low <= stop_loss if is_long else window_high >= stop_loss
+        tp_hit = window_high >= take_profit if is_long else window_low <= take_profit
+        sl_at = int(np.argmax(sl_hit)) if sl_hit.any() else len(sl_hit)
+        tp_at = int(np.argmax(tp_hit)) if tp_hit.any() else len(tp_hit)
+
+        if sl_at == tp_at == len(sl_hit):
+            exit_bar, exit_price, reason = end - 1, close[end - 1], 'time'
+        elif sl_at <= tp_at:
+            exit_bar, exit_price, reason = fill_bar + sl_at, stop_loss, 'stop_loss'
+        else:
+            exit_bar, exit_price, reason = fill_bar + tp_at, take_profit, 'take_profit'
+
+        if reason != 'time':
+            # геп через рівень: виконання по ціні входу (свічка входу) або по open
+            reference = fill if exit_bar == fill_bar else open_[exit_bar]
+            # long: SL - не вище рівня, TP - не нижче; short - навпаки
+            if (reason == 'stop_loss') == is_long:
+                exit_price = min(exit_price, reference)
+            else:
+                exit_price = max(exit_price, reference)
+
+        side = 1 if is_long else -1
+        trade_return = side * (exit_price - fill) / fill - 2 * self.fee
+        return {
+            'signal_bar': signal['bar'],
+            'direction': signal['direction'],
+            'entry_bar': fill_bar,
+            'exit_bar': exit_bar,
+            'entry_price': round(float(fill), 4),
+            'exit_price': round(float(exit_price), 4),
+            'exit_reason': reason,
+            'pnl_pct': float(trade_return * 100),
+            'size_percent': signal['position_size']['size_percent'],
+        }
+
+    # ====== ЗАПУСК ======
+
+    def run(self, df: pd.DataFrame) -> Dict:
+        """Повний прогін: сигнали на кожній свічці, угоди та метрики"""
+        started = time.perf_counter()
+        scores = self.score(df)
+        scored = time.perf_counter()
+        signals = self.generate_signals(df, scores)
+        generated = time.perf_counter()
+        simulation = self.simulate(df, signals)
+        finished = time.perf_counter()
+
+        evaluated = max(0, len(df) - self.analyzer.MIN_CANDLES + 1)
+        report = self.trade_metrics(simulation['trades'])
+        report.update({
+            'bars': len(df),
+            'evaluated_bars': evaluated,
+            'signals': len(signals),
+            'unfilled': simulation['unfilled'],
+            'skipped': simulation['skipped'],
+            'latency_per_bar_ms': (finished - started) * 1000 / max(evaluated, 1),
+            'timings_ms': {
+                'scoring': round((scored - started) * 1000, 2),
+                'signals': round((generated - scored) * 1000, 2),
+                'simulation': round((finished - generated) * 1000, 2),
+            },
+            'trade_log': simulation['trades'],
+        })
+        return report
+
+    def trade_metrics(self, trades: List[Dict]) -> Dict:
+        """Win rate, PnL, капітал і просідання за списком угод"""
+        returns = np.array([trade['pnl_pct'] for trade in trades]) / 100
+        sizes = np.array([trade['size_percent'] for trade in trades]) / 100
+
+        # Капітал: кожна угода змінює його на розмір позиції × дохідність
+        equity = np.cumprod(np.r_[1.0, 1 + sizes * returns])
+        drawdown = 1 - equity / np.maximum.accumulate(equity)
+        wins = int((returns > 0).sum())
+
+        return {
+            'trades': len(trades),
+            'wins': wins,
+            'losses': len(trades) - wins,
+            'win_rate': round(wins / len(trades), 3) if trades else 0.0,
+            'total_pnl_pct': round(float(returns.sum() * 100), 2),
+            'avg_pnl_pct': round(float(returns.mean() * 100), 3) if trades else 0.0,
+            'equity': round(float(equity[-1]), 6),
+            'return_pct': round(float((equity[-1] - 1) * 100), 3),
+            'max_drawdown_pct': round(float(drawdown.max() * 100), 3),
+            'avg_hold_bars': round(float(np.mean([t['exit_bar'] - t['entry_bar'] for t in trades])), 1) if trades else 0.0,
+        }
@@ -0,0 +1,126 @@
+# backend/app/futures/models/batch_indicators.py
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .indicator_plan import bands_from_std, macd_from_emas, typical_price
+from .kernels import rolling_mad, rolling_max, rolling_mean, rolling_min, rolling_std
+
+# Усі функції рахують уздовж останньої осі, тому однаково працюють
+# для 1-D ряду і для матриці (символи × свічки). Перші period-1 значень
+# заповнюються NaN - так само, як pandas rolling у services/ai_analyzer.
+
+
+# Ключі, які рахує compute_batch
+BATCH_INDICATORS = (
+    'sma_20', 'sma_50', 'sma_200', 'ema_12', 'ema_26', 'rsi',
+    'macd', 'macd_signal', 'macd_histogram', 'bb_upper', 'bb_middle', 'bb_lower',
+    'atr', 'williams_r', 'cci',
+)
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    """EMA як pandas ewm(span=period, adjust=False): старт з першого значення"""
+    values = np.asarray(values, dtype=float)
+    out = np.empty(values.shape)
+    if values.shape[-1] == 0:
+        return out
+    alpha = 2.0 / (period + 1)
+    # Цикл лише по свічках - кожен крок векторний по всіх символах
+    out[..., 0] = values[..., 0]
+    for i in range(1, values.shape[-1]):
+        out[..., i] = alpha * values[..., i] + (1 - alpha) * out[..., i - 1]
+    return out
+
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """RSI на простих середніх приростів/втрат (як services AIAnalyzer)"""
+    close = np.asarray(close, dtype=float)
+    delta = np.zeros(close.shape)
+    delta[..., 1:] = np.diff(close, axis=-1)
+    gain = rolling_mean(np.where(delta > 0, delta, 0.0), period)
+    loss = rolling_mean(np.where(delta < 0, -delta, 0.0), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + gain / loss))
+
+
+def macd(close: np.ndarray, fast: int = 12, slow: int = 26,
+         signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return macd_from_emas(ema(close, fast), ema(close, slow), lambda line: ema(line, signal))
+
+
+def bollinger_bands(close: np.ndarray, period: int = 20,
+                    std_dev: float = 2) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return bands_from_std(rolling_mean(close, period), rolling_std(close, period), std_dev)
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """ATR по TR без першої свічки (довжина n-1, як у services AIAnalyzer)"""
+    high, low, close = (np.asarray(a, dtype=float) for a in (high, low, close))
+    high_low = high[..., 1:] - low[..., 1:]
+    high_close = np.abs(high[..., 1:] - close[..., :-1])
+    low_close = np.abs(low[..., 1:] - close[..., :-1])
+    return rolling_mean(np.maximum(high_low, np.maximum(high_close, low_close)), period)
+
+
+def williams_r(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    highest_high = rolling_max(high, period)
+    lowest_low = rolling_min(low, period)
+    return -100 * (highest_high - close) / (highest_high - lowest_low + 0.000001)
+
+
+def cci(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 20) -> np.ndarray:
+    return cci_from_typical(typical_price(np.asarray(high, dtype=float), low, close), period)
+
+
+def cci_from_typical(typical: np.ndarray, period: int = 20) -> np.ndarray:
+    sma = rolling_mean(typical, period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (typical - sma) / (0.015 * rolling_mad(typical, period))
+
+
+def compute_batch(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Dict[str, np.ndarray]:
+    """Базовий набір індикаторів для матриці (символи × свічки) за один прохід"""
+    close = np.asarray(close, dtype=float)
+    # Спільні проміжні величини: EMA для MACD, SMA20 для середньої лінії Bollinger
+    sma_20 = rolling_mean(close, 20)
+    ema_12 = ema(close, 12)
+    ema_26 = ema(close, 26)
+    macd_line, macd_signal, macd_histogram = macd_from_emas(ema_12, ema_26, lambda line: ema(line, 9))
+    bb_upper, bb_middle, bb_lower = bands_from_std(sma_20, rolling_std(close, 20), 2)
+    return {
+        'sma_20': sma_20,
+        'sma_50': rolling_mean(close, 50),
+        'sma_200': rolling_mean(close, 200),
+        'ema_12': ema_12,
+        'ema_26': ema_26,
+        'rsi': rsi(close, 14),
+        'macd': macd_line,
+        'macd_signal': macd_signal,
+        'macd_histogram': macd_histogram,
+        'bb_upper': bb_upper,
+        'bb_middle': bb_middle,
+        'bb_lower': bb_lower,
+        'atr': atr(high, low, close, 14),
+        'williams_r': williams_r(high, low, close, 14),
+        'cci': cci(high, low, close, 20),
+    }
+
+
+def stack_frames(frames: Dict[str, pd.DataFrame],
+                 columns=('high', 'low', 'close')) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """
+    Збирає OHLCV кількох символів у матриці однакової ширини.
+    Довші історії обрізаються до найкоротшої (беруться останні свічки).
+    """
+    symbols = list(frames)
+    if not symbols:
+        return [], {column: np.empty((0, 0)) for column in columns}
+    length = min(len(frames[symbol]) for symbol in symbols)
+    matrices = {
+        column: np.vstack([frames[symbol][column].values[len(frames[symbol]) - length:]
+                           for symbol in symbols]).astype(float)
+        for column in columns
+    }
+    return symbols, matrices
@@ -0,0 +1,112 @@
+# backend/app/futures/models/compact_bundle.py
+from collections.abc import Mapping
+from typing import Any, Dict
+
+import numpy as np
+
+# Компактне зберігання набору індикаторів у кеші: ціни та індикатори -
+# float32, свічні паттерни (-100/0/100) - int8, усе в одному суцільному
+# буфері (struct-of-arrays) замість словника окремих float64-масивів.
+# Читання розширює колонку до float64/int32, тож аналіз сигналу працює як
+# зі звичайним dict; відносна похибка значень - точність float32 (~6e-8).
+
+FLOAT_DTYPE = np.dtype(np.float32)
+PATTERN_DTYPE = np.dtype(np.int8)
+
+
+def bundle_nbytes(indicators: Mapping) -> int:
+    """Пам'ять масивів набору індикаторів (dict або CompactBundle)"""
+    if isinstance(indicators, CompactBundle):
+        return indicators.nbytes
+    return sum(value.nbytes for value in indicators.values() if isinstance(value, np.ndarray))
+
+
+class CompactBundle(Mapping):
+    """
+    Набір індикаторів в одному буфері. Колонки з цілими значеннями в межах
+    int8 (CDL-паттерни) зберігаються як int8, решта масивів - float32;
+    не-масиви (скаляри) - окремо без змін. raw(key) - view без копії.
+    """
+    __slots__ = ('_buffer', '_layout', '_extras', '_views', 'length')
+
+    def __init__(self, indicators: Mapping[str, Any]):
+        arrays = {key: value for key, value in indicators.items()
+                  if isinstance(value, np.ndarray) and value.ndim == 1}
+        self._extras = {key: value for key, value in indicators.items() if key not in arrays}
+        self.length = len(next(iter(arrays.values()))) if arrays else 0
+        if any(len(values) != self.length for values in arrays.values()):
+            raise ValueError("Колонки компактного набору мають різну довжину")
+
+        # Спочатку float32-колонки (вирівнювання 4 байти), потім int8
+        patterns = [key for key, values in arrays.items() if self._fits_pattern(values)]
+        floats = [key for key in arrays if key not in patterns]
+        self._layout: Dict[str, tuple] = {}
+        offset = 0
+        for keys, dtype in ((floats, FLOAT_DTYPE), (patterns, PATTERN_DTYPE)):
+            for key in keys:
+                self._layout[key] = (offset, dtype)
+                offset += self.length * dtype.itemsize
+
+        self._buffer = np.empty(offset, dtype=np.uint8)
+        self._views = {}
+        for key, values in arrays.items():
+            self._column(key)[:] = values
+        self._freeze()
+
+    @staticmethod
+    def _fits_pattern(values: np.ndarray) -> bool:
+        if values.dtype.kind not in 'iu':
+            return False
+        return len(values) == 0 or (values.min() >= np.iinfo(PATTERN_DTYPE).min and
+                                    values.max() <= np.iinfo(PATTERN_DTYPE).max)
+
+    def _column(self, key: str) -> np.ndarray:
+        offset, dtype = self._layout[key]
+        return self._buffer[offset:offset + self.length * dtype.itemsize].view(dtype)
+
+    def _freeze(self):
+        self._buffer.flags.writeable = False
+        self._views = {key: self._column(key) for key in self._layout}
+
+    # ====== ДОСТУП ======
+
+    def raw(self, key: str) -> np.ndarray:
+        """Колонка у форматі зберігання (float32/int8), read-only view на буфер"""
+        return self._views[key]
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._views:
+            values = self._views[key]
+            return values.astype(np.int32 if values.dtype == PATTERN_DTYPE else float)
+        return self._extras[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._layout or key in self._extras
+
+    def __iter__(self):
+        return iter(list(self._layout) + list(self._extras))
+
+    def __len__(self) -> int:
+        return len(self._layout) + len(self._extras)
+
+    @property
+    def nbytes(self) -> int:
+        return self._buffer.nbytes
+
+    def dtypes(self) -> Dict[str, np.dtype]:
+        return {key: dtype for key, (_, dtype) in self._layout.items()}
+
+    # ====== СЕРІАЛІЗАЦІЯ (Redis) ======
+
+    def __reduce__(self):
+        return (_restore_bundle, (self._buffer.tobytes(), self._layout, self._extras, self.length))
+
+
+def _restore_bundle(data: bytes, layout: Dict[str, tuple], extras: Dict[str, Any],
+                    length: int) -> CompactBundle:
+    bundle = CompactBundle.__new__(CompactBundle)
+    bundle._buffer = np.frombuffer(data, dtype=np.uint8).copy()
+    bundle._layout, bundle._extras, bundle.length = layout, extras, length
+    bundle._freeze()
+    return bundle
+
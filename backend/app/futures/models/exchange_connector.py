@@ -4,11 +4,31 @@ import pandas as pd
 from typing import Dict, List, Optional
 import os
 from dotenv import load_dotenv
+from app.core.candle_store import candle_store
+from app.core.market_cache import market_cache
+from app.core.rate_limiter import rate_limiter
+from .resampler import OHLCVResampler, sort_timeframes, timeframe_ms
 
 # 1️⃣ ВИКЛИК load_dotenv() ДЛЯ ЗАВАНТАЖЕННЯ КЛЮЧІВ З .env
 load_dotenv()
 
+
+def futures_symbol(symbol: str) -> str:
+    """Символ безстрокового ф'ючерса у форматі ccxt (BTC/USDT -> BTC/USDT:USDT)"""
+    return symbol if symbol.endswith(':USDT') else f"{symbol}:USDT"
+
+
+def ohlcv_frame(ohlcv) -> pd.DataFrame:
+    """Рядки ccxt [[timestamp, open, high, low, close, volume], ...] -> DataFrame"""
+    df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    return df
+
+
 class ExchangeConnector:
+    # Максимум свічок базового таймфрейму за один запит (ліміт Binance futures)
+    MAX_BASE_LIMIT = 1500
+    
     def __init__(self, exchange_id: str = 'binance'):
         # 2️⃣ Зчитуємо ключі
         api_key = os.getenv('EXCHANGE_API_KEY')
@@ -29,19 +49,73 @@ class ExchangeConnector:
             }
         })
         
+        # Спільний ліміт запитів для всіх екземплярів біржі (і процесів - через Redis)
+        rate_limiter.attach_ccxt(self.exchange)
+        
         print(f"✅ Підключено до {exchange_id}. Ключ: {'Так' if api_key else 'Ні'}")
+        
+        # Інкрементальна агрегація старших таймфреймів: (symbol, base, timeframes) -> resampler
+        self._resamplers: Dict[tuple, OHLCVResampler] = {}
+        
+        # Локальне сховище свічок (CANDLE_STORE_DIR): з біржі докачуються лише нові
+        self.candle_store = candle_store
+    
+    def fetch_ohlcv(self, symbol: str, timeframe: str = '1h', limit: int = 100,
+                    use_cache: bool = True) -> pd.DataFrame:
+        """Отримання історичних даних (у межах однієї свічки - з процесного кешу)"""
+        # 5️⃣ Виправлення: ccxt може вимагати правильний формат символу
+        symbol = futures_symbol(symbol)
+        
+        if not use_cache:
+            return self._fetch_ohlcv(symbol, timeframe, limit)
+        return market_cache.get_ohlcv(symbol, timeframe, limit,
+                                      lambda: self._fetch_ohlcv(symbol, timeframe, limit))
+    
+    def fetch_ohlcv_multi(self, symbol: str, timeframes: List[str], limit: int = 500,
+                          base_timeframe: Optional[str] = None,
+                          min_candles: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Свічки кількох таймфреймів за мінімум запитів: завантажується
+        найдрібніший (або base_timeframe), старші агрегуються локально.
+        Таймфрейм, для якого MAX_BASE_LIMIT базових свічок дає менше за
+        min_candles (за замовчуванням limit) його свічок, - окремим запитом.
+        """
+        timeframes = sort_timeframes(timeframes)
+        base = base_timeframe or timeframes[0]
+        min_candles = min_candles or limit
+        
+        # напр. 1d з 1h: 1500 годин - лише 62 доби, тож денні свічки беремо з біржі
+        resampled = [tf for tf in timeframes
+                     if tf == base or self.MAX_BASE_LIMIT * timeframe_ms(base) // timeframe_ms(tf) >= min_candles]
+        native = [tf for tf in timeframes if tf not in resampled]
+        if base not in resampled:
+            resampled.insert(0, base)
+        
+        ratio = timeframe_ms(resampled[-1]) // timeframe_ms(base)
+        base_limit = min(self.MAX_BASE_LIMIT, max(limit, limit * ratio))
+        base_df = self.fetch_ohlcv(symbol, base, base_limit)
+        key = (symbol, base, tuple(resampled))
+        if key not in self._resamplers:
+            self._resamplers[key] = OHLCVResampler(base, resampled)
+        frames = self._resamplers[key].update(base_df)
+        for tf in native:
+            frames[tf] = self.fetch_ohlcv(symbol, tf, limit)
+        
+        return {tf: frames[tf].tail(limit).reset_index(drop=True) for tf in timeframes}
     
-    def fetch_ohlcv(self, symbol: str, timeframe: str = '1h', limit: int = 100) -> pd.DataFrame:
-        """Отримання історичних даних"""
+    def _fetch_ohlcv(self, symbol: str, timeframe: str, limit: int) -> pd.DataFrame:
+        """Запит свічок на біржу без кешу (зі сховищем - лише відсутні свічки)"""
+        if self.candle_store is not None:
+            try:
+                return self.candle_store.frame(
+                    symbol, timeframe, limit,
+                    lambda since, count: self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=count)
+                )
+            except Exception as e:
+                print(f"❌ Помилка сховища свічок {symbol}: {e}")
+                return pd.DataFrame()
         try:
-            # 5️⃣ Виправлення: ccxt може вимагати правильний формат символу
-            if not symbol.endswith(':USDT'):
-                symbol = f"{symbol}:USDT"
-                
-            ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            return df
+            return ohlcv_frame(self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit))
         except Exception as e:
             print(f"❌ Помилка отримання даних {symbol}: {e}")
             return pd.DataFrame()
@@ -54,6 +128,35 @@ class ExchangeConnector:
             print(f"❌ Помилка ticker {symbol}: {e}")
             return None
     
+    def fetch_tickers(self, symbols: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """Тікери одним запитом; ключі - символи в тому вигляді, як їх передано"""
+        try:
+            tickers = self.exchange.fetch_tickers()
+        except Exception as e:
+            print(f"❌ Помилка тікерів: {e}")
+            return {}
+        if symbols is None:
+            return tickers
+        result = {}
+        for symbol in symbols:
+            ticker = tickers.get(symbol) or tickers.get(f"{symbol}:USDT")
+            if ticker:
+                result[symbol] = ticker
+        return result
+    
+    def fetch_futures_symbols(self, settle: str = 'USDT') -> List[str]:
+        """Активні безстрокові ф'ючерси з розрахунком у settle (формат ccxt: BTC/USDT:USDT)"""
+        try:
+            markets = self.exchange.load_markets()
+        except Exception as e:
+            print(f"❌ Помилка завантаження ринків: {e}")
+            return []
+        return sorted(
+            symbol for symbol, market in markets.items()
+            if market.get('swap') and market.get('linear') and market.get('settle') == settle
+            and market.get('active', True) is not False
+        )
+    
     def fetch_funding_rate(self, symbol: str) -> Optional[Dict]:
         """Отримання фандинг рейту для ф'ючерсів"""
         try:
@@ -0,0 +1,693 @@
+# backend/app/futures/models/indicator_engine.py
+import copy
+import logging
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import talib
+
+from .indicator_plan import stoch_fast_k, stochastic_from_fast_k, williams_r_from_extrema
+from .rolling_extrema import Extrema, RollingExtrema, channel_midpoint, rolling_extrema
+
+# Поріг нуля як у TA-Lib (TA_IS_ZERO)
+_TA_EPSILON = 1e-14
+
+# Вікна ковзних екстремумів: STOCH, Tenkan, Williams %R, Kijun, Senkou B
+CHANNEL_WINDOWS = (5, 9, 14, 26, 52)
+
+
+def _is_zero(value: float) -> bool:
+    return -_TA_EPSILON < value < _TA_EPSILON
+
+
+# ====== РЕКУРСИВНІ СТАНИ (O(1) на свічку) ======
+# Кожен стан повторює алгоритм TA-Lib крок за кроком, тому після
+# прогону тієї ж історії значення збігаються з batch-розрахунком.
+
+class _EMAState:
+    """EMA з ініціалізацією через SMA, як у TA-Lib"""
+    __slots__ = ('period', 'k', 'skip', 'count', 'seed_sum', 'value')
+
+    def __init__(self, period: int, skip: int = 0):
+        self.period = period
+        self.k = 2.0 / (period + 1)
+        self.skip = skip  # скільки перших значень ігнорувати (вирівнювання MACD)
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value = np.nan
+
+    def update(self, x: float) -> float:
+        self.count += 1
+        if self.count <= self.skip:
+            return np.nan
+        n = self.count - self.skip
+        if n < self.period:
+            self.seed_sum += x
+            return np.nan
+        if n == self.period:
+            self.seed_sum += x
+            self.value = self.seed_sum / self.period
+        else:
+            self.value = ((x - self.value) * self.k) + self.value
+        return self.value
+
+
+class _RSIState:
+    """RSI Вайлдера (TA_RSI)"""
+    __slots__ = ('period', 'count', 'prev', 'gain', 'loss')
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.count = 0
+        self.prev = np.nan
+        self.gain = 0.0
+        self.loss = 0.0
+
+    def update(self, x: float) -> float:
+        self.count += 1
+        if self.count == 1:
+            self.prev = x
+            return np.nan
+        diff = x - self.prev
+        self.prev = x
+        n = self.count - 1
+        if n < self.period:
+            if diff < 0:
+                self.loss -= diff
+            else:
+                self.gain += diff
+            return np.nan
+        if n == self.period:
+            if diff < 0:
+                self.loss -= diff
+            else:
+                self.gain += diff
+            self.loss /= self.period
+            self.gain /= self.period
+        else:
+            self.loss *= (self.period - 1)
+            self.gain *= (self.period - 1)
+            if diff < 0:
+                self.loss -= diff
+            else:
+                self.gain += diff
+            self.loss /= self.period
+            self.gain /= self.period
+        total = self.gain + self.loss
+        return 100.0 * (self.gain / total) if not _is_zero(total) else 0.0
+
+
+def _true_range(high: float, low: float, prev_close: float) -> float:
+    greatest = high - low
+    val2 = abs(prev_close - high)
+    if val2 > greatest:
+        greatest = val2
+    val3 = abs(prev_close - low)
+    if val3 > greatest:
+        greatest = val3
+    return greatest
+
+
+class _ATRState:
+    """ATR Вайлдера (TA_ATR / TA_NATR)"""
+    __slots__ = ('period', 'count', 'prev_close', 'tr_sum', 'value')
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.count = 0
+        self.prev_close = np.nan
+        self.tr_sum = 0.0
+        self.value = np.nan
+
+    def update(self, high: float, low: float, close: float) -> float:
+        self.count += 1
+        if self.count == 1:
+            self.prev_close = close
+            return np.nan
+        tr = _true_range(high, low, self.prev_close)
+        self.prev_close = close
+        n = self.count - 1
+        if n < self.period:
+            self.tr_sum += tr
+            return np.nan
+        if n == self.period:
+            self.tr_sum += tr
+            self.value = self.tr_sum / self.period
+        else:
+            self.value *= self.period - 1
+            self.value += tr
+            self.value /= self.period
+        return self.value
+
+
+class _DMState:
+    """+DI / -DI / ADX Вайлдера (TA_PLUS_DI, TA_MINUS_DI, TA_ADX)"""
+    __slots__ = ('period', 'count', 'prev_high', 'prev_low', 'prev_close',
+                 'plus_dm', 'minus_dm', 'tr', 'dx_sum', 'adx')
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.count = 0
+        self.prev_high = np.nan
+        self.prev_low = np.nan
+        self.prev_close = np.nan
+        self.plus_dm = 0.0
+        self.minus_dm = 0.0
+        self.tr = 0.0
+        self.dx_sum = 0.0
+        self.adx = np.nan
+
+    def update(self, high: float, low: float, close: float) -> Tuple[float, float, float]:
+        """Повертає (plus_di, minus_di, adx)"""
+        self.count += 1
+        if self.count == 1:
+            self.prev_high, self.prev_low, self.prev_close = high, low, close
+            return np.nan, np.nan, np.nan
+
+        diff_p = high - self.prev_high
+        diff_m = self.prev_low - low
+        self.prev_high = high
+        self.prev_low = low
+        tr = _true_range(high, low, self.prev_close)
+        self.prev_close = close
+        n = self.count - 1
+        period = self.period
+
+        if n < period:
+            # Початкове накопичення (period-1 значень)
+            if diff_m > 0 and diff_p < diff_m:
+                self.minus_dm += diff_m
+            elif diff_p > 0 and diff_p > diff_m:
+                self.plus_dm += diff_p
+            self.tr += tr
+            return np.nan, np.nan, np.nan
+
+        self.minus_dm -= self.minus_dm / period
+        self.plus_dm -= self.plus_dm / period
+        if diff_m > 0 and diff_p < diff_m:
+            self.minus_dm += diff_m
+        elif diff_p > 0 and diff_p > diff_m:
+            self.plus_dm += diff_p
+        self.tr = self.tr - (self.tr / period) + tr
+
+        if _is_zero(self.tr):
+            plus_di = minus_di = 0.0
+            dx = None
+        else:
+            plus_di = 100.0 * (self.plus_dm / self.tr)
+            minus_di = 100.0 * (self.minus_dm / self.tr)
+            di_sum = minus_di + plus_di
+            dx = 100.0 * (abs(minus_di - plus_di) / di_sum) if not _is_zero(di_sum) else 0.0
+
+        # ADX: перші period значень DX усереднюються, далі згладжування Вайлдера
+        dx_index = n - period + 1
+        if dx_index < period:
+            if dx is not None and not _is_zero(plus_di + minus_di):
+                self.dx_sum += dx
+            return plus_di, minus_di, np.nan
+        if dx_index == period:
+            if dx is not None and not _is_zero(plus_di + minus_di):
+                self.dx_sum += dx
+            self.adx = self.dx_sum / period
+        elif dx is not None:
+            self.adx = ((self.adx * (period - 1)) + dx) / period
+        return plus_di, minus_di, self.adx
+
+
+class _MACDState:
+    """MACD(12, 26, 9) з вирівнюванням EMA як у TA_MACD"""
+    __slots__ = ('fast', 'slow', 'signal')
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = _EMAState(fast, skip=slow - fast)
+        self.slow = _EMAState(slow)
+        self.signal = _EMAState(signal)
+
+    def __copy__(self):
+        clone = _MACDState.__new__(_MACDState)
+        clone.fast = copy.copy(self.fast)
+        clone.slow = copy.copy(self.slow)
+        clone.signal = copy.copy(self.signal)
+        return clone
+
+    def update(self, x: float) -> Tuple[float, float, float]:
+        fast = self.fast.update(x)
+        slow = self.slow.update(x)
+        if np.isnan(slow):
+            return np.nan, np.nan, np.nan
+        macd = fast - slow
+        signal = self.signal.update(macd)
+        if np.isnan(signal):
+            return np.nan, np.nan, np.nan
+        return macd, signal, macd - signal
+
+
+class _OBVState:
+    """On-Balance Volume (TA_OBV)"""
+    __slots__ = ('prev_close', 'value')
+
+    def __init__(self):
+        self.prev_close = None
+        self.value = 0.0
+
+    def update(self, close: float, volume: float) -> float:
+        if self.prev_close is None:
+            self.value = volume
+        elif close > self.prev_close:
+            self.value += volume
+        elif close < self.prev_close:
+            self.value -= volume
+        self.prev_close = close
+        return self.value
+
+
+class _ADState:
+    """Accumulation/Distribution (TA_AD)"""
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def update(self, high: float, low: float, close: float, volume: float) -> float:
+        spread = high - low
+        if spread > 0.0:
+            self.value += (((close - low) - (high - close)) / spread) * volume
+        return self.value
+
+
+class _ChannelState:
+    """Ковзні екстремуми CHANNEL_WINDOWS та згладжування Slow Stochastic (3/3)"""
+    __slots__ = ('extrema', 'fast_k', 'slow_k')
+
+    def __init__(self):
+        self.extrema = RollingExtrema(CHANNEL_WINDOWS)
+        self.fast_k = deque(maxlen=3)
+        self.slow_k = deque(maxlen=3)
+
+    def __copy__(self):
+        state = _ChannelState.__new__(_ChannelState)
+        state.extrema = copy.copy(self.extrema)
+        state.fast_k, state.slow_k = deque(self.fast_k, maxlen=3), deque(self.slow_k, maxlen=3)
+        return state
+
+    @staticmethod
+    def _mean(values: deque) -> float:
+        return sum(values) / values.maxlen if len(values) == values.maxlen else np.nan
+
+    def update(self, high: float, low: float, close: float) -> Dict[str, float]:
+        extrema = {window: (np.float64(highest), np.float64(lowest))
+                   for window, (highest, lowest) in self.extrema.update(high, low).items()}
+        self.fast_k.append(float(stoch_fast_k(*extrema[5], close)))
+        stoch_k = self._mean(self.fast_k)
+        self.slow_k.append(stoch_k)
+        stoch_d = self._mean(self.slow_k)
+
+        values = {key: float(value) for key, value in _channel_indicators(extrema, close).items()}
+        values['stoch_k'] = np.nan if np.isnan(stoch_d) else stoch_k
+        values['stoch_d'] = stoch_d
+        return values
+
+
+# ====== ВІКОННІ ІНДИКАТОРИ ======
+# Канальні (Ішимоку, Williams %R, STOCH) оновлюються через _ChannelState,
+# решта залежить лише від скінченного хвоста історії, тому при оновленні
+# рахується тими ж функціями на хвості TAIL_WINDOW свічок.
+
+def _channel_indicators(extrema: Extrema, close) -> Dict:
+    """Індикатори з ковзних екстремумів (масиви для batch, скаляри для оновлення)"""
+    tenkan_sen = channel_midpoint(extrema, 9)
+    kijun_sen = channel_midpoint(extrema, 26)
+    return {
+        'williams_r': williams_r_from_extrema(*extrema[14], close),
+        'tenkan_sen': tenkan_sen,
+        'kijun_sen': kijun_sen,
+        'senkou_span_a': (tenkan_sen + kijun_sen) / 2,
+        'senkou_span_b': channel_midpoint(extrema, 52),
+    }
+
+
+def _volume_sma(volume: np.ndarray, last_only: bool = False) -> np.ndarray:
+    if last_only:
+        return np.array([np.mean(volume[-20:]) if len(volume) >= 20 else np.nan])
+    return pd.Series(volume).rolling(20).mean().values
+
+
+def _window_indicators(o: np.ndarray, h: np.ndarray, l: np.ndarray, c: np.ndarray,
+                       v: np.ndarray, rsi: np.ndarray, last_only: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Індикатори зі скінченним вікном (ті самі виклики, що й у calculate_indicators),
+    крім канальних. last_only=True - для оновлення: достатньо коректного
+    останнього значення.
+    """
+    stoch_rsi_k, stoch_rsi_d = talib.STOCHF(rsi, rsi, rsi, fastk_period=5, fastd_period=3)
+    bb_upper, bb_middle, bb_lower = talib.BBANDS(c, timeperiod=20, nbdevup=2, nbdevdn=2)
+
+    return {
+        'sma_20': talib.SMA(c, timeperiod=20),
+        'sma_50': talib.SMA(c, timeperiod=50),
+        'stoch_rsi_k': stoch_rsi_k, 'stoch_rsi_d': stoch_rsi_d,
+        'bb_upper': bb_upper, 'bb_middle': bb_middle, 'bb_lower': bb_lower,
+        'volume_sma': _volume_sma(v, last_only),
+        'mfi': talib.MFI(h, l, c, v, timeperiod=14),
+        'cci': talib.CCI(h, l, c, timeperiod=20),
+        'ultosc': talib.ULTOSC(h, l, c),
+        'doji': talib.CDLDOJI(o, h, l, c),
+        'hammer': talib.CDLHAMMER(o, h, l, c),
+        'engulfing': talib.CDLENGULFING(o, h, l, c),
+        'morning_star': talib.CDLMORNINGSTAR(o, h, l, c),
+        'evening_star': talib.CDLEVENINGSTAR(o, h, l, c),
+        'harami': talib.CDLHARAMI(o, h, l, c),
+    }
+
+
+_RECURSIVE_KEYS = (
+    'ema_8', 'ema_20', 'ema_50', 'ema_100', 'ema_200',
+    'adx', 'plus_di', 'minus_di', 'rsi',
+    'macd', 'macd_signal', 'macd_hist',
+    'atr', 'natr', 'obv', 'ad',
+)
+_RAW_KEYS = ('open', 'high', 'low', 'close', 'volume')
+_EMA_PERIODS = (8, 20, 50, 100, 200)
+
+
+class _SeriesBuffer:
+    """Масив, що росте з амортизованим O(1) додаванням"""
+    __slots__ = ('data', 'size')
+
+    def __init__(self, capacity: int = 1024):
+        self.data = np.empty(capacity, dtype=float)
+        self.size = 0
+
+    def append(self, value: float):
+        if self.size == len(self.data):
+            grown = np.empty(len(self.data) * 2, dtype=float)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+        self.data[self.size] = value
+        self.size += 1
+
+    def extend(self, values: np.ndarray):
+        needed = self.size + len(values)
+        if needed > len(self.data):
+            grown = np.empty(max(needed, len(self.data) * 2), dtype=float)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+        self.data[self.size:needed] = values
+        self.size = needed
+
+    def pop(self):
+        self.size -= 1
+
+    def drop_head(self, count: int):
+        self.data[:self.size - count] = self.data[count:self.size]
+        self.size -= count
+
+    def view(self, length: Optional[int] = None) -> np.ndarray:
+        if length is None or length >= self.size:
+            return self.data[:self.size]
+        return self.data[self.size - length:self.size]
+
+
+def _timestamps(df: pd.DataFrame) -> Optional[np.ndarray]:
+    """Мітки часу свічок (int64) з колонки timestamp або DatetimeIndex"""
+    if 'timestamp' in df.columns:
+        ts = df['timestamp']
+        if np.issubdtype(ts.dtype, np.datetime64):
+            return ts.values.astype('datetime64[ns]').astype(np.int64)
+        return ts.values.astype(np.int64)
+    if isinstance(df.index, pd.DatetimeIndex):
+        return df.index.values.astype('datetime64[ns]').astype(np.int64)
+    return None
+
+
+class StreamingIndicatorEngine:
+    """
+    Інкрементальний розрахунок індикаторів для однієї пари (symbol, timeframe).
+
+    Рекурсивні індикатори (EMA, RSI, ATR, ADX, MACD, OBV, AD) зберігають стан
+    і оновлюються за O(1) на нову свічку. Віконні індикатори рахуються на
+    короткому хвості історії. Незакрита остання свічка, яка змінюється між
+    опитуваннями, замінюється через відкат до контрольної точки стану.
+    """
+
+    TAIL_WINDOW = 64  # достатньо для найдовшого хвостового вікна (SMA 50, ULTOSC 28)
+
+    def __init__(self, symbol: str, timeframe: str = '1h', max_history: int = 5000,
+                 parity: bool = False, parity_rtol: float = 1e-9,
+                 reference_fn: Optional[Callable[[pd.DataFrame], Dict]] = None):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.max_history = max_history
+        self.parity = parity
+        self.parity_rtol = parity_rtol
+        self.reference_fn = reference_fn
+        self.last_parity_report: Optional[Dict] = None
+        self.logger = logging.getLogger(__name__)
+        self.reset()
+
+    def reset(self):
+        """Скидання всього стану"""
+        self._raw = {key: _SeriesBuffer() for key in _RAW_KEYS}
+        self._series = {key: _SeriesBuffer() for key in _RECURSIVE_KEYS}
+        self._window_series: Dict[str, _SeriesBuffer] = {}
+        self._states = self._new_states()
+        self._checkpoint = None
+        self._last_ts = None
+        self.updates = 0
+        self.bootstraps = 0
+
+    @staticmethod
+    def _new_states() -> Dict:
+        states = {f'ema_{p}': _EMAState(p) for p in _EMA_PERIODS}
+        states.update({
+            'rsi': _RSIState(14),
+            'atr': _ATRState(14),
+            'dm': _DMState(14),
+            'macd': _MACDState(),
+            'obv': _OBVState(),
+            'ad': _ADState(),
+            'channel': _ChannelState(),
+        })
+        return states
+
+    @property
+    def length(self) -> int:
+        return self._raw['close'].size
+
+    # ====== ОНОВЛЕННЯ ======
+
+    def _apply_recursive(self, o: float, h: float, l: float, c: float, v: float) -> Dict[str, float]:
+        """Крок усіх станів; повертає канальні індикатори свічки"""
+        states = self._states
+        series = self._series
+        for p in _EMA_PERIODS:
+            series[f'ema_{p}'].append(states[f'ema_{p}'].update(c))
+        plus_di, minus_di, adx = states['dm'].update(h, l, c)
+        series['plus_di'].append(plus_di)
+        series['minus_di'].append(minus_di)
+        series['adx'].append(adx)
+        series['rsi'].append(states['rsi'].update(c))
+        macd, macd_signal, macd_hist = states['macd'].update(c)
+        series['macd'].append(macd)
+        series['macd_signal'].append(macd_signal)
+        series['macd_hist'].append(macd_hist)
+        atr = states['atr'].update(h, l, c)
+        series['atr'].append(atr)
+        series['natr'].append((atr / c) * 100.0 if not _is_zero(c) else 0.0)
+        series['obv'].append(states['obv'].update(c, v))
+        series['ad'].append(states['ad'].update(h, l, c, v))
+        return states['channel'].update(h, l, c)
+
+    def update(self, o: float, h: float, l: float, c: float, v: float,
+               timestamp: Optional[int] = None):
+        """Додавання однієї закритої (або нової) свічки за O(1)"""
+        self._checkpoint = {name: copy.copy(state) for name, state in self._states.items()}
+        for key, value in zip(_RAW_KEYS, (o, h, l, c, v)):
+            self._raw[key].append(float(value))
+        channel = self._apply_recursive(float(o), float(h), float(l), float(c), float(v))
+
+        tail = {key: self._raw[key].view(self.TAIL_WINDOW) for key in _RAW_KEYS}
+        rsi_tail = self._series['rsi'].view(self.TAIL_WINDOW)
+        window = _window_indicators(tail['open'], tail['high'], tail['low'],
+                                    tail['close'], tail['volume'], rsi_tail, last_only=True)
+        for key, values in window.items():
+            self._window_series.setdefault(key, _SeriesBuffer()).append(values[-1])
+        for key, value in channel.items():
+            self._window_series.setdefault(key, _SeriesBuffer()).append(value)
+
+        self._last_ts = timestamp
+        self.updates += 1
+        self._compact()
+
+    def replace_last(self, o: float, h: float, l: float, c: float, v: float,
+                     timestamp: Optional[int] = None):
+        """Заміна останньої (незакритої) свічки новими значеннями"""
+        if self._checkpoint is None:
+            raise ValueError("Немає контрольної точки для заміни свічки")
+        self._states = self._checkpoint
+        for buffer in (*self._raw.values(), *self._series.values(), *self._window_series.values()):
+            buffer.pop()
+        self.update(o, h, l, c, v, timestamp)
+
+    def bootstrap(self, df: pd.DataFrame):
+        """Початкове заповнення стану з історії"""
+        self.reset()
+        raw = {key: df[key].values.astype(float) for key in _RAW_KEYS}
+        n = len(df)
+        if n == 0:
+            return
+
+        # Рекурсивні стани прокручуємо свічка за свічкою; останню свічку
+        # застосовуємо через update, щоб мати контрольну точку для заміни
+        o, h, l, c, v = (raw[key] for key in _RAW_KEYS)
+        for i in range(n - 1):
+            self._apply_recursive(o[i], h[i], l[i], c[i], v[i])
+        for key in _RAW_KEYS:
+            self._raw[key].extend(raw[key][:-1])
+
+        # Віконні індикатори - один batch-прохід на всю історію
+        rsi = self._series['rsi'].view()
+        window = {}
+        if n > 1:
+            window = _window_indicators(o[:-1], h[:-1], l[:-1], c[:-1], v[:-1], rsi)
+            extrema = rolling_extrema(h[:-1], l[:-1], CHANNEL_WINDOWS)
+            window.update(_channel_indicators(extrema, c[:-1]))
+            window['stoch_k'], window['stoch_d'] = stochastic_from_fast_k(stoch_fast_k(*extrema[5], c[:-1]))
+        for key, values in window.items():
+            buffer = _SeriesBuffer(max(1024, n * 2))
+            buffer.extend(np.asarray(values, dtype=float))
+            self._window_series[key] = buffer
+
+        ts = _timestamps(df)
+        self.update(o[-1], h[-1], l[-1], c[-1], v[-1], int(ts[-1]) if ts is not None else None)
+        self.bootstraps += 1
+
+    def _compact(self):
+        """Обрізання історії до max_history (не в режимі паритету)"""
+        if self.parity or self.length <= self.max_history * 2:
+            return
+        drop = self.length - self.max_history
+        for buffer in (*self._raw.values(), *self._series.values(), *self._window_series.values()):
+            buffer.drop_head(drop)
+
+    # ====== СИНХРОНІЗАЦІЯ З DATAFRAME ======
+
+    def sync(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Застосування нових свічок з df і повернення індикаторів для вікна df.
+        Формат результату такий самий, як у AIAnalyzer.calculate_indicators.
+        """
+        ts = _timestamps(df)
+        if ts is None or self._last_ts is None or len(df) == 0:
+            self.bootstrap(df)
+        else:
+            pos = int(np.searchsorted(ts, self._last_ts))
+            if pos >= len(ts) or ts[pos] != self._last_ts or pos + 1 > self.length:
+                self.bootstrap(df)
+            else:
+                rows = np.column_stack([df[key].values[pos:] for key in _RAW_KEYS]).astype(float)
+                last = rows[0]
+                stored = tuple(self._raw[key].data[self._raw[key].size - 1] for key in _RAW_KEYS)
+                if not np.array_equal(last, stored):
+                    self.replace_last(*last, timestamp=int(ts[pos]))
+                for i in range(1, len(rows)):
+                    self.update(*rows[i], timestamp=int(ts[pos + i]))
+                if self.length < len(df):
+                    self.bootstrap(df)
+
+        indicators = self.snapshot(len(df))
+        if self.parity:
+            self.last_parity_report = self.check_parity(len(df))
+        return indicators
+
+    def _full_series(self) -> Dict[str, np.ndarray]:
+        result = {key: buffer.view() for key, buffer in self._series.items()}
+        result.update({key: buffer.view() for key, buffer in self._window_series.items()})
+        result.update({key: buffer.view() for key, buffer in self._raw.items()})
+        return result
+
+    @staticmethod
+    def _window(full: Dict[str, np.ndarray], length: int) -> Dict[str, np.ndarray]:
+        """
+        Вирізання останніх length значень. Кумулятивні індикатори (VWAP, OBV, AD)
+        прив'язуються до початку вікна, як при batch-розрахунку на df.
+        """
+        total = len(full['close'])
+        start = total - length
+        result = {key: values[start:] for key, values in full.items()}
+
+        close, high, low, volume = (result[k] for k in ('close', 'high', 'low', 'volume'))
+        typical_price = (high + low + close) / 3
+        result['vwap'] = np.cumsum(typical_price * volume) / np.cumsum(volume)
+        result['chikou_span'] = np.roll(close, -26)
+        if start > 0:
+            obv = full['obv']
+            result['obv'] = obv[start:] - obv[start] + full['volume'][start]
+            result['ad'] = full['ad'][start:] - full['ad'][start - 1]
+        return result
+
+    def snapshot(self, length: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Індикатори для останніх length свічок"""
+        return self._window(self._full_series(), length or self.length)
+
+    # ====== ПАРИТЕТ З TA-LIB ======
+
+    def check_parity(self, length: Optional[int] = None) -> Dict:
+        """
+        Порівняння з batch-розрахунком TA-Lib на тій самій історії.
+        Повертає максимальні відносні розбіжності та список ключів понад допуск.
+        """
+        if self.reference_fn is None:
+            raise ValueError("Для перевірки паритету потрібна reference_fn")
+        length = length or self.length
+        history = pd.DataFrame({key: self._raw[key].view() for key in _RAW_KEYS})
+        reference = self._window(self.reference_fn(history), length)
+        streaming = self.snapshot(length)
+
+        diffs = {}
+        mismatches: List[str] = []
+        for key, expected in reference.items():
+            actual = streaming.get(key)
+            if actual is None:
+                mismatches.append(key)
+                continue
+            expected = np.asarray(expected, dtype=float)
+            actual = np.asarray(actual, dtype=float)
+            nan_mismatch = np.isnan(expected) != np.isnan(actual)
+            valid = ~np.isnan(expected) & ~np.isnan(actual)
+            scale = np.maximum(np.abs(expected[valid]), 1.0)
+            diff = float(np.max(np.abs(expected[valid] - actual[valid]) / scale)) if valid.any() else 0.0
+            diffs[key] = diff
+            if nan_mismatch.any() or diff > self.parity_rtol:
+                mismatches.append(key)
+
+        if mismatches:
+            self.logger.warning(f"⚠️ Паритет {self.symbol} {self.timeframe}: розбіжності в {mismatches}")
+        return {
+            'ok': not mismatches,
+            'mismatches': mismatches,
+            'max_rel_diff': diffs,
+            'length': length,
+        }
+
+
+class IndicatorEngineRegistry:
+    """Набір streaming-движків, по одному на (symbol, timeframe)"""
+
+    def __init__(self, **engine_kwargs):
+        self.engine_kwargs = engine_kwargs
+        self._engines: Dict[Tuple[str, str], StreamingIndicatorEngine] = {}
+
+    def get(self, symbol: str, timeframe: str) -> StreamingIndicatorEngine:
+        key = (symbol, timeframe)
+        if key not in self._engines:
+            self._engines[key] = StreamingIndicatorEngine(symbol, timeframe, **self.engine_kwargs)
+        return self._engines[key]
+
+    def drop(self, symbol: str, timeframe: str):
+        self._engines.pop((symbol, timeframe), None)
+
+    def __len__(self) -> int:
+        return len(self._engines)
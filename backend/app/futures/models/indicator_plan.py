@@ -0,0 +1,93 @@
+# backend/app/futures/models/indicator_plan.py
+import math
+from typing import Callable, Tuple
+
+import numpy as np
+
+from .kernels import rolling_mean
+from .lazy_indicators import IndicatorNode
+
+# Спільні проміжні величини для графів індикаторів обох аналізаторів
+# (models/ai_analyzer на TA-Lib і services/ai_analyzer на pandas).
+# Вузол рахується один раз на вікно свічок, а всі залежні індикатори
+# беруть уже готовий результат з LazyIndicators.
+
+
+def typical_price(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    return (high + low + close) / 3
+
+
+def vwap_from_typical(typical: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    return np.cumsum(typical * volume) / np.cumsum(volume)
+
+
+def macd_from_emas(fast_ema: np.ndarray, slow_ema: np.ndarray,
+                   signal_fn: Callable[[np.ndarray], np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD з уже порахованих EMA; signal_fn - згладжування лінії MACD"""
+    line = fast_ema - slow_ema
+    signal = signal_fn(line)
+    return line, signal, line - signal
+
+
+def bands_from_std(middle: np.ndarray, std: np.ndarray,
+                   std_dev: float = 2) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bollinger Bands з готових ковзних середнього та std"""
+    return middle + std * std_dev, middle, middle - std * std_dev
+
+
+def natr_from_atr(atr: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """NATR = ATR / close * 100 (нуль при нульовій ціні, як у TA-Lib)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(np.abs(close) < 1e-14, 0.0, (atr / close) * 100)
+
+
+# ====== ОСЦИЛЯТОРИ КАНАЛУ (з готових ковзних екстремумів) ======
+
+def williams_r_from_extrema(highest: np.ndarray, lowest: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """Williams %R як TA-Lib WILLR (нуль при нульовому діапазоні)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(highest == lowest, 0.0, (highest - close) / (highest - lowest) * -100)
+
+
+def stoch_fast_k(highest: np.ndarray, lowest: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """Fast %K (нуль при нульовому діапазоні, як у TA-Lib STOCH)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(highest == lowest, 0.0, (close - lowest) / (highest - lowest) * 100)
+
+
+def stochastic_from_fast_k(fast_k: np.ndarray, slow_k: int = 3,
+                           slow_d: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+    """Slow %K/%D як TA-Lib STOCH: SMA-згладжування, NaN до розгону обох ліній"""
+    k = rolling_mean(fast_k, slow_k)
+    d = rolling_mean(k, slow_d)
+    return np.where(np.isnan(d), np.nan, k), d
+
+
+# ====== РОЗГІН ЗГЛАДЖУВАНЬ ======
+
+def smoothing_warmup(alpha: float, lookback: int = 0, stages: int = 1,
+                     deviation: float = 0.1) -> Callable[[float], int]:
+    """
+    Розгін експоненційного згладжування: після k свічок внесок стартового
+    значення множиться на (1 - alpha)^k. deviation - оцінка стартового
+    відхилення (частка масштабу ряду), tolerance - допустима відносна похибка.
+    stages - кількість послідовних згладжувань (напр. DI і ADX у Wilder).
+    """
+    def warmup(tolerance: float) -> int:
+        if tolerance >= deviation:
+            return lookback
+        return lookback + stages * math.ceil(math.log(tolerance / deviation) / math.log(1 - alpha))
+    return warmup
+
+
+def ema_warmup(period: int, lookback: int = 0, deviation: float = 0.1) -> Callable[[float], int]:
+    return smoothing_warmup(2 / (period + 1), lookback, deviation=deviation)
+
+
+def wilder_warmup(period: int, lookback: int = 0, stages: int = 1,
+                  deviation: float = 0.1) -> Callable[[float], int]:
+    return smoothing_warmup(1 / period, lookback, stages, deviation)
+
+
+def typical_price_node() -> IndicatorNode:
+    return IndicatorNode(('typical_price',), ('high', 'low', 'close'), typical_price, internal=True)
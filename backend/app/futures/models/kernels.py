@@ -0,0 +1,72 @@
+# backend/app/futures/models/kernels.py
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Векторні ядра без Python-циклів та rolling.apply.
+# Рахують уздовж останньої осі (1-D ряд або матриця символи × свічки),
+# перші period-1 значень - NaN, як у pandas rolling(period).
+
+
+def _rolling_reduce(values: np.ndarray, period: int, reducer) -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] >= period:
+        out[..., period - 1:] = reducer(sliding_window_view(values, period, axis=-1))
+    return out
+
+
+def _rolling_extreme(values: np.ndarray, period: int, ufunc, identity: float) -> np.ndarray:
+    """
+    Ковзний максимум/мінімум за O(n) незалежно від period (van Herk/Gil-Werman):
+    ряд ділиться на блоки довжини period, вікно [i, i + period) - це суфікс
+    одного блоку та префікс наступного
+    """
+    values = np.asarray(values, dtype=float)
+    n = values.shape[-1]
+    out = np.full(values.shape, np.nan)
+    if n < period:
+        return out
+
+    padded = np.concatenate([values, np.full(values.shape[:-1] + (-n % period,), identity)], axis=-1)
+    blocks = padded.reshape(values.shape[:-1] + (-1, period))
+    prefix = ufunc.accumulate(blocks, axis=-1).reshape(padded.shape)
+    suffix = ufunc.accumulate(blocks[..., ::-1], axis=-1)[..., ::-1].reshape(padded.shape)
+    out[..., period - 1:] = ufunc(suffix[..., :n - period + 1], prefix[..., period - 1:n])
+    return out
+
+
+def rolling_max(values: np.ndarray, period: int) -> np.ndarray:
+    return _rolling_extreme(values, period, np.maximum, -np.inf)
+
+
+def rolling_min(values: np.ndarray, period: int) -> np.ndarray:
+    return _rolling_extreme(values, period, np.minimum, np.inf)
+
+
+def rolling_mad(values: np.ndarray, period: int) -> np.ndarray:
+    """Середнє абсолютне відхилення від середнього вікна (для CCI)"""
+    def mad(windows):
+        return np.abs(windows - windows.mean(axis=-1, keepdims=True)).mean(axis=-1)
+    return _rolling_reduce(values, period, mad)
+
+
+def obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """On-Balance Volume: знак зміни ціни × об'єм, накопичувально (старт з volume[0])"""
+    close = np.asarray(close, dtype=float)
+    volume = np.asarray(volume, dtype=float)
+    if close.shape[-1] == 0:
+        return np.zeros(close.shape)
+
+    delta = np.diff(close, axis=-1)
+    direction = np.where(delta > 0, 1.0, np.where(delta < 0, -1.0, 0.0))
+    flow = np.concatenate([volume[..., :1], direction * volume[..., 1:]], axis=-1)
+    return np.cumsum(flow, axis=-1)
+
+
+def rolling_mean(values: np.ndarray, period: int) -> np.ndarray:
+    return _rolling_reduce(values, period, lambda windows: windows.mean(axis=-1))
+
+
+def rolling_std(values: np.ndarray, period: int) -> np.ndarray:
+    """Вибіркове std (ddof=1), як pandas rolling().std()"""
+    return _rolling_reduce(values, period, lambda windows: windows.std(axis=-1, ddof=1))
@@ -0,0 +1,134 @@
+# backend/app/futures/models/lazy_indicators.py
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+# Скільки свічок історії потрібно вузлу понад його входи: число (точне вікно),
+# функція від допуску (згладжування, що збігається) або None - кумулятивний
+# індикатор, рівень якого залежить від початку вікна
+Warmup = Union[int, Callable[[float], int], None]
+
+
+class IndicatorNode:
+    """
+    Вузол графа індикаторів: які ключі він видає і з яких входів рахується.
+    internal=True - проміжна величина (спільна для кількох індикаторів),
+    яка не потрапляє в ключі/materialize(). warmup - скільки свічок понад
+    входи потрібно, щоб останнє значення не залежало від початку вікна.
+    """
+    __slots__ = ('outputs', 'inputs', 'func', 'internal', 'warmup')
+
+    def __init__(self, outputs: Sequence[str], inputs: Sequence[str], func: Callable,
+                 internal: bool = False, warmup: Warmup = 0):
+        self.outputs = tuple(outputs)
+        self.inputs = tuple(inputs)
+        self.func = func
+        self.internal = internal
+        self.warmup = warmup
+
+    def warmup_candles(self, tolerance: float) -> int:
+        """Розгін вузла для допуску (кумулятивні вузли - 0, див. anchored_keys)"""
+        if self.warmup is None:
+            return 0
+        return int(self.warmup(tolerance)) if callable(self.warmup) else int(self.warmup)
+
+    def __repr__(self):
+        return f"IndicatorNode({self.outputs} <- {self.inputs})"
+
+
+class LazyIndicators(Mapping):
+    """
+    Контейнер індикаторів з відкладеним розрахунком.
+
+    Вузол рахується лише при першому зверненні до одного з його ключів
+    (разом із залежностями) і запам'ятовується для цього вікна свічок.
+    Звернення ззовні фіксуються в touched - це звіт про те, що реально
+    використав сигнал.
+    """
+
+    def __init__(self, nodes: Iterable[IndicatorNode], sources: Dict[str, Any],
+                 context: Dict[str, Any] = None):
+        self._values: Dict[str, Any] = dict(sources)
+        self._context = context or {}
+        self._nodes = {}
+        for node in nodes:
+            for output in node.outputs:
+                self._nodes[output] = node
+        self._public = [key for key, node in self._nodes.items() if not node.internal]
+        self._keys = self._public + [key for key in sources if key not in self._nodes]
+        self.touched: List[str] = []
+        self.computed: List[str] = []
+
+    def _resolve(self, key: str) -> Any:
+        if key in self._values:
+            return self._values[key]
+        if key in self._context:
+            return self._context[key]
+        node = self._nodes.get(key)
+        if node is None:
+            raise KeyError(key)
+
+        result = node.func(*(self._resolve(name) for name in node.inputs))
+        if len(node.outputs) == 1:
+            result = (result,)
+        for output, value in zip(node.outputs, result):
+            self._values[output] = value
+        self.computed.extend(node.outputs)
+        return self._values[key]
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._resolve(key)
+        if key not in self.touched:
+            self.touched.append(key)
+        return value
+
+    def __contains__(self, key) -> bool:
+        return key in self._nodes or key in self._values
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def materialize(self) -> Dict[str, Any]:
+        """Розрахувати все і повернути звичайний dict (без обліку touched)"""
+        return {key: self._resolve(key) for key in self._keys}
+
+    def usage_report(self) -> Dict[str, List[str]]:
+        """Які індикатори сигнал прочитав, які довелось порахувати, а які пропущено"""
+        return {
+            'touched': list(self.touched),
+            'computed': list(self.computed),
+            'skipped': [key for key in self._public if key not in self._values],
+        }
+
+
+def required_window(nodes: Iterable[IndicatorNode], tolerance: float,
+                    keys: Optional[Iterable[str]] = None) -> int:
+    """
+    Мінімальна кількість свічок, за якої останні значення keys (типово - всіх
+    вузлів) збігаються з розрахунком по довшій історії в межах tolerance.
+    Розгін складається вздовж графа: вузол + найдовший з його входів.
+    """
+    by_output = {}
+    for node in nodes:
+        for output in node.outputs:
+            by_output[output] = node
+    windows: Dict[str, int] = {}
+
+    def window(key: str) -> int:
+        node = by_output.get(key)
+        if node is None:
+            return 1  # свічка-джерело
+        if key not in windows:
+            inputs = max((window(name) for name in node.inputs), default=1)
+            for output in node.outputs:
+                windows[output] = inputs + node.warmup_candles(tolerance)
+        return windows[key]
+
+    return max((window(key) for key in (keys if keys is not None else by_output)), default=1)
+
+
+def anchored_keys(nodes: Iterable[IndicatorNode]) -> List[str]:
+    """Кумулятивні індикатори (VWAP, OBV, A/D): їх рівень відраховується від початку вікна"""
+    return [output for node in nodes if node.warmup is None for output in node.outputs]
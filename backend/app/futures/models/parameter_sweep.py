@@ -0,0 +1,210 @@
+# backend/app/futures/models/parameter_sweep.py
+import itertools
+import logging
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from .ai_analyzer import AIAnalyzer
+from .backtest import BacktestEngine
+from .signal_scoring import CATEGORY_WEIGHTS, SCORING_INDICATORS
+
+logger = logging.getLogger(__name__)
+
+# Пороги, що підбираються (атрибути AIAnalyzer)
+THRESHOLD_PARAMS = ('MIN_RR', 'MIN_CONFIDENCE', 'MAX_CONFLICT', 'ADX_TREND', 'RSI_BANDS')
+
+# Параметри BacktestEngine, які передаються процесам пулу
+ENGINE_OPTIONS = ('lookback', 'entry_window', 'max_hold', 'fee')
+
+
+# ====== ПРОСТІР ПОШУКУ ======
+
+def make_config(params: Mapping[str, Any], base_weights: Optional[Mapping[str, float]] = None) -> Dict:
+    """
+    Конфігурація з плоских параметрів: категорії (trend, momentum, ...) -
+    ваги (нормуються до суми 1 разом з base_weights), решта - пороги
+    """
+    weights = {**(base_weights or CATEGORY_WEIGHTS),
+               **{name: value for name, value in params.items() if name in CATEGORY_WEIGHTS}}
+    total = sum(weights.values())
+    return {
+        'weights': {name: weight / total for name, weight in weights.items()},
+        'thresholds': {name: value for name, value in params.items() if name in THRESHOLD_PARAMS},
+    }
+
+
+def expand_search_space(space: Mapping[str, List], search: str = 'grid', samples: Optional[int] = None,
+                        seed: Optional[int] = None, base_weights: Optional[Mapping[str, float]] = None) -> List[Dict]:
+    """
+    Конфігурації з простору {параметр: [значення]}.
+    grid - повний перебір, random - samples випадкових комбінацій (без повторів).
+    """
+    unknown = set(space) - set(CATEGORY_WEIGHTS) - set(THRESHOLD_PARAMS)
+    if unknown:
+        raise ValueError(f"Невідомі параметри перебору: {sorted(unknown)}")
+
+    names = list(space)
+    if search == 'grid':
+        combinations = itertools.product(*(space[name] for name in names))
+    elif search == 'random':
+        rng = random.Random(seed)
+        combinations = ([rng.choice(list(space[name])) for name in names] for _ in range(samples or 20))
+    else:
+        raise ValueError(f"Невідомий тип пошуку: {search}")
+
+    configs, seen = [], set()
+    for values in combinations:
+        config = make_config(dict(zip(names, values)), base_weights)
+        key = repr(config)
+        if key not in seen:
+            seen.add(key)
+            configs.append(config)
+    return configs
+
+
+# ====== ОЦІНКА КОНФІГУРАЦІЇ ======
+
+def prepare_dataset(frames: Mapping[str, pd.DataFrame], engine: BacktestEngine) -> Dict[str, Dict]:
+    """Індикатори та рівні підтримки/опору кожного символу - один раз на весь перебір"""
+    dataset = {}
+    for symbol, df in frames.items():
+        if df is None or len(df) < engine.analyzer.MIN_CANDLES:
+            continue
+        indicators = engine.analyzer.build_lazy_indicators(df)
+        prices = df[['open', 'high', 'low', 'close']].reset_index(drop=True).astype(float)
+        dataset[symbol] = {
+            'prices': prices,
+            'indicators': {key: np.asarray(indicators[key]) for key in SCORING_INDICATORS},
+            'levels': engine.nearest_levels(prices['close'].values),
+        }
+    return dataset
+
+
+@contextmanager
+def applied_thresholds(analyzer: AIAnalyzer, thresholds: Mapping[str, Any]):
+    """Тимчасово встановлює пороги аналізатора"""
+    previous = {name: getattr(analyzer, name) for name in thresholds}
+    try:
+        for name, value in thresholds.items():
+            setattr(analyzer, name, value)
+        yield analyzer
+    finally:
+        for name, value in previous.items():
+            setattr(analyzer, name, value)
+
+
+def evaluate_config(engine: BacktestEngine, dataset: Mapping[str, Dict], config: Dict,
+                    train_fraction: float = 0.7) -> Dict:
+    """
+    Бектест конфігурації на всіх символах. Угоди з сигналом до train_fraction
+    історії символу - in-sample, після - out-of-sample.
+    """
+    in_sample, out_of_sample = [], []
+    with applied_thresholds(engine.analyzer, config['thresholds']):
+        for data in dataset.values():
+            prices = data['prices']
+            scores = engine.analyzer.score_series(prices, data['indicators'], weights=config['weights'])
+            signals = engine.generate_signals(prices, scores, data['levels'])
+            split = int(len(prices) * train_fraction)
+            for trade in engine.simulate(prices, signals)['trades']:
+                (in_sample if trade['signal_bar'] < split else out_of_sample).append(trade)
+
+    return {
+        'config': config,
+        'in_sample': engine.trade_metrics(in_sample),
+        'out_of_sample': engine.trade_metrics(out_of_sample),
+    }
+
+
+# ====== ВОРКЕР ======
+# Дані перебору передаються процесу один раз при старті, далі - лише конфігурації
+
+_worker_state = None
+
+
+def _init_worker(dataset: Dict[str, Dict], engine_options: Dict, baseline: Dict, train_fraction: float):
+    global _worker_state
+    analyzer = AIAnalyzer()
+    for name, value in baseline.items():
+        setattr(analyzer, name, value)
+    _worker_state = (BacktestEngine(analyzer, **engine_options), dataset, train_fraction)
+
+
+def _evaluate_worker(config: Dict) -> Dict:
+    engine, dataset, train_fraction = _worker_state
+    return evaluate_config(engine, dataset, config, train_fraction)
+
+
+# ====== ПЕРЕБІР ======
+
+class ParameterSweep:
+    """
+    Перебір ваг категорій і порогів сигналу на історії. Індикатори та рівні
+    рахуються один раз, кожна конфігурація - лише векторна переоцінка,
+    відбір сигналів і симуляція угод. Конфігурації розподіляються по пулу
+    процесів; рейтинг - за out-of-sample метрикою.
+    """
+
+    def __init__(self, engine: Optional[BacktestEngine] = None, workers: int = 1, train_fraction: float = 0.7,
+                 metric: str = 'total_pnl_pct', min_trades: int = 5):
+        self.engine = engine or BacktestEngine()
+        self.workers = max(1, workers)
+        self.train_fraction = train_fraction
+        self.metric = metric
+        self.min_trades = min_trades  # менше угод out-of-sample - у кінець рейтингу
+
+    def run(self, frames: Mapping[str, pd.DataFrame], space: Mapping[str, List], search: str = 'grid',
+            samples: Optional[int] = None, seed: Optional[int] = None,
+            base_weights: Optional[Mapping[str, float]] = None) -> Dict:
+        started = time.perf_counter()
+        configs = expand_search_space(space, search, samples, seed, base_weights)
+        dataset = prepare_dataset(frames, self.engine)
+        prepared = time.perf_counter()
+
+        results = self._evaluate(dataset, configs)
+        ranking = self.rank(results)
+        finished = time.perf_counter()
+
+        logger.info(f"🔧 Перебір параметрів: {len(configs)} конфігурацій × {len(dataset)} символів "
+                    f"за {finished - started:.1f} с")
+        return {
+            'best': ranking[0] if ranking and dataset else None,
+            'ranking': ranking,
+            'configs': len(configs),
+            'symbols': len(dataset),
+            'metric': self.metric,
+            'timings_ms': {
+                'prepare': round((prepared - started) * 1000, 2),
+                'evaluate': round((finished - prepared) * 1000, 2),
+            },
+        }
+
+    def _evaluate(self, dataset: Dict[str, Dict], configs: List[Dict]) -> List[Dict]:
+        if self.workers == 1 or len(configs) < 2:
+            return [evaluate_config(self.engine, dataset, config, self.train_fraction) for config in configs]
+
+        engine_options = {name: getattr(self.engine, name) for name in ENGINE_OPTIONS}
+        baseline = {name: getattr(self.engine.analyzer, name) for name in THRESHOLD_PARAMS}
+        workers = min(self.workers, len(configs))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(dataset, engine_options, baseline, self.train_fraction),
+        ) as executor:
+            return list(executor.map(_evaluate_worker, configs, chunksize=max(1, len(configs) // (workers * 4))))
+
+    def rank(self, results: List[Dict]) -> List[Dict]:
+        """Спершу конфігурації з достатньою кількістю угод, далі - out-of-sample, in-sample"""
+        def key(result):
+            out_of_sample = result['out_of_sample']
+            return (out_of_sample['trades'] >= self.min_trades, out_of_sample[self.metric],
+                    result['in_sample'][self.metric])
+        return sorted(results, key=key, reverse=True)
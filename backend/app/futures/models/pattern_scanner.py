@@ -0,0 +1,122 @@
+# backend/app/futures/models/pattern_scanner.py
+import logging
+import time
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import talib
+from talib import abstract
+
+logger = logging.getLogger(__name__)
+
+# Сканер свічних паттернів TA-Lib (уся група CDL або підмножина) по
+# мінімальному хвосту свічок. Значення CDL на свічці залежить лише від
+# lookback попередніх свічок, тож хвости всіх символів склеюються в один
+# масив і кожна функція викликається один раз на весь пакет. Результат -
+# бітові маски (біт i - паттерн patterns[i]) окремо для бичачих і ведмежих.
+
+CDL_PATTERNS = tuple(talib.get_function_groups()['Pattern Recognition'])
+MASK_DTYPE = np.uint64
+
+
+class PatternScanner:
+    """
+    Пакетний скан паттернів. bars - скільки останніх свічок кожного символу
+    отримують маску; tail = max lookback + bars - мінімальна історія.
+    """
+
+    def __init__(self, patterns: Optional[Sequence[str]] = None, bars: int = 1):
+        patterns = tuple(patterns) if patterns is not None else CDL_PATTERNS
+        unknown = [name for name in patterns if name not in CDL_PATTERNS]
+        if unknown:
+            raise ValueError(f"Невідомі паттерни TA-Lib: {unknown}")
+        if len(patterns) > np.iinfo(MASK_DTYPE).bits:
+            raise ValueError(f"Маска вміщує не більше {np.iinfo(MASK_DTYPE).bits} паттернів")
+        if bars < 1:
+            raise ValueError("bars має бути >= 1")
+
+        self.patterns = patterns
+        self.bars = bars
+        self._functions = [getattr(talib, name) for name in patterns]
+        self.lookback = max((abstract.Function(name).lookback for name in patterns), default=0)
+        self.stats = {'scans': 0, 'symbols': 0, 'calls': 0}
+
+    @property
+    def tail(self) -> int:
+        return self.lookback + self.bars
+
+    # ====== МАСКИ ======
+
+    def scan_arrays(self, open_: np.ndarray, high: np.ndarray, low: np.ndarray,
+                    close: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Маски для матриць (символи × свічки, щонайменше tail стовпців):
+        {'bullish', 'bearish'} форми (символи × bars).
+        """
+        columns = [np.asarray(values, dtype=float)[:, -self.tail:] for values in (open_, high, low, close)]
+        symbols = columns[0].shape[0]
+        bullish = np.zeros((symbols, self.bars), dtype=MASK_DTYPE)
+        bearish = np.zeros((symbols, self.bars), dtype=MASK_DTYPE)
+        if symbols == 0:
+            return {'bullish': bullish, 'bearish': bearish}
+
+        # Склеєні хвости: останні bars свічок кожного сегмента бачать лише свій символ
+        flat = [np.ascontiguousarray(values).ravel() for values in columns]
+        for bit, function in enumerate(self._functions):
+            values = function(*flat).reshape(symbols, self.tail)[:, -self.bars:]
+            flag = MASK_DTYPE(1) << MASK_DTYPE(bit)
+            bullish[values > 0] |= flag
+            bearish[values < 0] |= flag
+        self.stats['calls'] += len(self._functions)
+        return {'bullish': bullish, 'bearish': bearish}
+
+    def scan(self, frames: Mapping[str, pd.DataFrame]) -> Dict:
+        """Маски для символів з історією >= tail (решта - у skipped)"""
+        started = time.perf_counter()
+        symbols = [symbol for symbol, df in frames.items() if df is not None and len(df) >= self.tail]
+        matrices = [
+            np.array([frames[symbol][column].values[-self.tail:] for symbol in symbols],
+                     dtype=float).reshape(len(symbols), self.tail)
+            for column in ('open', 'high', 'low', 'close')
+        ]
+        masks = self.scan_arrays(*matrices)
+
+        scanned = set(symbols)
+        self.stats['scans'] += 1
+        self.stats['symbols'] += len(symbols)
+        elapsed = (time.perf_counter() - started) * 1000
+        logger.info(f"🕯️ Скан паттернів: {len(symbols)} символів × {len(self.patterns)} паттернів "
+                    f"за {elapsed:.1f} мс")
+        return {
+            'symbols': symbols,
+            'patterns': list(self.patterns),
+            'bullish': masks['bullish'],
+            'bearish': masks['bearish'],
+            'skipped': [symbol for symbol in frames if symbol not in scanned],
+            'elapsed_ms': round(elapsed, 3),
+        }
+
+    # ====== ДЕКОДУВАННЯ ======
+
+    def decode(self, mask) -> List[str]:
+        """Назви паттернів, біти яких увімкнені в mask (число або hex-рядок з to_hex)"""
+        mask = int(mask, 16) if isinstance(mask, str) else int(mask)
+        return [name for bit, name in enumerate(self.patterns) if mask >> bit & 1]
+
+    @staticmethod
+    def to_hex(masks: np.ndarray) -> List[List[str]]:
+        """
+        Маски для JSON: hex-рядки замість чисел - у JavaScript number
+        точний лише до 2**53, тож старші біти uint64 губилися б.
+        """
+        return [[format(int(mask), '016x') for mask in row] for row in masks]
+
+    def latest(self, scan: Dict) -> Dict[str, Dict[str, List[str]]]:
+        """{symbol: {'bullish': [...], 'bearish': [...]}} на останній свічці; без паттернів - пропуск"""
+        result = {}
+        for i, symbol in enumerate(scan['symbols']):
+            bullish, bearish = scan['bullish'][i, -1], scan['bearish'][i, -1]
+            if bullish or bearish:
+                result[symbol] = {'bullish': self.decode(bullish), 'bearish': self.decode(bearish)}
+        return result
@@ -0,0 +1,81 @@
+# backend/app/futures/models/price_levels.py
+from typing import List, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def pivot_mask(values: np.ndarray, radius: int, kind: str = 'max') -> np.ndarray:
+    """
+    Маска локальних екстремумів: values[i] дорівнює max/min вікна
+    [i-radius, i+radius]. Працює і для 1-D ряду, і для матриці
+    (символи × свічки) - вікно ковзає по останній осі.
+    """
+    values = np.asarray(values, dtype=float)
+    mask = np.zeros(values.shape, dtype=bool)
+    size = 2 * radius + 1
+    if values.shape[-1] < size:
+        return mask
+
+    windows = sliding_window_view(values, size, axis=-1)
+    extrema = windows.max(axis=-1) if kind == 'max' else windows.min(axis=-1)
+    mask[..., radius:values.shape[-1] - radius] = values[..., radius:values.shape[-1] - radius] == extrema
+    return mask
+
+
+def find_pivots(values: np.ndarray, radius: int, kind: str = 'max') -> np.ndarray:
+    """Індекси локальних екстремумів ряду"""
+    return np.flatnonzero(pivot_mask(values, radius, kind))
+
+
+def find_swing_points(high: np.ndarray, low: np.ndarray, radius: int = 10) -> Tuple[List, List]:
+    """Свінгові максимуми/мінімуми у форматі [(індекс, ціна), ...]"""
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    high_idx = find_pivots(high, radius, 'max')
+    low_idx = find_pivots(low, radius, 'min')
+    return (list(zip(high_idx.tolist(), high[high_idx].tolist())),
+            list(zip(low_idx.tolist(), low[low_idx].tolist())))
+
+
+def cluster_levels(levels, threshold_percent: float = 0.015) -> List[float]:
+    """
+    Кластеризація рівнів за один прохід по відсортованих цінах.
+    Середнє кластера ведеться як накопичена сума, тому крок - O(1),
+    а загальна складність визначається сортуванням (O(n log n)).
+    """
+    if len(levels) == 0:
+        return []
+
+    levels = np.sort(np.asarray(levels, dtype=float))
+    boundaries = [0]
+    cluster_sum = levels[0]
+    cluster_count = 1
+
+    for i in range(1, len(levels)):
+        price = levels[i]
+        cluster_mean = cluster_sum / cluster_count
+        if cluster_mean == 0 or abs(price - cluster_mean) / cluster_mean < threshold_percent:
+            cluster_sum += price
+            cluster_count += 1
+        else:
+            boundaries.append(i)
+            cluster_sum = price
+            cluster_count = 1
+
+    boundaries.append(len(levels))
+    return [float(np.mean(levels[start:end])) for start, end in zip(boundaries[:-1], boundaries[1:])]
+
+
+def extract_levels(close: np.ndarray, window: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+    """Ціни локальних мінімумів (підтримки) та максимумів (опори) по close"""
+    close = np.asarray(close, dtype=float)
+    return close[pivot_mask(close, window, 'min')], close[pivot_mask(close, window, 'max')]
+
+
+def extract_levels_batch(closes: np.ndarray, window: int = 20) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """extract_levels для матриці (символи × свічки) за один векторний прохід"""
+    closes = np.asarray(closes, dtype=float)
+    support_mask = pivot_mask(closes, window, 'min')
+    resistance_mask = pivot_mask(closes, window, 'max')
+    return [(row[s_mask], row[r_mask]) for row, s_mask, r_mask in zip(closes, support_mask, resistance_mask)]
@@ -0,0 +1,143 @@
+# backend/app/futures/models/resampler.py
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from app.core.market_cache import timeframe_seconds
+
+OHLCV_COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+# 1970-01-05 - понеділок: тижневі свічки біржі починаються з понеділка 00:00 UTC
+WEEK_OFFSET_MS = 4 * 86400 * 1000
+
+
+def timeframe_ms(timeframe: str) -> int:
+    if timeframe.endswith('M'):
+        raise ValueError("Місячні свічки мають змінну довжину і не агрегуються локально")
+    return timeframe_seconds(timeframe) * 1000
+
+
+def bucket_starts(ts_ms: np.ndarray, timeframe: str) -> np.ndarray:
+    """Час відкриття свічки таймфрейму, до якої належить кожна мітка (мс)"""
+    period = timeframe_ms(timeframe)
+    offset = WEEK_OFFSET_MS if timeframe.endswith('w') else 0
+    return (ts_ms - offset) // period * period + offset
+
+
+def timestamps_ms(df: pd.DataFrame) -> np.ndarray:
+    values = df['timestamp']
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.values.astype('datetime64[ms]').astype(np.int64)
+    return values.values.astype(np.int64)
+
+
+def sort_timeframes(timeframes: Iterable[str]) -> List[str]:
+    return sorted(set(timeframes), key=timeframe_ms)
+
+
+def _aggregate(ts: np.ndarray, columns: Dict[str, np.ndarray], timeframe: str) -> Dict[str, np.ndarray]:
+    """Векторна агрегація: reduceat по межах свічок старшого таймфрейму"""
+    if len(ts) == 0:
+        return {name: np.empty(0, dtype=np.int64 if name == 'timestamp' else float) for name in OHLCV_COLUMNS}
+
+    starts = bucket_starts(ts, timeframe)
+    first = np.flatnonzero(np.r_[True, starts[1:] != starts[:-1]])
+    last = np.r_[first[1:], len(ts)] - 1
+    return {
+        'timestamp': starts[first],
+        'open': columns['open'][first],
+        'high': np.maximum.reduceat(columns['high'], first),
+        'low': np.minimum.reduceat(columns['low'], first),
+        'close': columns['close'][last],
+        'volume': np.add.reduceat(columns['volume'], first),
+    }
+
+
+def _columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    return {name: df[name].values.astype(float) for name in OHLCV_COLUMNS[1:]}
+
+
+def _window_start(ts: np.ndarray, timeframe: str) -> int:
+    """Перша повна свічка: неповну першу (історія почалась посеред неї) відкидаємо"""
+    start = int(bucket_starts(ts[:1], timeframe)[0])
+    return start if ts[0] == start else start + timeframe_ms(timeframe)
+
+
+def _to_frame(data: Dict[str, np.ndarray]) -> pd.DataFrame:
+    frame = pd.DataFrame({name: data[name] for name in OHLCV_COLUMNS})
+    frame['timestamp'] = pd.to_datetime(frame['timestamp'], unit='ms')
+    return frame
+
+
+def resample_ohlcv(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """
+    Агрегація базових свічок у старший таймфрейм (open - перший, high - max,
+    low - min, close - останній, volume - сума). Остання свічка може бути
+    незакритою - як і на біржі.
+    """
+    if len(df) == 0:
+        return _to_frame(_aggregate(np.empty(0, dtype=np.int64), {}, timeframe))
+    ts = timestamps_ms(df)
+    data = _aggregate(ts, _columns(df), timeframe)
+    keep = data['timestamp'] >= _window_start(ts, timeframe)
+    return _to_frame({name: values[keep] for name, values in data.items()})
+
+
+class OHLCVResampler:
+    """
+    Інкрементальна агрегація одного базового потоку свічок у кілька старших
+    таймфреймів. При новій базовій свічці перераховується лише остання
+    (незакрита) свічка кожного таймфрейму, решта береться зі стану.
+    """
+
+    def __init__(self, base_timeframe: str, timeframes: Iterable[str]):
+        self.base_timeframe = base_timeframe
+        base_ms = timeframe_ms(base_timeframe)
+        self.timeframes = [tf for tf in sort_timeframes(timeframes) if tf != base_timeframe]
+        for tf in self.timeframes:
+            if timeframe_ms(tf) % base_ms != 0:
+                raise ValueError(f"Таймфрейм {tf} не кратний базовому {base_timeframe}")
+
+        self._state: Dict[str, Dict[str, np.ndarray]] = {}
+        self._last_ts = None
+        self.full_rebuilds = 0
+        self.incremental_updates = 0
+
+    def update(self, base_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """Актуальні свічки всіх таймфреймів для вікна base_df"""
+        result = {self.base_timeframe: base_df}
+        if len(base_df) == 0:
+            self._state, self._last_ts = {}, None
+            return {**result, **{tf: resample_ohlcv(base_df, tf) for tf in self.timeframes}}
+
+        ts = timestamps_ms(base_df)
+        # Стан придатний, якщо нове вікно перекриває попереднє і не йде назад у часі
+        incremental = self._last_ts is not None and ts[0] <= self._last_ts <= ts[-1]
+        columns = _columns(base_df)
+
+        for tf in self.timeframes:
+            window_start = _window_start(ts, tf)
+            state = self._state.get(tf) if incremental else None
+            dirty_from = int(bucket_starts(np.array([self._last_ts]), tf)[0]) if state is not None else None
+
+            if state is None or dirty_from < window_start:
+                data = _aggregate(ts, columns, tf)
+                keep = data['timestamp'] >= window_start
+            else:
+                # Перераховуємо лише свічки, починаючи з останньої відомої (вона могла бути незакритою)
+                tail = np.searchsorted(ts, dirty_from)
+                fresh = _aggregate(ts[tail:], {name: values[tail:] for name, values in columns.items()}, tf)
+                old_keep = (state['timestamp'] >= window_start) & (state['timestamp'] < dirty_from)
+                data = {name: np.concatenate([state[name][old_keep], fresh[name]]) for name in OHLCV_COLUMNS}
+                keep = slice(None)
+
+            self._state[tf] = {name: values[keep] for name, values in data.items()}
+            result[tf] = _to_frame(self._state[tf])
+
+        if incremental:
+            self.incremental_updates += 1
+        else:
+            self.full_rebuilds += 1
+        self._last_ts = int(ts[-1])
+        return result
@@ -0,0 +1,107 @@
+# backend/app/futures/models/rolling_extrema.py
+import copy
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from .kernels import rolling_max, rolling_min
+
+# Ковзні максимуми high / мінімуми low для кількох вікон одразу - основа
+# каналів Ішимоку, Williams %R, Stochastic та каналу Дончіана.
+# Batch - kernels.rolling_max/min (O(n) на вікно, без sliding_window_view),
+# streaming - RollingExtrema: одна монотонна черга на бік для всіх вікон.
+
+Extrema = Dict[int, Tuple[np.ndarray, np.ndarray]]
+
+
+def rolling_extrema(high: np.ndarray, low: np.ndarray, windows: Iterable[int]) -> Extrema:
+    """{вікно: (найвищий high, найнижчий low)} для всіх вікон; перші window-1 значень - NaN"""
+    return {window: (rolling_max(high, window), rolling_min(low, window)) for window in sorted(set(windows))}
+
+
+def channel_midpoint(extrema: Extrema, window: int) -> np.ndarray:
+    """Середина каналу (max high + min low) / 2 - лінії Ішимоку"""
+    highest, lowest = extrema[window]
+    return (highest + lowest) / 2
+
+
+class _MonotonicQueue:
+    """
+    Кандидати в екстремум останніх свічок: індекси зростають, значення
+    спадають (sign=1 - максимум, -1 - мінімум; зберігається sign × значення).
+    Екстремум будь-якого вікна - перший кандидат, що потрапляє у вікно.
+    """
+    __slots__ = ('sign', 'indices', 'keys', 'head')
+
+    def __init__(self, sign: float):
+        self.sign = sign
+        self.indices: List[int] = []
+        self.keys: List[float] = []
+        self.head = 0  # кандидати до head уже вийшли з найдовшого вікна
+
+    def __copy__(self):
+        queue = _MonotonicQueue(self.sign)
+        queue.indices, queue.keys, queue.head = self.indices[self.head:], self.keys[self.head:], 0
+        return queue
+
+    def push(self, index: int, value: float):
+        key = self.sign * value
+        while len(self.keys) > self.head and self.keys[-1] <= key:
+            self.keys.pop()
+            self.indices.pop()
+        self.indices.append(index)
+        self.keys.append(key)
+
+    def evict(self, oldest: int):
+        """Вилучення кандидатів з індексом < oldest"""
+        while self.indices[self.head] < oldest:
+            self.head += 1
+        if self.head > 64 and self.head * 2 > len(self.indices):
+            del self.indices[:self.head], self.keys[:self.head]
+            self.head = 0
+
+    def query(self, start: int) -> float:
+        """Екстремум свічок з індексом >= start (до останньої доданої)"""
+        return self.sign * self.keys[bisect_left(self.indices, start, self.head)]
+
+
+class RollingExtrema:
+    """
+    Інкрементальні ковзні екстремуми для набору вікон: O(1) амортизовано
+    на свічку + O(log w) на запит вікна. Значення збігаються з rolling_extrema.
+    """
+
+    def __init__(self, windows: Iterable[int] = (9, 26, 52)):
+        self.windows = tuple(sorted(set(windows)))
+        self.reset()
+
+    def reset(self):
+        self._high = _MonotonicQueue(1.0)
+        self._low = _MonotonicQueue(-1.0)
+        self.count = 0
+
+    def __copy__(self):
+        state = RollingExtrema.__new__(RollingExtrema)
+        state.windows, state.count = self.windows, self.count
+        state._high, state._low = copy.copy(self._high), copy.copy(self._low)
+        return state
+
+    def update(self, high: float, low: float) -> Dict[int, Tuple[float, float]]:
+        """Додавання свічки; повертає {вікно: (max high, min low)} з нею включно"""
+        index = self.count
+        self._high.push(index, high)
+        self._low.push(index, low)
+        oldest = index - self.windows[-1] + 1
+        self._high.evict(oldest)
+        self._low.evict(oldest)
+        self.count += 1
+        return self.current()
+
+    def current(self) -> Dict[int, Tuple[float, float]]:
+        last = self.count - 1
+        return {
+            window: (self._high.query(last - window + 1), self._low.query(last - window + 1))
+            if self.count >= window else (np.nan, np.nan)
+            for window in self.windows
+        }
@@ -0,0 +1,70 @@
+# backend/app/futures/models/shared_ohlcv.py
+from multiprocessing import shared_memory
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .resampler import OHLCV_COLUMNS, timestamps_ms
+
+# (ім'я блоку, свічок у блоці, початок, кінець) - усе, що треба передати процесу
+FrameHandle = Tuple[str, int, int, int]
+
+
+class SharedOHLCV:
+    """
+    Свічки кількох символів в одному блоці shared_memory: матриця float64
+    6 × N (timestamp у мс, open, high, low, close, volume), символи йдуть
+    підряд. Процеси-воркери читають свій зріз без pickle DataFrame.
+    Блоком володіє процес-творець: close() звільняє і видаляє його.
+    """
+
+    def __init__(self, frames: Dict[str, pd.DataFrame]):
+        self.layout: Dict[str, Tuple[int, int]] = {}
+        total = 0
+        for symbol, df in frames.items():
+            if df is not None and len(df) > 0:
+                self.layout[symbol] = (total, total + len(df))
+                total += len(df)
+
+        self.total = total
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, len(OHLCV_COLUMNS) * total * 8))
+        matrix = np.ndarray((len(OHLCV_COLUMNS), total), dtype=np.float64, buffer=self._shm.buf)
+        for symbol, (start, stop) in self.layout.items():
+            df = frames[symbol]
+            matrix[0, start:stop] = timestamps_ms(df)
+            for row, column in enumerate(OHLCV_COLUMNS[1:], start=1):
+                matrix[row, start:stop] = df[column].values
+        del matrix  # інакше буфер не звільниться при close()
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def handle(self, symbol: str) -> FrameHandle:
+        start, stop = self.layout[symbol]
+        return self.name, self.total, start, stop
+
+    def close(self):
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_frame(handle: FrameHandle) -> pd.DataFrame:
+    """DataFrame свічок символу з блоку shared_memory (копія зрізу)"""
+    name, total, start, stop = handle
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        matrix = np.ndarray((len(OHLCV_COLUMNS), total), dtype=np.float64, buffer=shm.buf)
+        df = pd.DataFrame({column: matrix[row, start:stop].copy() for row, column in enumerate(OHLCV_COLUMNS)})
+        del matrix
+    finally:
+        shm.close()
+    df['timestamp'] = pd.to_datetime(df['timestamp'].astype(np.int64), unit='ms')
+    return df
@@ -0,0 +1,278 @@
+# backend/app/futures/models/signal_scoring.py
+import warnings
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .kernels import rolling_max, rolling_mean, rolling_min
+
+# Векторні версії правил оцінки AIAnalyzer (_analyze_trend/_momentum/_risk/
+# _volume/_structure, _calculate_total_confidence, _calculate_conflict_score).
+# Пороги ті самі, що в скалярних методах; результат - масив на кожну свічку,
+# значення на останній свічці збігається з живим сигналом.
+
+LONG, SHORT, NEUTRAL = 1, -1, 0
+DIRECTION_NAMES = {LONG: 'long', SHORT: 'short', NEUTRAL: 'neutral'}
+
+CATEGORY_WEIGHTS = {
+    'trend': 0.30,
+    'momentum': 0.25,
+    'risk': 0.20,
+    'volume': 0.15,
+    'structure': 0.10,
+}
+
+# Пороги оцінки (AIAnalyzer.ADX_TREND / RSI_BANDS)
+DEFAULT_THRESHOLDS = {
+    'adx_trend': 20,
+    'rsi_bands': (35, 45, 55, 65),
+}
+
+# Ключі індикаторів, які читає оцінка
+SCORING_INDICATORS = (
+    'close', 'volume', 'ema_20', 'ema_50', 'ema_200', 'adx', 'rsi', 'macd_hist', 'stoch_k', 'cci',
+    'williams_r', 'atr', 'bb_upper', 'bb_lower', 'obv', 'tenkan_sen', 'kijun_sen',
+    'morning_star', 'evening_star', 'engulfing',
+)
+
+
+def _fill_nan(values: np.ndarray, fill) -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    return np.where(np.isnan(values), fill, values)
+
+
+def _round(values: np.ndarray, digits: int) -> np.ndarray:
+    """
+    round() для float по масиву: np.round множить на 10**digits і на майже
+    половинних значеннях може округлити інакше - їх доокруглюємо поштучно
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, digits)
+    scaled = values * 10.0 ** digits
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_half.any():
+        rounded[near_half] = [round(float(value), digits) for value in values[near_half]]
+    return rounded
+
+
+def _lagged(values: np.ndarray, lag: int, fill: float = np.nan) -> np.ndarray:
+    """values[i - lag] (fill для перших lag свічок)"""
+    out = np.full(len(values), fill, dtype=float)
+    out[lag:] = values[:len(values) - lag]
+    return out
+
+
+def _window_range(close: np.ndarray, window: int) -> np.ndarray:
+    """max - min останніх window цін (на початку ряду - по наявних)"""
+    high, low = rolling_max(close, window), rolling_min(close, window)
+    head = min(window - 1, len(close))
+    high[:head] = np.maximum.accumulate(close[:head])
+    low[:head] = np.minimum.accumulate(close[:head])
+    return high - low
+
+
+# ====== КАТЕГОРІЇ ======
+
+def score_trend(close: np.ndarray, ema_20: np.ndarray, ema_50: np.ndarray, ema_200: np.ndarray,
+                adx: np.ndarray, adx_trend: float = 20) -> Dict[str, np.ndarray]:
+    e20, e50, e200 = _fill_nan(ema_20, close), _fill_nan(ema_50, close), _fill_nan(ema_200, close)
+    adx = _fill_nan(adx, 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        long_strength = np.where(e200 == 0, 0, np.minimum(1.0, (e20 - e200) / e200 * 3))
+        short_strength = np.where(e20 == 0, 0, np.minimum(1.0, (e200 - e20) / e20 * 3))
+        range_percent = np.where(close > 0, _window_range(close, 20) / close, 0)
+
+    strong_long = (e20 > e50) & (e50 > e200) & (adx > adx_trend)
+    strong_short = (e20 < e50) & (e50 < e200) & (adx > adx_trend)
+    ranging = ~strong_long & ~strong_short & (range_percent < 0.01)
+
+    direction = np.select(
+        [strong_long, strong_short, ranging, e20 > e50],
+        [LONG, SHORT, NEUTRAL, LONG], default=SHORT
+    ).astype(np.int8)
+    score = np.select(
+        [strong_long, strong_short, ranging],
+        [0.6 + long_strength * 0.4, 0.6 + short_strength * 0.4, 0.2], default=0.4
+    )
+    return {'direction': direction, 'score': _round(score, 3), 'adx': adx}
+
+
+def score_momentum(direction: np.ndarray, close: np.ndarray, rsi: np.ndarray, macd_hist: np.ndarray,
+                   stoch_k: np.ndarray, cci: np.ndarray, williams_r: np.ndarray,
+                   rsi_bands=(35, 45, 55, 65)) -> Dict[str, np.ndarray]:
+    is_long, is_short = direction == LONG, direction == SHORT
+
+    # RSI (для neutral діє гілка short, як у скалярному методі)
+    rsi = _fill_nan(rsi, 50)
+    oversold, weak, strong, overbought = rsi_bands
+    rsi_score = np.where(
+        is_long,
+        np.select([rsi < oversold, rsi < weak, rsi < strong, rsi < overbought], [0.9, 0.8, 0.6, 0.4], default=0.2),
+        np.select([rsi > overbought, rsi > strong, rsi > weak, rsi > oversold], [0.9, 0.8, 0.6, 0.4], default=0.2),
+    )
+
+    # MACD: поточна гістограма + середня за 5 свічок (без NaN); враховується з 6-ї свічки
+    has_macd = np.arange(len(macd_hist)) >= 5
+    macd_current = _fill_nan(macd_hist, 0)
+    macd_trend = np.full(len(macd_hist), np.nan)
+    if len(macd_hist) >= 5:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # вікно з одних NaN
+            macd_trend[4:] = np.nanmean(sliding_window_view(np.asarray(macd_hist, dtype=float), 5), axis=-1)
+    macd_bonus = 0.8 + np.minimum(0.2, np.abs(macd_current) / np.maximum(close, 1) * 1000)
+    macd_score = np.select(
+        [is_long & (macd_current > 0) & (macd_trend > 0), is_short & (macd_current < 0) & (macd_trend < 0)],
+        [macd_bonus, macd_bonus], default=0.3
+    )
+    macd_score = np.where(has_macd, macd_score, 0.0)
+
+    stoch = _fill_nan(stoch_k, 50)
+    stoch_score = np.where(
+        is_long,
+        np.select([stoch < 25, stoch < 35, stoch < 70], [0.9, 0.8, 0.6], default=0.3),
+        np.select([stoch > 75, stoch > 65, stoch > 30], [0.9, 0.8, 0.6], default=0.3),
+    )
+
+    cci = _fill_nan(cci, 0)
+    cci_score = np.select(
+        [is_long & (cci < -100), is_short & (cci > 100), (cci > -100) & (cci < 100)],
+        [0.9, 0.9, 0.5], default=0.3
+    )
+
+    williams = _fill_nan(williams_r, -50)
+    williams_score = np.select(
+        [is_long & (williams < -80), is_short & (williams > -20), (williams >= -80) & (williams <= -20)],
+        [0.9, 0.9, 0.5], default=0.3
+    )
+
+    score = 0 + rsi_score * 0.3 + macd_score * 0.25 + stoch_score * 0.2 + cci_score * 0.15 + williams_score * 0.1
+    return {
+        'score': _round(score, 3),
+        'rsi_level': np.round(rsi, 1),
+        'macd_hist': np.round(macd_current, 4),
+        'has_macd': has_macd,
+    }
+
+
+def score_risk(close: np.ndarray, atr: np.ndarray, bb_upper: np.ndarray, bb_lower: np.ndarray) -> Dict[str, np.ndarray]:
+    atr = _fill_nan(atr, 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        atr_percent = np.where(close > 0, atr / close * 100, 0)
+    volatility = np.select(
+        [(atr_percent > 0.5) & (atr_percent < 2.5), (atr_percent >= 2.5) & (atr_percent < 4), atr_percent < 0.5],
+        [0.9, 0.7, 0.5], default=0.3
+    )
+
+    upper = _fill_nan(bb_upper, close * 1.02)
+    lower = _fill_nan(bb_lower, close * 0.98)
+    width = upper - lower
+    with np.errstate(divide='ignore', invalid='ignore'):
+        position = np.where(width > 0, (close - lower) / width, 0.5)
+    bb_score = np.select(
+        [position < 0.15, position > 0.85, (position > 0.35) & (position < 0.65)],
+        [np.where(close > lower, 0.9, 0.6), np.where(close < upper, 0.9, 0.6), 0.7], default=0.5
+    )
+
+    return {'score': _round(volatility * 0.6 + bb_score * 0.4, 3), 'atr': atr, 'volatility': volatility}
+
+
+def score_volume(volume: np.ndarray, obv: np.ndarray) -> Dict[str, np.ndarray]:
+    average = rolling_mean(volume, 20)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(average > 0, volume / average, 1.0)
+    score = np.select([ratio > 1.8, ratio > 1.4, ratio > 1.0, ratio > 0.7], [0.9, 0.8, 0.7, 0.6], default=0.4)
+
+    obv = _fill_nan(obv, 0)
+    obv_bullish = obv > _lagged(obv, 9, fill=0)  # obv[-1] > obv[-10]
+
+    # менше 20 свічок - нейтральна оцінка без OBV, як у скалярному методі
+    short_history = np.arange(len(volume)) < 19
+    return {
+        'score': np.where(short_history, 0.5, score),
+        'volume_ratio': np.where(short_history, 1.0, np.round(ratio, 2)),
+        'obv_bullish': obv_bullish,
+        'has_obv': ~short_history,
+    }
+
+
+def score_structure(tenkan_sen: np.ndarray, kijun_sen: np.ndarray, morning_star: np.ndarray,
+                    evening_star: np.ndarray, engulfing: np.ndarray) -> Dict[str, np.ndarray]:
+    ichimoku_bullish = _fill_nan(tenkan_sen, 0) > _fill_nan(kijun_sen, 0)
+    ichimoku_score = np.where(ichimoku_bullish, 0.8, 0.2)
+    pattern_score = np.select(
+        [morning_star > 0, evening_star > 0, engulfing > 0],
+        [0.9, 0.1, 0.8], default=0.2
+    )
+    return {'score': _round(0 + ichimoku_score * 0.4 + pattern_score * 0.3, 3), 'ichimoku_bullish': ichimoku_bullish}
+
+
+# ====== ЗВЕДЕННЯ ======
+
+def total_confidence(scores: Mapping[str, np.ndarray], weights: Optional[Mapping[str, float]] = None) -> np.ndarray:
+    """Зважена сума категорій з корекцією за узгодженість (std оцінок)"""
+    weights = weights or CATEGORY_WEIGHTS
+    total = (scores['trend'] * weights['trend'] + scores['momentum'] * weights['momentum'] +
+             scores['risk'] * weights['risk'] + scores['volume'] * weights['volume'] +
+             scores['structure'] * weights['structure'])
+
+    spread = np.std(np.vstack([scores[name] for name in CATEGORY_WEIGHTS]), axis=0)
+    total = np.where(spread < 0.1, total * 1.1, np.where(spread > 0.25, total * 0.9, total))
+    return _round(np.clip(total, 0.0, 1.0), 3)
+
+
+def conflict_score(trend_score: np.ndarray, rsi_level: np.ndarray, macd_hist: np.ndarray,
+                   volume_ratio: np.ndarray, obv_bullish: np.ndarray, ichimoku_bullish: np.ndarray,
+                   has_macd: np.ndarray, has_obv: np.ndarray) -> np.ndarray:
+    """
+    Частка конфліктів між індикаторами, як у _calculate_conflict_score:
+    перевірки MACD та OBV рахуються лише там, де є ці фактори
+    """
+    rsi_conflict = ((rsi_level > 65) & (trend_score > 0.7)) | ((rsi_level < 35) & (trend_score < 0.3))
+    macd_conflict = has_macd & (((macd_hist > 0) & (trend_score < 0.3)) | ((macd_hist < 0) & (trend_score > 0.7)))
+    volume_conflict = has_obv & (volume_ratio < 0.7) & obv_bullish
+    ichimoku_conflict = (~ichimoku_bullish & (trend_score > 0.7)) | (ichimoku_bullish & (trend_score < 0.3))
+
+    conflicts = (rsi_conflict.astype(int) + macd_conflict.astype(int) +
+                 volume_conflict.astype(int) + ichimoku_conflict.astype(int))
+    checks = 2 + has_macd.astype(int) + has_obv.astype(int)
+    return conflicts / checks
+
+
+def score_series(indicators: Mapping[str, np.ndarray], weights: Optional[Mapping[str, float]] = None,
+                 thresholds: Optional[Mapping] = None) -> Dict[str, np.ndarray]:
+    """
+    Оцінки на кожній свічці: напрямок тренду (LONG/SHORT/NEUTRAL), оцінки
+    категорій, загальна впевненість та рівень конфліктів.
+    indicators - результат AIAnalyzer.calculate_indicators (або LazyIndicators).
+    """
+    thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    close = np.asarray(indicators['close'], dtype=float)
+    trend = score_trend(close, indicators['ema_20'], indicators['ema_50'], indicators['ema_200'], indicators['adx'],
+                        thresholds['adx_trend'])
+    momentum = score_momentum(trend['direction'], close, indicators['rsi'], indicators['macd_hist'],
+                              indicators['stoch_k'], indicators['cci'], indicators['williams_r'],
+                              thresholds['rsi_bands'])
+    risk = score_risk(close, indicators['atr'], indicators['bb_upper'], indicators['bb_lower'])
+    volume = score_volume(np.asarray(indicators['volume'], dtype=float), indicators['obv'])
+    structure = score_structure(indicators['tenkan_sen'], indicators['kijun_sen'], indicators['morning_star'],
+                                indicators['evening_star'], indicators['engulfing'])
+
+    scores = {
+        'trend': trend['score'],
+        'momentum': momentum['score'],
+        'risk': risk['score'],
+        'volume': volume['score'],
+        'structure': structure['score'],
+    }
+    return {
+        'direction': trend['direction'],
+        **{f'{name}_score': values for name, values in scores.items()},
+        'confidence': total_confidence(scores, weights),
+        'conflict': conflict_score(trend['score'], momentum['rsi_level'], momentum['macd_hist'],
+                                   volume['volume_ratio'], volume['obv_bullish'], structure['ichimoku_bullish'],
+                                   momentum['has_macd'], volume['has_obv']),
+        'atr': risk['atr'],
+        'volatility': risk['volatility'],
+    }
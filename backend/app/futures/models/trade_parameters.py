@@ -0,0 +1,127 @@
+# backend/app/futures/models/trade_parameters.py
+from typing import Dict
+
+import numpy as np
+
+from .signal_scoring import LONG, SHORT, _round
+
+# Векторні відповідники _calculate_entry_points / _calculate_tp_sl_points /
+# _calculate_risk_reward / _calculate_position_size / _validate_signal з
+# models/ai_analyzer: масиви напрямків (LONG/SHORT), цін, ATR і рівнів
+# (NaN - рівня немає) замість словника на кожен сигнал. Округлення - як у
+# скалярних методах, тож значення збігаються поелементно.
+
+
+def direction_codes(directions) -> np.ndarray:
+    """Напрямки як коди LONG/SHORT ('long'/'short' або вже коди)"""
+    directions = np.asarray(directions)
+    if directions.dtype.kind in 'UO':
+        return np.where(directions == 'long', LONG, SHORT)
+    return directions
+
+
+def _has_level(levels: np.ndarray) -> np.ndarray:
+    """Рівень заданий (у скалярній версії None/0 - немає рівня)"""
+    return ~np.isnan(levels) & (levels != 0)
+
+
+def entry_prices(direction: np.ndarray, price: np.ndarray, support: np.ndarray,
+                 resistance: np.ndarray) -> np.ndarray:
+    """Оптимальний вхід: long - на підтримці, short - на опорі, без рівня - ±0.5% від ціни"""
+    entry = np.where(
+        direction == LONG,
+        np.where(_has_level(support), support, price * 0.995),
+        np.where(_has_level(resistance), resistance, price * 1.005),
+    )
+    return _round(entry, 4)
+
+
+def take_profit_stop_loss(direction: np.ndarray, entry: np.ndarray, atr: np.ndarray, support: np.ndarray,
+                          resistance: np.ndarray):
+    """TP/SL від рівнів з обмеженням ATR (3 ATR / 1 ATR) та мінімальною відстанню 0.2%"""
+    is_long = direction == LONG
+    has_support, has_resistance = _has_level(support), _has_level(resistance)
+
+    take_profit = np.where(
+        is_long,
+        np.where(has_resistance, np.minimum(resistance * 0.995, entry + (atr * 3.0)), entry + (atr * 3.0)),
+        np.where(has_support, np.maximum(support * 1.005, entry - (atr * 3.0)), entry - (atr * 3.0)),
+    )
+    stop_loss = np.where(
+        is_long,
+        np.where(has_support, np.maximum(support * 1.005, entry - (atr * 1.0)), entry - (atr * 1.0)),
+        np.where(has_resistance, np.minimum(resistance * 0.995, entry + (atr * 1.0)), entry + (atr * 1.0)),
+    )
+
+    min_distance = entry * 0.002
+    take_profit = np.where(np.abs(take_profit - entry) < min_distance,
+                           np.where(is_long, entry + min_distance, entry - min_distance), take_profit)
+    stop_loss = np.where(np.abs(stop_loss - entry) < min_distance,
+                         np.where(is_long, entry - min_distance, entry + min_distance), stop_loss)
+    return _round(take_profit, 4), _round(stop_loss, 4)
+
+
+def risk_reward(entry: np.ndarray, take_profit: np.ndarray, stop_loss: np.ndarray) -> np.ndarray:
+    """Прибуток / ризик (1.0 при нульовому вході чи ризику)"""
+    profit = np.abs(take_profit - entry)
+    risk = np.abs(stop_loss - entry)
+    degenerate = (entry == 0) | (risk == 0)
+    ratio = profit / np.where(degenerate, 1.0, risk)
+    return np.where(degenerate, 1.0, _round(ratio, 2))
+
+
+def position_size(entry: np.ndarray, stop_loss: np.ndarray, volatility: np.ndarray, confidence: np.ndarray,
+                  base_risk: float = 0.02, max_position: float = 5.0) -> Dict[str, np.ndarray]:
+    """Розмір позиції (% капіталу) з корекцією за волатильність і впевненість"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stop_distance_pct = np.abs(entry - stop_loss) / entry * 100
+    sized = (entry != 0) & (entry != stop_loss) & (stop_distance_pct != 0)
+
+    volatility_adjustment = np.select([volatility < 0.4, volatility > 0.8, volatility > 0.6], [1.3, 0.7, 0.8], 1.0)
+    confidence_adjustment = np.select(
+        [confidence >= 0.8, confidence >= 0.7, confidence <= 0.5, confidence <= 0.6], [1.2, 1.1, 0.7, 0.8], 1.0
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        size = np.minimum((base_risk * 100) / stop_distance_pct * volatility_adjustment * confidence_adjustment,
+                          max_position)
+
+    return {
+        'size_percent': np.where(sized, _round(np.where(sized, size, 0.0), 2), 0.0),
+        'volatility_adjustment': np.where(sized, volatility_adjustment, 1.0),
+        'confidence_adjustment': np.where(sized, confidence_adjustment, 1.0),
+        'stop_distance_pct': np.where(sized, _round(np.where(sized, stop_distance_pct, 0.0), 2), 0.0),
+        'sized': sized,
+    }
+
+
+def position_size_record(sizes: Dict[str, np.ndarray], index: int, base_risk: float = 0.02,
+                         max_position: float = 5.0) -> Dict:
+    """Словник position_size сигналу (як у _calculate_position_size) з масивів position_size()"""
+    if not sizes['sized'][index]:
+        return {
+            'size_percent': 0,
+            'risk_per_trade': base_risk * 100,
+            'volatility_adjustment': 1.0,
+            'confidence_adjustment': 1.0,
+        }
+    return {
+        'size_percent': float(sizes['size_percent'][index]),
+        'risk_per_trade': round(base_risk * 100, 2),
+        'volatility_adjustment': float(sizes['volatility_adjustment'][index]),
+        'confidence_adjustment': float(sizes['confidence_adjustment'][index]),
+        'max_position_percent': max_position,
+        'stop_distance_pct': float(sizes['stop_distance_pct'][index]),
+    }
+
+
+def valid_signals(confidence: np.ndarray, risk_reward_ratio: np.ndarray, conflict: np.ndarray, entry: np.ndarray,
+                  take_profit: np.ndarray, stop_loss: np.ndarray, min_confidence: float = 0.5,
+                  min_rr: float = 2.0, max_conflict: float = 0.4) -> np.ndarray:
+    """Маска _validate_signal (confidence/conflict - уже округлені, як у сигналі)"""
+    tp_distance = np.abs(take_profit - entry)
+    sl_distance = np.abs(stop_loss - entry)
+    min_distance = entry * 0.001
+    return (
+        (confidence >= min_confidence) & (risk_reward_ratio >= min_rr) & (conflict <= max_conflict) &
+        (tp_distance != 0) & (sl_distance != 0) & (tp_distance >= min_distance) & (sl_distance >= min_distance)
+    )
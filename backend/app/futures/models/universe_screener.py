@@ -0,0 +1,179 @@
+# backend/app/futures/models/universe_screener.py
+import logging
+import time
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from .batch_indicators import ema
+from .kernels import rolling_mean
+
+logger = logging.getLogger(__name__)
+
+# Перший етап відбору: дешеві ознаки по короткому хвосту свічок і bulk-тікерах,
+# пораховані одним векторним проходом по матриці (символи × свічки).
+# Повний generate_trading_signal отримують лише top_k кандидатів.
+
+SCREENER_WEIGHTS = {'volatility': 0.25, 'volume': 0.25, 'trend': 0.3, 'levels': 0.2}
+
+
+class UniverseScreener:
+    """
+    Скринер ф'ючерсного універсу. Ознаки кожного символу:
+    - volatility: перцентиль поточного NATR серед значень хвоста;
+    - volume: сплеск об'єму останньої свічки відносно середнього;
+    - trend: нахил EMA за slope_lag свічок у одиницях ATR;
+    - levels: близькість ціни до максимуму/мінімуму level_window свічок (в ATR).
+    Кожна ознака нормується до [0, 1], оцінка - зважена сума (weights).
+    """
+
+    def __init__(self, top_k: int = 20, tail: int = 64, min_score: float = 0.4,
+                 min_quote_volume: float = 0.0, weights: Optional[Mapping[str, float]] = None,
+                 atr_period: int = 14, ema_period: int = 20, slope_lag: int = 5,
+                 volume_window: int = 20, level_window: int = 48,
+                 volume_cap: float = 3.0, slope_cap: float = 2.0, level_cap: float = 3.0):
+        self.top_k = top_k
+        self.tail = tail                          # свічок на символ (мінімум для оцінки)
+        self.min_score = min_score
+        self.min_quote_volume = min_quote_volume  # 24h обіг у USDT з тікера; 0 - без фільтра
+        self.weights = dict(weights or SCREENER_WEIGHTS)
+        self.atr_period = atr_period
+        self.ema_period = ema_period
+        self.slope_lag = slope_lag
+        self.volume_window = volume_window
+        self.level_window = level_window
+        # Значення ознак, що дають максимальну оцінку
+        self.volume_cap = volume_cap  # об'єм у volume_cap разів вищий за середній
+        self.slope_cap = slope_cap    # EMA пройшла slope_cap ATR за slope_lag свічок
+        self.level_cap = level_cap    # далі level_cap ATR від рівня - нуль
+        self.stats = {'scans': 0, 'scanned': 0, 'passed': 0}
+
+        required = max(atr_period + 1, volume_window + 1, level_window, ema_period, slope_lag + 1)
+        if tail < required:
+            raise ValueError(f"Хвіст скринера ({tail}) коротший за потрібні вікна ({required})")
+
+    @property
+    def pass_rate(self) -> float:
+        """Частка символів, що пройшли в повний аналіз, за всі скани"""
+        return self.stats['passed'] / self.stats['scanned'] if self.stats['scanned'] else 0.0
+
+    # ====== ДАНІ ======
+
+    def stack_tails(self, frames: Mapping[str, pd.DataFrame]):
+        """Останні tail свічок символів з достатньою історією - у матриці"""
+        symbols = [symbol for symbol, df in frames.items() if df is not None and len(df) >= self.tail]
+        matrices = {
+            column: np.array([frames[symbol][column].values[-self.tail:] for symbol in symbols],
+                             dtype=float).reshape(len(symbols), self.tail)
+            for column in ('high', 'low', 'close', 'volume')
+        }
+        return symbols, matrices
+
+    # ====== ОЗНАКИ ======
+
+    def features(self, high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+                 price: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """Сирі ознаки для матриць (символи × свічки); price - поточна ціна (типово close)"""
+        price = close[:, -1] if price is None else price
+        prev_close = close[:, :-1]
+        true_range = np.maximum(high[:, 1:] - low[:, 1:],
+                                np.maximum(np.abs(high[:, 1:] - prev_close), np.abs(low[:, 1:] - prev_close)))
+        atr = rolling_mean(true_range, self.atr_period)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            natr = atr / close[:, 1:]
+            valid = ~np.isnan(natr)
+            atr_percentile = ((natr <= natr[:, -1:]) & valid).sum(axis=1) / valid.sum(axis=1)
+
+            # Нульовий знаменник (без об'єму / без руху ціни) - ознака невизначена (NaN), оцінка 0
+            mean_volume = volume[:, -1 - self.volume_window:-1].mean(axis=1)
+            volume_surge = volume[:, -1] / np.where(mean_volume > 0, mean_volume, np.nan)
+            last_atr = np.where(atr[:, -1] > 0, atr[:, -1], np.nan)
+
+            line = ema(close, self.ema_period)
+            ema_slope = (line[:, -1] - line[:, -1 - self.slope_lag]) / last_atr
+
+            highest = high[:, -self.level_window:].max(axis=1)
+            lowest = low[:, -self.level_window:].min(axis=1)
+            level_distance = np.minimum(np.abs(highest - price), np.abs(price - lowest)) / last_atr
+
+        return {
+            'atr_percentile': atr_percentile,
+            'volume_surge': volume_surge,
+            'ema_slope': ema_slope,
+            'level_distance': level_distance,
+        }
+
+    def score(self, features: Dict[str, np.ndarray]) -> np.ndarray:
+        """Зважена оцінка [0, 1]; символи з невизначеними ознаками - 0"""
+        parts = {
+            'volatility': features['atr_percentile'],
+            'volume': (features['volume_surge'] - 1) / (self.volume_cap - 1),
+            'trend': np.abs(features['ema_slope']) / self.slope_cap,
+            'levels': 1 - features['level_distance'] / self.level_cap,
+        }
+        total = sum(self.weights.values())
+        score = sum(np.clip(parts[name], 0.0, 1.0) * weight for name, weight in self.weights.items()) / total
+        return np.nan_to_num(score, nan=0.0)
+
+    # ====== ВІДБІР ======
+
+    def screen(self, frames: Mapping[str, pd.DataFrame], tickers: Optional[Mapping[str, Dict]] = None,
+               top_k: Optional[int] = None) -> Dict:
+        """
+        Відбір кандидатів для повного аналізу. tickers - bulk-тікери
+        ({symbol: {'last', 'quoteVolume', ...}}): поточна ціна та фільтр обігу.
+        """
+        started = time.perf_counter()
+        tickers = tickers or {}
+        top_k = self.top_k if top_k is None else top_k
+
+        symbols, matrices = self.stack_tails(frames)
+        if self.min_quote_volume > 0 and symbols:
+            liquid = [float((tickers.get(symbol) or {}).get('quoteVolume') or 0) >= self.min_quote_volume
+                      for symbol in symbols]
+            symbols = [symbol for symbol, keep in zip(symbols, liquid) if keep]
+            matrices = {column: values[np.array(liquid)] for column, values in matrices.items()}
+        stacked = time.perf_counter()
+
+        ranking: List[Dict] = []
+        if symbols:
+            price = np.array([float((tickers.get(symbol) or {}).get('last') or np.nan) for symbol in symbols])
+            price = np.where(np.isnan(price), matrices['close'][:, -1], price)
+            features = self.features(matrices['high'], matrices['low'], matrices['close'], matrices['volume'], price)
+            scores = self.score(features)
+
+            order = np.argsort(-scores, kind='stable')
+            selected = order[scores[order] >= self.min_score][:top_k]
+            ranking = [
+                {
+                    'symbol': symbols[i],
+                    'score': round(float(scores[i]), 4),
+                    'trend': 'up' if features['ema_slope'][i] > 0 else 'down',
+                    **{name: round(float(values[i]), 4) if np.isfinite(values[i]) else None
+                       for name, values in features.items()},
+                }
+                for i in selected
+            ]
+        finished = time.perf_counter()
+
+        scanned = len(frames)
+        self.stats['scans'] += 1
+        self.stats['scanned'] += scanned
+        self.stats['passed'] += len(ranking)
+
+        logger.info(f"🔎 Скринер: {len(ranking)}/{scanned} символів у повний аналіз "
+                    f"за {(finished - started) * 1000:.1f} мс")
+        return {
+            'candidates': [row['symbol'] for row in ranking],
+            'ranking': ranking,
+            'scanned': scanned,
+            'eligible': len(symbols),
+            'passed': len(ranking),
+            'pass_rate': round(len(ranking) / scanned, 4) if scanned else 0.0,
+            'timings_ms': {
+                'stack': round((stacked - started) * 1000, 3),
+                'score': round((finished - stacked) * 1000, 3),
+            },
+        }
@@ -0,0 +1,236 @@
+# backend/app/futures/models/volume_profile.py
+import math
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .indicator_engine import _timestamps
+
+# Профіль об'єму за ціною: об'єм свічки рівномірно розподіляється по кошиках
+# між її low та high. Кошики логарифмічні (ширина - bin_percent від ціни),
+# тож сітка не перебудовується, коли ціна йде далеко від старту.
+# Рівні - вузли високого об'єму (локальні максимуми профілю).
+
+
+class VolumeProfileIndex:
+    """
+    Індекс рівнів однієї пари (symbol, timeframe) на профілі об'єму.
+    Оновлюється інкрементально (нова свічка - O(кошиків свічки)), найближчі
+    підтримка/опір - бінарним пошуком по відсортованих рівнях.
+    window - скільки останніх свічок формують профіль (None - уся історія).
+    """
+
+    def __init__(self, bin_percent: float = 0.005, window: Optional[int] = 500,
+                 node_radius: int = 2, min_volume_ratio: float = 1.0):
+        self.step = math.log1p(bin_percent)
+        self.window = window
+        self.node_radius = node_radius            # кошиків з кожного боку для локального максимуму
+        self.min_volume_ratio = min_volume_ratio  # вузол - не менше за середній об'єм кошика × ratio
+        self.updates = 0
+        self.bootstraps = 0
+        self.reset()
+
+    def reset(self):
+        self._volume = np.zeros(0)
+        self._base = 0  # індекс кошика для _volume[0]
+        self._candles: Deque[Tuple[int, int, int, float]] = deque()  # (timestamp, перший, останній кошик, об'єм на кошик)
+        self._levels: Optional[np.ndarray] = None
+
+    @property
+    def length(self) -> int:
+        return len(self._candles)
+
+    # ====== КОШИКИ ======
+
+    def _bin(self, price: np.ndarray) -> np.ndarray:
+        return np.floor(np.log(price) / self.step).astype(np.int64)
+
+    def _ensure_range(self, first: int, last: int):
+        """Розширення щільного масиву кошиків, щоб вмістити [first, last]"""
+        if len(self._volume) == 0:
+            self._base = first
+            self._volume = np.zeros(last - first + 1)
+            return
+        top = self._base + len(self._volume) - 1
+        if first >= self._base and last <= top:
+            return
+        pad = max(16, len(self._volume) // 2)
+        new_base = min(first, self._base) - (pad if first < self._base else 0)
+        new_top = max(last, top) + (pad if last > top else 0)
+        grown = np.zeros(new_top - new_base + 1)
+        grown[self._base - new_base:self._base - new_base + len(self._volume)] = self._volume
+        self._volume, self._base = grown, new_base
+
+    def _add(self, first: int, last: int, share: float, sign: float = 1.0):
+        self._ensure_range(first, last)
+        segment = self._volume[first - self._base:last - self._base + 1]
+        segment += sign * share
+        if sign < 0:
+            np.maximum(segment, 0.0, out=segment)  # залишки округлення після вилучення
+        self._levels = None
+
+    # ====== ОНОВЛЕННЯ ======
+
+    def _candle(self, high: float, low: float, volume: float) -> Tuple[int, int, float]:
+        """(перший кошик, останній кошик, об'єм на кошик) для свічки"""
+        low, high = min(low, high), max(low, high)
+        if low <= 0 or volume <= 0:
+            return 0, 0, 0.0
+        first, last = (int(b) for b in self._bin(np.array([low, high])))  # як у bootstrap
+        return first, last, volume / (last - first + 1)
+
+    def update(self, high: float, low: float, volume: float, timestamp: Optional[int] = None):
+        """Додавання однієї свічки; найстаріша виходить з вікна"""
+        first, last, share = self._candle(high, low, volume)
+        if share:
+            self._add(first, last, share)
+        self._candles.append((timestamp, first, last, share))
+        self.updates += 1
+
+        if self.window is not None and len(self._candles) > self.window:
+            _, old_first, old_last, old_share = self._candles.popleft()
+            if old_share:
+                self._add(old_first, old_last, old_share, sign=-1.0)
+
+    def replace_last(self, high: float, low: float, volume: float, timestamp: Optional[int] = None):
+        """Заміна останньої (незакритої) свічки"""
+        _, first, last, share = self._candles.pop()
+        if share:
+            self._add(first, last, share, sign=-1.0)
+        self.update(high, low, volume, timestamp)
+        self.updates -= 1
+
+    def bootstrap(self, df: pd.DataFrame):
+        """Побудова профілю з нуля одним векторним проходом"""
+        self.reset()
+        self.bootstraps += 1
+        if self.window is not None:
+            df = df.tail(self.window)
+        if len(df) == 0:
+            return
+
+        high = np.maximum(df['high'].values, df['low'].values).astype(float)
+        low = np.minimum(df['high'].values, df['low'].values).astype(float)
+        volume = df['volume'].values.astype(float)
+        timestamps = _timestamps(df)
+
+        valid = (low > 0) & (volume > 0)
+        first = np.zeros(len(df), dtype=np.int64)
+        last = np.zeros(len(df), dtype=np.int64)
+        first[valid], last[valid] = self._bin(low[valid]), self._bin(high[valid])
+        counts = last - first + 1
+        share = np.where(valid, volume / counts, 0.0)
+
+        if valid.any():
+            base, top = first[valid].min(), last[valid].max()
+            # кошики всіх свічок: first..last кожної, розгорнуті в один масив
+            sizes = np.where(valid, counts, 0)
+            offsets = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+            bins = np.repeat(first, sizes) + offsets
+            self._base = int(base)
+            self._volume = np.bincount(bins - base, weights=np.repeat(share, sizes), minlength=int(top - base + 1))
+
+        for i in range(len(df)):
+            self._candles.append((None if timestamps is None else int(timestamps[i]),
+                                  int(first[i]), int(last[i]), float(share[i])))
+        self._levels = None
+
+    def sync(self, df: pd.DataFrame) -> 'VolumeProfileIndex':
+        """
+        Застосування нових свічок з df (за timestamp). Змінена остання свічка
+        замінюється, розрив у даних - повна перебудова.
+        """
+        timestamps = _timestamps(df)
+        last_ts = self._candles[-1][0] if self._candles else None
+        if timestamps is None or last_ts is None or len(df) == 0:
+            self.bootstrap(df)
+            return self
+
+        pos = int(np.searchsorted(timestamps, last_ts))
+        if pos >= len(timestamps) or timestamps[pos] != last_ts:
+            self.bootstrap(df)
+            return self
+
+        high, low, volume = (df[column].values.astype(float) for column in ('high', 'low', 'volume'))
+        if self._candle(high[pos], low[pos], volume[pos]) != self._candles[-1][1:]:
+            self.replace_last(high[pos], low[pos], volume[pos], last_ts)
+        for i in range(pos + 1, len(df)):
+            self.update(high[i], low[i], volume[i], int(timestamps[i]))
+        return self
+
+    # ====== РІВНІ ======
+
+    def levels(self) -> np.ndarray:
+        """Ціни вузлів високого об'єму (відсортовані; перераховуються після оновлень)"""
+        if self._levels is None:
+            self._levels = self._find_nodes()
+        return self._levels
+
+    def _find_nodes(self) -> np.ndarray:
+        volume = self._volume
+        filled = volume[volume > 0]
+        if len(filled) == 0:
+            return np.empty(0)
+
+        radius = self.node_radius
+        padded = np.pad(volume, radius)
+        local_max = volume == sliding_window_view(padded, 2 * radius + 1).max(axis=-1)
+        # на плато з однакових кошиків лишаємо перший
+        local_max[1:] &= ~(local_max[:-1] & (volume[1:] == volume[:-1]))
+        nodes = np.flatnonzero(local_max & (volume > 0) & (volume >= filled.mean() * self.min_volume_ratio))
+        return np.exp((self._base + nodes + 0.5) * self.step)
+
+    def nearest(self, price: float) -> Tuple[Optional[float], Optional[float]]:
+        """Найближчі підтримка (рівень ≤ price) та опір (рівень > price) за O(log n)"""
+        levels = self.levels()
+        pos = int(np.searchsorted(levels, price, side='right'))
+        support = float(levels[pos - 1]) if pos > 0 else None
+        resistance = float(levels[pos]) if pos < len(levels) else None
+        return support, resistance
+
+    def support_resistance(self, price: float, count: int = 5) -> Dict:
+        """Рівні у форматі AIAnalyzer.calculate_support_resistance"""
+        levels = self.levels()
+        pos = int(np.searchsorted(levels, price, side='right'))
+        supports, resistances = levels[max(0, pos - count):pos], levels[pos:pos + count]
+        nearest_support = float(supports[-1]) if len(supports) else None
+        nearest_resistance = float(resistances[0]) if len(resistances) else None
+
+        return {
+            'supports': [round(float(s), 4) for s in supports],
+            'resistances': [round(float(r), 4) for r in resistances],
+            'nearest_support': round(nearest_support, 4) if nearest_support else None,
+            'nearest_resistance': round(nearest_resistance, 4) if nearest_resistance else None,
+            'support_distance_pct': round((price - nearest_support) / price * 100, 2) if nearest_support else None,
+            'resistance_distance_pct': round((nearest_resistance - price) / price * 100, 2) if nearest_resistance else None,
+        }
+
+
+class VolumeProfileRegistry:
+    """Резидентні індекси рівнів, по одному на (symbol, timeframe)"""
+
+    def __init__(self, **index_kwargs):
+        self.index_kwargs = index_kwargs
+        self._indexes: Dict[Tuple[str, str], VolumeProfileIndex] = {}
+
+    def get(self, symbol: str, timeframe: str) -> VolumeProfileIndex:
+        key = (symbol, timeframe)
+        if key not in self._indexes:
+            self._indexes[key] = VolumeProfileIndex(**self.index_kwargs)
+        return self._indexes[key]
+
+    def nearest_batch(self, prices: Dict[str, float], timeframe: str) -> Dict[str, Tuple[Optional[float], Optional[float]]]:
+        """Найближчі рівні для багатьох символів з уже синхронізованими індексами"""
+        return {
+            symbol: self._indexes[(symbol, timeframe)].nearest(price)
+            for symbol, price in prices.items() if (symbol, timeframe) in self._indexes
+        }
+
+    def drop(self, symbol: str, timeframe: str):
+        self._indexes.pop((symbol, timeframe), None)
+
+    def __len__(self) -> int:
+        return len(self._indexes)
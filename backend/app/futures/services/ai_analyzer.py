@@ -4,19 +4,53 @@ import numpy as np
 from datetime import datetime
 from typing import Dict, Tuple, List, Optional
 import logging
+from app.core.market_cache import market_cache
+from app.futures.models.async_exchange_connector import AsyncExchangeConnector
 from app.futures.models.exchange_connector import ExchangeConnector
+from app.futures.models.batch_indicators import BATCH_INDICATORS, compute_batch, stack_frames
+from app.futures.models.indicator_plan import (
+    bands_from_std, ema_warmup, macd_from_emas, typical_price, typical_price_node, vwap_from_typical
+)
+from app.futures.models.kernels import obv, rolling_mad, rolling_max, rolling_min
+from app.futures.models.rolling_extrema import Extrema, channel_midpoint, rolling_extrema
+from app.futures.models.lazy_indicators import IndicatorNode, LazyIndicators, required_window
 
 class AIAnalyzer:
     """ПРОФЕСІЙНИЙ AI аналіз з повним набором індикаторів для максимальної точності"""
     
-    def __init__(self):
+    VERSION = "2.1"     # змінювати при зміні логіки сигналу (інвалідовує кеш сигналів)
+    FULL_HISTORY = 500  # свічок без режиму хвостового вікна
+    MIN_HISTORY = 100   # менше - fallback-сигнал
+    CHANNEL_WINDOWS = (9, 14, 26, 52)  # Tenkan, Williams %R, Kijun, Senkou B
+    
+    def __init__(self, tail_window: bool = False, tail_tolerance: float = 1e-6):
         self.exchange = ExchangeConnector()
+        # Пакетне завантаження свічок: паралельні запити на одній сесії біржі
+        self.async_exchange = AsyncExchangeConnector()
         self.logger = logging.getLogger(__name__)
+        self.indicator_nodes = self._build_indicator_nodes()
+        
+        # Хвостове вікно: сигнал читає лише останні значення індикаторів,
+        # тому завантажуємо і рахуємо тільки потрібний для них розгін.
+        # Вимкнене за замовчуванням: VWAP кумулятивний від початку вікна, і
+        # vwap_position на коротшому вікні може відрізнятися від повної історії
+        self.tail_window = tail_window
+        self.tail_tolerance = tail_tolerance
+        self.history_limit = self.analysis_window()
+    
+    @property
+    def version(self) -> str:
+        """Версія логіки + глибина історії: від обох залежить результат сигналу"""
+        return f"{self.VERSION}/{self.history_limit}"
         
-    def analyze_market(self, symbol: str, timeframe: str = "1h") -> Dict:
+    def analyze_market(self, symbol: str, timeframe: str = "1h", df: Optional[pd.DataFrame] = None,
+                       precomputed: Optional[Dict] = None) -> Dict:
         """
         ПРОФЕСІЙНИЙ аналіз з 8+ індикаторами для максимального прибутку
         
+        df / precomputed - вже завантажені свічки та пакетно пораховані
+        базові індикатори (див. analyze_markets)
+        
         Повертає: {
             "direction": "long"/"short"/"neutral",
             "confidence": 0.0-1.0,
@@ -31,13 +65,19 @@ class AIAnalyzer:
         start_time = datetime.now()
         
         try:
-            # 1. Отримуємо більше даних для точного аналізу
-            df = self.exchange.fetch_ohlcv(symbol, timeframe, limit=500)
-            if len(df) < 100:
+            # 1. Отримуємо історію, достатню для розгону всіх індикаторів
+            if df is None:
+                df = self.exchange.fetch_ohlcv(symbol, timeframe, limit=self.history_limit)
+            elif precomputed is None and len(df) > self.history_limit:
+                df = df.tail(self.history_limit).reset_index(drop=True)
+            if len(df) < self.MIN_HISTORY:
                 return self._get_fallback_signal(symbol)
             
-            # 2. Розраховуємо ПОВНИЙ НАБІР індикаторів
-            indicators = self._calculate_all_indicators(df)
+            # 2. Розраховуємо ПОВНИЙ НАБІР індикаторів (той самий df - один розрахунок)
+            indicators = market_cache.get_indicators(
+                'services', symbol, timeframe, df,
+                lambda: self._calculate_all_indicators(df, precomputed)
+            )
             
             # 3. ГЛИБОКИЙ аналіз з конфірмацією
             signal_analysis = self._deep_signal_analysis(df, indicators)
@@ -96,45 +136,159 @@ class AIAnalyzer:
             execution_time = (datetime.now() - start_time).total_seconds()
             self.logger.info(f"⏱️  Аналіз {symbol} зайняв {execution_time:.2f} секунд")
     
-    def _calculate_all_indicators(self, df: pd.DataFrame) -> Dict:
-        """РОЗРАХУНОК ВСІХ 8+ КРИТИЧНИХ ІНДИКАТОРІВ"""
-        close = df['close'].values
-        high = df['high'].values
-        low = df['low'].values
-        volume = df['volume'].values
+    def analyze_markets(self, symbols: List[str], timeframe: str = "1h",
+                        frames: Optional[Dict[str, pd.DataFrame]] = None) -> Dict[str, Dict]:
+        """
+        Пакетний аналіз кількох символів.
         
-        indicators = {
+        Базові індикатори (SMA/EMA/RSI/MACD/BB/ATR/Williams %R/CCI) рахуються
+        одним векторним проходом по матриці (символи × свічки) для кожної
+        групи символів з однаковою довжиною історії, решта - як у analyze_market.
+        """
+        frames = self.fetch_frames(symbols, timeframe, frames)
+        
+        # Групуємо за довжиною, щоб EMA рахувалась по тій самій історії
+        groups: Dict[int, Dict[str, pd.DataFrame]] = {}
+        for symbol, df in frames.items():
+            if symbol in symbols and df is not None and len(df) >= self.MIN_HISTORY:
+                groups.setdefault(len(df), {})[symbol] = df
+        
+        precomputed = {}
+        for group in groups.values():
+            group_symbols, matrices = stack_frames(group)
+            precomputed.update(self.calculate_indicators_batch(
+                group_symbols, matrices['high'], matrices['low'], matrices['close']))
+        
+        self.logger.info(f"📦 Пакетний розрахунок індикаторів: {len(precomputed)} символів, {len(groups)} груп")
+        
+        return {
+            symbol: self.analyze_market(symbol, timeframe, df=frames.get(symbol),
+                                        precomputed=precomputed.get(symbol))
+            for symbol in symbols
+        }
+    
+    def fetch_frames(self, symbols: List[str], timeframe: str = "1h",
+                     frames: Optional[Dict[str, pd.DataFrame]] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Свічки для символів (history_limit останніх) - паралельно через
+        AsyncExchangeConnector; вже передані frames не завантажуються
+        """
+        frames = dict(frames or {})
+        missing = [symbol for symbol in symbols if symbol not in frames]
+        if missing:
+            try:
+                frames.update(self.async_exchange.run(
+                    self.async_exchange.fetch_ohlcv_many(missing, timeframe, limit=self.history_limit)
+                ))
+            except Exception as e:
+                self.logger.warning(f"⚠️ Не вдалося завантажити свічки {len(missing)} символів: {e}")
+        return {
+            symbol: df.tail(self.history_limit).reset_index(drop=True) if df is not None else None
+            for symbol, df in frames.items()
+        }
+    
+    def calculate_indicators_batch(self, symbols: List[str], high: np.ndarray, low: np.ndarray,
+                                   close: np.ndarray) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Базові індикатори для матриць (символи × свічки) за один прохід NumPy.
+        Повертає {symbol: {indicator: рядок-view}} у форматі _calculate_all_indicators.
+        """
+        matrices = compute_batch(high, low, close)
+        return {
+            symbol: {key: values[row] for key, values in matrices.items()}
+            for row, symbol in enumerate(symbols)
+        }
+    
+    def _build_indicator_nodes(self) -> List[IndicatorNode]:
+        """
+        План розрахунку індикаторів. Спільні проміжні величини (EMA, RSI,
+        rolling std, typical price) - окремі вузли, тому MACD, Bollinger,
+        Stoch RSI, CCI та VWAP беруть їх готовими замість повторного розрахунку.
+        """
+        hlc = ('high', 'low', 'close')
+        
+        def node(outputs, inputs, func, internal=False, warmup=0):
+            return IndicatorNode((outputs,) if isinstance(outputs, str) else outputs, inputs, func,
+                                 internal, warmup)
+        
+        # warmup - свічки понад входи, потрібні для точного останнього значення
+        # (None - кумулятивний індикатор, відраховується від початку вікна)
+        return [
+            # СПІЛЬНІ ПРОМІЖНІ ВЕЛИЧИНИ
+            typical_price_node(),
+            node('close_std_20', ('close',), lambda c: pd.Series(c).rolling(window=20).std().values,
+                 internal=True, warmup=19),
+            node('channel_extrema', ('high', 'low'), lambda h, l: rolling_extrema(h, l, self.CHANNEL_WINDOWS),
+                 internal=True, warmup=max(self.CHANNEL_WINDOWS) - 1),
+            
             # БАЗОВІ
-            'sma_20': self._calculate_sma(close, 20),
-            'sma_50': self._calculate_sma(close, 50),
-            'sma_200': self._calculate_sma(close, 200),
-            'ema_12': self._calculate_ema(close, 12),
-            'ema_26': self._calculate_ema(close, 26),
-            'rsi': self._calculate_rsi(close, 14),
-            'macd': self._calculate_macd(close)[0],
-            'macd_signal': self._calculate_macd(close)[1],
-            'macd_histogram': self._calculate_macd(close)[2],
-            'bb_upper': self._calculate_bollinger_bands(close, 20, 2)[0],
-            'bb_middle': self._calculate_bollinger_bands(close, 20, 2)[1],
-            'bb_lower': self._calculate_bollinger_bands(close, 20, 2)[2],
-            'atr': self._calculate_atr(high, low, close, 14),
-            'current_price': close[-1],
-            'volume_array': volume,
+            node('sma_20', ('close',), lambda c: self._calculate_sma(c, 20), warmup=19),
+            node('sma_50', ('close',), lambda c: self._calculate_sma(c, 50), warmup=49),
+            node('sma_200', ('close',), lambda c: self._calculate_sma(c, 200), warmup=199),
+            node('ema_12', ('close',), lambda c: self._calculate_ema(c, 12), warmup=ema_warmup(12)),
+            node('ema_26', ('close',), lambda c: self._calculate_ema(c, 26), warmup=ema_warmup(26)),
+            node('rsi', ('close',), lambda c: self._calculate_rsi(c, 14), warmup=14),
+            # лінія MACD ~1% ціни - стартове відхилення сигнальної EMA відповідно менше
+            node(('macd', 'macd_signal', 'macd_histogram'), ('ema_12', 'ema_26'),
+                 lambda fast, slow: macd_from_emas(fast, slow, lambda line: self._calculate_ema(line, 9)),
+                 warmup=ema_warmup(9, deviation=0.01)),
+            node(('bb_upper', 'bb_middle', 'bb_lower'), ('sma_20', 'close_std_20'),
+                 lambda middle, std: bands_from_std(middle, std, 2)),
+            node('atr', hlc, lambda h, l, c: self._calculate_atr(h, l, c, 14), warmup=14),
             
             # НОВІ ПРОФІ ІНДИКАТОРИ ⭐⭐⭐
-            'vwap': self._calculate_vwap(df),
-            'stoch_rsi_k': self._calculate_stoch_rsi(close)[0],
-            'stoch_rsi_d': self._calculate_stoch_rsi(close)[1],
-            'ichimoku': self._calculate_ichimoku(df),
-            'obv': self._calculate_obv(close, volume),
-            'adl': self._calculate_adl(df),
-            'cci': self._calculate_cci(df, 20),
-            'williams_r': self._calculate_williams_r(df, 14),
+            node('vwap', ('typical_price', 'volume'), vwap_from_typical, warmup=None),
+            node(('stoch_rsi_k', 'stoch_rsi_d'), ('rsi',), self._stoch_from_rsi, warmup=13 + 2),
+            node('ichimoku', ('df', 'channel_extrema'), self._calculate_ichimoku, warmup=26),  # зсув 26
+            node('obv', ('close', 'volume'), self._calculate_obv, warmup=None),
+            node('adl', ('df',), self._calculate_adl, warmup=None),
+            node('cci', ('typical_price',), lambda tp: self._cci_from_typical(tp, 20), warmup=19),
+            node('williams_r', ('df', 'channel_extrema'), lambda df, e: self._calculate_williams_r(df, 14, e)),
             
             # ДОДАТКОВІ
-            'volume_sma': self._calculate_sma(volume, 20),
-            'price_change_24h': ((close[-1] - close[-24]) / close[-24]) * 100 if len(close) >= 24 else 0,
+            node('volume_sma', ('volume',), lambda v: self._calculate_sma(v, 20), warmup=19),
+        ]
+    
+    def analysis_window(self) -> int:
+        """
+        Скільки свічок завантажувати для аналізу. У режимі хвостового вікна -
+        мінімум, за якого останні значення всіх індикаторів збігаються з
+        розрахунком по повній історії в межах tail_tolerance (але не менше
+        MIN_HISTORY). VWAP/OBV/A/D кумулятивні й відраховуються від початку вікна.
+        """
+        if not self.tail_window:
+            return self.FULL_HISTORY
+        return max(self.MIN_HISTORY, required_window(self.indicator_nodes, self.tail_tolerance))
+    
+    def _indicator_plan(self, df: pd.DataFrame, precomputed: Optional[Dict] = None) -> LazyIndicators:
+        """Граф індикаторів для df; precomputed (пакетні значення) замінюють відповідні вузли"""
+        context = {
+            'df': df,
+            'close': df['close'].values,
+            'high': df['high'].values,
+            'low': df['low'].values,
+            'volume': df['volume'].values,
         }
+        return LazyIndicators(self.indicator_nodes, dict(precomputed or {}), context=context)
+    
+    def _calculate_base_indicators(self, df: pd.DataFrame) -> Dict:
+        """Базові індикатори одного символу (ті самі ключі, що й у calculate_indicators_batch)"""
+        plan = self._indicator_plan(df)
+        return {key: plan[key] for key in BATCH_INDICATORS}
+    
+    def _calculate_all_indicators(self, df: pd.DataFrame, precomputed: Optional[Dict] = None) -> Dict:
+        """РОЗРАХУНОК ВСІХ 8+ КРИТИЧНИХ ІНДИКАТОРІВ"""
+        close = df['close'].values
+        volume = df['volume'].values
+        
+        # Кожен вузол плану рахується рівно один раз (базові - або вже пакетно)
+        indicators = self._indicator_plan(df, precomputed).materialize()
+        
+        indicators.update({
+            'current_price': close[-1],
+            'volume_array': volume,
+            'price_change_24h': ((close[-1] - close[-24]) / close[-24]) * 100 if len(close) >= 24 else 0,
+        })
         
         indicators['volume_ratio'] = volume[-1] / indicators['volume_sma'][-1] if indicators['volume_sma'][-1] > 0 else 1
         
@@ -144,42 +298,40 @@ class AIAnalyzer:
     
     def _calculate_vwap(self, df: pd.DataFrame) -> np.ndarray:
         """Volume Weighted Average Price"""
-        typical_price = (df['high'] + df['low'] + df['close']) / 3
-        vwap = (typical_price * df['volume']).cumsum() / df['volume'].cumsum()
-        return vwap.values
+        typical = typical_price(df['high'].values, df['low'].values, df['close'].values)
+        return vwap_from_typical(typical, df['volume'].values)
     
     def _calculate_stoch_rsi(self, prices: np.ndarray, rsi_period: int = 14, stoch_period: int = 14) -> Tuple[np.ndarray, np.ndarray]:
         """Stochastic RSI"""
-        rsi = self._calculate_rsi(prices, rsi_period)
-        rsi_series = pd.Series(rsi)
+        return self._stoch_from_rsi(self._calculate_rsi(prices, rsi_period), stoch_period)
+    
+    def _stoch_from_rsi(self, rsi: np.ndarray, stoch_period: int = 14) -> Tuple[np.ndarray, np.ndarray]:
+        """Stochastic RSI з уже порахованого RSI"""
+        lowest = rolling_min(rsi, stoch_period)
         
-        stoch_k = 100 * (rsi_series - rsi_series.rolling(stoch_period).min()) / \
-                  (rsi_series.rolling(stoch_period).max() - rsi_series.rolling(stoch_period).min())
-        stoch_d = stoch_k.rolling(3).mean()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            stoch_k = 100 * (rsi - lowest) / (rolling_max(rsi, stoch_period) - lowest)
+        stoch_d = pd.Series(stoch_k).rolling(3).mean()
         
-        return stoch_k.values, stoch_d.values
+        return stoch_k, stoch_d.values
     
-    def _calculate_ichimoku(self, df: pd.DataFrame) -> Dict:
-        """Ichimoku Cloud"""
+    def _calculate_ichimoku(self, df: pd.DataFrame, extrema: Optional[Extrema] = None) -> Dict:
+        """Ichimoku Cloud (extrema - вже пораховані ковзні екстремуми 9/26/52)"""
         high, low, close = df['high'].values, df['low'].values, df['close'].values
+        if extrema is None:
+            extrema = rolling_extrema(high, low, (9, 26, 52))
         
         # Tenkan-sen
-        period9_high = pd.Series(high).rolling(9).max()
-        period9_low = pd.Series(low).rolling(9).min()
-        tenkan_sen = (period9_high + period9_low) / 2
+        tenkan_sen = pd.Series(channel_midpoint(extrema, 9))
         
         # Kijun-sen
-        period26_high = pd.Series(high).rolling(26).max()
-        period26_low = pd.Series(low).rolling(26).min()
-        kijun_sen = (period26_high + period26_low) / 2
+        kijun_sen = pd.Series(channel_midpoint(extrema, 26))
         
         # Senkou Span A
         senkou_span_a = ((tenkan_sen + kijun_sen) / 2).shift(26)
         
         # Senkou Span B
-        period52_high = pd.Series(high).rolling(52).max()
-        period52_low = pd.Series(low).rolling(52).min()
-        senkou_span_b = ((period52_high + period52_low) / 2).shift(26)
+        senkou_span_b = pd.Series(channel_midpoint(extrema, 52)).shift(26)
         
         # Chikou Span
         chikou_span = pd.Series(close).shift(-26)
@@ -199,18 +351,7 @@ class AIAnalyzer:
     
     def _calculate_obv(self, prices: np.ndarray, volume: np.ndarray) -> np.ndarray:
         """On-Balance Volume"""
-        obv = np.zeros_like(prices)
-        obv[0] = volume[0]
-        
-        for i in range(1, len(prices)):
-            if prices[i] > prices[i-1]:
-                obv[i] = obv[i-1] + volume[i]
-            elif prices[i] < prices[i-1]:
-                obv[i] = obv[i-1] - volume[i]
-            else:
-                obv[i] = obv[i-1]
-        
-        return obv
+        return obv(prices, volume)
     
     def _calculate_adl(self, df: pd.DataFrame) -> np.ndarray:
         """Accumulation/Distribution Line"""
@@ -224,21 +365,26 @@ class AIAnalyzer:
     
     def _calculate_cci(self, df: pd.DataFrame, period: int = 20) -> np.ndarray:
         """Commodity Channel Index"""
-        typical_price = (df['high'] + df['low'] + df['close']) / 3
-        sma = typical_price.rolling(period).mean()
-        mad = typical_price.rolling(period).apply(lambda x: np.mean(np.abs(x - np.mean(x))))
-        cci = (typical_price - sma) / (0.015 * mad)
-        return cci.values
+        typical = typical_price(df['high'].values, df['low'].values, df['close'].values)
+        return self._cci_from_typical(typical, period)
+    
+    def _cci_from_typical(self, typical: np.ndarray, period: int = 20) -> np.ndarray:
+        """CCI з уже порахованої typical price"""
+        sma = pd.Series(typical).rolling(period).mean().values
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (typical - sma) / (0.015 * rolling_mad(typical, period))
     
-    def _calculate_williams_r(self, df: pd.DataFrame, period: int = 14) -> np.ndarray:
+    def _calculate_williams_r(self, df: pd.DataFrame, period: int = 14,
+                              extrema: Optional[Extrema] = None) -> np.ndarray:
         """Williams %R"""
         high, low, close = df['high'].values, df['low'].values, df['close'].values
         
-        highest_high = pd.Series(high).rolling(period).max()
-        lowest_low = pd.Series(low).rolling(period).min()
+        if extrema is None or period not in extrema:
+            extrema = rolling_extrema(high, low, (period,))
+        highest_high, lowest_low = extrema[period]
         williams_r = -100 * (highest_high - close) / (highest_high - lowest_low + 0.000001)
         
-        return williams_r.values
+        return williams_r
     
     # ===== ГЛИБОКИЙ АНАЛІЗ СИГНАЛУ =====
     
@@ -709,17 +855,12 @@ class AIAnalyzer:
     def _calculate_macd(self, prices: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         ema12 = self._calculate_ema(prices, 12)
         ema26 = self._calculate_ema(prices, 26)
-        macd = ema12 - ema26
-        signal = self._calculate_ema(macd, 9)
-        histogram = macd - signal
-        return macd, signal, histogram
+        return macd_from_emas(ema12, ema26, lambda macd: self._calculate_ema(macd, 9))
     
     def _calculate_bollinger_bands(self, prices: np.ndarray, period: int = 20, std_dev: float = 2):
         sma = self._calculate_sma(prices, period)
         std = pd.Series(prices).rolling(window=period).std().values
-        upper_band = sma + (std * std_dev)
-        lower_band = sma - (std * std_dev)
-        return upper_band, sma, lower_band
+        return bands_from_std(sma, std, std_dev)
     
     def _calculate_atr(self, high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
         high_low = high[1:] - low[1:]
@@ -1,20 +1,41 @@
 # backend/app/futures/services/signal_orchestrator.py
+import os
 import pandas as pd
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 import logging
 from app.futures.models.exchange_connector import ExchangeConnector
+from app.futures.models.pattern_scanner import PatternScanner
+from app.futures.models.universe_screener import UniverseScreener
 from .ai_analyzer import AIAnalyzer
 from .explanation_builder import ExplanationBuilder
+from .signal_pool import SignalWorkerPool
 
 class SignalOrchestrator:
-    def __init__(self):
+    def __init__(self, workers: Optional[int] = None, symbol_timeout: Optional[float] = None):
         self.exchange = ExchangeConnector()
         self.analyzer = AIAnalyzer()
         self.explainer = ExplanationBuilder()
         self.logger = logging.getLogger(__name__)
         
-    def generate_signal(self, symbol: str, timeframe: str = '1h') -> Dict:
+        # Паралельний режим: workers > 1 - аналіз символів у пулі процесів
+        self.workers = workers if workers is not None else int(os.getenv('SIGNAL_WORKERS', 1))
+        self.symbol_timeout = symbol_timeout if symbol_timeout is not None else \
+            float(os.getenv('SIGNAL_SYMBOL_TIMEOUT', 30))
+        self.pool = SignalWorkerPool(self.workers, self.symbol_timeout) if self.workers > 1 else None
+        
+        # Перший етап: скринер універсу відбирає кандидатів для повного аналізу
+        self.screener = UniverseScreener(
+            top_k=int(os.getenv('SCREENER_TOP_K', 20)),
+            min_score=float(os.getenv('SCREENER_MIN_SCORE', 0.4)),
+            min_quote_volume=float(os.getenv('SCREENER_MIN_QUOTE_VOLUME', 0)),
+        )
+        
+        # Свічні паттерни: уся група CDL TA-Lib або підмножина з PATTERN_SCAN_SET (через кому)
+        patterns = [name.strip() for name in os.getenv('PATTERN_SCAN_SET', '').split(',') if name.strip()]
+        self.pattern_scanner = PatternScanner(patterns or None, bars=int(os.getenv('PATTERN_SCAN_BARS', 1)))
+        
+    def generate_signal(self, symbol: str, timeframe: str = '1h', analysis: Dict = None) -> Dict:
         """Повний пайплайн генерації сигналу - ВИПРАВЛЕНА ВЕРСІЯ"""
         try:
             self.logger.info(f"🔍 Генерація сигналу для {symbol} ({timeframe})")
@@ -33,8 +54,9 @@ class SignalOrchestrator:
                 self.logger.warning(f"⚠️ Не вдалося отримати чи конвертувати ціну: {e}")
                 # Якщо не вийшло, current_price залишиться None
 
-            # 2. Аналізуємо через AI (основна логіка)
-            analysis = self.analyzer.analyze_market(symbol, timeframe)
+            # 2. Аналізуємо через AI (основна логіка), якщо аналіз не передано
+            if analysis is None:
+                analysis = self.analyzer.analyze_market(symbol, timeframe)
             
             # Перевіряємо, чи не повернув AI помилку
             if analysis.get('error'):
@@ -92,11 +114,69 @@ class SignalOrchestrator:
             self.logger.error(f"❌ Критична помилка генерації сигналу: {e}", exc_info=True)
             return {'error': str(e), 'symbol': symbol}
     
-    def generate_multiple_signals(self, symbols: List[str]) -> List[Dict]:
-        """Генерація сигналів для кількох пар"""
+    def generate_multiple_signals(self, symbols: List[str], timeframe: str = '1h') -> List[Dict]:
+        """
+        Генерація сигналів для кількох пар: індикатори - одним пакетним проходом
+        або, якщо задано workers > 1, паралельно в пулі процесів
+        """
+        if self.pool is not None and len(symbols) > 1:
+            frames = self.analyzer.fetch_frames(symbols, timeframe)
+            analyses = self.pool.analyze(symbols, frames, timeframe)
+        else:
+            analyses = self.analyzer.analyze_markets(symbols, timeframe)
         signals = []
         for symbol in symbols:
-            signal = self.generate_signal(symbol)
+            signal = self.generate_signal(symbol, timeframe, analysis=analyses[symbol])
             if 'error' not in signal:
                 signals.append(signal)
-        return signals
\ No newline at end of file
+        return signals
+    
+    def screen_universe(self, symbols: Optional[List[str]] = None, timeframe: str = '1h',
+                        top_k: Optional[int] = None) -> Dict:
+        """
+        Дешевий відбір кандидатів: bulk-тікери + короткий хвіст свічок.
+        symbols - None означає весь ф'ючерсний універс біржі;
+        top_k - None означає налаштування скринера.
+        """
+        symbols = symbols or self.exchange.fetch_futures_symbols()
+        tickers = self.exchange.fetch_tickers(symbols)
+        frames = self._fetch_tails(symbols, timeframe, self.screener.tail)
+        screening = self.screener.screen(frames, tickers, top_k=top_k)
+        screening['total_pass_rate'] = round(self.screener.pass_rate, 4)
+        return screening
+    
+    def scan_patterns(self, symbols: Optional[List[str]] = None, timeframe: str = '1h') -> Dict:
+        """Свічні паттерни на останніх свічках символів (хвіст мінімальної довжини)"""
+        symbols = symbols or self.exchange.fetch_futures_symbols()
+        frames = self._fetch_tails(symbols, timeframe, self.pattern_scanner.tail)
+        scan = self.pattern_scanner.scan(frames)
+        return {
+            'patterns': scan['patterns'],
+            'symbols': scan['symbols'],
+            'bullish': self.pattern_scanner.to_hex(scan['bullish']),
+            'bearish': self.pattern_scanner.to_hex(scan['bearish']),
+            'latest': self.pattern_scanner.latest(scan),
+            'skipped': scan['skipped'],
+            'elapsed_ms': scan['elapsed_ms'],
+        }
+    
+    def generate_screened_signals(self, symbols: Optional[List[str]] = None, timeframe: str = '1h',
+                                  top_k: Optional[int] = None) -> Dict:
+        """Двоетапна генерація: скринер універсу, потім повний аналіз лише top-K кандидатів"""
+        screening = self.screen_universe(symbols, timeframe, top_k)
+        candidates = screening['candidates']
+        signals = self.generate_multiple_signals(candidates, timeframe) if candidates else []
+        self.logger.info(f"🎯 Двоетапний відбір: {screening['scanned']} символів -> "
+                         f"{len(candidates)} кандидатів -> {len(signals)} сигналів")
+        return {'signals': signals, 'screening': screening}
+    
+    def _fetch_tails(self, symbols: List[str], timeframe: str, limit: int) -> Dict[str, pd.DataFrame]:
+        """Короткі хвости свічок усіх символів паралельними запитами"""
+        connector = self.analyzer.async_exchange
+        return connector.run(connector.fetch_ohlcv_many(symbols, timeframe, limit=limit))
+    
+    def close(self):
+        """Зупинка пулу процесів (якщо запускався) та асинхронного конектора"""
+        if self.pool is not None:
+            self.pool.close()
+        self.analyzer.async_exchange.shutdown()
@@ -0,0 +1,145 @@
+# backend/app/futures/services/signal_pool.py
+import logging
+import math
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional, Set
+
+import pandas as pd
+
+from app.futures.models.shared_ohlcv import FrameHandle, SharedOHLCV, attach_frame
+
+logger = logging.getLogger(__name__)
+
+# ====== ВОРКЕР ======
+# Кожен процес пулу має власний AIAnalyzer (створюється один раз при старті)
+
+_worker_analyzer = None
+
+
+class SymbolTimeout(BaseException):
+    """Від BaseException: не перехоплюється except Exception в analyze_market"""
+
+
+def _init_worker(pid_queue=None):
+    global _worker_analyzer
+    if pid_queue is not None:
+        pid_queue.put(os.getpid())  # пул знає свої процеси без приватних полів executor
+    from .ai_analyzer import AIAnalyzer
+    _worker_analyzer = AIAnalyzer()
+
+
+def _raise_timeout(signum, frame):
+    raise SymbolTimeout("перевищено час аналізу символу")
+
+
+def _analyze_worker(symbol: str, timeframe: str, handle: FrameHandle, timeout: Optional[float]) -> Dict:
+    """Аналіз одного символу у процесі пулу; свічки - зі shared_memory"""
+    df = attach_frame(handle)
+    # SIGALRM перериває зависаючий розрахунок у самому воркері (лише POSIX)
+    use_timer = bool(timeout) and hasattr(signal, 'setitimer')
+    if use_timer:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return _worker_analyzer.analyze_market(symbol, timeframe, df=df)
+    except SymbolTimeout:
+        return {'error': 'timeout', 'symbol': symbol}
+    finally:
+        if use_timer:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+# ====== ПУЛ ======
+
+class SignalWorkerPool:
+    """
+    Паралельний аналіз символів у пулі процесів (talib/pandas - CPU-bound,
+    потоки не допомагають через GIL). Свічки всіх символів передаються
+    одним блоком shared_memory, результати повертаються в порядку symbols.
+    """
+
+    START_GRACE = 30.0  # с на запуск процесів (spawn + імпорти) поверх таймаутів символів
+
+    def __init__(self, workers: int, symbol_timeout: Optional[float] = 30.0):
+        self.workers = max(1, workers)
+        self.symbol_timeout = symbol_timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pid_queue = None
+        self._pids: Set[int] = set()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: без успадкування потоків/з'єднань батьківського процесу
+            context = multiprocessing.get_context('spawn')
+            self._pid_queue = context.SimpleQueue()
+            self._pids = set()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self._pid_queue,),
+            )
+            logger.info(f"🚀 Запущено пул аналізу: {self.workers} процесів")
+        return self._executor
+
+    def analyze(self, symbols: List[str], frames: Dict[str, pd.DataFrame], timeframe: str = '1h') -> Dict[str, Dict]:
+        """{symbol: аналіз}; помилка/таймаут символу - {'error': ..., 'symbol': ...}"""
+        results: Dict[str, Dict] = {}
+        with SharedOHLCV({symbol: frames.get(symbol) for symbol in symbols}) as shared:
+            executor = self._get_executor()
+            futures = {
+                symbol: executor.submit(_analyze_worker, symbol, timeframe, shared.handle(symbol), self.symbol_timeout)
+                for symbol in dict.fromkeys(symbols) if symbol in shared.layout
+            }
+
+            # Запасний дедлайн на випадок воркера, що завис поза Python-кодом
+            deadline = None
+            if self.symbol_timeout:
+                rounds = math.ceil(len(futures) / self.workers)
+                deadline = time.monotonic() + self.symbol_timeout * (rounds + 1) + self.START_GRACE
+
+            stuck = False
+            for symbol, future in futures.items():
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    results[symbol] = future.result(timeout=remaining)
+                except FutureTimeoutError:
+                    stuck = True
+                    results[symbol] = {'error': 'timeout', 'symbol': symbol}
+                except Exception as e:
+                    logger.error(f"❌ Воркер аналізу {symbol}: {e}")
+                    results[symbol] = {'error': str(e), 'symbol': symbol}
+
+            if stuck:
+                logger.warning("⚠️ Пул аналізу не вклався в дедлайн - перезапуск")
+                self.close(wait=False)
+
+        return {
+            symbol: results.get(symbol, {'error': 'no_data', 'symbol': symbol})
+            for symbol in symbols
+        }
+
+    def worker_pids(self) -> Set[int]:
+        """PID процесів пулу (кожен воркер повідомляє свій при старті)"""
+        while self._pid_queue is not None and not self._pid_queue.empty():
+            self._pids.add(self._pid_queue.get())
+        return set(self._pids)
+
+    def close(self, wait: bool = True):
+        """Зупинка пулу; wait=False - процеси, що ще працюють (зависли), завершуються примусово"""
+        if self._executor is not None:
+            pids = self.worker_pids()
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            if not wait:
+                for pid in pids:
+                    try:
+                        os.kill(pid, signal.SIGTERM)
+                    except (ProcessLookupError, PermissionError):
+                        pass  # уже завершився
+            self._executor = None
+            self._pid_queue.close()
+            self._pid_queue = None
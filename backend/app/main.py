@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 import logging
 from .celery_app import celery_app as celery_instance
 from .services.price_updater_service import start_price_updater, stop_price_updater
+from .core.http_client import http_client
 
 # Імпортуємо моделі
 from .database import engine, Base
@@ -15,7 +16,7 @@ from .api import kraken as kraken_api
 from app.api.coinbase import router as coinbase_router
 from app.api.bybit import router as bybit_router
 from app.api.okx import router as okx_router
-from app.futures.api.router import router as futures_router
+from app.futures.api.router import router as futures_router, signal_orchestrator
 from app.futures.api import history  # ← для графіків
 
 logging.basicConfig(
@@ -34,6 +35,8 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     stop_price_updater()
+    signal_orchestrator.close()
+    await http_client.close()
 
 # CORS налаштування
 app.add_middleware(
@@ -58,84 +58,71 @@ class ArbitrageCalculator:
             # НОВА МОНЕТА - ДОДАЄМ ТУТ:
         }
 
-    async def _get_price_from_exchange(self, exchange: str, symbol: str) -> Optional[float]:
-        """Отримати ціну з конкретної біржі (спрощено)"""
-        try:
-            # Пропускаємо виключені біржі
-            if exchange in self.excluded_exchanges:
-                logger.debug(f"⏭️ Пропускаємо виключену біржу: {exchange}")
-                return None
-            
-            if exchange not in self.exchange_clients:
-                logger.warning(f"⚠️ Біржа {exchange} не підтримується")
-                return None
-            
-            client = self.exchange_clients[exchange]
-            logger.info(f"      → Виклик client.get_price('{symbol}')...")
-            
-            price_data = await client.get_price(symbol)
-            
-            if price_data and 'price' in price_data:
-                price = float(price_data['price'])
-                
-                # ПРОСТА ПЕРЕВІРКА: ціна має бути > 0
-                if price <= 0:
-                    logger.warning(f"⚠️ {exchange}: Недійсна ціна {price} для {symbol}")
-                    return None
-                
-                logger.info(f"      → Отримано: {price_data}")
-                return price
-            else:
-                logger.warning(f"⚠️ {exchange}: price_data = None або пустий")
-                return None
-                
-        except Exception as e:
-            logger.error(f"❌ Помилка отримання ціни з {exchange} для {symbol}: {e}")
-            return None
-
     async def _get_prices_for_coin(self, coin: str) -> Dict[str, Optional[float]]:
         """Отримати ціни для монети з усіх бірж (крім виключених)"""
-        logger.info(f"🔍 Отримання цін для {coin} (без {self.excluded_exchanges})")
-        
         if coin not in self.exchange_symbols:
             logger.error(f"❌ Монета {coin} не підтримується")
             return {}
         
-        symbols = self.exchange_symbols[coin]
-        prices = {}
-        
-        # ДОДАЄМО ДЕТАЛЬНЕ ЛОГУВАННЯ
-        logger.info(f"📋 Символи для {coin}: {symbols}")
-        
-        # Отримуємо ціни тільки з доступних бірж
-        for exchange, symbol in symbols.items():
-            # Пропускаємо виключені біржі
-            if exchange in self.excluded_exchanges:
-                logger.info(f"   ⏭️ Пропускаємо виключену біржу: {exchange}")
-                continue
-                
-            logger.info(f"   🔍 Запит до {exchange} з символом {symbol}")
-            price = await self._get_price_from_exchange(exchange, symbol)
-            prices[exchange] = price
-            
-            if price:
-                logger.info(f"      ✅ {exchange}: Ціна = {price}")
-            else:
-                logger.warning(f"      ❌ {exchange}: не вдалося отримати ціну")
-        
+        prices = (await self._get_price_matrix([coin]))[coin]
         logger.info(f"📊 Отримані ціни для {coin}: {prices}")
-        
-        # РАХУЄМО СКІЛЬКИ УСПІШНИХ
-        successful = sum(1 for price in prices.values() if price is not None)
-        logger.info(f"📈 Успішних запитів для {coin}: {successful}/{len(prices)}")
-        
         return prices
 
-    async def calculate_arbitrage_for_coin(self, coin: str) -> Optional[Dict[str, Any]]:
-        """Розрахувати арбітражні можливості для конкретної монети"""
+    async def _get_price_matrix(self, coins: List[str]) -> Dict[str, Dict[str, Optional[float]]]:
+        """
+        Ціни монет з усіх бірж (крім виключених): один пакетний запит на біржу,
+        біржі - паралельно. Кількість запитів не залежить від кількості монет.
+        """
+        coins = [coin for coin in coins if coin in self.exchange_symbols]
+        exchanges = [exchange for exchange in self.exchange_clients if exchange not in self.excluded_exchanges]
+        logger.info(f"🔍 Отримання цін для {len(coins)} монет з {exchanges}")
+
+        async def fetch(exchange: str) -> Dict[str, Dict]:
+            symbols = [self.exchange_symbols[coin][exchange] for coin in coins
+                       if exchange in self.exchange_symbols[coin]]
+            if not symbols:
+                return {}
+            try:
+                return await self.exchange_clients[exchange].get_prices_bulk(symbols)
+            except Exception as e:
+                logger.error(f"❌ Помилка пакетного отримання цін з {exchange}: {e}")
+                return {}
+
+        bulk = dict(zip(exchanges, await asyncio.gather(*(fetch(exchange) for exchange in exchanges))))
+
+        matrix = {}
+        for coin in coins:
+            prices = {}
+            for exchange in exchanges:
+                symbol = self.exchange_symbols[coin].get(exchange)
+                if symbol is None:
+                    continue
+                prices[exchange] = self._valid_price(exchange, symbol, bulk[exchange].get(symbol))
+            matrix[coin] = prices
+
+        successful = sum(price is not None for prices in matrix.values() for price in prices.values())
+        total = sum(len(prices) for prices in matrix.values())
+        logger.info(f"📈 Отримано цін: {successful}/{total} ({len(exchanges)} запитів)")
+        return matrix
+
+    @staticmethod
+    def _valid_price(exchange: str, symbol: str, price_data: Optional[Dict]) -> Optional[float]:
+        if not price_data or 'price' not in price_data:
+            return None
+        price = float(price_data['price'])
+        # ПРОСТА ПЕРЕВІРКА: ціна має бути > 0
+        if price <= 0:
+            logger.warning(f"⚠️ {exchange}: Недійсна ціна {price} для {symbol}")
+            return None
+        return price
+
+    async def calculate_arbitrage_for_coin(self, coin: str,
+                                           prices: Optional[Dict[str, Optional[float]]] = None) -> Optional[Dict[str, Any]]:
+        """Розрахувати арбітражні можливості для конкретної монети (prices - уже отримані ціни)"""
         try:
             # Отримуємо ціни
-            prices = await self._get_prices_for_coin(coin)
+            if prices is None:
+                prices = await self._get_prices_for_coin(coin)
             
             if not prices:
                 logger.warning(f"⚠️ Не вдалося отримати ціни для {coin}")
@@ -253,9 +240,12 @@ class ArbitrageCalculator:
         
         coins = coins[:8]  # Обмеження для тесту
         
+        # Усі ціни - один запит на біржу
+        matrix = await self._get_price_matrix(coins)
+        
         for coin in coins:
             try:
-                result = await self.calculate_arbitrage_for_coin(coin)
+                result = await self.calculate_arbitrage_for_coin(coin, matrix.get(coin, {}))
                 if result:
                     results.append(result)
                 else:
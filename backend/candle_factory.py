@@ -0,0 +1,43 @@
+# backend/candle_factory.py
+import os
+import sys
+
+# Спільне для тестів: імпорт модуля додає backend/ у sys.path і задає
+# тестові ключі біржі (тому імпортується до app), create_test_data -
+# синтетичні свічки.
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('EXCHANGE_API_KEY', 'test')
+os.environ.setdefault('EXCHANGE_API_SECRET', 'test')
+
+import numpy as np
+import pandas as pd
+
+
+def create_test_data(num_candles=500, seed=7, start='2024-01-01', freq='h', price=45000.0,
+                     drift=0.0, noise=0.01, surge=1.0, gap=0.0, doji=0.0):
+    """
+    Випадкове блукання з реалістичними high/low/volume для тестів.
+    drift - тренд, noise - волатильність, surge - множник об'єму останньої
+    свічки, gap - шум ціни відкриття, doji - частка свічок з open ≈ close.
+    """
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(rng.normal(drift, noise, num_candles)))
+    open_price = np.r_[close[0], close[:-1]]
+    if gap:
+        open_price = open_price * (1 + rng.normal(0, gap, num_candles))
+    if doji:
+        is_doji = rng.random(num_candles) < doji
+        open_price[is_doji] = close[is_doji] * (1 + rng.normal(0, 1e-4, is_doji.sum()))
+    high = np.maximum(open_price, close) * (1 + rng.uniform(0, noise / 2, num_candles))
+    low = np.minimum(open_price, close) * (1 - rng.uniform(0, noise / 2, num_candles))
+    volume = rng.uniform(100, 1000, num_candles)
+    volume[-1] *= surge
+
+    return pd.DataFrame({
+        'timestamp': pd.date_range(start=start, periods=num_candles, freq=freq),
+        'open': open_price,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': volume
+    })
@@ -73,12 +73,15 @@ def generate_ai_signals_and_trades():
         created_signals = 0
         created_trades = 0
         
-        for symbol in symbols[:3]:  # Тільки перші 3 для тесту
+        # Індикатори для всіх символів рахуються одним пакетним проходом
+        analyses = analyzer.analyze_markets(symbols[:3], '1h')  # Тільки перші 3 для тесту
+        
+        for symbol in symbols[:3]:
             print(f"\n🔍 Аналіз {symbol}...")
             
             try:
                 # Генеруємо AI сигнал
-                signal_data = analyzer.analyze_market(symbol, '1h')
+                signal_data = analyses[symbol]
                 
                 if signal_data.get('error'):
                     print(f"   ❌ Помилка: {signal_data.get('error_message', 'Unknown')[:30]}")
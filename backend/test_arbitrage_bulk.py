@@ -0,0 +1,130 @@
+# backend/test_arbitrage_bulk.py
+import asyncio
+import zlib
+
+from aiohttp import web
+import candle_factory  # noqa: F401 - тестові ключі біржі до імпорту app
+from app.core.http_client import http_client
+from app.services.arbitrage_calculator import ArbitrageCalculator
+
+
+def price_of(exchange, symbol):
+    """Детермінована ціна символу на біржі"""
+    return 100 + zlib.crc32(f"{exchange}:{symbol}".encode()) % 1000 / 10
+
+
+async def start_exchanges(calculator, kraken_unknown=()):
+    """Локальні ендпоінти тікерів чотирьох бірж; лічильник запитів по біржах"""
+    symbols = {exchange: [coin_symbols[exchange] for coin_symbols in calculator.exchange_symbols.values()]
+               for exchange in ('Binance', 'Bybit', 'OKX', 'Kraken')}
+    symbols['Binance'] += ['LTCUSDT', 'BNBUSDT']  # зайві пари в повному списку
+    requests = {exchange: 0 for exchange in symbols}
+
+    async def binance_all(request):
+        requests['Binance'] += 1
+        if 'symbol' in request.query:
+            symbol = request.query['symbol']
+            return web.json_response({'symbol': symbol, 'price': str(price_of('Binance', symbol))})
+        return web.json_response([{'symbol': s, 'price': str(price_of('Binance', s))} for s in symbols['Binance']])
+
+    async def bybit_tickers(request):
+        requests['Bybit'] += 1
+        wanted = [request.query['symbol']] if 'symbol' in request.query else symbols['Bybit']
+        return web.json_response({'result': {'list': [
+            {'symbol': s, 'lastPrice': str(price_of('Bybit', s)), 'bid1Price': '1', 'ask1Price': '2',
+             'volume24h': '3'} for s in wanted]}})
+
+    async def okx_tickers(request):
+        requests['OKX'] += 1
+        wanted = [request.query['instId']] if 'instId' in request.query else symbols['OKX']
+        return web.json_response({'code': '0', 'data': [
+            {'instId': s, 'last': str(price_of('OKX', s)), 'bidPx': '1', 'askPx': '2', 'vol24h': '3'}
+            for s in wanted]})
+
+    async def kraken_ticker(request):
+        requests['Kraken'] += 1
+        pairs = request.query['pair'].split(',')
+        if any(pair in kraken_unknown for pair in pairs):
+            return web.json_response({'error': ['EQuery:Unknown asset pair']})
+        return web.json_response({'error': [], 'result': {
+            pair: {'c': [str(price_of('Kraken', pair)), '1'], 'b': ['1'], 'a': ['2'], 'v': ['3']}
+            for pair in pairs}})
+
+    app = web.Application()
+    app.router.add_get('/binance/api/v3/ticker/price', binance_all)
+    app.router.add_get('/bybit/v5/market/tickers', bybit_tickers)
+    app.router.add_get('/okx/api/v5/market/ticker', okx_tickers)
+    app.router.add_get('/okx/api/v5/market/tickers', okx_tickers)
+    app.router.add_get('/kraken/0/public/Ticker', kraken_ticker)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    root = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    clients = calculator.exchange_clients
+    clients['Binance'].base_url = f"{root}/binance/api/v3"
+    clients['Bybit'].base_url = f"{root}/bybit/v5/market"
+    clients['OKX'].base_url = f"{root}/okx/api/v5"
+    clients['Kraken'].base_url = f"{root}/kraken/0/public"
+    return runner, requests
+
+
+def test_one_request_per_exchange():
+    async def scenario():
+        calculator = ArbitrageCalculator(threshold=0.0)
+        runner, requests = await start_exchanges(calculator)
+        try:
+            results = await calculator.calculate_arbitrage_all_coins()
+            bulk_requests = dict(requests)
+
+            # та сама ціна, що й поштучним запитом до біржі
+            for exchange in bulk_requests:
+                requests[exchange] = 0
+            single = float((await calculator.exchange_clients['Bybit'].get_price('ETHUSDT'))['price'])
+        finally:
+            await http_client.close()
+            await runner.cleanup()
+
+        assert bulk_requests == {'Binance': 1, 'Bybit': 1, 'OKX': 1, 'Kraken': 1}
+        assert len(results) == len(calculator.exchange_symbols)
+        for result in results:
+            coin_symbols = calculator.exchange_symbols[result['coin']]
+            assert set(result['prices']) == {'Binance', 'Bybit', 'OKX', 'Kraken'}
+            for exchange, price in result['prices'].items():
+                assert price == price_of(exchange, coin_symbols[exchange])
+        eth = next(result for result in results if result['coin'] == 'ETH')
+        assert single == eth['prices']['Bybit'] == price_of('Bybit', 'ETHUSDT')
+        assert any(result['best_opportunity'] for result in results)
+
+    asyncio.run(scenario())
+
+
+def test_single_coin_and_kraken_fallback():
+    async def scenario():
+        calculator = ArbitrageCalculator(threshold=0.0)
+        runner, requests = await start_exchanges(calculator, kraken_unknown=('MATICUSD',))
+        try:
+            matrix = await calculator._get_price_matrix(list(calculator.exchange_symbols))
+            fallback_requests = requests['Kraken']
+            specific = await calculator.calculate_specific_arbitrage('BTC', 'Kraken', 'OKX')
+        finally:
+            await http_client.close()
+            await runner.cleanup()
+
+        # невідома пара валить пакетний запит Kraken - решта пар поштучно
+        assert fallback_requests == 1 + len(calculator.exchange_symbols)
+        assert matrix['MATIC']['Kraken'] is None
+        assert matrix['BTC']['Kraken'] == price_of('Kraken', 'XXBTZUSD')
+        assert specific['success'] and specific['buy_price'] == price_of('Kraken', 'XXBTZUSD')
+        assert specific['sell_price'] == price_of('OKX', 'BTC-USDT')
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ ПАКЕТНОГО ОТРИМАННЯ ЦІН ДЛЯ АРБІТРАЖУ")
+    print("=" * 60)
+    for test in (test_one_request_per_exchange, test_single_coin_and_kraken_fallback):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,113 @@
+# backend/test_async_exchange.py
+import asyncio
+import tempfile
+import time
+
+import candle_factory  # noqa: F401 - тестові ключі біржі до імпорту app
+from app.core.candle_store import CandleStore
+from app.futures.models.async_exchange_connector import AsyncExchangeConnector
+
+LATENCY = 0.05
+HOUR = 3600 * 1000
+
+
+class FakeAsyncExchange:
+    """Біржа з фіксованою затримкою відповіді; символи з 'BAD' - помилка"""
+
+    def __init__(self):
+        self.closed = False
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        await asyncio.sleep(LATENCY)
+        if 'BAD' in symbol:
+            raise RuntimeError("symbol not found")
+        now = int(time.time() * 1000) // HOUR * HOUR
+        return [[now - (limit - 1 - i) * HOUR, 100.0, 101.0, 99.0, 100.5, 10.0] for i in range(limit)]
+
+    async def fetch_ticker(self, symbol):
+        await asyncio.sleep(LATENCY)
+        if 'BAD' in symbol:
+            raise RuntimeError("symbol not found")
+        return {'symbol': symbol, 'last': 100.5}
+
+    async def close(self):
+        self.closed = True
+
+
+def create_connector(max_concurrency):
+    connector = AsyncExchangeConnector(max_concurrency=max_concurrency)
+    connector.exchange = FakeAsyncExchange()
+    connector.candle_store = None
+    return connector
+
+
+def test_many_symbols_take_one_round_trip():
+    connector = create_connector(100)
+    symbols = [f"ASYNC{i}/USDT" for i in range(100)]
+    started = time.perf_counter()
+    frames = connector.run(connector.fetch_ohlcv_many(symbols, '1h', limit=50))
+    elapsed = time.perf_counter() - started
+    print(f"   100 символів: {elapsed * 1000:.0f} мс (послідовно ~{100 * LATENCY * 1000:.0f} мс)")
+    assert list(frames) == symbols and all(len(df) == 50 for df in frames.values())
+    assert connector.stats['max_in_flight'] == 100  # усі запити одночасно - один round-trip
+
+    # повторний запит у межах свічки - з кешу, без мережі
+    requests = connector.stats['requests']
+    connector.run(connector.fetch_ohlcv_many(symbols[:10], '1h', limit=50))
+    assert connector.stats['requests'] == requests
+    connector.shutdown()
+
+
+def test_semaphore_bounds_concurrency():
+    connector = create_connector(8)
+    symbols = [f"BOUND{i}/USDT" for i in range(40)]
+    started = time.perf_counter()
+    connector.run(connector.fetch_ohlcv_many(symbols, '1h', limit=20, use_cache=False))
+    elapsed = time.perf_counter() - started
+    assert connector.stats['max_in_flight'] == 8
+    assert elapsed >= 5 * LATENCY * 0.9
+    connector.shutdown()
+
+
+def test_candle_store_not_capped_by_default_executor():
+    # більше, ніж потоків у пулі за замовчуванням (min(32, CPU + 4))
+    connector = create_connector(40)
+    connector.candle_store = CandleStore(tempfile.mkdtemp())
+    symbols = [f"STORE{i}/USDT" for i in range(40)]
+    frames = connector.run(connector.fetch_ohlcv_many(symbols, '1h', limit=30, use_cache=False))
+    assert all(len(df) == 30 for df in frames.values())
+    assert connector.stats['max_in_flight'] == 40
+    assert connector.candle_store.stats['syncs'] == 40
+    connector.shutdown()
+
+
+def test_errors_and_tickers():
+    connector = create_connector(10)
+    frames = connector.run(connector.fetch_ohlcv_many(['OK1/USDT', 'BAD/USDT'], '1h', limit=10))
+    assert len(frames['OK1/USDT']) == 10 and frames['BAD/USDT'].empty
+    tickers = connector.run(connector.fetch_tickers_many(['OK1/USDT', 'BAD/USDT', 'OK2/USDT']))
+    assert set(tickers) == {'OK1/USDT', 'OK2/USDT'}
+    assert connector.stats['errors'] == 2
+    connector.shutdown()
+
+
+def test_callable_from_foreign_event_loop():
+    connector = create_connector(10)
+    fake = connector.exchange
+
+    async def caller():
+        return await connector.fetch_ohlcv_many(['LOOP1/USDT', 'LOOP2/USDT'], '1h', limit=5)
+
+    frames = asyncio.run(caller())
+    assert all(len(df) == 5 for df in frames.values())
+    connector.shutdown()
+    assert fake.closed and connector.exchange is None
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ АСИНХРОННОГО КОНЕКТОРА")
+    print("=" * 60)
+    for test in (test_many_symbols_take_one_round_trip, test_semaphore_bounds_concurrency,
+                 test_candle_store_not_capped_by_default_executor, test_errors_and_tickers, test_callable_from_foreign_event_loop):
+        test()
+        print(f"✅ {test.__name__}")
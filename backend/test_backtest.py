@@ -0,0 +1,114 @@
+# backend/test_backtest.py
+import time
+
+import pandas as pd
+from candle_factory import create_test_data
+from app.futures.models.ai_analyzer import AIAnalyzer
+from app.futures.models.backtest import BacktestEngine
+from app.futures.models.price_levels import find_pivots
+
+SIGNAL_KEYS = ('direction', 'confidence', 'take_profit', 'stop_loss', 'risk_reward')
+
+
+def create_candles(rows):
+    """Свічки з явних (open, high, low, close)"""
+    df = pd.DataFrame(rows, columns=['open', 'high', 'low', 'close'])
+    df['volume'] = 100.0
+    return df
+
+
+def make_signal(bar, direction, entry, take_profit, stop_loss):
+    return {
+        'bar': bar, 'direction': direction, 'entry_points': {'optimal_entry': entry},
+        'take_profit': take_profit, 'stop_loss': stop_loss, 'position_size': {'size_percent': 50},
+    }
+
+
+def test_signals_match_live():
+    analyzer = AIAnalyzer()
+    engine = BacktestEngine(analyzer, lookback=None)
+    live_signals = 0
+    for seed in (0, 1):
+        df = create_test_data(600, seed)
+        signals = engine.generate_signals(df)
+        for t in range(analyzer.MIN_CANDLES - 1, len(df), 5):
+            live = analyzer.generate_trading_signal('TEST', df.iloc[:t + 1])
+            signal = signals.get(t)
+            if live['direction'] == 'neutral':
+                assert signal is None, (seed, t)
+                continue
+            live_signals += 1
+            assert all(signal[key] == live[key] for key in SIGNAL_KEYS), (seed, t)
+            assert signal['entry_points']['optimal_entry'] == live['entry_points']['optimal_entry']
+            assert signal['position_size'] == live['position_size']
+    assert live_signals > 10
+
+
+def test_levels_use_lookback_window():
+    analyzer = AIAnalyzer()
+    engine = BacktestEngine(analyzer, lookback=300)
+    df = create_test_data(600, 3)
+    close = df['close'].values
+    support_idx, resistance_idx = find_pivots(close, 20, 'min'), find_pivots(close, 20, 'max')
+    for t in (160, 299, 300, 450, 599):
+        window = df.iloc[max(0, t + 1 - 300):t + 1]
+        expected = analyzer.calculate_support_resistance(window)
+        assert engine._support_resistance(close, t, support_idx, resistance_idx) == expected, t
+
+
+def test_simulated_exits():
+    engine = BacktestEngine(AIAnalyzer(), entry_window=2, max_hold=3, fee=0.0)
+    df = create_candles([
+        (100, 101, 99, 100),    # 0: сигнали
+        (100, 100, 97, 98),     # 1: лімітний вхід long 98
+        (98, 104, 97.5, 103),   # 2: TP 104
+        (103, 103, 100, 101),   # 3
+        (101, 105, 95, 96),     # 4: вхід long 101, SL і TP в одній свічці -> SL
+        (96, 97, 95, 96.5),     # 5: вхід long по open 96 (геп під ліміт)
+        (90, 91, 88, 89),       # 6: геп нижче SL -> вихід по open
+        (89, 90, 88, 89),       # 7
+    ])
+    signals = {
+        0: make_signal(0, 'long', 98, 104, 96),
+        1: make_signal(1, 'long', 97, 110, 90),    # під час відкритої позиції - пропуск
+        3: make_signal(3, 'long', 101, 105, 96),
+        4: make_signal(4, 'long', 96.5, 110, 93),
+    }
+    simulation = engine.simulate(df, signals)
+    trades = simulation['trades']
+    assert [(t['entry_bar'], t['exit_bar'], t['exit_reason']) for t in trades] == \
+        [(1, 2, 'take_profit'), (4, 4, 'stop_loss'), (5, 6, 'stop_loss')]
+    assert [t['exit_price'] for t in trades] == [104, 96, 90] and trades[2]['entry_price'] == 96
+    assert simulation['skipped'] == 1
+    assert trades[0]['pnl_pct'] == (104 - 98) / 98 * 100
+
+    # short: ліміт не виконано, потім вихід по часу
+    short = engine.simulate(df, {1: make_signal(1, 'short', 120, 80, 130), 4: make_signal(4, 'short', 96, 50, 120)})
+    assert short['unfilled'] == 1
+    assert [(t['entry_bar'], t['exit_bar'], t['exit_reason']) for t in short['trades']] == [(5, 7, 'time')]
+    assert short['trades'][0]['entry_price'] == 96
+
+
+def test_run_report():
+    analyzer = AIAnalyzer()
+    df = create_test_data(800, 5)
+    report = BacktestEngine(analyzer).run(df)
+    assert report['evaluated_bars'] == len(df) - analyzer.MIN_CANDLES + 1
+    assert report['trades'] == report['wins'] + report['losses'] == len(report['trade_log'])
+    assert report['signals'] == report['trades'] + report['unfilled'] + report['skipped']
+    assert 0 <= report['max_drawdown_pct'] <= 100 and report['latency_per_bar_ms'] > 0
+
+    start = time.perf_counter()
+    for t in range(len(df) - 50, len(df)):
+        analyzer.generate_trading_signal('TEST', df.iloc[max(0, t - 499):t + 1])
+    live_latency = (time.perf_counter() - start) * 1000 / 50
+    print(f"   {report['evaluated_bars']} свічок: {report['latency_per_bar_ms']:.3f} мс/свічку "
+          f"(живий сигнал {live_latency:.2f} мс), угод {report['trades']}, win rate {report['win_rate']:.0%}")
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ БЕКТЕСТУ СИГНАЛІВ")
+    print("=" * 60)
+    for test in (test_signals_match_live, test_levels_use_lookback_window, test_simulated_exits, test_run_report):
+        test()
+        print(f"✅ {test.__name__}")
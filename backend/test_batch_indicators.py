@@ -0,0 +1,66 @@
+# backend/test_batch_indicators.py
+import time
+
+import numpy as np
+from candle_factory import create_test_data
+from app.futures.services.ai_analyzer import AIAnalyzer
+from app.futures.models.batch_indicators import stack_frames
+
+
+def test_batch_matches_per_symbol():
+    analyzer = AIAnalyzer()
+    frames = {f'SYM{seed}/USDT': create_test_data(500, seed) for seed in range(12)}
+    symbols, matrices = stack_frames(frames)
+    batch = analyzer.calculate_indicators_batch(symbols, matrices['high'], matrices['low'], matrices['close'])
+
+    for symbol, df in frames.items():
+        single = analyzer._calculate_base_indicators(df)
+        assert set(batch[symbol]) == set(single)
+        for key, values in single.items():
+            assert np.allclose(batch[symbol][key], values, rtol=1e-9, equal_nan=True), (symbol, key)
+
+
+def test_batch_rows_are_views():
+    analyzer = AIAnalyzer()
+    frames = {f'SYM{seed}': create_test_data(300, seed) for seed in range(3)}
+    symbols, matrices = stack_frames(frames)
+    batch = analyzer.calculate_indicators_batch(symbols, matrices['high'], matrices['low'], matrices['close'])
+    assert batch['SYM0']['rsi'].base is batch['SYM1']['rsi'].base
+
+
+def test_analyze_markets_matches_analyze_market():
+    analyzer = AIAnalyzer()
+    frames = {f'SYM{seed}/USDT': create_test_data(500 if seed % 3 else 450, seed) for seed in range(6)}
+    batch = analyzer.analyze_markets(list(frames), '1h', frames=frames)
+
+    for symbol, df in frames.items():
+        single = analyzer.analyze_market(symbol, '1h', df=df)
+        for key in ('direction', 'confidence', 'take_profit', 'stop_loss', 'factors', 'position_size'):
+            assert batch[symbol][key] == single[key], (symbol, key)
+
+
+def test_batch_speed():
+    analyzer = AIAnalyzer()
+    frames = {f'SYM{seed}': create_test_data(500, seed) for seed in range(40)}
+
+    start = time.perf_counter()
+    for df in frames.values():
+        analyzer._calculate_base_indicators(df)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    symbols, matrices = stack_frames(frames)
+    analyzer.calculate_indicators_batch(symbols, matrices['high'], matrices['low'], matrices['close'])
+    batch_time = time.perf_counter() - start
+
+    print(f"   40 символів × 500 свічок: по одному {loop_time * 1000:.0f} мс, пакетно {batch_time * 1000:.0f} мс")
+    assert batch_time < loop_time
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ ПАКЕТНИХ ІНДИКАТОРІВ")
+    print("=" * 60)
+    for test in (test_batch_matches_per_symbol, test_batch_rows_are_views,
+                 test_analyze_markets_matches_analyze_market, test_batch_speed):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,127 @@
+# backend/test_candle_store.py
+import tempfile
+
+import numpy as np
+import candle_factory  # noqa: F401 - тестові ключі біржі до імпорту app
+from app.core.candle_store import CandleStore
+from app.futures.models.resampler import timestamps_ms
+
+HOUR = 3600 * 1000
+START = 1_700_000_000_000 // HOUR * HOUR
+
+
+class FakeExchange:
+    """Детермінована стрічка свічок 1h; незакрита поточна свічка має інший close"""
+
+    def __init__(self, now_ms):
+        self.now_ms = now_ms
+        self.calls = []
+
+    @staticmethod
+    def candle(ts, forming=False):
+        k = (ts - START) // HOUR
+        close = 100 + np.sin(k / 7) * 5 + k * 0.01
+        return [ts, close - 0.3, close + 1, close - 1, close - 0.5 if forming else close, 10 + k % 13]
+
+    def fetch(self, since, limit):
+        self.calls.append((since, limit))
+        current = self.now_ms // HOUR * HOUR
+        first = current - (limit - 1) * HOUR if since is None else max(since, START)
+        stamps = range(max(first, START), min(current, first + (limit - 1) * HOUR) + 1, HOUR)
+        return [self.candle(ts, forming=ts == current) for ts in stamps]
+
+
+def now_at(candles):
+    """Момент усередині свічки з номером candles (від START)"""
+    return START + candles * HOUR + HOUR // 2
+
+
+def test_cold_start_and_candle_reuse():
+    store = CandleStore(tempfile.mkdtemp())
+    exchange = FakeExchange(now_at(2000))
+    df = store.frame('BTC/USDT:USDT', '1h', 500, exchange.fetch, now=exchange.now_ms / 1000)
+    assert len(df) == 500 and len(exchange.calls) == 1
+    assert timestamps_ms(df)[-1] == START + 2000 * HOUR
+    assert df['close'].iloc[-1] == FakeExchange.candle(START + 2000 * HOUR, forming=True)[4]
+    assert store.arrays('BTC/USDT:USDT', '1h')['timestamp'][-1] == START + 1999 * HOUR
+
+    def ticking(since, limit):
+        rows = exchange.fetch(since, limit)
+        rows[-1][4] += 1.0  # ціна незакритої свічки змінилася
+        return rows
+
+    # закриті не докачуються, незакрита - свіжа, одним запитом limit=1
+    df = store.frame('BTC/USDT:USDT', '1h', 500, ticking, now=exchange.now_ms / 1000)
+    assert exchange.calls[1:] == [(None, 1)] and store.stats['skipped'] == 1
+    assert df['close'].iloc[-1] == FakeExchange.candle(START + 2000 * HOUR, forming=True)[4] + 1.0
+    assert len(df) == 500 and timestamps_ms(df)[-2] == START + 1999 * HOUR
+
+
+def test_gap_only_fetching():
+    store = CandleStore(tempfile.mkdtemp())
+    exchange = FakeExchange(now_at(2000))
+    store.sync('ETH/USDT:USDT', '1h', exchange.fetch, 500, now=exchange.now_ms / 1000)
+
+    exchange.now_ms = now_at(2003)
+    appended = store.sync('ETH/USDT:USDT', '1h', exchange.fetch, 500, now=exchange.now_ms / 1000)
+    assert appended == 3
+    assert exchange.calls[-1][0] == START + 2000 * HOUR  # since = перша відсутня свічка
+    closed = store.arrays('ETH/USDT:USDT', '1h')
+    assert np.array_equal(np.diff(closed['timestamp']), np.full(len(closed['timestamp']) - 1, HOUR))
+    # свічка 2000 збережена вже закритою, а не значенням незакритої
+    assert closed['close'][-3] == FakeExchange.candle(START + 2000 * HOUR)[4]
+
+    # великий розрив докачується сторінками
+    store.page_limit = 1000
+    exchange.now_ms = now_at(4500)
+    calls = len(exchange.calls)
+    assert store.sync('ETH/USDT:USDT', '1h', exchange.fetch, 500, now=exchange.now_ms / 1000) == 2497
+    assert len(exchange.calls) - calls == 3
+    assert store.stats['resets'] == 0
+
+
+def test_persistence_and_zero_copy():
+    directory = tempfile.mkdtemp()
+    exchange = FakeExchange(now_at(3000))
+    CandleStore(directory).sync('SOL/USDT:USDT', '1h', exchange.fetch, 2500, now=exchange.now_ms / 1000)
+
+    reopened = CandleStore(directory)
+    history = reopened.history('SOL/USDT:USDT', '1h')
+    assert len(history) == 2500 and len(exchange.calls) == 1
+    columns = reopened.arrays('SOL/USDT:USDT', '1h')
+    candle_file = reopened._file('SOL/USDT:USDT', '1h')
+    assert np.shares_memory(columns['close'], candle_file._map)
+    assert np.shares_memory(history['close'].values, candle_file._map)
+    assert not columns['close'].flags.writeable
+
+    # ріст capacity: старі view лишаються дійсними й незмінними
+    before = columns['close'].copy()
+    exchange.now_ms = now_at(5000)
+    reopened.sync('SOL/USDT:USDT', '1h', exchange.fetch, 500, now=exchange.now_ms / 1000)
+    assert candle_file.capacity >= 4500
+    assert np.array_equal(columns['close'], before)
+    assert np.array_equal(reopened.arrays('SOL/USDT:USDT', '1h')['close'][:2500], before)
+
+
+def test_stale_history_resets():
+    store = CandleStore(tempfile.mkdtemp(), max_gap=100)
+    exchange = FakeExchange(now_at(1000))
+    store.sync('XRP/USDT:USDT', '1h', exchange.fetch, 200, now=exchange.now_ms / 1000)
+    old = store.arrays('XRP/USDT:USDT', '1h')
+    first_close = old['close'][0]
+
+    exchange.now_ms = now_at(1500)
+    store.sync('XRP/USDT:USDT', '1h', exchange.fetch, 200, now=exchange.now_ms / 1000)
+    fresh = store.arrays('XRP/USDT:USDT', '1h')
+    assert store.stats['resets'] == 1 and len(fresh['timestamp']) == 200
+    assert fresh['timestamp'][-1] == START + 1499 * HOUR
+    assert old['close'][0] == first_close
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ ЛОКАЛЬНОГО СХОВИЩА СВІЧОК")
+    print("=" * 60)
+    for test in (test_cold_start_and_candle_reuse, test_gap_only_fetching, test_persistence_and_zero_copy,
+                 test_stale_history_resets):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,79 @@
+# backend/test_compact_bundle.py
+import pickle
+
+import numpy as np
+from candle_factory import create_test_data
+from app.core.market_cache import market_cache
+from app.futures.models.ai_analyzer import AIAnalyzer
+from app.futures.models.compact_bundle import CompactBundle, bundle_nbytes
+
+PATTERNS = ('doji', 'hammer', 'engulfing', 'morning_star', 'evening_star', 'harami')
+
+
+def test_layout_and_dtypes():
+    indicators = AIAnalyzer().calculate_indicators(create_test_data(500, 21))
+    bundle = CompactBundle(indicators)
+    assert set(bundle) == set(indicators)
+    dtypes = bundle.dtypes()
+    assert all(dtypes[key] == np.int8 for key in PATTERNS)
+    assert all(dtype == np.float32 for key, dtype in dtypes.items() if key not in PATTERNS)
+    # усі колонки - view на один буфер, без копій
+    assert all(np.shares_memory(bundle.raw(key), bundle._buffer) for key in bundle)
+    assert not bundle.raw('close').flags.writeable
+    assert bundle['close'].dtype == np.float64 and bundle['doji'].dtype == np.int32
+
+
+def test_accuracy_tolerance():
+    analyzer = AIAnalyzer()
+    for seed in (1, 2, 3):
+        indicators = analyzer.calculate_indicators(create_test_data(500, seed))
+        bundle = CompactBundle(indicators)
+        for key, values in indicators.items():
+            if key in PATTERNS:
+                assert np.array_equal(bundle[key], values), key
+            else:
+                # відносна похибка float32 - поелементно, NaN розгону зберігаються
+                assert np.allclose(bundle[key], values, rtol=1e-7, atol=0, equal_nan=True), key
+
+
+def test_signals_with_compact_bundles():
+    reference = AIAnalyzer(lazy_indicators=False)
+    compact = AIAnalyzer(compact_indicators=True)  # діє і за lazy_indicators=True (за замовчуванням)
+    df = create_test_data(600, 4)
+    same_direction = total = 0
+    for end in range(300, len(df) + 1, 10):
+        window = df.iloc[:end]
+        expected = reference.generate_trading_signal('COMPACT-REF', window)
+        signal = compact.generate_trading_signal('COMPACT', window)
+        assert abs(signal['confidence'] - expected['confidence']) <= 0.01, end
+        same_direction += signal['direction'] == expected['direction']
+        total += 1
+    assert same_direction / total >= 0.95
+    cached = market_cache.get_indicators('models_compact', 'COMPACT', '1h', df, lambda: None)
+    assert isinstance(cached, CompactBundle)
+
+
+def test_pickle_roundtrip():
+    bundle = CompactBundle(AIAnalyzer().calculate_indicators(create_test_data(300, 5)))
+    restored = pickle.loads(pickle.dumps(bundle))
+    assert restored.dtypes() == bundle.dtypes()
+    assert all(np.array_equal(restored.raw(key), bundle.raw(key), equal_nan=True) for key in bundle)
+    assert len(pickle.dumps(bundle)) < bundle.nbytes * 1.1
+
+
+def test_memory_footprint():
+    indicators = AIAnalyzer().calculate_indicators(create_test_data(500, 6))
+    full, compact = bundle_nbytes(indicators), bundle_nbytes(CompactBundle(indicators))
+    bundles = 300 * 4
+    print(f"   500 свічок: {full / 1024:.0f} КБ -> {compact / 1024:.0f} КБ на набір; "
+          f"300 символів × 4 ТФ: {full * bundles / 2 ** 20:.0f} МБ -> {compact * bundles / 2 ** 20:.0f} МБ")
+    assert compact < full * 0.55
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ КОМПАКТНИХ НАБОРІВ ІНДИКАТОРІВ")
+    print("=" * 60)
+    for test in (test_layout_and_dtypes, test_accuracy_tolerance, test_signals_with_compact_bundles,
+                 test_pickle_roundtrip, test_memory_footprint):
+        test()
+        print(f"✅ {test.__name__}")
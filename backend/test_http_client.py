@@ -0,0 +1,158 @@
+# backend/test_http_client.py
+import asyncio
+import time
+
+import aiohttp
+from aiohttp import web
+import candle_factory  # noqa: F401 - тестові ключі біржі до імпорту app
+from app.core.http_client import HttpClient, http_client
+from app.api.binance import BinanceClient
+from app.futures.api.history import BinanceHistoryClient
+
+
+async def start_server():
+    """Локальний сервер з ендпоінтами Binance; запам'ятовує порти клієнтів (з'єднання)"""
+    peers = []
+
+    async def ticker_price(request):
+        peers.append(request.transport.get_extra_info('peername')[1])
+        return web.json_response({'symbol': request.query['symbol'], 'price': '45000.5'})
+
+    async def klines(request):
+        peers.append(request.transport.get_extra_info('peername')[1])
+        limit = int(request.query['limit'])
+        return web.json_response([[1_700_000_000_000 + i * 3600_000, '1', '2', '0.5', '1.5', '10']
+                                  for i in range(limit)])
+
+    app = web.Application()
+    app.router.add_get('/api/v3/ticker/price', ticker_price)
+    app.router.add_get('/api/v3/klines', klines)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/api/v3", peers
+
+
+def test_clients_share_pooled_connections():
+    async def scenario():
+        runner, base_url, peers = await start_server()
+        binance, history = BinanceClient(), BinanceHistoryClient()
+        binance.base_url = history.base_url = base_url
+        try:
+            for _ in range(20):
+                price = await binance.get_price('BTCUSDT')
+                assert price['price'] == 45000.5
+            klines = await history.get_klines('BTC/USDT:USDT', limit=5)
+            assert len(klines) == 5 and klines[-1]['close'] == 1.5
+            session = http_client.session()
+            assert session.connector.limit_per_host == http_client.limit_per_host
+            # усі послідовні запити - через одне keep-alive з'єднання
+            assert len(set(peers)) == 1
+        finally:
+            await http_client.close()
+            await runner.cleanup()
+        assert session.closed
+
+    asyncio.run(scenario())
+
+
+def test_session_per_event_loop():
+    client = HttpClient(limit_per_host=4, timeout=3)
+
+    async def current():
+        return client.session()
+
+    async def both():
+        first, second = client.session(), await current()
+        assert first.timeout.total == 3 and first.connector.limit_per_host == 4
+        await client.close()
+        return first, second
+
+    first, second = asyncio.run(both())
+    assert first is second and first.closed
+
+    # новий цикл подій (asyncio.run у фоновій задачі) - нова сесія
+    async def reopen():
+        session = client.session()
+        await client.close()
+        return session
+
+    assert asyncio.run(reopen()) is not first
+    assert client.stats['sessions'] == 2
+
+
+def test_session_closed_with_event_loop():
+    client = HttpClient()
+
+    async def forgotten():
+        return client.session()  # без client.close()
+
+    session = asyncio.run(forgotten())
+    assert session.closed
+    asyncio.run(forgotten())
+    assert len(client._sessions) == 1  # сесію закритого циклу забуто
+
+
+def test_stats_count_every_request():
+    async def scenario():
+        runner, base_url, peers = await start_server()
+        client = HttpClient()
+        try:
+            async with client.get(f"{base_url}/ticker/price", params={'symbol': 'BTCUSDT'}) as response:
+                assert response.status == 200
+            async with client.get(f"{base_url}/missing") as response:
+                assert response.status == 404
+            assert await client.get_json(f"{base_url}/missing") is None
+            try:
+                async with client.get("http://127.0.0.1:1/closed-port"):
+                    pass
+            except aiohttp.ClientError:
+                pass
+        finally:
+            await client.close()
+            await runner.cleanup()
+        return client.stats
+
+    stats = asyncio.run(scenario())
+    assert stats['requests'] == 4 and stats['errors'] == 3
+
+
+def test_pooled_vs_session_per_request():
+    async def scenario():
+        runner, base_url, peers = await start_server()
+        url = f"{base_url}/ticker/price"
+        client = HttpClient()
+        try:
+            started = time.perf_counter()
+            for _ in range(100):
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(url, params={'symbol': 'BTCUSDT'}) as response:
+                        await response.json()
+            per_request = time.perf_counter() - started
+            fresh = len(set(peers))
+
+            peers.clear()
+            started = time.perf_counter()
+            for _ in range(100):
+                assert await client.get_json(url, params={'symbol': 'BTCUSDT'})
+            pooled = time.perf_counter() - started
+        finally:
+            await client.close()
+            await runner.cleanup()
+        print(f"   100 запитів: сесія на запит {per_request * 1000:.0f} мс ({fresh} з'єднань), "
+              f"спільна сесія {pooled * 1000:.0f} мс ({len(set(peers))} з'єднання)")
+        assert fresh > 1 and len(set(peers)) == 1
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ СПІЛЬНОГО HTTP-КЛІЄНТА")
+    print("=" * 60)
+    for test in (test_clients_share_pooled_connections, test_session_per_event_loop,
+                 test_session_closed_with_event_loop, test_stats_count_every_request,
+                 test_pooled_vs_session_per_request):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,112 @@
+# backend/test_indicator_plan.py
+import time
+from collections import Counter
+
+import numpy as np
+import talib
+from candle_factory import create_test_data
+from app.futures.services.ai_analyzer import AIAnalyzer
+from app.futures.models.ai_analyzer import AIAnalyzer as ModelsAIAnalyzer
+
+
+def legacy_all_indicators(analyzer, df):
+    """Попередній порядок викликів: MACD ×3, Bollinger ×3, Stoch RSI ×2"""
+    close, high, low, volume = df['close'].values, df['high'].values, df['low'].values, df['volume'].values
+    return {
+        'sma_20': analyzer._calculate_sma(close, 20),
+        'sma_50': analyzer._calculate_sma(close, 50),
+        'sma_200': analyzer._calculate_sma(close, 200),
+        'ema_12': analyzer._calculate_ema(close, 12),
+        'ema_26': analyzer._calculate_ema(close, 26),
+        'rsi': analyzer._calculate_rsi(close, 14),
+        'macd': analyzer._calculate_macd(close)[0],
+        'macd_signal': analyzer._calculate_macd(close)[1],
+        'macd_histogram': analyzer._calculate_macd(close)[2],
+        'bb_upper': analyzer._calculate_bollinger_bands(close, 20, 2)[0],
+        'bb_middle': analyzer._calculate_bollinger_bands(close, 20, 2)[1],
+        'bb_lower': analyzer._calculate_bollinger_bands(close, 20, 2)[2],
+        'atr': analyzer._calculate_atr(high, low, close, 14),
+        'vwap': analyzer._calculate_vwap(df),
+        'stoch_rsi_k': analyzer._calculate_stoch_rsi(close)[0],
+        'stoch_rsi_d': analyzer._calculate_stoch_rsi(close)[1],
+        'obv': analyzer._calculate_obv(close, volume),
+        'adl': analyzer._calculate_adl(df),
+        'cci': analyzer._calculate_cci(df, 20),
+        'williams_r': analyzer._calculate_williams_r(df, 14),
+        'volume_sma': analyzer._calculate_sma(volume, 20),
+    }
+
+
+def count_calls(analyzer, names):
+    """Підміняє методи екземпляра лічильниками викликів"""
+    calls = Counter()
+    for name in names:
+        method = getattr(analyzer, name)
+
+        def wrapper(*args, _name=name, _method=method, **kwargs):
+            calls[_name] += 1
+            return _method(*args, **kwargs)
+        setattr(analyzer, name, wrapper)
+    return calls
+
+
+def test_plan_matches_legacy_calls():
+    analyzer = AIAnalyzer()
+    for seed in range(5):
+        df = create_test_data(500, seed)
+        indicators = analyzer._calculate_all_indicators(df)
+        for key, values in legacy_all_indicators(analyzer, df).items():
+            assert np.array_equal(indicators[key], values, equal_nan=True), (seed, key)
+        assert 'typical_price' not in indicators and 'close_std_20' not in indicators
+
+
+def test_shared_intermediates_computed_once():
+    analyzer = AIAnalyzer()
+    calls = count_calls(analyzer, ['_calculate_ema', '_calculate_rsi', '_calculate_macd',
+                                   '_calculate_bollinger_bands', '_calculate_stoch_rsi'])
+    analyzer._calculate_all_indicators(create_test_data(500))
+
+    # ema_12, ema_26 та сигнальна лінія MACD; RSI - один раз для rsi і Stoch RSI
+    assert calls['_calculate_ema'] == 3
+    assert calls['_calculate_rsi'] == 1
+    assert calls['_calculate_macd'] == calls['_calculate_bollinger_bands'] == calls['_calculate_stoch_rsi'] == 0
+
+
+def test_models_plan_matches_talib():
+    df = create_test_data(400)
+    indicators = ModelsAIAnalyzer().calculate_indicators(df)
+    close, high, low = df['close'].values, df['high'].values, df['low'].values
+
+    stoch_rsi_k, stoch_rsi_d = talib.STOCHRSI(close, timeperiod=14)
+    assert np.array_equal(indicators['stoch_rsi_k'], stoch_rsi_k, equal_nan=True)
+    assert np.array_equal(indicators['stoch_rsi_d'], stoch_rsi_d, equal_nan=True)
+    assert np.array_equal(indicators['natr'], talib.NATR(high, low, close, timeperiod=14), equal_nan=True)
+    assert 'typical_price' not in indicators
+
+
+def test_plan_benchmark():
+    """Бенчмарк на 500 свічках: попередні повторні виклики проти плану"""
+    analyzer = AIAnalyzer()
+    df = create_test_data(500)
+
+    def best_time(func, repeat=5):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    legacy_time = best_time(lambda: legacy_all_indicators(analyzer, df))
+    plan_time = best_time(lambda: analyzer._calculate_all_indicators(df))
+    print(f"   500 свічок: попередньо {legacy_time * 1000:.1f} мс, план {plan_time * 1000:.1f} мс "
+          f"(×{legacy_time / plan_time:.2f})")
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ ПЛАНУ ІНДИКАТОРІВ")
+    print("=" * 60)
+    for test in (test_plan_matches_legacy_calls, test_shared_intermediates_computed_once,
+                 test_models_plan_matches_talib, test_plan_benchmark):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,126 @@
+# backend/test_kernels.py
+import time
+
+import numpy as np
+import pandas as pd
+from candle_factory import create_test_data
+from app.futures.services.ai_analyzer import AIAnalyzer
+from app.futures.models import batch_indicators, indicator_plan, signal_scoring, universe_screener
+from app.futures.models.kernels import obv, rolling_mad, rolling_max, rolling_mean, rolling_min, rolling_std
+
+
+# ===== ЕТАЛОННІ (ПОПЕРЕДНІ) РЕАЛІЗАЦІЇ =====
+
+def legacy_obv(prices, volume):
+    result = np.zeros_like(prices)
+    result[0] = volume[0]
+    for i in range(1, len(prices)):
+        if prices[i] > prices[i-1]:
+            result[i] = result[i-1] + volume[i]
+        elif prices[i] < prices[i-1]:
+            result[i] = result[i-1] - volume[i]
+        else:
+            result[i] = result[i-1]
+    return result
+
+
+def legacy_mad(values, period):
+    return pd.Series(values).rolling(period).apply(lambda x: np.mean(np.abs(x - np.mean(x)))).values
+
+
+def legacy_cci(df, period=20):
+    typical_price = (df['high'] + df['low'] + df['close']) / 3
+    sma = typical_price.rolling(period).mean()
+    mad = typical_price.rolling(period).apply(lambda x: np.mean(np.abs(x - np.mean(x))))
+    return ((typical_price - sma) / (0.015 * mad)).values
+
+
+def test_obv_matches_loop():
+    for seed in range(5):
+        df = create_test_data(500, seed)
+        close = df['close'].round(-2).values  # є однакові ціни поспіль
+        assert np.array_equal(obv(close, df['volume'].values), legacy_obv(close, df['volume'].values))
+    assert obv(np.array([]), np.array([])).shape == (0,)
+
+
+def test_rolling_kernels_match_pandas():
+    values = create_test_data(500)['close'].values.copy()
+    values[100:103] = np.nan
+    for period in (3, 14, 20, 52):
+        assert np.allclose(rolling_mad(values, period), legacy_mad(values, period), rtol=1e-12, equal_nan=True)
+        assert np.array_equal(rolling_max(values, period), pd.Series(values).rolling(period).max().values,
+                              equal_nan=True)
+        assert np.array_equal(rolling_min(values, period), pd.Series(values).rolling(period).min().values,
+                              equal_nan=True)
+    assert np.isnan(rolling_max(values[:5], 14)).all()
+
+
+def test_rolling_mean_single_implementation():
+    values = create_test_data(300)['close'].values
+    for period in (3, 20, 200):
+        assert np.allclose(rolling_mean(values, period), pd.Series(values).rolling(period).mean().values,
+                           rtol=1e-12, equal_nan=True)
+        assert np.allclose(rolling_std(values, period), pd.Series(values).rolling(period).std().values,
+                           rtol=1e-7, equal_nan=True)  # pandas std - онлайн-алгоритм
+    # Коротший за period ряд - усі NaN тієї ж форми
+    for kernel in (rolling_mean, rolling_std):
+        short = kernel(np.ones((3, 5)), 14)
+        assert short.shape == (3, 5) and np.isnan(short).all()
+    # Одна реалізація для скринера, скорингу, плану індикаторів і батчу
+    for module in (batch_indicators, indicator_plan, signal_scoring, universe_screener):
+        assert module.rolling_mean is rolling_mean
+    assert batch_indicators.rolling_std is rolling_std
+
+
+def test_kernels_work_on_matrix():
+    frames = [create_test_data(300, seed) for seed in range(4)]
+    close = np.vstack([df['close'].values for df in frames])
+    volume = np.vstack([df['volume'].values for df in frames])
+    for row in range(len(frames)):
+        assert np.array_equal(obv(close, volume)[row], obv(close[row], volume[row]))
+        assert np.array_equal(rolling_mad(close, 20)[row], rolling_mad(close[row], 20), equal_nan=True)
+
+
+def test_analyzer_outputs_unchanged():
+    analyzer = AIAnalyzer()
+    for seed in range(5):
+        df = create_test_data(500, seed)
+        close, volume = df['close'].values, df['volume'].values
+        assert np.allclose(analyzer._calculate_cci(df, 20), legacy_cci(df), rtol=1e-12, equal_nan=True)
+        assert np.array_equal(analyzer._calculate_obv(close, volume), legacy_obv(close, volume))
+
+        legacy_williams = (-100 * (pd.Series(df['high'].values).rolling(14).max() - close) /
+                           (pd.Series(df['high'].values).rolling(14).max() -
+                            pd.Series(df['low'].values).rolling(14).min() + 0.000001)).values
+        assert np.array_equal(analyzer._calculate_williams_r(df, 14), legacy_williams, equal_nan=True)
+
+
+def test_kernel_speed():
+    frames = [create_test_data(500, seed) for seed in range(12)]
+
+    start = time.perf_counter()
+    for df in frames:
+        legacy_cci(df)
+        legacy_obv(df['close'].values, df['volume'].values)
+    legacy_time = time.perf_counter() - start
+
+    analyzer = AIAnalyzer()
+    start = time.perf_counter()
+    for df in frames:
+        analyzer._calculate_cci(df, 20)
+        analyzer._calculate_obv(df['close'].values, df['volume'].values)
+    kernel_time = time.perf_counter() - start
+
+    print(f"   CCI+OBV, 12 символів × 500 свічок: попередньо {legacy_time * 1000:.0f} мс, "
+          f"ядра {kernel_time * 1000:.1f} мс")
+    assert kernel_time < legacy_time
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ NUMPY-ЯДЕР")
+    print("=" * 60)
+    for test in (test_obv_matches_loop, test_rolling_kernels_match_pandas, test_rolling_mean_single_implementation,
+                 test_kernels_work_on_matrix,
+                 test_analyzer_outputs_unchanged, test_kernel_speed):
+        test()
+        print(f"✅ {test.__name__}")
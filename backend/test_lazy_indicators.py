@@ -0,0 +1,68 @@
+# backend/test_lazy_indicators.py
+import numpy as np
+from candle_factory import create_test_data
+from app.futures.models.ai_analyzer import AIAnalyzer
+from app.futures.models.lazy_indicators import IndicatorNode, LazyIndicators
+
+
+def test_nodes_computed_once_with_dependencies():
+    calls = []
+
+    def double(x):
+        calls.append('double')
+        return x * 2
+
+    nodes = [
+        IndicatorNode(('doubled',), ('value',), double),
+        IndicatorNode(('quadrupled',), ('doubled',), lambda x: x * 2),
+    ]
+    indicators = LazyIndicators(nodes, {'value': np.arange(3.0)})
+
+    assert 'quadrupled' in indicators and not calls
+    assert list(indicators['quadrupled']) == [0.0, 4.0, 8.0]
+    assert indicators['doubled'] is indicators['doubled']
+    assert calls == ['double']
+    assert indicators.usage_report()['touched'] == ['quadrupled', 'doubled']
+
+
+def test_lazy_signal_matches_eager():
+    for seed in range(8):
+        df = create_test_data(400, seed)
+        eager = AIAnalyzer(lazy_indicators=False).generate_trading_signal('BTC/USDT', df, '1h')
+        lazy = AIAnalyzer(lazy_indicators=True).generate_trading_signal('BTC/USDT', df, '1h')
+        for key in ('direction', 'confidence', 'take_profit', 'stop_loss', 'factors',
+                    'indicators_summary', 'market_structure'):
+            assert lazy.get(key) == eager.get(key), (seed, key)
+
+
+def test_usage_report_lists_unread_indicators():
+    analyzer = AIAnalyzer()
+    analyzer.generate_trading_signal('BTC/USDT', create_test_data(400, 7), '1h')
+
+    usage = analyzer.last_indicator_usage
+    assert 'rsi' in usage['touched']
+    for key in ('ultosc', 'harami', 'doji', 'hammer', 'sma_20'):
+        assert key in usage['skipped']
+
+    report = analyzer.get_indicator_usage_report()
+    assert report['signals'] == 1
+    assert 'ultosc' in report['never_touched']
+
+
+def test_materialize_returns_full_dict():
+    analyzer = AIAnalyzer()
+    df = create_test_data(300)
+    indicators = analyzer.calculate_indicators(df)
+    assert isinstance(indicators, dict)
+    assert list(indicators) == list(analyzer.build_lazy_indicators(df))
+    assert np.array_equal(indicators['senkou_span_a'],
+                          (indicators['tenkan_sen'] + indicators['kijun_sen']) / 2, equal_nan=True)
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ LAZY ІНДИКАТОРІВ")
+    print("=" * 60)
+    for test in (test_nodes_computed_once_with_dependencies, test_lazy_signal_matches_eager,
+                 test_usage_report_lists_unread_indicators, test_materialize_returns_full_dict):
+        test()
+        print(f"✅ {test.__name__}")
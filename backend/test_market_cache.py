@@ -0,0 +1,163 @@
+# backend/test_market_cache.py
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from candle_factory import create_test_data
+from app.core.market_cache import MarketDataCache, last_closed_candle_ts, market_cache
+from app.futures.models.exchange_connector import ExchangeConnector
+from app.futures.services.ai_analyzer import AIAnalyzer
+
+HOUR = 3600
+
+
+class CountingFetch:
+    def __init__(self, df):
+        self.df = df
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.df
+
+
+def test_last_closed_candle_ts():
+    now = 1_700_000_000 + 1234
+    assert last_closed_candle_ts('1h', now) == (now // HOUR - 1) * HOUR * 1000
+    assert last_closed_candle_ts('15m', now) == (now // 900 - 1) * 900 * 1000
+
+
+def test_frames_cached_within_candle():
+    cache = MarketDataCache()
+    fetch = CountingFetch(create_test_data(500))
+    now = 100 * HOUR + 10
+
+    first = cache.get_ohlcv('BTC/USDT:USDT', '1h', 500, fetch, now=now)
+    second = cache.get_ohlcv('BTC/USDT:USDT', '1h', 500, fetch, now=now + 3)
+    smaller = cache.get_ohlcv('BTC/USDT:USDT', '1h', 100, fetch, now=now + 6)
+    assert fetch.calls == 1
+    assert first.equals(second) and first is not second
+    assert smaller.equals(first.tail(100).reset_index(drop=True))
+
+    cache.get_ohlcv('BTC/USDT:USDT', '1h', 1000, fetch, now=now)  # більший limit - новий запит
+    cache.get_ohlcv('BTC/USDT:USDT', '1h', 500, fetch, now=now + HOUR)  # нова свічка
+    assert fetch.calls == 3
+    assert cache.get_stats()['frame_hits'] == 2
+
+
+def test_forming_candle_refreshed_after_ttl():
+    cache = MarketDataCache(frame_ttl=10)
+    fetch = CountingFetch(create_test_data(100))
+    now = 100 * HOUR + 10
+
+    cache.get_ohlcv('BTC', '1h', 100, fetch, now=now)
+    assert cache.peek_ohlcv('BTC', '1h', 100, now=now + 5) is not None
+    # та сама закрита свічка, але незакрита вже застаріла - новий запит
+    assert cache.peek_ohlcv('BTC', '1h', 100, now=now + 15) is None
+    cache.get_ohlcv('BTC', '1h', 100, fetch, now=now + 15)
+    assert fetch.calls == 2
+
+    cache.put_ohlcv('ETH', '1h', 100, fetch.df, now=now)
+    assert cache.peek_ohlcv('ETH', '1h', 100, now=now + 9) is not None
+    assert cache.peek_ohlcv('ETH', '1h', 100, now=now + 10) is None
+
+
+def test_indicator_bundles_read_only():
+    cache = MarketDataCache()
+    df = create_test_data(100)
+    compute = lambda: {'rsi': np.arange(5.0), 'macd': {'hist': np.ones(3)}, 'label': 'x'}
+
+    first = cache.get_indicators('models', 'BTC', '1h', df, compute)
+    try:
+        first['rsi'][0] = 100
+        assert False, "масив з кешу не повинен змінюватися"
+    except ValueError:
+        pass
+    assert not first['macd']['hist'].flags.writeable
+    first['label'] = 'змінено'  # копія словника, кеш не зачіпає
+
+    second = cache.get_indicators('models', 'BTC', '1h', df, compute)
+    assert second['label'] == 'x' and second['rsi'][0] == 0
+
+
+def test_empty_frames_not_cached():
+    cache = MarketDataCache()
+    fetch = CountingFetch(pd.DataFrame())
+    for _ in range(2):
+        assert len(cache.get_ohlcv('BTC/USDT:USDT', '1h', 100, fetch, now=0)) == 0
+    assert fetch.calls == 2 and cache.get_stats()['frames'] == 0
+
+
+def test_lru_eviction():
+    cache = MarketDataCache(max_frames=2)
+    fetch = CountingFetch(create_test_data(50))
+    for symbol in ('A', 'B', 'A', 'C', 'A', 'B'):
+        cache.get_ohlcv(symbol, '1h', 50, fetch, now=0)
+
+    stats = cache.get_stats()
+    assert fetch.calls == 4  # B витіснено після C, A залишався найсвіжішим
+    assert stats['frames'] == 2 and stats['evictions'] == 2
+    assert stats['frame_hits'] == 2 and stats['frame_misses'] == 4
+
+
+def test_concurrent_misses_fetch_once():
+    cache = MarketDataCache()
+    df = create_test_data(100)
+
+    def slow_fetch():
+        slow_fetch.calls += 1
+        time.sleep(0.05)
+        return df
+    slow_fetch.calls = 0
+
+    threads = [threading.Thread(target=cache.get_ohlcv, args=('BTC', '1h', 100, slow_fetch, 0)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert slow_fetch.calls == 1
+
+
+def test_connector_and_analyzer_share_cache():
+    market_cache.clear()
+    bundle_hits = market_cache.get_stats()['bundle_hits']
+    df = create_test_data(500)
+    connector = ExchangeConnector()
+    fetch = CountingFetch(df)
+    connector._fetch_ohlcv = lambda symbol, timeframe, limit: fetch()
+
+    analyzer = AIAnalyzer()
+    analyzer.exchange = connector
+    computations = []
+    original = analyzer._calculate_all_indicators
+    analyzer._calculate_all_indicators = lambda *args: computations.append(1) or original(*args)
+
+    first = analyzer.analyze_market('BTC/USDT', '1h')
+    second = analyzer.analyze_market('BTC/USDT', '1h')
+    connector.fetch_ohlcv('BTC/USDT:USDT', '1h', limit=100)
+
+    assert fetch.calls == 1
+    assert len(computations) == 1
+    assert first['direction'] == second['direction'] and first['confidence'] == second['confidence']
+    assert market_cache.get_stats()['bundle_hits'] == bundle_hits + 1
+
+
+def test_redis_unavailable_falls_back_to_memory():
+    cache = MarketDataCache(redis_url='redis://127.0.0.1:1/0')
+    assert cache.redis_client is None
+    fetch = CountingFetch(create_test_data(50))
+    cache.get_ohlcv('BTC', '1h', 50, fetch, now=0)
+    cache.get_ohlcv('BTC', '1h', 50, fetch, now=0)
+    assert fetch.calls == 1
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ КЕШУ РИНКОВИХ ДАНИХ")
+    print("=" * 60)
+    for test in (test_last_closed_candle_ts, test_frames_cached_within_candle,
+                 test_forming_candle_refreshed_after_ttl, test_indicator_bundles_read_only, test_empty_frames_not_cached,
+                 test_lru_eviction, test_concurrent_misses_fetch_once, test_connector_and_analyzer_share_cache,
+                 test_redis_unavailable_falls_back_to_memory):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,113 @@
+# backend/test_parameter_sweep.py
+import os
+import tempfile
+import time
+
+import pytest
+from candle_factory import create_test_data
+from app.futures.models.ai_analyzer import AIAnalyzer
+from app.futures.models.ai_learning_analyzer import AILearningAnalyzer
+from app.futures.models.backtest import BacktestEngine
+from app.futures.models.parameter_sweep import (
+    ParameterSweep, applied_thresholds, evaluate_config, expand_search_space, make_config, prepare_dataset,
+)
+
+SPACE = {'trend': [0.2, 0.4], 'MIN_RR': [1.5, 2.0], 'RSI_BANDS': [(30, 40, 60, 70), (35, 45, 55, 65)]}
+
+
+def create_frames(count=3, num_candles=600):
+    return {f'SYM{i}/USDT': create_test_data(num_candles, seed=i) for i in range(count)}
+
+
+def test_search_space():
+    grid = expand_search_space(SPACE)
+    assert len(grid) == 8
+    assert all(abs(sum(config['weights'].values()) - 1) < 1e-12 for config in grid)
+    assert make_config({'trend': 0.7})['weights'] == pytest.approx(
+        {'trend': 0.5, 'momentum': 0.178571, 'risk': 0.142857, 'volume': 0.107143, 'structure': 0.071429}, abs=1e-6)
+
+    random_configs = expand_search_space(SPACE, 'random', samples=50, seed=1)
+    assert 1 < len(random_configs) <= 8 and all(config in grid for config in random_configs)
+    with pytest.raises(ValueError):
+        expand_search_space({'UNKNOWN': [1]})
+
+
+def test_cached_levels_match_engine():
+    engine = BacktestEngine(AIAnalyzer())
+    frames = create_frames(2)
+    dataset = prepare_dataset(frames, engine)
+    result = evaluate_config(engine, dataset, make_config({}), train_fraction=0.5)
+
+    trades = 0
+    for symbol, df in frames.items():
+        signals = engine.generate_signals(df)
+        assert engine.generate_signals(df, levels=dataset[symbol]['levels']) == signals
+        trades += len(engine.simulate(df, signals)['trades'])
+    assert result['in_sample']['trades'] + result['out_of_sample']['trades'] == trades > 0
+
+
+def test_thresholds_match_live_signal():
+    analyzer = AIAnalyzer()
+    engine = BacktestEngine(analyzer, lookback=None)
+    df = create_test_data(400, 2)
+    config = make_config({'ADX_TREND': 30, 'RSI_BANDS': (30, 40, 60, 70), 'MIN_RR': 1.5, 'MIN_CONFIDENCE': 0.55})
+    dataset = prepare_dataset({'X': df}, engine)
+    with applied_thresholds(analyzer, config['thresholds']):
+        scores = analyzer.score_series(df, dataset['X']['indicators'])
+        signals = engine.generate_signals(df, scores, dataset['X']['levels'])
+        for t in range(analyzer.MIN_CANDLES - 1, len(df), 7):
+            live = analyzer.generate_trading_signal('X', df.iloc[:t + 1])
+            signal = signals.get(t)
+            assert (signal['direction'], signal['confidence']) == (live['direction'], live['confidence']) \
+                if live['direction'] != 'neutral' else signal is None, t
+    assert analyzer.MIN_RR == 2.0 and analyzer.RSI_BANDS == (35, 45, 55, 65)
+
+
+def test_pool_matches_sequential():
+    frames = create_frames(2)
+    sequential = ParameterSweep(workers=1, min_trades=1).run(frames, SPACE)
+    parallel = ParameterSweep(workers=2, min_trades=1).run(frames, SPACE)
+    assert sequential['configs'] == parallel['configs'] == 8
+    assert [r['config'] for r in sequential['ranking']] == [r['config'] for r in parallel['ranking']]
+    assert [r['out_of_sample'] for r in sequential['ranking']] == [r['out_of_sample'] for r in parallel['ranking']]
+
+    metrics = [(r['out_of_sample']['trades'] >= 1, r['out_of_sample']['total_pnl_pct']) for r in sequential['ranking']]
+    assert metrics == sorted(metrics, reverse=True)
+
+
+def test_best_weights_written_to_knowledge_base():
+    analyzer = AILearningAnalyzer()
+    frames = create_frames(2)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'knowledge_base.pkl')
+        result = analyzer.optimize_parameters(frames, {'trend': [0.2, 0.5], 'MIN_RR': [1.5, 2.5]},
+                                              save_to=path, min_trades=1)
+        best = result['best']['config']
+        assert analyzer.dynamic_weights == {k: round(v, 4) for k, v in best['weights'].items()}
+
+        restored = AILearningAnalyzer(config_file=path)
+        assert restored.dynamic_weights == analyzer.dynamic_weights
+        assert restored.knowledge_base['parameter_sweep']['thresholds'] == best['thresholds']
+        restored.knowledge_base['indicator_performance']['rsi_level']['total'] += 1  # defaultdict збережено
+
+
+def test_sweep_speed():
+    frames = create_frames(4, num_candles=1000)
+    space = {'trend': [0.2, 0.3, 0.4], 'momentum': [0.2, 0.3], 'MIN_RR': [1.5, 2.0, 2.5]}
+    workers = min(4, os.cpu_count() or 1)
+
+    start = time.perf_counter()
+    result = ParameterSweep(workers=workers).run(frames, space)
+    elapsed = time.perf_counter() - start
+    print(f"   {result['configs']} конфігурацій × {result['symbols']} символів: {elapsed:.2f} с "
+          f"(підготовка {result['timings_ms']['prepare']:.0f} мс, {workers} процесів)")
+    assert result['best'] is not None
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ ПЕРЕБОРУ ПАРАМЕТРІВ")
+    print("=" * 60)
+    for test in (test_search_space, test_cached_levels_match_engine, test_thresholds_match_live_signal,
+                 test_pool_matches_sequential, test_best_weights_written_to_knowledge_base, test_sweep_speed):
+        test()
+        print(f"✅ {test.__name__}")
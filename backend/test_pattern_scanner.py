@@ -0,0 +1,88 @@
+# backend/test_pattern_scanner.py
+import time
+
+import numpy as np
+import pytest
+import talib
+from candle_factory import create_test_data
+from app.futures.models.pattern_scanner import CDL_PATTERNS, PatternScanner
+
+ANALYZER_PATTERNS = ('CDLDOJI', 'CDLHAMMER', 'CDLENGULFING', 'CDLMORNINGSTAR', 'CDLEVENINGSTAR', 'CDLHARAMI')
+
+
+def full_history_masks(scanner, df):
+    """Маски з повних серій TA-Lib (еталон)"""
+    columns = [df[column].values.astype(float) for column in ('open', 'high', 'low', 'close')]
+    bullish, bearish = np.zeros(scanner.bars, dtype=np.uint64), np.zeros(scanner.bars, dtype=np.uint64)
+    for bit, name in enumerate(scanner.patterns):
+        values = getattr(talib, name)(*columns)[-scanner.bars:]
+        bullish[values > 0] |= np.uint64(1) << np.uint64(bit)
+        bearish[values < 0] |= np.uint64(1) << np.uint64(bit)
+    return bullish, bearish
+
+
+def test_tail_scan_matches_full_history():
+    scanner = PatternScanner(bars=40)
+    frames = {f'SYM{seed}': create_test_data(400, seed, gap=0.004, doji=0.1) for seed in range(12)}
+    scan = scanner.scan(frames)
+    assert scan['symbols'] == list(frames)
+    fired = 0
+    for i, symbol in enumerate(scan['symbols']):
+        bullish, bearish = full_history_masks(scanner, frames[symbol])
+        assert np.array_equal(scan['bullish'][i], bullish), symbol
+        assert np.array_equal(scan['bearish'][i], bearish), symbol
+        fired += np.count_nonzero(bullish | bearish)
+    assert fired > 0
+    assert scanner.stats['calls'] == len(CDL_PATTERNS)
+
+
+def test_subset_and_decode():
+    scanner = PatternScanner(ANALYZER_PATTERNS, bars=3)
+    assert scanner.tail == 12 + 3
+    df = create_test_data(300, 2, gap=0.004, doji=0.1)
+    scan = scanner.scan({'A': df, 'SHORT': df.tail(scanner.tail - 1)})
+    assert scan['symbols'] == ['A'] and scan['skipped'] == ['SHORT']
+
+    close = df['close'].values.astype(float)
+    doji = talib.CDLDOJI(df['open'].values, df['high'].values, df['low'].values, close)[-3:]
+    for bar in range(3):
+        assert ('CDLDOJI' in scanner.decode(scan['bullish'][0, bar])) == (doji[bar] > 0)
+    latest = scanner.latest(scan)
+    assert set(latest) <= {'A'}
+
+    # hex для JSON: старші біти uint64 не губляться (float64 у JS - лише 53 біти)
+    high_bit = np.array([[np.uint64(1) << np.uint64(60) | np.uint64(1)]], dtype=np.uint64)
+    assert PatternScanner.to_hex(high_bit) == [['1000000000000001']]
+    assert int(float(high_bit[0, 0])) != int(high_bit[0, 0])
+    full = PatternScanner()
+    assert full.decode('1000000000000001') == [full.patterns[0], full.patterns[60]]
+    hexed = scanner.to_hex(scan['bullish'])
+    assert all(scanner.decode(hexed[0][bar]) == scanner.decode(scan['bullish'][0, bar]) for bar in range(3))
+
+    with pytest.raises(ValueError):
+        PatternScanner(['CDLNOTAPATTERN'])
+
+
+def test_batch_cost():
+    frames = {f'SYM{seed}': create_test_data(500, seed, gap=0.004, doji=0.1) for seed in range(300)}
+    scanner = PatternScanner()
+    started = time.perf_counter()
+    scanner.scan(frames)
+    batch_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for df in frames.values():
+        columns = [df[column].values.astype(float) for column in ('open', 'high', 'low', 'close')]
+        for name in ANALYZER_PATTERNS:
+            getattr(talib, name)(*columns)
+    six_full_time = time.perf_counter() - started
+    print(f"   {len(CDL_PATTERNS)} паттернів пакетом: {batch_time * 1000:.1f} мс; "
+          f"6 паттернів по повних вікнах: {six_full_time * 1000:.1f} мс (300 символів)")
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ СКАНЕРА СВІЧНИХ ПАТТЕРНІВ")
+    print("=" * 60)
+    for test in (test_tail_scan_matches_full_history, test_subset_and_decode, test_batch_cost):
+        test()
+        print(f"✅ {test.__name__}")
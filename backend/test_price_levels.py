@@ -0,0 +1,94 @@
+# backend/test_price_levels.py
+import numpy as np
+from candle_factory import create_test_data
+from app.futures.models.ai_analyzer import AIAnalyzer
+from app.futures.models.price_levels import cluster_levels, find_swing_points
+
+
+# ===== ЕТАЛОННІ (ПОПЕРЕДНІ) РЕАЛІЗАЦІЇ =====
+
+def legacy_swing_points(high, low):
+    highs, lows = [], []
+    for i in range(10, len(high) - 10):
+        if high[i] == max(high[i-10:i+11]):
+            highs.append((i, high[i]))
+        if low[i] == min(low[i-10:i+11]):
+            lows.append((i, low[i]))
+    return highs, lows
+
+
+def legacy_levels(close, window=20):
+    supports, resistances = [], []
+    for i in range(window, len(close) - window):
+        if close[i] == np.min(close[i-window:i+window+1]):
+            supports.append(close[i])
+        if close[i] == np.max(close[i-window:i+window+1]):
+            resistances.append(close[i])
+    return supports, resistances
+
+
+def legacy_cluster_levels(levels, threshold_percent=0.015):
+    if not levels:
+        return []
+    levels = sorted(levels)
+    clusters = []
+    current_cluster = [levels[0]]
+    for price in levels[1:]:
+        cluster_mean = np.mean(current_cluster)
+        if cluster_mean == 0:
+            current_cluster.append(price)
+            continue
+        if abs(price - cluster_mean) / cluster_mean < threshold_percent:
+            current_cluster.append(price)
+        else:
+            clusters.append(np.mean(current_cluster))
+            current_cluster = [price]
+    if current_cluster:
+        clusters.append(np.mean(current_cluster))
+    return clusters
+
+
+def test_swing_points_match_loop():
+    for seed in range(10):
+        df = create_test_data(300, seed)
+        high, low = df['high'].values, df['low'].values
+        assert find_swing_points(high, low, 10) == legacy_swing_points(high, low)
+
+
+def test_cluster_levels_match_loop():
+    rng = np.random.default_rng(3)
+    for _ in range(50):
+        levels = list(rng.uniform(100, 130, rng.integers(1, 60)))
+        assert np.allclose(cluster_levels(levels), legacy_cluster_levels(levels), rtol=1e-12)
+    assert cluster_levels([]) == []
+
+
+def test_support_resistance_matches_loop():
+    analyzer = AIAnalyzer()
+    for seed in range(10):
+        df = create_test_data(300, seed)
+        close = df['close'].values
+        supports, resistances = legacy_levels(close)
+        support_clusters = legacy_cluster_levels(supports)
+        resistance_clusters = legacy_cluster_levels(resistances)
+
+        result = analyzer.calculate_support_resistance(df)
+        assert result['supports'] == [round(s, 4) for s in support_clusters[-5:]]
+        assert result['resistances'] == [round(r, 4) for r in resistance_clusters[-5:]]
+
+
+def test_batch_matches_single():
+    analyzer = AIAnalyzer()
+    frames = {f'SYM{seed}': create_test_data(300 if seed % 2 else 250, seed) for seed in range(8)}
+    batch = analyzer.calculate_support_resistance_batch(frames)
+    for symbol, df in frames.items():
+        assert batch[symbol] == analyzer.calculate_support_resistance(df)
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ РІВНІВ ТА СВІНГІВ")
+    print("=" * 60)
+    for test in (test_swing_points_match_loop, test_cluster_levels_match_loop,
+                 test_support_resistance_matches_loop, test_batch_matches_single):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,156 @@
+# backend/test_rate_limiter.py
+import asyncio
+import threading
+import time
+
+import ccxt
+import ccxt.async_support as ccxt_async
+from aiohttp import web
+import candle_factory  # noqa: F401 - тестові ключі біржі до імпорту app
+from app.core.http_client import http_client
+from app.core.rate_limiter import RateLimiter, rate_limiter, retry_after_seconds
+
+
+def test_bucket_burst_and_endpoints():
+    limiter = RateLimiter({'ex': (10, 1), 'okx': (20, 2), 'okx:market/ticker': (4, 1)})
+    assert all(limiter.try_acquire('ex') for _ in range(10))
+    assert not limiter.try_acquire('ex')
+    assert 0 < limiter._take('ex', 1) <= 0.1 + 1e-6
+
+    # вага ендпоінту списується цілком; ендпоінт без власного ліміту - кошик біржі
+    assert limiter.try_acquire('okx:market/ticker', 4) and not limiter.try_acquire('okx:market/ticker')
+    assert limiter.try_acquire('okx:public/time', 20) and not limiter.try_acquire('okx')
+    assert limiter.try_acquire('unknown', 10 ** 6)
+    assert limiter.stats['rejected'] == 3
+
+
+def test_heavy_requests_charged_in_full():
+    # ccxt fetch_tickers (вага 40) на кошику 20: борг замість списання лише 20
+    limiter = RateLimiter({'ex': (20, 0.1)})  # 200 токенів/с
+    started = time.perf_counter()
+    for _ in range(3):
+        assert limiter.acquire_sync('ex', 40)
+    elapsed = time.perf_counter() - started
+    assert elapsed >= 0.35  # 120 токенів: 20 з кошика + 100 поповнення
+    assert not limiter.try_acquire('ex')
+    assert 0.1 < limiter._take('ex', 1) <= 0.1 + 1 / 200 + 1e-3
+
+
+def test_async_acquire_uses_redis_asyncio():
+    # справжній Redis тут не перевіряється: лише що acquire() іде через redis.asyncio
+    # і при помилці переходить на локальний кошик
+    limiter = RateLimiter({'ex': (10, 1)})
+    sync_calls = []
+    limiter._redis_url = 'redis://127.0.0.1:1/0'
+    limiter._script = lambda **kwargs: sync_calls.append(kwargs)
+    assert asyncio.run(limiter.acquire('ex'))
+    assert sync_calls == []
+    assert limiter.stats['redis_errors'] == 1 and limiter.stats['granted'] == 1
+
+
+def test_async_and_threads_share_rate():
+    limiter = RateLimiter({'ex': (10, 0.1)})  # 100 токенів/с, сплеск 10
+
+    async def many():
+        await asyncio.gather(*(limiter.acquire('ex') for _ in range(50)))
+
+    started = time.perf_counter()
+    asyncio.run(many())
+    elapsed = time.perf_counter() - started
+    assert 0.35 <= elapsed < 1.0
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=lambda: [limiter.acquire_sync('ex') for _ in range(10)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    print(f"   50 async-запитів і 40 із 4 потоків при 100/с: {elapsed * 1000:.0f} мс (потоки)")
+    assert 0.25 <= elapsed < 1.0
+    assert limiter.stats['granted'] == 90
+
+
+def test_retry_after_blocks_bucket():
+    assert retry_after_seconds({'Retry-After': '2'}) == 2
+    assert retry_after_seconds({'retry-after': 'Wed, 21 Oct 2015 07:28:00 GMT'}) == 0
+    assert retry_after_seconds({}, default=30) == 30
+
+    limiter = RateLimiter({'ex': (100, 1)})
+    limiter.penalize('ex', 0.3)
+    assert not limiter.try_acquire('ex')
+    assert not asyncio.run(limiter.acquire('ex', timeout=0.1))
+    started = time.perf_counter()
+    assert limiter.acquire_sync('ex', timeout=1)
+    assert time.perf_counter() - started >= 0.15
+    assert limiter.stats['penalties'] == 1
+
+
+def test_http_client_honors_429():
+    rate_limiter.configure('test-exchange', 100, 1)
+
+    async def scenario():
+        async def limited(request):
+            return web.json_response({'code': -1003}, status=429, headers={'Retry-After': '1'})
+
+        app = web.Application()
+        app.router.add_get('/limited', limited)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/limited"
+        try:
+            assert await http_client.get_json(url, rate_limit='test-exchange') is None
+            assert not rate_limiter.try_acquire('test-exchange')
+            started = time.perf_counter()
+            assert await http_client.get_json(url, rate_limit='test-exchange') is None
+            return time.perf_counter() - started
+        finally:
+            await http_client.close()
+            await runner.cleanup()
+
+    assert asyncio.run(scenario()) >= 0.8
+
+
+def test_ccxt_instances_share_bucket():
+    limiter = RateLimiter({})
+    first, second = ccxt.binance(), ccxt.binance()
+    name = limiter.attach_ccxt(first)
+    limiter.attach_ccxt(second)
+    capacity, rate = limiter.limit(name)
+    assert name == 'ccxt:binance' and rate == 1000 / first.rateLimit
+
+    # два екземпляри разом не перевищують швидкість одного
+    started = time.perf_counter()
+    for _ in range(10):
+        first.throttle(capacity / 10)
+        second.throttle(capacity / 10)
+    assert time.perf_counter() - started >= 0.9
+
+    try:
+        first.handle_errors(429, 'Too Many Requests', 'https://fapi.binance.com/x', 'GET',
+                            {'Retry-After': '5'}, '', None, {}, None)
+    except ccxt.BaseError:
+        pass
+    assert limiter.stats['penalties'] == 1 and not limiter.try_acquire(name)
+
+    async def async_throttle():
+        exchange = ccxt_async.binance()
+        other = RateLimiter({})
+        other.attach_ccxt(exchange)
+        await exchange.throttle(1)
+        await exchange.close()
+        return other.stats['granted']
+
+    assert asyncio.run(async_throttle()) == 1
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ СПІЛЬНОГО ОБМЕЖУВАЧА ЗАПИТІВ")
+    print("=" * 60)
+    for test in (test_bucket_burst_and_endpoints, test_heavy_requests_charged_in_full,
+                 test_async_acquire_uses_redis_asyncio, test_async_and_threads_share_rate,
+                 test_retry_after_blocks_bucket, test_http_client_honors_429, test_ccxt_instances_share_bucket):
+        test()
+        print(f"✅ {test.__name__}")
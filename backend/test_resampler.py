@@ -0,0 +1,109 @@
+# backend/test_resampler.py
+import numpy as np
+from candle_factory import create_test_data
+from app.core.market_cache import market_cache
+from app.futures.models.ai_analyzer import AIAnalyzer
+from app.futures.models.exchange_connector import ExchangeConnector
+from app.futures.models.resampler import OHLCVResampler, resample_ohlcv
+
+
+def pandas_resample(df, rule):
+    """Еталон: pandas resample з відкиданням неповної першої свічки"""
+    agg = df.resample(rule, on='timestamp').agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+    ).reset_index()
+    if agg['timestamp'].iloc[0] != df['timestamp'].iloc[0]:
+        agg = agg.iloc[1:]
+    return agg.reset_index(drop=True)
+
+
+def assert_frames_equal(actual, expected):
+    assert list(actual['timestamp']) == list(expected['timestamp'])
+    for column in ('open', 'high', 'low', 'close', 'volume'):
+        assert np.allclose(actual[column].values, expected[column].values, rtol=1e-12), column
+
+
+def test_resample_matches_pandas():
+    df = create_test_data(600, start='2024-01-01 02:00')
+    for timeframe, rule in (('4h', '4h'), ('1d', '1D'), ('2h', '2h')):
+        assert_frames_equal(resample_ohlcv(df, timeframe), pandas_resample(df, rule))
+
+
+def test_weekly_candles_start_on_monday():
+    df = create_test_data(24 * 40, start='2024-01-03 00:00')  # середа
+    weekly = resample_ohlcv(df, '1w')
+    assert (weekly['timestamp'].dt.dayofweek == 0).all()
+
+    expected = df.groupby(df['timestamp'].dt.to_period('W-SUN').dt.start_time).agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+    ).rename_axis('timestamp').reset_index().iloc[1:].reset_index(drop=True)  # перший тиждень неповний
+    assert_frames_equal(weekly, expected)
+
+
+def test_incremental_matches_full_resample():
+    df = create_test_data(900, start='2024-01-01 02:00')
+    resampler = OHLCVResampler('1h', ['4h', '1d'])
+    resampler.update(df.iloc[:500])
+
+    for end in range(501, len(df) + 1):
+        window = df.iloc[max(0, end - 500):end].copy()
+        # незакрита свічка: спочатку часткове значення, потім фінальне
+        partial = window.copy()
+        partial.loc[partial.index[-1], 'close'] *= 0.999
+        resampler.update(partial)
+        frames = resampler.update(window)
+        for timeframe in ('4h', '1d'):
+            assert_frames_equal(frames[timeframe], resample_ohlcv(window, timeframe))
+
+    assert resampler.full_rebuilds == 1
+    assert resampler.incremental_updates == 2 * (len(df) - 500)
+
+
+def test_fetch_ohlcv_multi_single_request():
+    market_cache.clear()
+    df = create_test_data(1500, start='2024-01-01 00:00')
+    requests = []
+    connector = ExchangeConnector()
+    connector._fetch_ohlcv = lambda symbol, timeframe, limit: requests.append((timeframe, limit)) or df.tail(limit)
+
+    frames = connector.fetch_ohlcv_multi('BTC/USDT', ['4h', '1h'], limit=200)
+    assert requests == [('1h', 800)]
+    assert len(frames['1h']) == 200 and len(frames['4h']) == 200
+    assert_frames_equal(frames['4h'], resample_ohlcv(df, '4h').tail(200).reset_index(drop=True))
+
+    # 1500 годин - лише 62 доби: денні свічки окремим запитом
+    requests.clear()
+    frames = connector.fetch_ohlcv_multi('BTC/USDT', ['4h', '1h', '1d'], limit=200)
+    assert requests == [('1d', 200)]  # годинні - з кешу
+    assert len(frames['4h']) == 200 and len(frames['1d']) == 200
+
+
+def test_signal_with_higher_timeframes():
+    df = create_test_data(1500, start='2024-01-01 00:00')
+    analyzer = AIAnalyzer()
+    signal = analyzer.generate_trading_signal('BTC/USDT', df, '1h', confirm_timeframes=['4h', '1d', '15m'])
+    base = analyzer.generate_trading_signal('BTC/USDT', df, '1h')
+
+    mtf = signal['multi_timeframe']
+    assert signal['direction'] == base['direction'] and signal['confidence'] == base['confidence']
+    assert mtf['timeframes']['4h']['candles'] == 375
+    assert mtf['timeframes']['1d']['candles'] == 63  # 62 повні доби + поточна - замало для аналізу
+    assert 'fetch_ohlcv_multi' in mtf['timeframes']['1d']['error']
+    assert 'error' in mtf['timeframes']['15m']  # молодший таймфрейм не агрегується
+    assert 0.0 <= mtf['alignment'] <= 1.0
+
+    # власні денні свічки (як з fetch_ohlcv_multi) - підтвердження рахується
+    daily = create_test_data(200, start='2023-06-15', freq='D')
+    signal = analyzer.generate_multi_timeframe_signal('BTC/USDT', df, '1h', ['4h', '1d'], frames={'1d': daily})
+    assert signal['multi_timeframe']['timeframes']['1d']['candles'] == 200
+    assert 'error' not in signal['multi_timeframe']['timeframes']['1d']
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ АГРЕГАЦІЇ ТАЙМФРЕЙМІВ")
+    print("=" * 60)
+    for test in (test_resample_matches_pandas, test_weekly_candles_start_on_monday,
+                 test_incremental_matches_full_resample, test_fetch_ohlcv_multi_single_request,
+                 test_signal_with_higher_timeframes):
+        test()
+        print(f"✅ {test.__name__}")
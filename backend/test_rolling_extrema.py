@@ -0,0 +1,139 @@
+# backend/test_rolling_extrema.py
+import copy
+import time
+
+import numpy as np
+import pandas as pd
+import talib
+from candle_factory import create_test_data
+from app.futures.models.ai_analyzer import AIAnalyzer as ModelsAIAnalyzer
+from app.futures.models.rolling_extrema import RollingExtrema, rolling_extrema
+from app.futures.services.ai_analyzer import AIAnalyzer as ServicesAIAnalyzer
+
+WINDOWS = (5, 9, 14, 26, 52)
+
+
+def pandas_extrema(high, low, window):
+    return pd.Series(high).rolling(window).max().values, pd.Series(low).rolling(window).min().values
+
+
+def test_batch_matches_pandas():
+    for seed in range(3):
+        df = create_test_data(300 + seed, seed)
+        high, low = df['high'].round(-2).values, df['low'].round(-2).values  # однакові значення поспіль
+        extrema = rolling_extrema(high, low, WINDOWS)
+        assert tuple(extrema) == WINDOWS
+        for window in WINDOWS:
+            expected = pandas_extrema(high, low, window)
+            assert np.array_equal(extrema[window][0], expected[0], equal_nan=True)
+            assert np.array_equal(extrema[window][1], expected[1], equal_nan=True)
+
+    # матриця символи × свічки та ряд, коротший за вікно
+    frames = [create_test_data(200, seed) for seed in range(3)]
+    high = np.vstack([df['high'].values for df in frames])
+    low = np.vstack([df['low'].values for df in frames])
+    highest, lowest = rolling_extrema(high, low, (26,))[26]
+    for row, df in enumerate(frames):
+        expected = pandas_extrema(df['high'].values, df['low'].values, 26)
+        assert np.array_equal(highest[row], expected[0], equal_nan=True)
+        assert np.array_equal(lowest[row], expected[1], equal_nan=True)
+    assert np.isnan(rolling_extrema(high[0, :10], low[0, :10], (14,))[14][0]).all()
+
+
+def test_streaming_matches_batch():
+    df = create_test_data(400, 3)
+    high, low = df['high'].round(-1).values, df['low'].round(-1).values
+    batch = rolling_extrema(high, low, WINDOWS)
+    state = RollingExtrema(WINDOWS)
+    for i in range(len(df)):
+        current = state.update(high[i], low[i])
+        for window in WINDOWS:
+            expected = (batch[window][0][i], batch[window][1][i])
+            assert np.array_equal(current[window], expected, equal_nan=True), (i, window)
+    assert len(state._high.indices) - state._high.head <= max(WINDOWS)
+
+
+def test_streaming_copy_is_checkpoint():
+    df = create_test_data(120, 4)
+    state = RollingExtrema(WINDOWS)
+    for i in range(100):
+        state.update(df['high'].values[i], df['low'].values[i])
+    checkpoint = copy.copy(state)
+    expected = state.current()
+
+    state.update(10 ** 6, 1.0)  # незакрита свічка-викид
+    assert state.current()[52] != expected[52]
+    assert checkpoint.current() == expected
+    assert checkpoint.update(df['high'].values[100], df['low'].values[100]) == \
+        {window: (df['high'].values[101 - window:101].max(), df['low'].values[101 - window:101].min())
+         for window in WINDOWS}
+
+
+def test_models_oscillators_match_talib():
+    analyzer = ModelsAIAnalyzer()
+    df = create_test_data(500, 5)
+    high, low, close = df['high'].values, df['low'].values, df['close'].values
+    indicators = analyzer.calculate_indicators(df)
+
+    assert np.array_equal(indicators['williams_r'], talib.WILLR(high, low, close, timeperiod=14), equal_nan=True)
+    stoch_k, stoch_d = talib.STOCH(high, low, close)
+    np.testing.assert_allclose(indicators['stoch_k'], stoch_k, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(indicators['stoch_d'], stoch_d, rtol=0, atol=1e-9)
+
+    for key, window in (('tenkan_sen', 9), ('kijun_sen', 26), ('senkou_span_b', 52)):
+        highest, lowest = pandas_extrema(high, low, window)
+        assert np.array_equal(indicators[key], (highest + lowest) / 2, equal_nan=True), key
+    tenkan, kijun, span_a, span_b, _ = analyzer.calculate_ichimoku(df)
+    assert np.array_equal(tenkan, indicators['tenkan_sen'], equal_nan=True)
+    assert np.array_equal(span_b, indicators['senkou_span_b'], equal_nan=True)
+
+
+def test_services_ichimoku_matches_pandas():
+    analyzer = ServicesAIAnalyzer()
+    df = create_test_data(300, 6)
+    high, low = df['high'], df['low']
+    ichimoku = analyzer._calculate_ichimoku(df)
+    tenkan = (high.rolling(9).max() + low.rolling(9).min()) / 2
+    kijun = (high.rolling(26).max() + low.rolling(26).min()) / 2
+    span_b = ((high.rolling(52).max() + low.rolling(52).min()) / 2).shift(26)
+
+    assert np.array_equal(ichimoku['tenkan_sen'], tenkan.values, equal_nan=True)
+    assert np.array_equal(ichimoku['senkou_span_a'], ((tenkan + kijun) / 2).shift(26).values, equal_nan=True)
+    assert np.array_equal(ichimoku['senkou_span_b'], span_b.values, equal_nan=True)
+
+    plan = analyzer._indicator_plan(df)
+    assert np.array_equal(plan['williams_r'], analyzer._calculate_williams_r(df, 14), equal_nan=True)
+    assert plan.computed.count('channel_extrema') == 1
+
+
+def test_extrema_speed():
+    df = create_test_data(1000, 8)
+    high, low = df['high'].values, df['low'].values
+
+    start = time.perf_counter()
+    for _ in range(100):
+        rolling_extrema(high, low, WINDOWS)
+    batch_time = (time.perf_counter() - start) / 100
+
+    start = time.perf_counter()
+    for _ in range(100):
+        for window in WINDOWS:
+            pandas_extrema(high, low, window)
+    pandas_time = (time.perf_counter() - start) / 100
+
+    state = RollingExtrema(WINDOWS)
+    start = time.perf_counter()
+    for i in range(len(df)):
+        state.update(high[i], low[i])
+    streaming_time = (time.perf_counter() - start) / len(df)
+    print(f"   {len(WINDOWS)} вікон × {len(df)} свічок: batch {batch_time * 1000:.2f} мс, "
+          f"pandas {pandas_time * 1000:.2f} мс, streaming {streaming_time * 1e6:.1f} мкс/свічку")
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ КОВЗНИХ ЕКСТРЕМУМІВ")
+    print("=" * 60)
+    for test in (test_batch_matches_pandas, test_streaming_matches_batch, test_streaming_copy_is_checkpoint,
+                 test_models_oscillators_match_talib, test_services_ichimoku_matches_pandas, test_extrema_speed):
+        test()
+        print(f"✅ {test.__name__}")
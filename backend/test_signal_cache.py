@@ -0,0 +1,116 @@
+# backend/test_signal_cache.py
+import threading
+
+import pytest
+from fastapi import HTTPException
+import candle_factory  # noqa: F401 - тестові ключі біржі до імпорту app
+from app.core.market_cache import MarketDataCache, market_cache
+from app.futures.api import router as futures_router
+
+HOUR = 3600
+
+
+class FakeSession:
+    """Мінімальна сесія БД: рахує вставки та видає id"""
+
+    def __init__(self):
+        self.added = []
+
+    def add(self, row):
+        self.added.append(row)
+
+    def commit(self):
+        pass
+
+    def refresh(self, row):
+        row.id = len(self.added)
+
+
+def fake_analysis(symbol, timeframe):
+    fake_analysis.calls += 1
+    return {
+        'direction': 'long', 'confidence': 0.7, 'factors': {'trend_score': 0.8},
+        'entry_price': 100.0, 'take_profit': 110.0, 'stop_loss': 95.0,
+        'risk_reward': 2.0, 'symbol': symbol, 'timeframe': timeframe,
+    }
+
+
+def test_signal_cached_until_candle_close():
+    cache = MarketDataCache()
+    calls = []
+    compute = lambda: calls.append(1) or {'direction': 'long', 'n': len(calls)}
+    now = 100 * HOUR + 10
+
+    first, cached_first = cache.get_signal('BTC', '1h', 'v1', compute, now=now)
+    second, cached_second = cache.get_signal('BTC', '1h', 'v1', compute, now=now + 3000)
+    assert (cached_first, cached_second) == (False, True) and first == second and len(calls) == 1
+
+    cache.get_signal('BTC', '1h', 'v2', compute, now=now)  # нова версія аналізатора
+    renewed, cached = cache.get_signal('BTC', '1h', 'v1', compute, now=now + HOUR)  # свічка закрилась
+    assert not cached and renewed['n'] == 3
+    assert cache.get_stats()['signals'] == 2  # запис замінено, а не додано
+
+
+def test_failed_signal_not_cached():
+    cache = MarketDataCache()
+    calls = []
+    for _ in range(2):
+        assert cache.get_signal('BTC', '1h', 'v1', lambda: calls.append(1), now=0) == (None, False)
+    assert len(calls) == 2
+
+
+def test_concurrent_requests_compute_once():
+    cache = MarketDataCache()
+    barrier = threading.Barrier(6)
+    calls, results = [], []
+
+    def request():
+        barrier.wait()
+        results.append(cache.get_signal('BTC', '1h', 'v1', lambda: calls.append(1) or {'ok': True}, now=0))
+
+    threads = [threading.Thread(target=request) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1 and sum(not cached for _, cached in results) == 1
+
+
+def test_generate_endpoint_dedups_db_writes(monkeypatch):
+    market_cache.clear()
+    fake_analysis.calls = 0
+    monkeypatch.setattr(futures_router.signal_orchestrator, 'generate_signal', fake_analysis)
+    db = FakeSession()
+
+    first = futures_router.generate_signal('TEST/USDT:USDT', '1d', db=db)
+    second = futures_router.generate_signal('TEST/USDT:USDT', '1d', db=db)
+    other = futures_router.generate_signal('TEST/USDT:USDT', '4h', db=db)
+
+    assert fake_analysis.calls == 2 and len(db.added) == 2
+    assert not first['cached'] and second['cached'] and not other['cached']
+    assert second['signal'] == first['signal'] and first['signal']['id'] == 1
+
+
+def test_generate_endpoint_errors_not_cached(monkeypatch):
+    market_cache.clear()
+    calls = []
+    monkeypatch.setattr(futures_router.signal_orchestrator, 'generate_signal',
+                        lambda symbol, timeframe: calls.append(1) or {'error': 'no_data', 'symbol': symbol})
+    for _ in range(2):
+        with pytest.raises(HTTPException) as error:
+            futures_router.generate_signal('TEST/USDT:USDT', '1d', db=FakeSession())
+        assert error.value.detail == 'no_data'
+    assert len(calls) == 2
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ КЕШУ СИГНАЛІВ")
+    print("=" * 60)
+    for test in (test_signal_cached_until_candle_close, test_failed_signal_not_cached,
+                 test_concurrent_requests_compute_once):
+        test()
+        print(f"✅ {test.__name__}")
+    with pytest.MonkeyPatch.context() as patch:
+        for test in (test_generate_endpoint_dedups_db_writes, test_generate_endpoint_errors_not_cached):
+            test(patch)
+            print(f"✅ {test.__name__}")
@@ -0,0 +1,130 @@
+# backend/test_signal_pool.py
+import multiprocessing
+import os
+import time
+
+import pandas as pd
+from candle_factory import create_test_data
+from app.futures.models.shared_ohlcv import SharedOHLCV, attach_frame
+from app.futures.services.ai_analyzer import AIAnalyzer
+from app.futures.services.signal_orchestrator import SignalOrchestrator
+from app.futures.services.signal_pool import SignalWorkerPool
+
+SIGNAL_KEYS = ('direction', 'confidence', 'take_profit', 'stop_loss', 'risk_reward', 'position_size')
+
+
+def create_frames(count, num_candles=200):
+    return {f'SYM{i}/USDT': create_test_data(num_candles + i, seed=i) for i in range(count)}
+
+
+def test_shared_frames_roundtrip():
+    frames = create_frames(3)
+    frames['EMPTY/USDT'] = pd.DataFrame()
+    with SharedOHLCV(frames) as shared:
+        assert 'EMPTY/USDT' not in shared.layout
+        for symbol in ('SYM0/USDT', 'SYM2/USDT'):
+            restored = attach_frame(shared.handle(symbol))
+            pd.testing.assert_frame_equal(restored, frames[symbol], check_dtype=False)
+
+
+def test_pool_matches_sequential_in_order():
+    frames = create_frames(6)
+    symbols = list(reversed(list(frames))) + ['MISSING/USDT']
+    pool = SignalWorkerPool(workers=2, symbol_timeout=30)
+    try:
+        results = pool.analyze(symbols, frames)
+    finally:
+        pool.close()
+
+    analyzer = AIAnalyzer()
+    assert list(results) == symbols
+    assert results['MISSING/USDT']['error'] == 'no_data'
+    for symbol in symbols[:-1]:
+        expected = analyzer.analyze_market(symbol, '1h', df=frames[symbol])
+        assert all(results[symbol][key] == expected[key] for key in SIGNAL_KEYS), symbol
+
+
+def test_symbol_timeout():
+    frames = create_frames(2)
+    pool = SignalWorkerPool(workers=1, symbol_timeout=1e-4)
+    try:
+        results = pool.analyze(list(frames), frames)
+    finally:
+        pool.close()
+    for result in results.values():
+        assert result['error'] == 'timeout'  # не ковтається except Exception в analyze_market
+
+
+def test_close_terminates_hung_workers():
+    frames = create_frames(1)
+    pool = SignalWorkerPool(workers=1)
+    pool.analyze(list(frames), frames)  # запуск процесу
+    pids = pool.worker_pids()
+    assert len(pids) == 1
+    pool._get_executor().submit(time.sleep, 60)  # "завислий" воркер
+    time.sleep(0.2)
+
+    pool.close(wait=False)
+    deadline = time.monotonic() + 5
+    # active_children() також прибирає завершені процеси
+    while pids & {child.pid for child in multiprocessing.active_children()} and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not pids & {child.pid for child in multiprocessing.active_children()}
+
+
+def test_orchestrator_parallel_mode():
+    frames = create_frames(4)
+    orchestrators = (SignalOrchestrator(), SignalOrchestrator(workers=2))
+    def fetch(symbol, timeframe, limit):
+        return frames[symbol.split(':')[0]].tail(limit)
+
+    async def fetch_async(symbol, timeframe, limit):
+        return fetch(symbol, timeframe, limit)
+
+    for orchestrator in orchestrators:
+        orchestrator.exchange.fetch_ticker = lambda symbol: None
+        orchestrator.analyzer.exchange._fetch_ohlcv = fetch
+        orchestrator.analyzer.async_exchange._fetch_ohlcv = fetch_async
+
+    try:
+        sequential, parallel = (o.generate_multiple_signals(list(frames)) for o in orchestrators)
+    finally:
+        orchestrators[1].close()
+
+    assert orchestrators[0].pool is None and len(sequential) == len(frames)
+    assert [s['symbol'] for s in parallel] == [s['symbol'] for s in sequential]
+    for expected, actual in zip(sequential, parallel):
+        assert expected['direction'] == actual['direction'] and expected['confidence'] == actual['confidence']
+
+
+def test_pool_scan_speed():
+    frames = create_frames(40, num_candles=500)
+    workers = min(8, os.cpu_count() or 1)
+    pool = SignalWorkerPool(workers=workers)
+    try:
+        pool.analyze(list(frames)[:workers], frames)  # запуск процесів
+
+        start = time.perf_counter()
+        results = pool.analyze(list(frames), frames)
+        parallel_time = time.perf_counter() - start
+    finally:
+        pool.close()
+
+    analyzer = AIAnalyzer()
+    start = time.perf_counter()
+    for symbol, df in frames.items():
+        analyzer.analyze_market(symbol, '1h', df=df)
+    sequential_time = time.perf_counter() - start
+
+    print(f"   40 символів: послідовно {sequential_time * 1000:.0f} мс, "
+          f"пул з {workers} процесів {parallel_time * 1000:.0f} мс")
+    assert not any(result.get('error') for result in results.values())
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ ПАРАЛЕЛЬНОЇ ГЕНЕРАЦІЇ СИГНАЛІВ")
+    print("=" * 60)
+    for test in (test_shared_frames_roundtrip, test_pool_matches_sequential_in_order, test_symbol_timeout,
+                 test_close_terminates_hung_workers, test_orchestrator_parallel_mode, test_pool_scan_speed):
+        test()
+        print(f"✅ {test.__name__}")
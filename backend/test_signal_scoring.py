@@ -0,0 +1,99 @@
+# backend/test_signal_scoring.py
+import time
+
+import numpy as np
+from candle_factory import create_test_data
+from app.futures.models.ai_analyzer import AIAnalyzer
+from app.futures.models.signal_scoring import DIRECTION_NAMES
+
+CATEGORIES = ('trend', 'momentum', 'risk', 'volume', 'structure')
+
+
+def scalar_scores(analyzer, df):
+    """Оцінки останньої свічки скалярними методами (як у generate_trading_signal)"""
+    indicators = analyzer.calculate_indicators(df)
+    price = indicators['close'][-1]
+    trend = analyzer._analyze_trend(df, indicators, price)
+    analyses = {
+        'trend': trend,
+        'momentum': analyzer._analyze_momentum(indicators, price, trend['direction']),
+        'risk': analyzer._analyze_risk(df, indicators, price),
+        'volume': analyzer._analyze_volume(df, indicators),
+        'structure': analyzer._analyze_structure(df, indicators),
+    }
+    factors = {key: value for analysis in analyses.values() for key, value in analysis['factors'].items()}
+    return {
+        'direction': trend['direction'],
+        **{name: analysis['score'] for name, analysis in analyses.items()},
+        'confidence': analyzer._calculate_total_confidence(*analyses.values()),
+        'conflict': analyzer._calculate_conflict_score(factors),
+    }
+
+
+def assert_bar_matches(series, t, expected, context):
+    assert DIRECTION_NAMES[series['direction'][t]] == expected['direction'], context
+    for name in CATEGORIES:
+        assert series[f'{name}_score'][t] == expected[name], (context, name)
+    assert series['confidence'][t] == expected['confidence'], context
+    assert series['conflict'][t] == expected['conflict'], context
+
+
+def test_final_bar_matches_scalar():
+    analyzer = AIAnalyzer()
+    for seed in range(10):
+        for num_candles in (15, 40, 150, 400):
+            df = create_test_data(num_candles, seed)
+            series = analyzer.score_series(df)
+            assert len(series['confidence']) == num_candles
+            assert_bar_matches(series, -1, scalar_scores(analyzer, df), (seed, num_candles))
+
+
+def test_every_bar_matches_prefix():
+    analyzer = AIAnalyzer()
+    df = create_test_data(300, 11)
+    series = analyzer.score_series(df)
+    for t in range(20, len(df), 13):
+        assert_bar_matches(series, t, scalar_scores(analyzer, df.iloc[:t + 1]), t)
+
+
+def test_rescore_with_new_weights():
+    analyzer = AIAnalyzer()
+    df = create_test_data(300, 4)
+    series = analyzer.score_series(df)
+    weights = {'trend': 0.5, 'momentum': 0.2, 'risk': 0.1, 'volume': 0.1, 'structure': 0.1}
+
+    rescored = analyzer.rescore_confidence(series, weights)
+    np.testing.assert_array_equal(rescored, analyzer.score_series(df, weights=weights)['confidence'])
+    np.testing.assert_array_equal(analyzer.rescore_confidence(series, dict(zip(CATEGORIES, (0.3, 0.25, 0.2, 0.15, 0.1)))),
+                                  series['confidence'])
+
+    scores = [series[f'{name}_score'][-1] for name in CATEGORIES]
+    total = sum(score * weights[name] for score, name in zip(scores, CATEGORIES))
+    spread = np.std(scores)
+    total *= 1.1 if spread < 0.1 else 0.9 if spread > 0.25 else 1.0
+    assert rescored[-1] == round(min(1.0, max(0.0, total)), 3)
+
+
+def test_series_speed():
+    analyzer = AIAnalyzer()
+    df = create_test_data(1000, 2)
+    indicators = analyzer.calculate_indicators(df)
+
+    start = time.perf_counter()
+    analyzer.score_series(df, indicators)
+    series_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for t in range(len(df) - 100, len(df)):
+        scalar_scores(analyzer, df.iloc[:t + 1])
+    scalar_time = (time.perf_counter() - start) / 100 * len(df)
+    print(f"   {len(df)} свічок: серія {series_time * 1000:.1f} мс, по свічках ~{scalar_time * 1000:.0f} мс")
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ ВЕКТОРНОЇ ОЦІНКИ СИГНАЛІВ")
+    print("=" * 60)
+    for test in (test_final_bar_matches_scalar, test_every_bar_matches_prefix, test_rescore_with_new_weights,
+                 test_series_speed):
+        test()
+        print(f"✅ {test.__name__}")
@@ -0,0 +1,108 @@
+# backend/test_tail_window.py
+import numpy as np
+import talib
+from candle_factory import create_test_data
+from app.core.market_cache import market_cache
+from app.futures.models.ai_analyzer import AIAnalyzer as ModelsAIAnalyzer
+from app.futures.models.indicator_plan import ema_warmup
+from app.futures.models.lazy_indicators import IndicatorNode, anchored_keys, required_window
+from app.futures.services.ai_analyzer import AIAnalyzer
+
+TOLERANCE = 1e-6
+SIGNAL_KEYS = ('direction', 'confidence', 'take_profit', 'stop_loss', 'risk_reward', 'position_size')
+
+
+def test_required_window_composes_along_graph():
+    nodes = [
+        IndicatorNode(('rsi',), ('close',), None, warmup=14),
+        IndicatorNode(('stoch',), ('rsi',), None, warmup=15),
+        IndicatorNode(('ema',), ('close',), None, warmup=ema_warmup(26)),
+        IndicatorNode(('vwap',), ('close', 'volume'), None, warmup=None),
+    ]
+    assert required_window(nodes, TOLERANCE, ['stoch']) == 30
+    assert required_window(nodes, TOLERANCE, ['vwap']) == 1
+    assert required_window(nodes, 1e-3, ['ema']) < required_window(nodes, TOLERANCE, ['ema'])
+    assert anchored_keys(nodes) == ['vwap']
+
+
+def test_tail_indicators_match_full_history():
+    full, tail = AIAnalyzer(), AIAnalyzer(tail_window=True, tail_tolerance=TOLERANCE)
+    assert full.history_limit == 500 and tail.history_limit < 500
+    anchored = set(anchored_keys(tail.indicator_nodes))
+
+    for seed in range(5):
+        df = create_test_data(500, seed)
+        expected = full._calculate_all_indicators(df)
+        actual = tail._calculate_all_indicators(df.tail(tail.history_limit).reset_index(drop=True))
+        price = expected['current_price']
+
+        for key, values in expected.items():
+            if key in anchored or key == 'volume_array' or not isinstance(values, np.ndarray):
+                continue
+            assert abs(values[-1] - actual[key][-1]) <= TOLERANCE * price, key
+        for key in ('tenkan_sen', 'kijun_sen', 'senkou_span_a', 'senkou_span_b'):
+            assert np.isclose(expected['ichimoku'][key][-1], actual['ichimoku'][key][-1], rtol=TOLERANCE)
+        # OBV кумулятивний, але сигнал читає лише його зміну за 4 свічки
+        assert np.isclose(expected['obv'][-1] - expected['obv'][-5], actual['obv'][-1] - actual['obv'][-5])
+
+
+def test_tail_signal_matches_full_history():
+    full, tail = AIAnalyzer(), AIAnalyzer(tail_window=True)
+    for seed in range(10):
+        df = create_test_data(500, seed)
+        expected = full.analyze_market('BTC/USDT', '1h', df=df)
+        actual = tail.analyze_market('BTC/USDT', '1h', df=df)
+        assert all(expected[key] == actual[key] for key in SIGNAL_KEYS), seed
+
+
+def test_analyze_market_fetches_tail_only():
+    market_cache.clear()
+    df = create_test_data(500)
+    analyzer = AIAnalyzer(tail_window=True)
+    limits = []
+    analyzer.exchange._fetch_ohlcv = lambda symbol, timeframe, limit: limits.append(limit) or df.tail(limit)
+
+    async def fetch_async(symbol, timeframe, limit):
+        return analyzer.exchange._fetch_ohlcv(symbol, timeframe, limit)
+
+    analyzer.async_exchange._fetch_ohlcv = fetch_async
+
+    signal = analyzer.analyze_market('ETH/USDT', '1h')
+    analyzer.analyze_markets(['SOL/USDT'], '1h')
+
+    assert limits == [analyzer.history_limit] * 2
+    assert not signal.get('error')
+
+
+def test_full_history_by_default():
+    # VWAP відраховується від початку вікна: за замовчуванням сигнал - по повній історії
+    analyzer = AIAnalyzer()
+    assert not analyzer.tail_window and analyzer.history_limit == AIAnalyzer.FULL_HISTORY
+    assert 'vwap' in anchored_keys(analyzer.indicator_nodes)
+
+
+def test_models_warmup_declarations():
+    analyzer = ModelsAIAnalyzer()
+    df = create_test_data(3000, seed=1)
+    high, low, close = df['high'].values, df['low'].values, df['close'].values
+
+    # EMA200 та ADX збігаються повільно - потрібне вікно залежить від допуску
+    for key, scale, indicator in (('ema_200', close[-1], lambda h, l, c: talib.EMA(c, timeperiod=200)),
+                                  ('adx', 100, lambda h, l, c: talib.ADX(h, l, c, timeperiod=14))):
+        window = analyzer.required_window(1e-4, [key])
+        assert window < len(df)
+        reference = indicator(high, low, close)[-1]
+        assert abs(indicator(high[-window:], low[-window:], close[-window:])[-1] - reference) <= 1e-4 * scale
+
+    assert analyzer.required_window(1e-4, ['senkou_span_b']) == 52
+    assert set(analyzer.anchored_indicators()) == {'obv', 'vwap', 'ad', 'chikou_span'}
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ ХВОСТОВОГО ВІКНА")
+    print("=" * 60)
+    for test in (test_required_window_composes_along_graph, test_tail_indicators_match_full_history,
+                 test_tail_signal_matches_full_history, test_analyze_market_fetches_tail_only,
+                 test_full_history_by_default, test_models_warmup_declarations):
+        test()
+        print(f"✅ {test.__name__}")
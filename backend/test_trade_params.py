@@ -0,0 +1,109 @@
+# backend/test_trade_params.py
+import time
+
+import numpy as np
+import candle_factory  # noqa: F401 - тестові ключі біржі до імпорту app
+from app.futures.models.ai_analyzer import AIAnalyzer
+from app.futures.models.signal_scoring import DIRECTION_NAMES, LONG, SHORT
+
+
+def create_test_params(num_signals=4000, seed=11):
+    """Випадкові сигнали: ціни різного масштабу, рівні поруч з ціною (частина - відсутні)"""
+    rng = np.random.default_rng(seed)
+    price = np.round(10 ** rng.uniform(-2, 5, num_signals), 4)
+    price[:5] = 0.0
+    atr = price * rng.uniform(0, 0.03, num_signals)
+    atr[rng.random(num_signals) < 0.05] = 0.0
+    support = np.round(price * (1 - rng.uniform(0, 0.04, num_signals)), 4)
+    resistance = np.round(price * (1 + rng.uniform(0, 0.04, num_signals)), 4)
+    support[rng.random(num_signals) < 0.2] = np.nan
+    resistance[rng.random(num_signals) < 0.2] = np.nan
+    return {
+        'directions': rng.choice([LONG, SHORT], num_signals),
+        'prices': price,
+        'atrs': atr,
+        'supports': support,
+        'resistances': resistance,
+        'volatility': rng.uniform(0, 1, num_signals),
+        'confidence': np.round(rng.uniform(0.3, 0.95, num_signals), 3),
+        'conflict': rng.uniform(0, 0.6, num_signals),
+    }
+
+
+def scalar_parameters(analyzer, params, i):
+    """Рядок через скалярні методи аналізатора"""
+    level = lambda values: None if np.isnan(values[i]) else float(values[i])
+    support_resistance = {'nearest_support': level(params['supports']),
+                          'nearest_resistance': level(params['resistances'])}
+    direction = DIRECTION_NAMES[params['directions'][i]]
+    entry_points = analyzer._calculate_entry_points(direction, params['prices'][i], None, None,
+                                                    support_resistance=support_resistance)
+    entry = entry_points['optimal_entry']
+    tp_sl = analyzer._calculate_tp_sl_points(direction, entry, params['atrs'][i], None, None,
+                                             support_resistance=support_resistance)
+    risk_reward = analyzer._calculate_risk_reward(entry, tp_sl['take_profit'], tp_sl['stop_loss'])
+    signal = {
+        'confidence': round(float(params['confidence'][i]), 3),
+        'entry_points': entry_points,
+        'take_profit': tp_sl['take_profit'],
+        'stop_loss': tp_sl['stop_loss'],
+        'risk_reward': risk_reward,
+        'conflict_score': round(float(params['conflict'][i]), 2),
+    }
+    return {
+        **signal,
+        'valid': analyzer._validate_signal(signal),
+        'position_size': analyzer._calculate_position_size(entry, tp_sl['stop_loss'], params['volatility'][i],
+                                                           params['confidence'][i]),
+    }
+
+
+def test_batch_matches_scalar():
+    analyzer = AIAnalyzer()
+    params = create_test_params()
+    batch = analyzer.trade_parameters_batch(**params)
+    assert batch['valid'].any() and not batch['valid'].all()
+    for i in range(len(params['prices'])):
+        expected = scalar_parameters(analyzer, params, i)
+        assert batch['entry'][i] == expected['entry_points']['optimal_entry'], i
+        assert batch['take_profit'][i] == expected['take_profit'], i
+        assert batch['stop_loss'][i] == expected['stop_loss'], i
+        assert batch['risk_reward'][i] == expected['risk_reward'], i
+        assert batch['valid'][i] == expected['valid'], i
+        assert analyzer.position_size_record(batch, i) == expected['position_size'], i
+
+
+def test_string_directions_and_missing_levels():
+    analyzer = AIAnalyzer()
+    batch = analyzer.trade_parameters_batch(
+        ['long', 'short'], [100.0, 100.0], [1.0, 1.0], [np.nan, 0.0], [np.nan, np.nan], [0.5, 0.5], [0.7, 0.7]
+    )
+    assert batch['entry'].tolist() == [99.5, 100.5]
+    assert batch['take_profit'].tolist() == [102.5, 97.5]
+    assert batch['stop_loss'].tolist() == [98.5, 101.5]
+    assert batch['risk_reward'].tolist() == [3.0, 3.0]
+    assert batch['valid'].all()
+
+
+def test_batch_speed():
+    analyzer = AIAnalyzer()
+    params = create_test_params(20000, 3)
+    started = time.perf_counter()
+    analyzer.trade_parameters_batch(**params)
+    batch_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for i in range(len(params['prices'])):
+        scalar_parameters(analyzer, params, i)
+    scalar_time = time.perf_counter() - started
+    print(f"   batch: {batch_time * 1000:.1f} мс, скалярно: {scalar_time * 1000:.1f} мс "
+          f"(x{scalar_time / batch_time:.0f})")
+    assert batch_time < scalar_time
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ ПАКЕТНИХ ПАРАМЕТРІВ УГОДИ")
+    print("=" * 60)
+    for test in (test_batch_matches_scalar, test_string_directions_and_missing_levels, test_batch_speed):
+        test()
+        print(f"✅ {test.__name__}")
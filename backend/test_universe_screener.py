@@ -0,0 +1,163 @@
+# backend/test_universe_screener.py
+import json
+import time
+
+import numpy as np
+import pandas as pd
+from candle_factory import create_test_data
+from app.core.market_cache import market_cache
+from app.futures.models.universe_screener import UniverseScreener
+from app.futures.services.signal_orchestrator import SignalOrchestrator
+
+
+def create_universe(flat=40, active=5, num_candles=64):
+    """flat символів без руху та active трендових зі сплеском об'єму"""
+    frames = {f'FLAT{i}/USDT': create_test_data(num_candles, i, price=100, noise=0.002) for i in range(flat)}
+    frames.update({f'HOT{i}/USDT': create_test_data(num_candles, 100 + i, price=100, drift=0.01, surge=4.0)
+                   for i in range(active)})
+    return frames
+
+
+def scalar_features(screener, df, price=None):
+    """Ознаки одного символу через pandas (еталон для векторного розрахунку)"""
+    df = df.tail(screener.tail).reset_index(drop=True)
+    high, low, close, volume = df['high'], df['low'], df['close'], df['volume']
+    price = close.iloc[-1] if price is None else price
+    true_range = pd.concat([high - low, (high - close.shift()).abs(), (low - close.shift()).abs()], axis=1).max(axis=1)
+    atr = true_range.iloc[1:].rolling(screener.atr_period).mean()
+    natr = (atr / close.iloc[1:]).dropna()
+    ema = close.ewm(span=screener.ema_period, adjust=False).mean()
+    highest, lowest = high.iloc[-screener.level_window:].max(), low.iloc[-screener.level_window:].min()
+    return {
+        'atr_percentile': (natr <= natr.iloc[-1]).mean(),
+        'volume_surge': volume.iloc[-1] / volume.iloc[-1 - screener.volume_window:-1].mean(),
+        'ema_slope': (ema.iloc[-1] - ema.iloc[-1 - screener.slope_lag]) / atr.iloc[-1],
+        'level_distance': min(abs(highest - price), abs(price - lowest)) / atr.iloc[-1],
+    }
+
+
+def test_features_match_scalar():
+    screener = UniverseScreener()
+    frames = {f'S{i}': create_test_data(80, i, price=100, drift=0.003 * (i - 3)) for i in range(6)}
+    symbols, matrices = screener.stack_tails(frames)
+    features = screener.features(matrices['high'], matrices['low'], matrices['close'], matrices['volume'])
+    for row, symbol in enumerate(symbols):
+        expected = scalar_features(screener, frames[symbol])
+        for name, value in expected.items():
+            assert np.isclose(features[name][row], value, rtol=1e-9), (symbol, name)
+
+
+def test_screen_selects_active_symbols():
+    screener = UniverseScreener(top_k=10)
+    frames = create_universe()
+    frames['NEW/USDT'] = create_test_data(30, 999, price=100, drift=0.02, surge=5.0)  # коротка історія
+
+    result = screener.screen(frames)
+    assert result['scanned'] == 46 and result['eligible'] == 45
+    assert set(f'HOT{i}/USDT' for i in range(5)) <= set(result['candidates'])
+    assert 'NEW/USDT' not in result['candidates'] and len(result['candidates']) <= 10
+    assert result['pass_rate'] == round(result['passed'] / 46, 4)
+    scores = [row['score'] for row in result['ranking']]
+    assert scores == sorted(scores, reverse=True) and min(scores) >= screener.min_score
+    assert all(row['trend'] == 'up' for row in result['ranking'] if row['symbol'].startswith('HOT'))
+
+    assert screener.screen(frames, top_k=2)['candidates'] == result['candidates'][:2]
+    assert screener.stats == {'scans': 2, 'scanned': 92, 'passed': result['passed'] + 2}
+
+
+def test_tickers_filter_and_price():
+    screener = UniverseScreener(top_k=50, min_score=0.0, min_quote_volume=1e6)
+    frames = create_universe(flat=4, active=2)
+    tickers = {symbol: {'last': float(df['close'].iloc[-1]) * 1.01, 'quoteVolume': 5e6}
+               for symbol, df in frames.items()}
+    tickers['FLAT0/USDT']['quoteVolume'] = 1e5
+    del tickers['FLAT1/USDT']
+
+    result = screener.screen(frames, tickers)
+    assert result['eligible'] == 4
+    assert {'FLAT0/USDT', 'FLAT1/USDT'}.isdisjoint(result['candidates'])
+    row = next(row for row in result['ranking'] if row['symbol'] == 'HOT0/USDT')
+    expected = scalar_features(screener, frames['HOT0/USDT'], tickers['HOT0/USDT']['last'])
+    assert np.isclose(row['level_distance'], expected['level_distance'], atol=1e-4)
+
+    assert UniverseScreener().screen({})['candidates'] == []
+
+
+def test_degenerate_windows_score_zero():
+    screener = UniverseScreener(top_k=10, min_score=0.0)
+    frames = create_universe(flat=3, active=2)
+    silent = create_test_data(64, 500, price=100, drift=0.01)
+    silent['volume'] = 0.0  # без угод
+    constant = create_test_data(64, 501, price=100)
+    constant[['open', 'high', 'low', 'close']] = 100.0  # ціна не рухається
+    frames.update({'SILENT/USDT': silent, 'CONST/USDT': constant})
+
+    symbols, matrices = screener.stack_tails(frames)
+    features = screener.features(matrices['high'], matrices['low'], matrices['close'], matrices['volume'])
+    scores = dict(zip(symbols, screener.score(features)))
+    assert np.isnan(features['volume_surge'][symbols.index('SILENT/USDT')])
+    assert np.isnan(features['ema_slope'][symbols.index('CONST/USDT')])
+    assert np.isnan(features['level_distance'][symbols.index('CONST/USDT')])
+    assert scores['SILENT/USDT'] == 0.0 and scores['CONST/USDT'] == 0.0
+    assert max(scores.values()) > 0
+
+    result = screener.screen(frames)
+    assert result['candidates'][0].startswith('HOT')
+    rows = {row['symbol']: row for row in result['ranking']}
+    assert rows['SILENT/USDT']['score'] == 0.0 and rows['SILENT/USDT']['volume_surge'] is None
+    assert rows['CONST/USDT']['ema_slope'] is None and rows['CONST/USDT']['level_distance'] is None
+    json.dumps(result, allow_nan=False)  # відповідь API серіалізується
+
+
+def test_orchestrator_analyzes_candidates_only():
+    market_cache.clear()
+    frames = create_universe(flat=20, active=3, num_candles=500)
+    orchestrator = SignalOrchestrator(workers=1)
+    requested = []
+
+    def fetch(symbol, timeframe, limit):
+        requested.append((symbol, limit))
+        return frames[symbol.replace(':USDT', '')].tail(limit).reset_index(drop=True)
+
+    async def fetch_async(symbol, timeframe, limit):
+        return fetch(symbol, timeframe, limit)
+
+    for exchange in (orchestrator.exchange, orchestrator.analyzer.exchange):
+        exchange._fetch_ohlcv = fetch
+    orchestrator.analyzer.async_exchange._fetch_ohlcv = fetch_async
+    orchestrator.exchange.fetch_futures_symbols = lambda: list(frames)
+    orchestrator.exchange.fetch_tickers = lambda symbols: {}
+    orchestrator.exchange.fetch_ticker = lambda symbol: None
+
+    result = orchestrator.generate_screened_signals(top_k=4)
+    candidates = result['screening']['candidates']
+    assert 0 < len(candidates) <= 4 and result['screening']['scanned'] == len(frames)
+    assert orchestrator.screener.top_k != 4  # налаштування спільного скринера не змінюються
+    full_history = [symbol.replace(':USDT', '') for symbol, limit in requested
+                    if limit == orchestrator.analyzer.history_limit]
+    assert sorted(full_history) == sorted(candidates)
+    assert {signal['symbol'] for signal in result['signals']} <= set(candidates)
+
+
+def test_screen_speed():
+    screener = UniverseScreener(top_k=20)
+    frames = {f'SYM{i}/USDT': create_test_data(64, i, price=100, drift=0.002 * np.sin(i)) for i in range(300)}
+    symbols, matrices = screener.stack_tails(frames)
+
+    start = time.perf_counter()
+    for _ in range(20):
+        screener.features(matrices['high'], matrices['low'], matrices['close'], matrices['volume'])
+    features_time = (time.perf_counter() - start) / 20
+
+    result = screener.screen(frames)
+    print(f"   {len(frames)} символів: ознаки {features_time * 1000:.2f} мс, повний скан "
+          f"{sum(result['timings_ms'].values()):.1f} мс, pass rate {result['pass_rate']:.1%}")
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ СКРИНЕРА УНІВЕРСУ")
+    print("=" * 60)
+    for test in (test_features_match_scalar, test_screen_selects_active_symbols, test_tickers_filter_and_price,
+                 test_degenerate_windows_score_zero, test_orchestrator_analyzes_candidates_only, test_screen_speed):
+        test()
+        print(f"✅ {test.__name__}")
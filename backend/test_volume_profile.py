@@ -0,0 +1,126 @@
+# backend/test_volume_profile.py
+import time
+
+import numpy as np
+from candle_factory import create_test_data
+from app.futures.models.ai_analyzer import AIAnalyzer
+from app.futures.models.volume_profile import VolumeProfileIndex, VolumeProfileRegistry
+
+
+def assert_same_profile(index, reference):
+    """Однаковий профіль у спільному діапазоні кошиків та однакові рівні"""
+    offset = reference._base - index._base
+    volume = index._volume[offset:offset + len(reference._volume)]
+    np.testing.assert_allclose(volume, reference._volume, rtol=1e-9, atol=1e-6)
+    assert np.allclose(np.delete(index._volume, np.s_[offset:offset + len(reference._volume)]), 0, atol=1e-6)
+    np.testing.assert_allclose(index.levels(), reference.levels())
+
+
+def brute_force_nearest(levels, price):
+    supports = [level for level in levels if level <= price]
+    resistances = [level for level in levels if level > price]
+    return (max(supports) if supports else None), (min(resistances) if resistances else None)
+
+
+def test_incremental_matches_bootstrap():
+    df = create_test_data(900, 1)
+    index = VolumeProfileIndex(window=300)
+    index.sync(df.iloc[:350])
+    for end in range(351, len(df) + 1, 7):
+        index.sync(df.iloc[:end])
+    index.sync(df)
+    assert index.bootstraps == 1 and index.length == 300
+
+    reference = VolumeProfileIndex(window=300)
+    reference.bootstrap(df)
+    assert_same_profile(index, reference)
+
+
+def test_replace_last_candle():
+    df = create_test_data(200, 2)
+    index = VolumeProfileIndex(window=None)
+    index.sync(df)
+
+    changed = df.copy()
+    changed.loc[len(df) - 1, ['high', 'volume']] = [df['high'].iloc[-1] * 1.02, 5000.0]
+    index.sync(changed)
+    assert index.bootstraps == 1 and index.length == len(df)
+
+    reference = VolumeProfileIndex(window=None)
+    reference.bootstrap(changed)
+    assert_same_profile(index, reference)
+
+
+def test_gap_rebuilds_profile():
+    df = create_test_data(400, 3)
+    index = VolumeProfileIndex(window=200)
+    index.sync(df.iloc[:100])
+    index.sync(df.iloc[250:])  # остання відома свічка вже не в даних
+    assert index.bootstraps == 2 and index.length == 150
+
+
+def test_nearest_levels():
+    df = create_test_data(600, 4)
+    index = VolumeProfileIndex(window=None).sync(df)
+    levels = list(index.levels())
+    assert len(levels) > 2 and levels == sorted(levels)
+
+    for price in np.linspace(df['low'].min() * 0.9, df['high'].max() * 1.1, 200):
+        assert index.nearest(price) == brute_force_nearest(levels, price)
+    assert index.nearest(levels[3]) == (levels[3], levels[4])
+
+    price = float(df['close'].iloc[-1])
+    result = index.support_resistance(price, count=3)
+    support, resistance = index.nearest(price)
+    assert result['nearest_support'] == (round(support, 4) if support else None)
+    assert result['nearest_resistance'] == (round(resistance, 4) if resistance else None)
+    assert len(result['supports']) <= 3 and len(result['resistances']) <= 3
+
+
+def test_registry_batch():
+    registry = VolumeProfileRegistry(window=300)
+    frames = {f'SYM{i}USDT': create_test_data(400, i) for i in range(300)}
+
+    start = time.perf_counter()
+    for symbol, df in frames.items():
+        registry.get(symbol, '1h').sync(df)
+    bootstrap_time = time.perf_counter() - start
+
+    updated = {symbol: create_test_data(401, int(symbol[3:-4])) for symbol in frames}
+    start = time.perf_counter()
+    for symbol, df in updated.items():
+        registry.get(symbol, '1h').sync(df)
+    prices = {symbol: float(df['close'].iloc[-1]) for symbol, df in updated.items()}
+    nearest = registry.nearest_batch(prices, '1h')
+    update_time = time.perf_counter() - start
+
+    assert len(registry) == 300 and len(nearest) == 300
+    assert all(registry.get(symbol, '1h').bootstraps == 1 for symbol in frames)
+    assert registry.nearest_batch({'MISSING': 1.0}, '1h') == {}
+    print(f"   {len(registry)} символів: побудова {bootstrap_time * 1000:.0f} мс, "
+          f"нова свічка + рівні {update_time * 1000:.0f} мс")
+
+
+def test_signal_with_volume_profile():
+    analyzer = AIAnalyzer(level_source='volume_profile')
+    df = create_test_data(500, 5)
+    directions = set()
+    for end in range(300, len(df) + 1, 10):
+        signal = analyzer.generate_trading_signal('TEST', df.iloc[:end])
+        directions.add(signal['direction'])
+    assert len(analyzer.level_indexes) == 1
+    assert analyzer.level_indexes.get('TEST', '1h').bootstraps == 1
+    assert directions - {'neutral'}
+
+    pivots = AIAnalyzer().generate_trading_signal('TEST', df)
+    if pivots['direction'] != 'neutral':
+        assert pivots['support_resistance'] == AIAnalyzer().calculate_support_resistance(df)
+
+
+if __name__ == "__main__":
+    print("🧪 ТЕСТ ПРОФІЛЮ ОБ'ЄМУ")
+    print("=" * 60)
+    for test in (test_incremental_matches_bootstrap, test_replace_last_candle, test_gap_rebuilds_profile,
+                 test_nearest_levels, test_registry_batch, test_signal_with_volume_profile):
+        test()
+        print(f"✅ {test.__name__}")